@@ -0,0 +1,34 @@
+"""reverse lookup indexes
+
+Revision ID: b5d83e0a6c12
+Revises: 7c1e51057d00
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b5d83e0a6c12'
+down_revision: str | None = '7c1e51057d00'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('access_resources', schema=None) as batch_op:
+        batch_op.create_index('ix_access_resources_resource_id', ['resource_id'], unique=False)
+
+    with op.batch_alter_table('group_accesses', schema=None) as batch_op:
+        batch_op.create_index('ix_group_accesses_access_id', ['access_id'], unique=False)
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('group_accesses', schema=None) as batch_op:
+        batch_op.drop_index('ix_group_accesses_access_id')
+
+    with op.batch_alter_table('access_resources', schema=None) as batch_op:
+        batch_op.drop_index('ix_access_resources_resource_id')
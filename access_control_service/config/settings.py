@@ -21,6 +21,10 @@ class Settings(BaseSettings):
     db_name: str = Field(
         default="access_control_service",
     )
+    db_echo: bool = Field(
+        default=False,
+        description="Логировать каждый SQL запрос (SQLAlchemy echo); только для отладки",
+    )
 
     database_url: str | None = Field(
         default=None,
@@ -69,6 +73,23 @@ class Settings(BaseSettings):
         ),
     )
 
+    cache_ttl_effective_resources_seconds: int = Field(
+        default=300,
+        description=(
+            "Время жизни кэша эффективных ресурсов (5 минут). "
+            "Ключ формата: 'effective:{version}:{hash}', версия сбрасывается при изменении групп и доступов."
+        ),
+    )
+
+    tracing_exporter: str = Field(
+        default="none",
+        description="Экспорт спанов трассировки: none, memory (в памяти процесса) или jsonl (в файл)",
+    )
+    tracing_jsonl_path: str = Field(
+        default="traces.jsonl",
+        description="Файл для экспортера jsonl",
+    )
+
     log_level: str = Field(
         default="INFO",
         description="Уровень логирования (DEBUG, INFO, WARNING, ERROR, CRITICAL)",
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from access_control_service.db.base import Base
@@ -12,6 +12,10 @@ class AccessResource(Base):
     access_id: Mapped[int] = mapped_column(ForeignKey("accesses.id"), primary_key=True)
     resource_id: Mapped[int] = mapped_column(ForeignKey("resources.id"), primary_key=True)
 
+    __table_args__ = (
+        Index("ix_access_resources_resource_id", "resource_id"),
+    )
+
 
 class Access(Base):
     __tablename__ = "accesses"
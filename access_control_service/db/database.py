@@ -8,6 +8,7 @@ from alembic.config import Config
 from alembic import command
 
 from access_control_service.config.settings import Settings
+from access_control_service.services.metrics import instrument_engine
 from access_control_service.db.base import Base  # noqa: F401
 from access_control_service.db.resource import Resource  # noqa: F401
 from access_control_service.db.access import Access, AccessResource  # noqa: F401
@@ -101,9 +102,10 @@ class Database:
 
         self._engine = create_async_engine(
             self.DATABASE_URL,
-            echo=True,
+            echo=self._settings.db_echo,
             future=True,
         )
+        instrument_engine(self._engine)
 
         self._AsyncSessionLocal = async_sessionmaker(
             self._engine,
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import String, ForeignKey
+from sqlalchemy import String, ForeignKey, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from access_control_service.db.base import Base
@@ -13,6 +13,10 @@ class GroupAccess(Base):
     group_id: Mapped[int] = mapped_column(ForeignKey("groups.id"), primary_key=True)
     access_id: Mapped[int] = mapped_column(ForeignKey("accesses.id"), primary_key=True)
 
+    __table_args__ = (
+        Index("ix_group_accesses_access_id", "access_id"),
+    )
+
 
 class Group(Base):
     __tablename__ = "groups"
@@ -25,6 +25,10 @@ class RedisClientProtocol(Protocol):
     def connection(self) -> redis.Redis:
         ...
 
+    @property
+    def binary_connection(self) -> redis.Redis:
+        ...
+
     async def connect(self) -> None:
         ...
 
@@ -20,14 +20,18 @@ from access_control_service.services.protocols import (
     GroupServiceProtocol,
     ConflictServiceProtocol,
     ConflictServiceAdminProtocol,
+    ConflictAnalyticsServiceProtocol,
+    EffectivePermissionsServiceProtocol,
 )
 from access_control_service.services.resource_service import ResourceService
 from access_control_service.services.resource_service_admin import ResourceServiceAdmin
+from access_control_service.services.effective_permissions_service import EffectivePermissionsService
 from access_control_service.services.access_service import AccessService
 from access_control_service.services.access_service_admin import AccessServiceAdmin
 from access_control_service.services.group_service import GroupService
 from access_control_service.services.conflict_service import ConflictService
 from access_control_service.services.conflict_service_admin import ConflictServiceAdmin
+from access_control_service.services.conflict_analytics import ConflictAnalyticsService
 from access_control_service.repositories.access_repository import AccessRepository
 from access_control_service.repositories.resource_repository import ResourceRepository
 from access_control_service.repositories.group_repository import GroupRepository
@@ -84,6 +88,12 @@ async def get_redis_connection() -> AsyncGenerator[redis.Redis[Any], None]:
     yield connection
 
 
+async def get_redis_binary_connection() -> AsyncGenerator[redis.Redis[Any], None]:
+    redis_client = get_redis_client()
+    connection = redis_client.binary_connection
+    yield connection
+
+
 def get_access_repository(
     session: AsyncSession = Depends(get_db_session),
 ) -> AccessRepositoryProtocol:
@@ -102,6 +112,16 @@ def get_resource_service(
     return ResourceService(resource_repository=resource_repository)
 
 
+def get_effective_permissions_service(
+    resource_repository: ResourceRepositoryProtocol = Depends(get_resource_repository),
+    redis_conn: redis.Redis = Depends(get_redis_connection),
+) -> EffectivePermissionsServiceProtocol:
+    return EffectivePermissionsService(
+        resource_repository=resource_repository,
+        redis_conn=redis_conn,
+    )
+
+
 def get_resource_service_admin(
     resource_repository: ResourceRepositoryProtocol = Depends(get_resource_repository),
 ) -> ResourceServiceAdminProtocol:
@@ -154,8 +174,16 @@ def get_group_service(
 
 def get_conflict_service(
     conflict_repository: ConflictRepositoryProtocol = Depends(get_conflict_repository),
+    redis_conn: redis.Redis = Depends(get_redis_connection),
 ) -> ConflictServiceProtocol:
-    return ConflictService(conflict_repository=conflict_repository)
+    return ConflictService(conflict_repository=conflict_repository, redis_conn=redis_conn)
+
+
+def get_conflict_analytics_service(
+    conflict_repository: ConflictRepositoryProtocol = Depends(get_conflict_repository),
+    redis_conn: redis.Redis = Depends(get_redis_connection),
+) -> ConflictAnalyticsServiceProtocol:
+    return ConflictAnalyticsService(conflict_repository=conflict_repository, redis_conn=redis_conn)
 
 
 def get_conflict_service_admin(
@@ -4,7 +4,10 @@ from contextlib import asynccontextmanager
 import logging
 import sys
 
+from access_control_service.services.tracing import configure_tracing, create_exporter, setup_tracing
+from access_control_service.services.metrics import setup_metrics
 from access_control_service.routes import resources, accesses, groups, conflicts, health, admin
+from access_control_service.models.models import RESPONSE_SCHEMA_VERSION, SCHEMA_VERSION_HEADER
 from access_control_service.dependencies import (
     get_database,
     get_redis_client,
@@ -26,6 +29,8 @@ logging.getLogger("redis").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+configure_tracing(create_exporter(settings.tracing_exporter, settings.tracing_jsonl_path))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -71,6 +76,16 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+setup_metrics(app)
+setup_tracing(app)
+
+
+@app.middleware("http")
+async def schema_version_middleware(request: Request, call_next):
+    response = await call_next(request)
+    response.headers[SCHEMA_VERSION_HEADER] = RESPONSE_SCHEMA_VERSION
+    return response
+
 
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
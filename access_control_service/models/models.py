@@ -2,6 +2,11 @@ from pydantic import BaseModel, ConfigDict, Field
 
 from access_control_service.models.enums import ResourceType
 
+# Версия схемы ответов API; клиенты (BFF) отдают ответ как есть, только если версия совпадает
+# с ожидаемой. Увеличивать при любом изменении публичных моделей ниже.
+RESPONSE_SCHEMA_VERSION = "1"
+SCHEMA_VERSION_HEADER = "X-Schema-Version"
+
 
 class Resource(BaseModel):
     model_config = ConfigDict(from_attributes=True)
@@ -95,5 +100,66 @@ class GetConflictsResponse(BaseModel):
     conflicts: list[Conflict] = Field(default_factory=list, description="Список конфликтов групп")
 
 
+class CheckConflictsRequest(BaseModel):
+    user_group_ids: list[int] = Field(default_factory=list, description="ID активных групп пользователя")
+    requested_group_ids: list[int] = Field(default_factory=list, description="ID запрашиваемых групп")
+
+
+class CheckConflictsResponse(BaseModel):
+    has_conflict: bool = Field(description="Найден ли конфликт")
+    user_group_id: int | None = Field(default=None, description="Группа пользователя, участвующая в конфликте")
+    requested_group_id: int | None = Field(default=None, description="Запрашиваемая группа, участвующая в конфликте")
+
+
+class EffectiveResourcesRequest(BaseModel):
+    group_ids: list[int] = Field(default_factory=list, description="ID групп, выданных пользователю")
+    access_ids: list[int] = Field(default_factory=list, description="ID доступов, выданных пользователю напрямую")
+
+
+class EffectiveResourcesResponse(BaseModel):
+    resources: list[Resource] = Field(default_factory=list, description="Ресурсы, доступные через группы и доступы")
+
+
+class ResourceHolderAccess(BaseModel):
+    access_id: int = Field(description="ID доступа, содержащего ресурс")
+    group_ids: list[int] = Field(default_factory=list, description="ID групп, в которые входит доступ")
+
+
+class ResourceHoldersResponse(BaseModel):
+    resource_id: int = Field(description="ID ресурса")
+    accesses: list[ResourceHolderAccess] = Field(default_factory=list, description="Доступы к ресурсу и группы, через которые они выдаются")
+    access_ids: list[int] = Field(default_factory=list, description="ID всех доступов, содержащих ресурс")
+    group_ids: list[int] = Field(default_factory=list, description="ID всех групп, дающих доступ к ресурсу")
+
+
+class ConflictGroupDegree(BaseModel):
+    group_id: int = Field(description="ID группы")
+    degree: int = Field(description="Количество групп, конфликтующих с данной")
+
+
+class ConflictComponent(BaseModel):
+    component_id: int = Field(description="ID компоненты (минимальный ID группы в ней)")
+    size: int = Field(description="Количество групп в компоненте")
+    group_ids: list[int] = Field(default_factory=list, description="ID групп компоненты")
+
+
+class ConflictAnalyticsResponse(BaseModel):
+    version: int = Field(description="Версия матрицы конфликтов, по которой посчитана аналитика")
+    groups_count: int = Field(description="Количество групп, участвующих в конфликтах")
+    pairs_count: int = Field(description="Количество конфликтующих пар (без учета направления)")
+    components_count: int = Field(description="Количество компонент связности графа конфликтов")
+    top_groups: list[ConflictGroupDegree] = Field(default_factory=list, description="Группы с наибольшим числом конфликтов")
+    components: list[ConflictComponent] = Field(default_factory=list, description="Компоненты связности графа конфликтов")
+
+
+class ConflictGroupAnalyticsResponse(BaseModel):
+    version: int = Field(description="Версия матрицы конфликтов, по которой посчитана аналитика")
+    group_id: int = Field(description="ID группы")
+    degree: int = Field(description="Количество групп, конфликтующих с данной")
+    neighbors: list[int] = Field(default_factory=list, description="ID групп, напрямую конфликтующих с данной")
+    component_id: int = Field(description="ID компоненты связности, в которую входит группа")
+    component_group_ids: list[int] = Field(default_factory=list, description="ID групп, связанных с данной через цепочку конфликтов")
+
+
 class AddResourceToAccessRequest(BaseModel):
     resource_id: int = Field(gt=0, description="ID ресурса")
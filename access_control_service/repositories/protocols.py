@@ -50,6 +50,16 @@ class ResourceRepositoryProtocol(Protocol):
     async def find_by_id_with_accesses(self, resource_id: int) -> Resource | None:
         ...
 
+    async def find_effective_by_grants(
+        self,
+        group_ids: list[int],
+        access_ids: list[int],
+    ) -> list[Resource]:
+        ...
+
+    async def find_holders(self, resource_id: int) -> list[tuple[int, int | None]]:
+        ...
+
     async def find_all(self) -> list[Resource]:
         ...
 
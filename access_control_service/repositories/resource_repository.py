@@ -1,8 +1,10 @@
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, or_
 from sqlalchemy.orm import selectinload
 
 from access_control_service.db.resource import Resource
+from access_control_service.db.access import AccessResource
+from access_control_service.db.group import GroupAccess
 
 
 class ResourceRepository:
@@ -34,6 +36,41 @@ class ResourceRepository:
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
 
+    async def find_effective_by_grants(
+        self,
+        group_ids: list[int],
+        access_ids: list[int],
+    ) -> list[Resource]:
+        """Ресурсы, достижимые через группы (group_accesses) и доступы (access_resources), одним запросом."""
+
+        group_access_ids = select(GroupAccess.access_id).where(GroupAccess.group_id.in_(group_ids))
+        stmt = (
+            select(Resource)
+            .join(AccessResource, AccessResource.resource_id == Resource.id)
+            .where(
+                or_(
+                    AccessResource.access_id.in_(group_access_ids),
+                    AccessResource.access_id.in_(access_ids),
+                )
+            )
+            .distinct()
+            .order_by(Resource.id)
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def find_holders(self, resource_id: int) -> list[tuple[int, int | None]]:
+        """Пары (access_id, group_id) для ресурса: access_resources LEFT JOIN group_accesses."""
+
+        stmt = (
+            select(AccessResource.access_id, GroupAccess.group_id)
+            .outerjoin(GroupAccess, GroupAccess.access_id == AccessResource.access_id)
+            .where(AccessResource.resource_id == resource_id)
+            .order_by(AccessResource.access_id, GroupAccess.group_id)
+        )
+        result = await self._session.execute(stmt)
+        return [(access_id, group_id) for access_id, group_id in result.all()]
+
     async def find_all(self) -> list[Resource]:
         stmt = select(Resource)
         result = await self._session.execute(stmt)
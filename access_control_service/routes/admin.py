@@ -1,8 +1,10 @@
 import logging
 import redis.asyncio as redis
 from fastapi import APIRouter, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from access_control_service.dependencies import (
+    get_db_session,
     get_redis_connection,
     get_resource_service_admin,
     get_access_service,
@@ -13,7 +15,11 @@ from access_control_service.dependencies import (
 from access_control_service.services.cache import (
     invalidate_access_groups_cache,
     invalidate_group_accesses_cache,
-    invalidate_conflicts_matrix_cache
+    invalidate_conflicts_matrix_cache,
+    add_conflict_to_group_sets,
+    remove_conflict_from_group_sets,
+    invalidate_access_graph_cache,
+    publish_cache_invalidation,
 )
 from access_control_service.services.protocols import (
     ResourceServiceAdminProtocol,
@@ -45,31 +51,55 @@ router = APIRouter(prefix="/admin", tags=["Admin"])
 @router.post("/resources", response_model=CreateResourceResponse, status_code=status.HTTP_201_CREATED)
 async def create_resource(
     resource_in: CreateResourceRequest,
+    session: AsyncSession = Depends(get_db_session),
+    redis_conn: redis.Redis = Depends(get_redis_connection),
     resource_service_admin: ResourceServiceAdminProtocol = Depends(get_resource_service_admin),
 ):
-    return await resource_service_admin.create_resource(resource_in)
+    result = await resource_service_admin.create_resource(resource_in)
+
+    # Событие для BFF уходит после фиксации: перечитанные после сброса кэша данные уже новые
+    await session.commit()
+    await publish_cache_invalidation(redis_conn, "resources")
+
+    return result
 
 
 @router.delete("/resources/{resource_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_resource(
     resource_id: int,
+    session: AsyncSession = Depends(get_db_session),
+    redis_conn: redis.Redis = Depends(get_redis_connection),
     resource_service_admin: ResourceServiceAdminProtocol = Depends(get_resource_service_admin),
 ):
     await resource_service_admin.delete_resource(resource_id)
 
+    # Версия графа доступов меняется после фиксации, иначе под ней сохранятся старые результаты
+    await session.commit()
+    await invalidate_access_graph_cache(redis_conn)
+    await publish_cache_invalidation(redis_conn, "resources", "accesses", "groups")
+
 
 @router.post("/accesses", response_model=CreateAccessResponse, status_code=status.HTTP_201_CREATED)
 async def create_access(
     access_in: CreateAccessRequest,
+    session: AsyncSession = Depends(get_db_session),
+    redis_conn: redis.Redis = Depends(get_redis_connection),
     access_service: AccessServiceProtocol = Depends(get_access_service),
 ):
-    return await access_service.create_access(access_in)
+    result = await access_service.create_access(access_in)
+
+    await session.commit()
+    await invalidate_access_graph_cache(redis_conn)
+    await publish_cache_invalidation(redis_conn, "accesses")
+
+    return result
 
 
 @router.post("/accesses/{access_id}/resources", response_model=AccessOut)
 async def add_resource_to_access(
     access_id: int,
     resource_data: AddResourceToAccessRequest,
+    session: AsyncSession = Depends(get_db_session),
     redis_conn: redis.Redis = Depends(get_redis_connection),
     access_service_admin: AccessServiceAdminProtocol = Depends(get_access_service_admin),
     access_service: AccessServiceProtocol = Depends(get_access_service),
@@ -78,7 +108,9 @@ async def add_resource_to_access(
         access_id, resource_data.resource_id
     )
 
+    await session.commit()
     await invalidate_access_groups_cache(redis_conn, access_id)
+    await publish_cache_invalidation(redis_conn, "accesses", "groups")
 
     access = await access_service.get_access(access_id)
 
@@ -103,6 +135,7 @@ async def add_resource_to_access(
 async def remove_resource_from_access(
     access_id: int,
     resource_id: int,
+    session: AsyncSession = Depends(get_db_session),
     redis_conn: redis.Redis = Depends(get_redis_connection),
     access_service_admin: AccessServiceAdminProtocol = Depends(get_access_service_admin),
 ):
@@ -110,68 +143,91 @@ async def remove_resource_from_access(
         access_id, resource_id
     )
 
+    await session.commit()
     await invalidate_access_groups_cache(redis_conn, access_id)
+    await publish_cache_invalidation(redis_conn, "accesses", "groups")
 
 
 @router.delete("/accesses/{access_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_access(
     access_id: int,
+    session: AsyncSession = Depends(get_db_session),
     redis_conn: redis.Redis = Depends(get_redis_connection),
     access_service_admin: AccessServiceAdminProtocol = Depends(get_access_service_admin),
 ):
     await access_service_admin.delete_access(access_id)
 
+    await session.commit()
     await invalidate_access_groups_cache(redis_conn, access_id)
+    await publish_cache_invalidation(redis_conn, "accesses", "groups")
 
 
 @router.post("/groups", response_model=CreateGroupResponse, status_code=status.HTTP_201_CREATED)
 async def create_group(
     group_in: CreateGroupRequest,
+    session: AsyncSession = Depends(get_db_session),
+    redis_conn: redis.Redis = Depends(get_redis_connection),
     group_service: GroupServiceProtocol = Depends(get_group_service),
 ):
-    return await group_service.create_group(group_in)
+    result = await group_service.create_group(group_in)
+
+    await session.commit()
+    await invalidate_access_graph_cache(redis_conn)
+    await publish_cache_invalidation(redis_conn, "groups")
+
+    return result
 
 
 @router.post("/groups/{group_id}/accesses/{access_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def add_access_to_group(
     group_id: int,
     access_id: int,
+    session: AsyncSession = Depends(get_db_session),
     redis_conn: redis.Redis = Depends(get_redis_connection),
     group_service: GroupServiceProtocol = Depends(get_group_service),
 ):
     await group_service.add_access_to_group(group_id, access_id)
 
+    await session.commit()
     await invalidate_group_accesses_cache(redis_conn, group_id)
     await invalidate_access_groups_cache(redis_conn, access_id)
+    await publish_cache_invalidation(redis_conn, "groups")
 
 
 @router.delete("/groups/{group_id}/accesses/{access_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def remove_access_from_group(
     group_id: int,
     access_id: int,
+    session: AsyncSession = Depends(get_db_session),
     redis_conn: redis.Redis = Depends(get_redis_connection),
     group_service: GroupServiceProtocol = Depends(get_group_service),
 ):
     await group_service.remove_access_from_group(group_id, access_id)
 
+    await session.commit()
     await invalidate_group_accesses_cache(redis_conn, group_id)
     await invalidate_access_groups_cache(redis_conn, access_id)
+    await publish_cache_invalidation(redis_conn, "groups")
 
 
 @router.delete("/groups/{group_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_group(
     group_id: int,
+    session: AsyncSession = Depends(get_db_session),
     redis_conn: redis.Redis = Depends(get_redis_connection),
     group_service: GroupServiceProtocol = Depends(get_group_service),
 ):
     await group_service.delete_group(group_id)
 
+    await session.commit()
     await invalidate_group_accesses_cache(redis_conn, group_id)
+    await publish_cache_invalidation(redis_conn, "groups")
 
 
 @router.post("/conflicts", response_model=list[CreateConflictResponse], status_code=status.HTTP_201_CREATED)
 async def create_conflict(
     conflict_in: CreateConflictRequest,
+    session: AsyncSession = Depends(get_db_session),
     redis_conn: redis.Redis = Depends(get_redis_connection),
     conflict_service_admin: ConflictServiceAdminProtocol = Depends(get_conflict_service_admin),
 ):
@@ -181,7 +237,13 @@ async def create_conflict(
     """
     result = await conflict_service_admin.create_conflict(conflict_in)
 
+    # Кэши конфликтов меняются только после фиксации: откат не оставит в них конфликт, а версия
+    # матрицы не сменится раньше, чем новые данные станут видны читателям аналитики
+    await session.commit()
+    await add_conflict_to_group_sets(redis_conn, conflict_in.group_id1, conflict_in.group_id2)
+
     await invalidate_conflicts_matrix_cache(redis_conn)
+    await publish_cache_invalidation(redis_conn, "conflicts")
 
     return result
 
@@ -189,6 +251,7 @@ async def create_conflict(
 @router.delete("/conflicts", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_conflict(
     conflict_in: DeleteConflictRequest,
+    session: AsyncSession = Depends(get_db_session),
     redis_conn: redis.Redis = Depends(get_redis_connection),
     conflict_service_admin: ConflictServiceAdminProtocol = Depends(get_conflict_service_admin),
 ):
@@ -198,4 +261,8 @@ async def delete_conflict(
     """
     await conflict_service_admin.delete_conflict(conflict_in.group_id1, conflict_in.group_id2)
 
+    await session.commit()
+    await remove_conflict_from_group_sets(redis_conn, conflict_in.group_id1, conflict_in.group_id2)
+
     await invalidate_conflicts_matrix_cache(redis_conn)
+    await publish_cache_invalidation(redis_conn, "conflicts")
@@ -1,25 +1,61 @@
 import redis.asyncio as redis
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, Query, Response
 
 from access_control_service.dependencies import (
     get_redis_connection,
+    get_redis_binary_connection,
     get_conflict_service,
+    get_conflict_analytics_service,
+)
+from access_control_service.models.models import (
+    GetConflictsResponse,
+    Conflict,
+    CheckConflictsRequest,
+    CheckConflictsResponse,
+    ConflictAnalyticsResponse,
+    ConflictGroupAnalyticsResponse,
+)
+from access_control_service.services.protocols import (
+    ConflictServiceProtocol,
+    ConflictAnalyticsServiceProtocol,
 )
-from access_control_service.models.models import GetConflictsResponse, Conflict
-from access_control_service.services.protocols import ConflictServiceProtocol
 from access_control_service.services.cache import (
     get_conflicts_matrix_from_cache,
-    set_conflicts_matrix_cache
+    set_conflicts_matrix_cache,
+    get_conflicts_csr_from_cache,
+    set_conflicts_csr_cache,
+)
+from access_control_service.services.conflict_packing import (
+    CONFLICTS_CSR_MEDIA_TYPE,
+    accepts_conflicts_csr,
+    pack_conflicts_csr,
 )
 
 router = APIRouter()
 
 
-@router.get("", response_model=GetConflictsResponse)
+@router.get(
+    "",
+    response_model=GetConflictsResponse,
+    responses={200: {"content": {CONFLICTS_CSR_MEDIA_TYPE: {}}}},
+)
 async def get_all_conflicts(
+    accept: str | None = Header(default=None),
     redis_conn: redis.Redis = Depends(get_redis_connection),
+    redis_binary_conn: redis.Redis = Depends(get_redis_binary_connection),
     conflict_service: ConflictServiceProtocol = Depends(get_conflict_service),
 ):
+    if accepts_conflicts_csr(accept):
+        packed = await get_conflicts_csr_from_cache(redis_binary_conn)
+        if packed is None:
+            conflicts_list = await conflict_service.get_all_conflicts()
+            packed = pack_conflicts_csr(
+                (conflict.group_id1, conflict.group_id2) for conflict in conflicts_list
+            )
+            await set_conflicts_csr_cache(redis_binary_conn, packed)
+
+        return Response(content=packed, media_type=CONFLICTS_CSR_MEDIA_TYPE)
+
     cached_conflicts = await get_conflicts_matrix_from_cache(redis_conn)
     if cached_conflicts is not None:
         conflicts = [
@@ -27,11 +63,37 @@ async def get_all_conflicts(
             for conflict_dict in cached_conflicts
         ]
         return GetConflictsResponse(conflicts=conflicts)
-    
+
     conflicts_list = await conflict_service.get_all_conflicts()
-    
+
     conflicts_dict = [conflict.model_dump() for conflict in conflicts_list]
     await set_conflicts_matrix_cache(redis_conn, conflicts_dict)
-    
+
     return GetConflictsResponse(conflicts=conflicts_list)
 
+
+@router.post("/check", response_model=CheckConflictsResponse)
+async def check_conflicts(
+    check_in: CheckConflictsRequest,
+    conflict_service: ConflictServiceProtocol = Depends(get_conflict_service),
+):
+    """Проверка конфликтов запрашиваемых групп с группами пользователя без передачи матрицы."""
+    return await conflict_service.check_conflicts(check_in)
+
+
+@router.get("/analytics", response_model=ConflictAnalyticsResponse)
+async def get_conflicts_analytics(
+    top: int = Query(default=10, ge=0, le=1000, description="Количество групп в рейтинге по числу конфликтов"),
+    analytics_service: ConflictAnalyticsServiceProtocol = Depends(get_conflict_analytics_service),
+):
+    """Степени, компоненты связности и самые конфликтные группы графа конфликтов."""
+    return await analytics_service.get_analytics(top)
+
+
+@router.get("/analytics/groups/{group_id}", response_model=ConflictGroupAnalyticsResponse)
+async def get_group_conflicts_analytics(
+    group_id: int,
+    analytics_service: ConflictAnalyticsServiceProtocol = Depends(get_conflict_analytics_service),
+):
+    """Прямые и транзитивные конфликты группы."""
+    return await analytics_service.get_group_analytics(group_id)
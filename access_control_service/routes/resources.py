@@ -1,10 +1,19 @@
 from fastapi import APIRouter, Depends
 
-from access_control_service.dependencies import get_resource_service
+from access_control_service.dependencies import (
+    get_resource_service,
+    get_effective_permissions_service,
+)
 from access_control_service.models.models import (
     Resource as ResourceOut,
+    EffectiveResourcesRequest,
+    EffectiveResourcesResponse,
+    ResourceHoldersResponse,
+)
+from access_control_service.services.protocols import (
+    ResourceServiceProtocol,
+    EffectivePermissionsServiceProtocol,
 )
-from access_control_service.services.protocols import ResourceServiceProtocol
 
 router = APIRouter()
 
@@ -21,9 +30,31 @@ async def get_resource(
     return ResourceOut.model_validate(resource)
 
 
+@router.get("/{resource_id}/holders", response_model=ResourceHoldersResponse)
+async def get_resource_holders(
+    resource_id: int,
+    effective_permissions_service: EffectivePermissionsServiceProtocol = Depends(
+        get_effective_permissions_service
+    ),
+):
+    """Доступы и группы, через которые можно получить ресурс."""
+    return await effective_permissions_service.get_resource_holders(resource_id)
+
+
 @router.get("", response_model=list[ResourceOut])
 async def get_all_resources(
     resource_service: ResourceServiceProtocol = Depends(get_resource_service),
 ):
     resources = await resource_service.get_all_resources()
     return [ResourceOut.model_validate(resource) for resource in resources]
+
+
+@router.post("/effective", response_model=EffectiveResourcesResponse)
+async def resolve_effective_resources(
+    grants: EffectiveResourcesRequest,
+    effective_permissions_service: EffectivePermissionsServiceProtocol = Depends(
+        get_effective_permissions_service
+    ),
+):
+    """Дедуплицированный набор ресурсов, доступных через переданные группы и доступы."""
+    return await effective_permissions_service.resolve_resources(grants)
@@ -7,11 +7,22 @@ import logging
 import redis.asyncio as redis
 
 from access_control_service.config.settings import get_settings
+from access_control_service.services.metrics import record_cache_lookup
 
 logger = logging.getLogger(__name__)
 
 
 CONFLICTS_MATRIX_KEY = "conflicts:matrix"
+CONFLICTS_MATRIX_CSR_KEY = "conflicts:matrix:csr"
+CONFLICT_GROUP_SETS_READY_KEY = "conflicts:groups:ready"
+# Счетчик изменений множеств conflicts:group:{id}: пересборка, начатая до изменения, не помечает их готовыми
+CONFLICT_GROUP_SETS_GENERATION_KEY = "conflicts:groups:generation"
+CONFLICTS_VERSION_KEY = "conflicts:version"
+ACCESS_GRAPH_VERSION_KEY = "access_graph:version"
+
+# Канал событий об изменениях справочников; на него подписан BFF для сброса кэша ответов.
+# Семейства: resources, accesses, groups, conflicts
+CACHE_INVALIDATION_CHANNEL = "access_control:invalidations"
 
 
 async def get_conflicts_matrix_from_cache(
@@ -19,6 +30,7 @@ async def get_conflicts_matrix_from_cache(
 ) -> list[dict[str, int]] | None:
 
     cached_value = await redis_conn.get(CONFLICTS_MATRIX_KEY)
+    record_cache_lookup("conflicts_matrix", cached_value is not None)
     if cached_value is None:
         logger.debug("Матрица конфликтов не найдена в кэше")
         return None
@@ -48,12 +60,206 @@ async def set_conflicts_matrix_cache(
     )
 
 
+async def get_conflicts_csr_from_cache(
+    redis_conn: redis.Redis[Any],
+) -> bytes | None:
+    """Redis-соединение должно быть без decode_responses: значение хранится как bytes."""
+
+    cached_value = await redis_conn.get(CONFLICTS_MATRIX_CSR_KEY)
+    record_cache_lookup("conflicts_csr", cached_value is not None)
+    if cached_value is None:
+        logger.debug("Упакованная матрица конфликтов не найдена в кэше")
+        return None
+
+    logger.debug(f"Упакованная матрица конфликтов загружена из кэша: {len(cached_value)} байт")
+    return cached_value
+
+
+async def set_conflicts_csr_cache(
+    redis_conn: redis.Redis[Any],
+    packed: bytes,
+) -> None:
+
+    ttl = get_settings().cache_ttl_conflicts_matrix_seconds
+    await redis_conn.setex(CONFLICTS_MATRIX_CSR_KEY, ttl, packed)
+    logger.debug(
+        f"Упакованная матрица конфликтов сохранена в кэш: {len(packed)} байт, TTL={ttl}с"
+    )
+
+
 async def invalidate_conflicts_matrix_cache(
     redis_conn: redis.Redis[Any],
 ) -> None:
+    """Вызывается после фиксации транзакции: иначе под новой версией может сохраниться аналитика старых данных."""
+
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.delete(CONFLICTS_MATRIX_KEY, CONFLICTS_MATRIX_CSR_KEY)
+    pipe.incr(CONFLICTS_VERSION_KEY)
+    _, version = await pipe.execute()
+    logger.debug(f"Кэш матрицы конфликтов инвалидирован, версия матрицы: {version}")
+
+
+async def get_conflicts_version(
+    redis_conn: redis.Redis[Any],
+) -> int:
+
+    version = await redis_conn.get(CONFLICTS_VERSION_KEY)
+    return int(version) if version is not None else 0
+
+
+def _build_conflict_analytics_key(version: int) -> str:
+
+    return f"conflicts:analytics:{version}"
+
+
+async def get_conflict_analytics_from_cache(
+    redis_conn: redis.Redis[Any],
+    version: int,
+) -> dict[str, Any] | None:
+
+    key = _build_conflict_analytics_key(version)
+    cached_value = await redis_conn.get(key)
+    record_cache_lookup("conflict_analytics", cached_value is not None)
+    if cached_value is None:
+        logger.debug(f"Аналитика конфликтов версии {version} не найдена в кэше")
+        return None
+
+    try:
+        return json.loads(cached_value)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ошибка декодирования кэша аналитики конфликтов: {e}")
+        await redis_conn.delete(key)
+        return None
+
+
+async def set_conflict_analytics_cache(
+    redis_conn: redis.Redis[Any],
+    version: int,
+    analytics: dict[str, Any],
+) -> None:
+
+    ttl = get_settings().cache_ttl_conflicts_matrix_seconds
+    await redis_conn.setex(
+        _build_conflict_analytics_key(version),
+        ttl,
+        json.dumps(analytics)
+    )
+    logger.debug(f"Аналитика конфликтов версии {version} сохранена в кэш, TTL={ttl}с")
+
+
+def _build_conflict_group_key(group_id: int) -> str:
+
+    return f"conflicts:group:{group_id}"
+
+
+async def add_conflict_to_group_sets(
+    redis_conn: redis.Redis[Any],
+    group_id1: int,
+    group_id2: int,
+) -> None:
+    """Вызывается после фиксации транзакции: откат не должен оставлять конфликт в множествах."""
+
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.sadd(_build_conflict_group_key(group_id1), group_id2)
+    pipe.sadd(_build_conflict_group_key(group_id2), group_id1)
+    pipe.incr(CONFLICT_GROUP_SETS_GENERATION_KEY)
+    await pipe.execute()
+    logger.debug(f"Конфликт {group_id1}<->{group_id2} добавлен в множества групп")
+
+
+async def remove_conflict_from_group_sets(
+    redis_conn: redis.Redis[Any],
+    group_id1: int,
+    group_id2: int,
+) -> None:
+
+    pipe = redis_conn.pipeline(transaction=True)
+    pipe.srem(_build_conflict_group_key(group_id1), group_id2)
+    pipe.srem(_build_conflict_group_key(group_id2), group_id1)
+    pipe.incr(CONFLICT_GROUP_SETS_GENERATION_KEY)
+    await pipe.execute()
+    logger.debug(f"Конфликт {group_id1}<->{group_id2} удален из множеств групп")
+
+
+async def get_conflict_group_sets_generation(
+    redis_conn: redis.Redis[Any],
+) -> int:
+    """Читается до загрузки таблицы конфликтов для rebuild_conflict_group_sets."""
+
+    generation = await redis_conn.get(CONFLICT_GROUP_SETS_GENERATION_KEY)
+    return int(generation) if generation is not None else 0
+
+
+async def rebuild_conflict_group_sets(
+    redis_conn: redis.Redis[Any],
+    pairs: list[tuple[int, int]],
+    generation: int,
+) -> bool:
+    """Полная пересборка множеств conflicts:group:{id} по таблице конфликтов.
+
+    Удаление старых множеств, запись новых и отметка готовности выполняются одной транзакцией
+    MULTI/EXEC под WATCH счетчика изменений. Если после чтения generation конфликт был добавлен
+    или удален, pairs могут быть устаревшими: пересборка отменяется и возвращается False.
+    Отметка готовности живет cache_ttl_conflicts_matrix_seconds, после чего множества пересобираются.
+    """
+
+    stale_keys = [key async for key in redis_conn.scan_iter(match="conflicts:group:*")]
+
+    adjacency: dict[int, set[int]] = {}
+    for group_id1, group_id2 in pairs:
+        adjacency.setdefault(group_id1, set()).add(group_id2)
+        adjacency.setdefault(group_id2, set()).add(group_id1)
+
+    ttl = get_settings().cache_ttl_conflicts_matrix_seconds
+    async with redis_conn.pipeline(transaction=True) as pipe:
+        try:
+            await pipe.watch(CONFLICT_GROUP_SETS_GENERATION_KEY)
+            current = await pipe.get(CONFLICT_GROUP_SETS_GENERATION_KEY)
+            if (int(current) if current is not None else 0) != generation:
+                logger.debug("Конфликты изменились во время пересборки множеств, пересборка отменена")
+                return False
+
+            pipe.multi()
+            if stale_keys:
+                pipe.delete(*stale_keys)
+            for group_id, neighbors in adjacency.items():
+                pipe.sadd(_build_conflict_group_key(group_id), *neighbors)
+            pipe.setex(CONFLICT_GROUP_SETS_READY_KEY, ttl, 1)
+            await pipe.execute()
+        except redis.WatchError:
+            logger.debug("Конфликты изменились во время пересборки множеств, пересборка отменена")
+            return False
+
+    logger.debug(f"Множества конфликтов пересобраны: {len(adjacency)} групп")
+    return True
+
+
+async def find_conflict_in_group_sets(
+    redis_conn: redis.Redis[Any],
+    user_group_ids: list[int],
+    requested_group_ids: list[int],
+) -> tuple[bool, tuple[int, int] | None]:
+    """Проверка конфликтов за один round-trip через SMISMEMBER.
+
+    Возвращает (множества готовы, пара (группа пользователя, запрашиваемая группа) или None).
+    """
+
+    pipe = redis_conn.pipeline(transaction=False)
+    pipe.exists(CONFLICT_GROUP_SETS_READY_KEY)
+    for requested_group_id in requested_group_ids:
+        pipe.smismember(_build_conflict_group_key(requested_group_id), user_group_ids)
+    ready, *memberships = await pipe.execute()
+
+    record_cache_lookup("conflict_group_sets", bool(ready))
+    if not ready:
+        return False, None
 
-    await redis_conn.delete(CONFLICTS_MATRIX_KEY)
-    logger.debug("Кэш матрицы конфликтов инвалидирован")
+    for requested_group_id, flags in zip(requested_group_ids, memberships):
+        for user_group_id, is_member in zip(user_group_ids, flags):
+            if is_member:
+                return True, (user_group_id, requested_group_id)
+
+    return True, None
 
 
 def _build_group_accesses_key(group_id: int) -> str:
@@ -68,6 +274,7 @@ async def get_group_accesses_from_cache(
 
     key = _build_group_accesses_key(group_id)
     cached_value = await redis_conn.get(key)
+    record_cache_lookup("group_accesses", cached_value is not None)
     if cached_value is None:
         logger.debug(f"Доступы группы {group_id} не найдены в кэше")
         return None
@@ -106,6 +313,7 @@ async def invalidate_group_accesses_cache(
 
     key = _build_group_accesses_key(group_id)
     await redis_conn.delete(key)
+    await invalidate_access_graph_cache(redis_conn)
     logger.debug(f"Кэш доступов группы {group_id} инвалидирован")
 
 
@@ -121,6 +329,7 @@ async def get_access_groups_from_cache(
 
     key = _build_access_groups_key(access_id)
     cached_value = await redis_conn.get(key)
+    record_cache_lookup("access_groups", cached_value is not None)
     if cached_value is None:
         logger.debug(f"Группы доступа {access_id} не найдены в кэше")
         return None
@@ -160,5 +369,122 @@ async def invalidate_access_groups_cache(
 
     key = _build_access_groups_key(access_id)
     await redis_conn.delete(key)
+    await invalidate_access_graph_cache(redis_conn)
     logger.debug(f"Кэш групп доступа {access_id} инвалидирован")
 
+
+async def get_access_graph_version(
+    redis_conn: redis.Redis[Any],
+) -> int:
+
+    version = await redis_conn.get(ACCESS_GRAPH_VERSION_KEY)
+    return int(version) if version is not None else 0
+
+
+async def invalidate_access_graph_cache(
+    redis_conn: redis.Redis[Any],
+) -> None:
+    """Смена версии графа группа -> доступ -> ресурс; старые ключи эффективных прав истекают по TTL.
+
+    Вызывается после фиксации транзакции: иначе под новой версией сохранятся результаты по старым данным.
+    """
+
+    version = await redis_conn.incr(ACCESS_GRAPH_VERSION_KEY)
+    logger.debug(f"Версия графа доступов увеличена: {version}")
+
+
+def _build_effective_resources_key(version: int, grants_hash: str) -> str:
+
+    return f"effective:{version}:{grants_hash}"
+
+
+async def get_effective_resources_from_cache(
+    redis_conn: redis.Redis[Any],
+    version: int,
+    grants_hash: str,
+) -> list[dict[str, Any]] | None:
+
+    key = _build_effective_resources_key(version, grants_hash)
+    cached_value = await redis_conn.get(key)
+    record_cache_lookup("effective_resources", cached_value is not None)
+    if cached_value is None:
+        logger.debug(f"Эффективные ресурсы {grants_hash} не найдены в кэше")
+        return None
+
+    try:
+        return json.loads(cached_value)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ошибка декодирования кэша эффективных ресурсов {grants_hash}: {e}")
+        await redis_conn.delete(key)
+        return None
+
+
+async def set_effective_resources_cache(
+    redis_conn: redis.Redis[Any],
+    version: int,
+    grants_hash: str,
+    resources: list[dict[str, Any]],
+) -> None:
+
+    ttl = get_settings().cache_ttl_effective_resources_seconds
+    await redis_conn.setex(
+        _build_effective_resources_key(version, grants_hash),
+        ttl,
+        json.dumps(resources)
+    )
+    logger.debug(
+        f"Эффективные ресурсы {grants_hash} сохранены в кэш: {len(resources)} ресурсов, TTL={ttl}с"
+    )
+
+
+def _build_resource_holders_key(version: int, resource_id: int) -> str:
+
+    return f"resource:{resource_id}:holders:{version}"
+
+
+async def get_resource_holders_from_cache(
+    redis_conn: redis.Redis[Any],
+    version: int,
+    resource_id: int,
+) -> dict[str, Any] | None:
+
+    key = _build_resource_holders_key(version, resource_id)
+    cached_value = await redis_conn.get(key)
+    record_cache_lookup("resource_holders", cached_value is not None)
+    if cached_value is None:
+        logger.debug(f"Держатели ресурса {resource_id} не найдены в кэше")
+        return None
+
+    try:
+        return json.loads(cached_value)
+    except json.JSONDecodeError as e:
+        logger.warning(f"Ошибка декодирования кэша держателей ресурса {resource_id}: {e}")
+        await redis_conn.delete(key)
+        return None
+
+
+async def set_resource_holders_cache(
+    redis_conn: redis.Redis[Any],
+    version: int,
+    resource_id: int,
+    holders: dict[str, Any],
+) -> None:
+
+    ttl = get_settings().cache_ttl_effective_resources_seconds
+    await redis_conn.setex(
+        _build_resource_holders_key(version, resource_id),
+        ttl,
+        json.dumps(holders)
+    )
+    logger.debug(f"Держатели ресурса {resource_id} сохранены в кэш, TTL={ttl}с")
+
+
+async def publish_cache_invalidation(
+    redis_conn: redis.Redis[Any],
+    *families: str,
+) -> None:
+    """Вызывается после фиксации транзакции: иначе BFF перечитает и закэширует данные до изменения."""
+
+    message = json.dumps({"families": sorted(set(families))})
+    receivers = await redis_conn.publish(CACHE_INVALIDATION_CHANNEL, message)
+    logger.debug(f"Событие инвалидации {message} отправлено {receivers} подписчикам")
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import logging
+import time
+from typing import Any, Iterable
+
+import redis.asyncio as redis
+
+from access_control_service.config.settings import get_settings
+from access_control_service.models.models import (
+    ConflictAnalyticsResponse,
+    ConflictComponent,
+    ConflictGroupAnalyticsResponse,
+    ConflictGroupDegree,
+)
+from access_control_service.repositories.protocols import ConflictRepositoryProtocol
+from access_control_service.services.cache import (
+    get_conflicts_version,
+    get_conflict_analytics_from_cache,
+    set_conflict_analytics_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class ConflictGraphSnapshot:
+    """Предрасчитанный граф конфликтов: соседи, степени и компоненты связности."""
+
+    def __init__(
+        self,
+        adjacency: dict[int, list[int]],
+        component_of: dict[int, int],
+        components: dict[int, list[int]],
+    ):
+        self.adjacency = adjacency
+        self.component_of = component_of
+        self.components = components
+
+    @classmethod
+    def from_pairs(cls, pairs: Iterable[tuple[int, int]]) -> ConflictGraphSnapshot:
+
+        neighbors: dict[int, set[int]] = {}
+        parent: dict[int, int] = {}
+
+        def find(group_id: int) -> int:
+            root = group_id
+            while parent[root] != root:
+                root = parent[root]
+            while parent[group_id] != root:
+                parent[group_id], group_id = root, parent[group_id]
+            return root
+
+        for group_id1, group_id2 in pairs:
+            neighbors.setdefault(group_id1, set()).add(group_id2)
+            neighbors.setdefault(group_id2, set()).add(group_id1)
+            parent.setdefault(group_id1, group_id1)
+            parent.setdefault(group_id2, group_id2)
+
+            root1, root2 = find(group_id1), find(group_id2)
+            if root1 != root2:
+                # Корнем компоненты всегда остается минимальный ID группы
+                if root1 < root2:
+                    parent[root2] = root1
+                else:
+                    parent[root1] = root2
+
+        component_of = {group_id: find(group_id) for group_id in parent}
+        components: dict[int, list[int]] = {}
+        for group_id in sorted(component_of):
+            components.setdefault(component_of[group_id], []).append(group_id)
+
+        adjacency = {group_id: sorted(ids) for group_id, ids in neighbors.items()}
+        return cls(adjacency, component_of, components)
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ConflictGraphSnapshot:
+
+        adjacency = {int(group_id): ids for group_id, ids in data["adjacency"].items()}
+        components = {int(root): ids for root, ids in data["components"].items()}
+        component_of = {
+            group_id: root
+            for root, ids in components.items()
+            for group_id in ids
+        }
+        return cls(adjacency, component_of, components)
+
+    def to_dict(self) -> dict[str, Any]:
+
+        return {
+            "adjacency": {str(group_id): ids for group_id, ids in self.adjacency.items()},
+            "components": {str(root): ids for root, ids in self.components.items()},
+        }
+
+    @property
+    def pairs_count(self) -> int:
+        return sum(len(ids) for ids in self.adjacency.values()) // 2
+
+    def degree(self, group_id: int) -> int:
+        return len(self.adjacency.get(group_id, ()))
+
+
+# Снимок последней посчитанной версии матрицы в памяти процесса: (версия, снимок, истекает в).
+# Живет не дольше записи в Redis, поэтому устаревший снимок не обслуживается бессрочно.
+_local_snapshot: tuple[int, ConflictGraphSnapshot, float] | None = None
+
+
+class ConflictAnalyticsService:
+
+    def __init__(
+        self,
+        conflict_repository: ConflictRepositoryProtocol,
+        redis_conn: redis.Redis,
+    ):
+        self._conflict_repository = conflict_repository
+        self._redis_conn = redis_conn
+
+    async def get_analytics(self, top: int = 10) -> ConflictAnalyticsResponse:
+
+        version, snapshot = await self._get_snapshot()
+
+        degrees = sorted(
+            ((group_id, len(ids)) for group_id, ids in snapshot.adjacency.items()),
+            key=lambda item: (-item[1], item[0]),
+        )
+        components = sorted(
+            (
+                ConflictComponent(component_id=root, size=len(ids), group_ids=ids)
+                for root, ids in snapshot.components.items()
+            ),
+            key=lambda component: (-component.size, component.component_id),
+        )
+
+        return ConflictAnalyticsResponse(
+            version=version,
+            groups_count=len(snapshot.adjacency),
+            pairs_count=snapshot.pairs_count,
+            components_count=len(components),
+            top_groups=[
+                ConflictGroupDegree(group_id=group_id, degree=degree)
+                for group_id, degree in degrees[:top]
+            ],
+            components=components,
+        )
+
+    async def get_group_analytics(self, group_id: int) -> ConflictGroupAnalyticsResponse:
+
+        version, snapshot = await self._get_snapshot()
+
+        component_id = snapshot.component_of.get(group_id, group_id)
+        component_group_ids = [
+            other_id
+            for other_id in snapshot.components.get(component_id, [])
+            if other_id != group_id
+        ]
+
+        return ConflictGroupAnalyticsResponse(
+            version=version,
+            group_id=group_id,
+            degree=snapshot.degree(group_id),
+            neighbors=snapshot.adjacency.get(group_id, []),
+            component_id=component_id,
+            component_group_ids=component_group_ids,
+        )
+
+    async def _get_snapshot(self) -> tuple[int, ConflictGraphSnapshot]:
+
+        global _local_snapshot
+
+        version = await get_conflicts_version(self._redis_conn)
+        if (
+            _local_snapshot is not None
+            and _local_snapshot[0] == version
+            and _local_snapshot[2] > time.monotonic()
+        ):
+            return version, _local_snapshot[1]
+
+        cached = await get_conflict_analytics_from_cache(self._redis_conn, version)
+        if cached is not None:
+            snapshot = ConflictGraphSnapshot.from_dict(cached)
+        else:
+            conflicts = await self._conflict_repository.find_all()
+            snapshot = ConflictGraphSnapshot.from_pairs(
+                (c.group_id1, c.group_id2) for c in conflicts
+            )
+            await set_conflict_analytics_cache(self._redis_conn, version, snapshot.to_dict())
+            logger.debug(
+                f"Аналитика конфликтов пересчитана для версии {version}: "
+                f"{len(snapshot.adjacency)} групп, {len(snapshot.components)} компонент"
+            )
+
+        ttl = get_settings().cache_ttl_conflicts_matrix_seconds
+        _local_snapshot = (version, snapshot, time.monotonic() + ttl)
+        return version, snapshot
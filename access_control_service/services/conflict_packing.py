@@ -0,0 +1,61 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from typing import Iterable
+
+# Компактное представление матрицы конфликтов для машинных клиентов.
+#
+# Формат (little-endian):
+#   заголовок: magic b"CCSR", версия (uint16), зарезервировано (uint16), число групп N (uint32)
+#   group_ids: int32[N]      - отсортированные ID групп, у которых есть конфликты
+#   offsets:   int32[N + 1]  - границы списков соседей в массиве neighbors
+#   neighbors: int32[M]      - ID конфликтующих групп (каждое направление хранится один раз)
+
+CONFLICTS_CSR_MEDIA_TYPE = "application/vnd.conflicts.csr"
+CONFLICTS_CSR_MAGIC = b"CCSR"
+CONFLICTS_CSR_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHI")
+
+
+def _to_little_endian_bytes(values: array) -> bytes:
+    if sys.byteorder != "little":
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def pack_conflicts_csr(pairs: Iterable[tuple[int, int]]) -> bytes:
+
+    adjacency: dict[int, set[int]] = {}
+    for group_id1, group_id2 in pairs:
+        adjacency.setdefault(group_id1, set()).add(group_id2)
+        adjacency.setdefault(group_id2, set()).add(group_id1)
+
+    group_ids = array("i", sorted(adjacency))
+    offsets = array("i", [0])
+    neighbors = array("i")
+    for group_id in group_ids:
+        neighbors.extend(sorted(adjacency[group_id]))
+        offsets.append(len(neighbors))
+
+    header = _HEADER.pack(CONFLICTS_CSR_MAGIC, CONFLICTS_CSR_VERSION, 0, len(group_ids))
+    return b"".join(
+        (
+            header,
+            _to_little_endian_bytes(group_ids),
+            _to_little_endian_bytes(offsets),
+            _to_little_endian_bytes(neighbors),
+        )
+    )
+
+
+def accepts_conflicts_csr(accept_header: str | None) -> bool:
+
+    if not accept_header:
+        return False
+
+    media_types = (part.split(";", 1)[0].strip().lower() for part in accept_header.split(","))
+    return CONFLICTS_CSR_MEDIA_TYPE in media_types
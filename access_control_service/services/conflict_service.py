@@ -1,17 +1,33 @@
+from __future__ import annotations
+
 import logging
 
+import redis.asyncio as redis
+
 from access_control_service.models.models import (
     Conflict as ConflictModel,
+    CheckConflictsRequest,
+    CheckConflictsResponse,
 )
 from access_control_service.repositories.protocols import ConflictRepositoryProtocol
+from access_control_service.services.cache import (
+    find_conflict_in_group_sets,
+    get_conflict_group_sets_generation,
+    rebuild_conflict_group_sets,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class ConflictService:
 
-    def __init__(self, conflict_repository: ConflictRepositoryProtocol):
+    def __init__(
+        self,
+        conflict_repository: ConflictRepositoryProtocol,
+        redis_conn: redis.Redis | None = None,
+    ):
         self._conflict_repository = conflict_repository
+        self._redis_conn = redis_conn
 
     async def get_all_conflicts(self) -> list[ConflictModel]:
 
@@ -25,3 +41,63 @@ class ConflictService:
         logger.debug(f"Найдено конфликтов: {len(conflicts_out)}")
         return conflicts_out
 
+    async def check_conflicts(
+        self, check_data: CheckConflictsRequest
+    ) -> CheckConflictsResponse:
+
+        user_group_ids = list(dict.fromkeys(check_data.user_group_ids))
+        requested_group_ids = list(dict.fromkeys(check_data.requested_group_ids))
+
+        if not user_group_ids or not requested_group_ids:
+            return CheckConflictsResponse(has_conflict=False)
+
+        if self._redis_conn is None:
+            conflict = await self._find_conflict_in_db(user_group_ids, requested_group_ids)
+        else:
+            ready, conflict = await find_conflict_in_group_sets(
+                self._redis_conn, user_group_ids, requested_group_ids
+            )
+            if not ready:
+                logger.debug("Множества конфликтов отсутствуют в Redis, выполняется пересборка")
+                generation = await get_conflict_group_sets_generation(self._redis_conn)
+                conflicts = await self._conflict_repository.find_all()
+                rebuilt = await rebuild_conflict_group_sets(
+                    self._redis_conn,
+                    [(c.group_id1, c.group_id2) for c in conflicts],
+                    generation,
+                )
+                if rebuilt:
+                    _, conflict = await find_conflict_in_group_sets(
+                        self._redis_conn, user_group_ids, requested_group_ids
+                    )
+                else:
+                    # Загруженная таблица могла устареть: ответ по свежему запросу к БД
+                    conflict = await self._find_conflict_in_db(user_group_ids, requested_group_ids)
+
+        if conflict is None:
+            return CheckConflictsResponse(has_conflict=False)
+
+        user_group_id, requested_group_id = conflict
+        logger.debug(
+            f"Найден конфликт: группа пользователя {user_group_id}, запрашиваемая группа {requested_group_id}"
+        )
+        return CheckConflictsResponse(
+            has_conflict=True,
+            user_group_id=user_group_id,
+            requested_group_id=requested_group_id,
+        )
+
+    async def _find_conflict_in_db(
+        self,
+        user_group_ids: list[int],
+        requested_group_ids: list[int],
+    ) -> tuple[int, int] | None:
+
+        user_groups_set = set(user_group_ids)
+        requested_groups_set = set(requested_group_ids)
+
+        for c in await self._conflict_repository.find_all():
+            if c.group_id1 in user_groups_set and c.group_id2 in requested_groups_set:
+                return c.group_id1, c.group_id2
+
+        return None
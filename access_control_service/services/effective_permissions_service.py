@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import hashlib
+import logging
+
+import redis.asyncio as redis
+
+from access_control_service.models.models import (
+    EffectiveResourcesRequest,
+    EffectiveResourcesResponse,
+    Resource as ResourceModel,
+    ResourceHolderAccess,
+    ResourceHoldersResponse,
+)
+from access_control_service.repositories.protocols import ResourceRepositoryProtocol
+from access_control_service.services.cache import (
+    get_access_graph_version,
+    get_effective_resources_from_cache,
+    set_effective_resources_cache,
+    get_resource_holders_from_cache,
+    set_resource_holders_cache,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_grants(group_ids: list[int], access_ids: list[int]) -> str:
+
+    payload = (
+        "g:" + ",".join(map(str, group_ids)) + "|a:" + ",".join(map(str, access_ids))
+    )
+    return hashlib.sha1(payload.encode()).hexdigest()
+
+
+class EffectivePermissionsService:
+
+    def __init__(
+        self,
+        resource_repository: ResourceRepositoryProtocol,
+        redis_conn: redis.Redis | None = None,
+    ):
+        self._resource_repository = resource_repository
+        self._redis_conn = redis_conn
+
+    async def resolve_resources(
+        self, grants: EffectiveResourcesRequest
+    ) -> EffectiveResourcesResponse:
+
+        group_ids = sorted(set(grants.group_ids))
+        access_ids = sorted(set(grants.access_ids))
+
+        if not group_ids and not access_ids:
+            return EffectiveResourcesResponse(resources=[])
+
+        if self._redis_conn is None:
+            return EffectiveResourcesResponse(
+                resources=await self._load_resources(group_ids, access_ids)
+            )
+
+        version = await get_access_graph_version(self._redis_conn)
+        grants_hash = _hash_grants(group_ids, access_ids)
+
+        cached = await get_effective_resources_from_cache(self._redis_conn, version, grants_hash)
+        if cached is not None:
+            return EffectiveResourcesResponse(
+                resources=[ResourceModel.model_validate(item) for item in cached]
+            )
+
+        resources = await self._load_resources(group_ids, access_ids)
+        await set_effective_resources_cache(
+            self._redis_conn,
+            version,
+            grants_hash,
+            [resource.model_dump() for resource in resources],
+        )
+        return EffectiveResourcesResponse(resources=resources)
+
+    async def get_resource_holders(self, resource_id: int) -> ResourceHoldersResponse:
+
+        version = None
+        if self._redis_conn is not None:
+            version = await get_access_graph_version(self._redis_conn)
+            cached = await get_resource_holders_from_cache(self._redis_conn, version, resource_id)
+            if cached is not None:
+                return ResourceHoldersResponse.model_validate(cached)
+
+        rows = await self._resource_repository.find_holders(resource_id)
+        if not rows and await self._resource_repository.find_by_id(resource_id) is None:
+            raise ValueError(f"Ресурс с ID {resource_id} не найден")
+
+        groups_by_access: dict[int, list[int]] = {}
+        for access_id, group_id in rows:
+            group_ids = groups_by_access.setdefault(access_id, [])
+            if group_id is not None:
+                group_ids.append(group_id)
+
+        response = ResourceHoldersResponse(
+            resource_id=resource_id,
+            accesses=[
+                ResourceHolderAccess(access_id=access_id, group_ids=group_ids)
+                for access_id, group_ids in groups_by_access.items()
+            ],
+            access_ids=list(groups_by_access),
+            group_ids=sorted({group_id for _, group_id in rows if group_id is not None}),
+        )
+        logger.debug(
+            f"Ресурс {resource_id} доступен через {len(response.access_ids)} доступов "
+            f"и {len(response.group_ids)} групп"
+        )
+
+        if self._redis_conn is not None:
+            await set_resource_holders_cache(
+                self._redis_conn, version, resource_id, response.model_dump()
+            )
+
+        return response
+
+    async def _load_resources(
+        self,
+        group_ids: list[int],
+        access_ids: list[int],
+    ) -> list[ResourceModel]:
+
+        resources = await self._resource_repository.find_effective_by_grants(group_ids, access_ids)
+        logger.debug(
+            f"Эффективные ресурсы для групп {group_ids} и доступов {access_ids}: {len(resources)}"
+        )
+        return [ResourceModel.model_validate(resource) for resource in resources]
@@ -17,6 +17,13 @@ from access_control_service.models.models import (
     CreateConflictRequest,
     CreateConflictResponse,
     Conflict as ConflictModel,
+    CheckConflictsRequest,
+    CheckConflictsResponse,
+    ConflictAnalyticsResponse,
+    ConflictGroupAnalyticsResponse,
+    EffectiveResourcesRequest,
+    EffectiveResourcesResponse,
+    ResourceHoldersResponse,
 )
 
 
@@ -29,6 +36,17 @@ class ResourceServiceProtocol(Protocol):
         ...
 
 
+class EffectivePermissionsServiceProtocol(Protocol):
+
+    async def resolve_resources(
+        self, grants: EffectiveResourcesRequest
+    ) -> EffectiveResourcesResponse:
+        ...
+
+    async def get_resource_holders(self, resource_id: int) -> ResourceHoldersResponse:
+        ...
+
+
 class ResourceServiceAdminProtocol(Protocol):
 
     async def create_resource(
@@ -112,6 +130,20 @@ class ConflictServiceProtocol(Protocol):
     async def get_all_conflicts(self) -> list[ConflictModel]:
         ...
 
+    async def check_conflicts(
+        self, check_data: CheckConflictsRequest
+    ) -> CheckConflictsResponse:
+        ...
+
+
+class ConflictAnalyticsServiceProtocol(Protocol):
+
+    async def get_analytics(self, top: int = 10) -> ConflictAnalyticsResponse:
+        ...
+
+    async def get_group_analytics(self, group_id: int) -> ConflictGroupAnalyticsResponse:
+        ...
+
 
 class ConflictServiceAdminProtocol(Protocol):
 
@@ -13,6 +13,7 @@ class RedisClient:
         
         self._settings = get_settings()
         self._connection: redis.Redis[Any] | None = None
+        self._binary_connection: redis.Redis[Any] | None = None
 
     @property
     def connection(self) -> redis.Redis[Any]:
@@ -23,16 +24,30 @@ class RedisClient:
             )
         return self._connection
 
+    @property
+    def binary_connection(self) -> redis.Redis[Any]:
+
+        if self._binary_connection is None:
+            raise RuntimeError(
+                "RedisClient не инициализирован. Вызовите connect() в lifecycle приложения."
+            )
+        return self._binary_connection
+
     async def connect(self) -> None:
         if self._connection is not None:
             return
 
         dsn = self._settings.build_redis_dsn()
         self._connection = redis.from_url(dsn, decode_responses=True)
+        self._binary_connection = redis.from_url(dsn, decode_responses=False)
 
     async def close(self) -> None:
         if self._connection is None:
             return
 
         await self._connection.close()
-        self._connection = None
\ No newline at end of file
+        self._connection = None
+
+        if self._binary_connection is not None:
+            await self._binary_connection.close()
+            self._binary_connection = None
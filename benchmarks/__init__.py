@@ -0,0 +1 @@
+"""Нагрузочный стенд: наполнение каталога, воспроизведение нагрузки и отчет по задержкам."""
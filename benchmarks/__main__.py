@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+
+from benchmarks.pipeline import PipelineConfig, format_pipeline_report, run_pipeline
+from benchmarks.runner import BenchmarkRunner, RunConfig
+from benchmarks.seed import Catalog, SeedConfig, seed_catalog
+from benchmarks.stats import format_report
+from benchmarks.targets import open_target
+from benchmarks.workload import WorkloadMix, load_workload
+
+logger = logging.getLogger("benchmarks")
+
+# Порты по умолчанию совпадают с docker-compose.yml
+DEFAULT_BFF = "http://localhost:8000"
+DEFAULT_USER_SERVICE = "http://localhost:8001"
+DEFAULT_ACCESS_CONTROL = "http://localhost:8002"
+DEFAULT_WORKLOAD = os.path.join(os.path.dirname(__file__), "workloads", "mixed.jsonl")
+
+
+def _add_seed_arguments(parser: argparse.ArgumentParser) -> None:
+
+    defaults = SeedConfig()
+    parser.add_argument("--access-control", default=DEFAULT_ACCESS_CONTROL,
+                        help="URL access_control_service или asgi:<модуль>:<атрибут>")
+    parser.add_argument("--user-service", default=DEFAULT_USER_SERVICE,
+                        help="URL user_service или asgi:<модуль>:<атрибут>")
+    parser.add_argument("--resources", type=int, default=defaults.resources)
+    parser.add_argument("--accesses", type=int, default=defaults.accesses)
+    parser.add_argument("--groups", type=int, default=defaults.groups)
+    parser.add_argument("--conflicts", type=int, default=defaults.conflicts)
+    parser.add_argument("--users", type=int, default=defaults.users)
+    parser.add_argument("--resources-per-access", type=int, default=defaults.resources_per_access)
+    parser.add_argument("--accesses-per-group", type=int, default=defaults.accesses_per_group)
+    parser.add_argument("--seed", type=int, default=defaults.random_seed, help="Зерно генератора случайных чисел")
+
+
+def _seed_config(args: argparse.Namespace) -> SeedConfig:
+    return SeedConfig(
+        resources=args.resources,
+        accesses=args.accesses,
+        groups=args.groups,
+        conflicts=args.conflicts,
+        users=args.users,
+        resources_per_access=args.resources_per_access,
+        accesses_per_group=args.accesses_per_group,
+        random_seed=args.seed,
+    )
+
+
+async def _seed(args: argparse.Namespace) -> Catalog:
+
+    async with open_target(args.access_control) as access_control, open_target(args.user_service) as user_service:
+        catalog = await seed_catalog(access_control, user_service, _seed_config(args))
+
+    logger.info(f"Каталог создан: {catalog.summary()}")
+    return catalog
+
+
+async def _run_seed(args: argparse.Namespace) -> None:
+    catalog = await _seed(args)
+    catalog.save(args.output)
+    print(f"Каталог сохранен в {args.output}: {catalog.summary()}")
+
+
+async def _run_benchmark(args: argparse.Namespace) -> None:
+
+    catalog = Catalog.load(args.catalog) if args.catalog else await _seed(args)
+    mix = WorkloadMix(load_workload(args.workload), catalog, random_seed=args.seed)
+    config = RunConfig(
+        concurrency=args.concurrency,
+        duration=None if args.requests is not None else args.duration,
+        total_requests=args.requests,
+        rate=args.rate,
+        approval_timeout=args.approval_timeout,
+    )
+
+    async with open_target(args.target, max_connections=args.concurrency * 2) as client:
+        report = await BenchmarkRunner(client, mix, config).run()
+
+    report["target"] = args.target
+    report["workload"] = args.workload
+    report["catalog"] = catalog.summary()
+    report["config"] = {
+        "concurrency": config.concurrency,
+        "duration": config.duration,
+        "requests": config.total_requests,
+        "rate": config.rate,
+    }
+
+    print(format_report(report))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+        print(f"Отчет сохранен в {args.report}")
+
+
+async def _run_pipeline(args: argparse.Namespace) -> int:
+
+    report = await run_pipeline(PipelineConfig(
+        messages=args.messages,
+        bulk_messages=args.bulk_messages,
+        consumers=args.consumers,
+        shards=args.shards,
+        users=args.users,
+        groups=args.groups,
+        accesses=args.accesses,
+        conflicts=args.conflicts,
+        upstream_latency=args.upstream_latency,
+        conflict_check_mode=args.conflict_check_mode,
+        random_seed=args.seed,
+    ))
+
+    print(format_pipeline_report(report))
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2)
+
+    throughput = report["latency"]["throughput_rps"]
+    if args.min_throughput is not None and throughput < args.min_throughput:
+        print(f"Пропускная способность {throughput} ниже порога {args.min_throughput}", file=sys.stderr)
+        return 1
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Нагрузочный стенд: наполнение каталога и воспроизведение смеси запросов",
+    )
+    parser.add_argument("-v", "--verbose", action="store_true", help="Подробный лог")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    seed_parser = subparsers.add_parser("seed", help="Создать каталог и пользователей через admin API")
+    _add_seed_arguments(seed_parser)
+    seed_parser.add_argument("--output", default="catalog.json", help="Файл для сохранения ID каталога")
+
+    run_parser = subparsers.add_parser("run", help="Запустить нагрузку и вывести отчет")
+    _add_seed_arguments(run_parser)
+    run_parser.add_argument("--target", default=DEFAULT_BFF,
+                            help="URL сервиса под нагрузкой или asgi:<модуль>:<атрибут>")
+    run_parser.add_argument("--workload", default=DEFAULT_WORKLOAD, help="JSONL файл со смесью операций")
+    run_parser.add_argument("--catalog", help="Готовый каталог из команды seed (иначе каталог создается заново)")
+    run_parser.add_argument("--concurrency", type=int, default=20)
+    run_parser.add_argument("--duration", type=float, default=30.0, help="Длительность прогона, с")
+    run_parser.add_argument("--requests", type=int, help="Число запросов вместо длительности")
+    run_parser.add_argument("--rate", type=float, help="Целевая частота запросов в секунду (открытый цикл)")
+    run_parser.add_argument("--approval-timeout", type=float, default=30.0,
+                            help="Сколько ждать решения по заявке, с")
+    run_parser.add_argument("--report", help="Файл для сохранения отчета в JSON")
+
+    defaults = PipelineConfig()
+    pipeline_parser = subparsers.add_parser(
+        "pipeline",
+        help="Конвейер валидации в одном процессе на in-memory очередях и апстримах",
+    )
+    pipeline_parser.add_argument("--messages", type=int, default=defaults.messages)
+    pipeline_parser.add_argument("--bulk-messages", type=int, default=defaults.bulk_messages,
+                                 help="Заявки пакетной загрузки в bulk-полосе, поставленные до основного потока")
+    pipeline_parser.add_argument("--consumers", type=int, default=defaults.consumers)
+    pipeline_parser.add_argument("--shards", type=int, default=defaults.shards,
+                                 help="Число шардов очереди заявок в каждой полосе")
+    pipeline_parser.add_argument("--users", type=int, default=defaults.users)
+    pipeline_parser.add_argument("--groups", type=int, default=defaults.groups)
+    pipeline_parser.add_argument("--accesses", type=int, default=defaults.accesses)
+    pipeline_parser.add_argument("--conflicts", type=int, default=defaults.conflicts)
+    pipeline_parser.add_argument("--upstream-latency", type=float, default=defaults.upstream_latency,
+                                 help="Имитация задержки обращения к соседним сервисам, с")
+    pipeline_parser.add_argument("--conflict-check-mode", choices=("matrix", "remote"),
+                                 default=defaults.conflict_check_mode)
+    pipeline_parser.add_argument("--seed", type=int, default=defaults.random_seed)
+    pipeline_parser.add_argument("--min-throughput", type=float,
+                                 help="Минимальная пропускная способность, сообщений/с (иначе код возврата 1)")
+    pipeline_parser.add_argument("--report", help="Файл для сохранения отчета в JSON")
+
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    # Логи приложений, запущенных в процессе, не должны влиять на замеры
+    if not args.verbose:
+        for name in ("access_control_service", "user_service", "validation_service", "bff_service", "httpx"):
+            logging.getLogger(name).setLevel(logging.ERROR)
+
+    if args.command == "pipeline":
+        return asyncio.run(_run_pipeline(args))
+
+    handler = _run_seed if args.command == "seed" else _run_benchmark
+    asyncio.run(handler(args))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any
+
+from benchmarks.stats import LatencyStats
+from validation_service.models.validation_models import ValidationRequest, ValidationResult
+from validation_service.rabbitmq.codec import VALIDATION_REQUEST_CONTENT_TYPE, encode_validation_request
+from validation_service.rabbitmq.consumers.validation_consumer import ValidationConsumer
+from validation_service.rabbitmq.in_memory import InMemoryChannel, InMemoryQueue, InMemoryResultPublisher
+from validation_service.rabbitmq.retry import dead_letter_queue_name
+from validation_service.rabbitmq.routing import LANE_BULK, LANE_INTERACTIVE, all_queue_names, route
+from validation_service.services.in_memory import InMemoryAccessControlClient, InMemoryUserServiceClient
+from validation_service.services.validation_service import ValidationService
+
+logger = logging.getLogger(__name__)
+
+VALIDATION_QUEUE = "validation_queue"
+RESULT_QUEUE = "result_queue"
+
+
+@dataclass
+class PipelineConfig:
+    messages: int = 10000
+    # Заявки пакетной загрузки: ставятся в bulk-полосу до основного потока interactive-заявок
+    bulk_messages: int = 0
+    consumers: int = 1
+    shards: int = 1
+    users: int = 1000
+    groups: int = 50
+    accesses: int = 150
+    conflicts: int = 40
+    groups_per_user: int = 3
+    accesses_per_group: int = 5
+    # Имитация сетевой задержки обращения к соседним сервисам, с
+    upstream_latency: float = 0.0
+    conflict_check_mode: str = "matrix"
+    random_seed: int = 42
+
+
+class _TimedPublisher(InMemoryResultPublisher):
+    """Публикатор, замеряющий время от постановки запроса в очередь до готового результата."""
+
+    def __init__(
+        self,
+        result_queue: InMemoryQueue,
+        enqueued_at: dict[str, tuple[float, str]],
+        stats: dict[str, LatencyStats],
+    ):
+        super().__init__(result_queue)
+        self._enqueued_at = enqueued_at
+        self._stats = stats
+
+    async def publish_result(self, result: ValidationResult) -> None:
+        await super().publish_result(result)
+        enqueued_at, lane = self._enqueued_at.pop(result.request_id)
+        latency = time.perf_counter() - enqueued_at
+        self._stats[lane].observe(latency, 200)
+        self._stats["all"].observe(latency, 200)
+
+
+def _build_upstreams(
+    config: PipelineConfig,
+    rng: random.Random,
+) -> tuple[InMemoryUserServiceClient, InMemoryAccessControlClient]:
+
+    group_ids = list(range(1, config.groups + 1))
+    access_ids = list(range(1, config.accesses + 1))
+    pairs = [(a, b) for i, a in enumerate(group_ids) for b in group_ids[i + 1:]]
+
+    access_control = InMemoryAccessControlClient(
+        group_accesses={
+            group_id: rng.sample(access_ids, min(config.accesses_per_group, len(access_ids)))
+            for group_id in group_ids
+        },
+        conflicts=rng.sample(pairs, min(config.conflicts, len(pairs))),
+        latency=config.upstream_latency,
+    )
+    user_service = InMemoryUserServiceClient(
+        user_groups={
+            user_id: rng.sample(group_ids, min(config.groups_per_user, len(group_ids)))
+            for user_id in range(1, config.users + 1)
+        },
+        latency=config.upstream_latency,
+    )
+    return user_service, access_control
+
+
+def _build_requests(config: PipelineConfig, rng: random.Random) -> list[tuple[str, ValidationRequest]]:
+
+    requests = []
+    for index in range(config.bulk_messages + config.messages):
+        lane = LANE_BULK if index < config.bulk_messages else LANE_INTERACTIVE
+        if rng.random() < 0.5:
+            permission_type, item_id = "group", rng.randint(1, config.groups)
+        else:
+            permission_type, item_id = "access", rng.randint(1, config.accesses)
+        requests.append((
+            lane,
+            ValidationRequest(
+                user_id=rng.randint(1, config.users),
+                permission_type=permission_type,
+                item_id=item_id,
+                request_id=f"bench-{index}",
+            ),
+        ))
+    return requests
+
+
+async def run_pipeline(config: PipelineConfig) -> dict[str, Any]:
+    """Прогоняет заявки через ValidationConsumer -> ValidationService -> publisher без брокера и сети."""
+
+    rng = random.Random(config.random_seed)
+    user_service, access_control = _build_upstreams(config, rng)
+    requests = _build_requests(config, rng)
+
+    channel = InMemoryChannel()
+    validation_queues = {
+        name: channel.get_queue(name) for _, name in all_queue_names(VALIDATION_QUEUE, config.shards)
+    }
+    result_queue = channel.get_queue(RESULT_QUEUE)
+    enqueued_at: dict[str, tuple[float, str]] = {}
+    latency = {"all": LatencyStats(), LANE_INTERACTIVE: LatencyStats(), LANE_BULK: LatencyStats()}
+    publisher = _TimedPublisher(result_queue, enqueued_at, latency)
+    validation_service = ValidationService(
+        user_client=user_service,
+        access_control_client=access_control,
+        conflict_check_mode=config.conflict_check_mode,
+    )
+
+    consumers = [
+        ValidationConsumer(
+            validation_service=validation_service,
+            publisher=publisher,
+            rabbitmq_url="",
+            validation_queue_name=VALIDATION_QUEUE,
+            shards=config.shards,
+            channel=channel,
+        )
+        for _ in range(config.consumers)
+    ]
+
+    started = time.perf_counter()
+    for lane, request in requests:
+        enqueued_at[request.request_id] = (time.perf_counter(), lane)
+        validation_queues[route(VALIDATION_QUEUE, request.user_id, lane, config.shards)].put_nowait(
+            encode_validation_request(request),
+            content_type=VALIDATION_REQUEST_CONTENT_TYPE,
+        )
+
+    tasks = []
+    for consumer in consumers:
+        await consumer.connect()
+        tasks.append(asyncio.create_task(consumer.start_consuming()))
+
+    for validation_queue in validation_queues.values():
+        await validation_queue.join()
+    elapsed = time.perf_counter() - started
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    approved = sum(1 for result in publisher.results if result.approved)
+    summaries = {}
+    for name, stats in latency.items():
+        summary = stats.summary(elapsed)
+        summary.pop("status_codes")
+        summary.pop("errors")
+        summaries[name] = summary
+
+    return {
+        "messages": config.messages,
+        "bulk_messages": config.bulk_messages,
+        "consumers": config.consumers,
+        "shards": config.shards,
+        "upstream_latency": config.upstream_latency,
+        "conflict_check_mode": config.conflict_check_mode,
+        "results": len(publisher.results),
+        "approved": approved,
+        "rejected": len(publisher.results) - approved,
+        "dead_lettered": sum(
+            channel.get_queue(dead_letter_queue_name(name)).qsize() for name in validation_queues
+        ),
+        "upstream_calls": {"user_service": user_service.calls, "access_control": access_control.calls},
+        "latency": summaries["all"],
+        "lanes": {lane: summaries[lane] for lane in (LANE_INTERACTIVE, LANE_BULK)},
+    }
+
+
+def format_pipeline_report(report: dict[str, Any]) -> str:
+
+    latency = report["latency"]
+    lines = [
+        f"Сообщений: {report['messages']} (+{report['bulk_messages']} bulk), консьюмеров: {report['consumers']}, "
+        f"шардов: {report['shards']}, режим проверки: {report['conflict_check_mode']}",
+        f"Пропускная способность: {latency['throughput_rps']} сообщений/с",
+        f"Время в конвейере (мс): p50={latency['p50_ms']} p95={latency['p95_ms']} "
+        f"p99={latency['p99_ms']} max={latency['max_ms']}",
+    ]
+    if report["bulk_messages"]:
+        for lane, lane_latency in report["lanes"].items():
+            lines.append(
+                f"  {lane} (мс): p50={lane_latency['p50_ms']} p95={lane_latency['p95_ms']} "
+                f"p99={lane_latency['p99_ms']} max={lane_latency['max_ms']}"
+            )
+    return "\n".join(lines + [
+        f"Одобрено: {report['approved']}, отклонено: {report['rejected']}, "
+        f"отброшено: {report['dead_lettered']}",
+        f"Обращения к апстримам: {json.dumps(report['upstream_calls'])}",
+    ])
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any
+
+import httpx
+
+from benchmarks.stats import BenchmarkStats
+from benchmarks.workload import RenderedRequest, WorkloadMix
+
+logger = logging.getLogger(__name__)
+
+# Статусы, при которых заявка еще не рассмотрена
+PENDING_STATUSES = frozenset({"pending"})
+
+
+@dataclass
+class RunConfig:
+    concurrency: int = 20
+    duration: float | None = 30.0
+    total_requests: int | None = None
+    # Целевая частота (запросов/с); None — замкнутый цикл без пауз
+    rate: float | None = None
+    approval_path: str = "/users/{user_id}/permissions"
+    approval_poll_interval: float = 0.05
+    approval_timeout: float = 30.0
+
+
+class BenchmarkRunner:
+    """Воспроизводит смесь операций заданным числом конкурентных воркеров."""
+
+    def __init__(self, client: httpx.AsyncClient, mix: WorkloadMix, config: RunConfig):
+        self._client = client
+        self._mix = mix
+        self._config = config
+        self._stats = BenchmarkStats()
+        self._issued = 0
+        self._deadline: float | None = None
+        self._next_slot: float | None = None
+        self._approval_tasks: set[asyncio.Task] = set()
+
+    def _take_slot(self) -> float | None:
+        """Следующий момент отправки при заданной частоте; None — лимит запросов исчерпан."""
+
+        config = self._config
+        if config.total_requests is not None and self._issued >= config.total_requests:
+            return None
+
+        now = time.perf_counter()
+        if self._deadline is not None and now >= self._deadline:
+            return None
+
+        self._issued += 1
+        if config.rate is None:
+            return now
+
+        slot = max(now, self._next_slot) if self._next_slot is not None else now
+        self._next_slot = slot + 1.0 / config.rate
+        return slot
+
+    async def _send(self, rendered: RenderedRequest) -> tuple[httpx.Response | None, float]:
+
+        started = time.perf_counter()
+        try:
+            response = await self._client.request(
+                rendered.operation.method,
+                rendered.path,
+                json=rendered.body,
+            )
+        except httpx.HTTPError as e:
+            logger.debug(f"Ошибка запроса {rendered.operation.name}: {e}")
+            return None, started
+        return response, started
+
+    async def _worker(self) -> None:
+
+        while True:
+            slot = self._take_slot()
+            if slot is None:
+                return
+
+            delay = slot - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+
+            rendered = self._mix.next_request()
+            response, started = await self._send(rendered)
+            # При заданной частоте задержка считается от запланированного момента:
+            # иначе медленные ответы скрывают очередь перед отправкой
+            origin = min(slot, started)
+            latency = time.perf_counter() - origin
+
+            status_code = response.status_code if response is not None else None
+            self._stats.observe(rendered.operation.name, latency, status_code)
+
+            if (
+                rendered.operation.track_approval
+                and response is not None
+                and response.status_code < 400
+            ):
+                task = asyncio.create_task(self._track_approval(rendered, origin))
+                self._approval_tasks.add(task)
+                task.add_done_callback(self._approval_tasks.discard)
+
+    def _find_status(self, payload: dict[str, Any], body: dict[str, Any]) -> str | None:
+
+        permission_type = body.get("permission_type")
+        item_id = body.get("item_id")
+        section = "groups" if permission_type == "group" else "accesses"
+        for permission in payload.get(section, []):
+            if permission.get("item_id") == item_id:
+                return permission.get("status")
+        return None
+
+    async def _track_approval(self, rendered: RenderedRequest, started: float) -> None:
+        """Опрашивает права пользователя, пока заявка не выйдет из статуса pending."""
+
+        body = rendered.body if isinstance(rendered.body, dict) else {}
+        user_id = body.get("user_id", rendered.params.get("user_id"))
+        path = self._config.approval_path.format(user_id=user_id)
+        deadline = started + self._config.approval_timeout
+
+        while time.perf_counter() < deadline:
+            try:
+                response = await self._client.get(path)
+            except httpx.HTTPError:
+                response = None
+
+            if response is not None and response.status_code == 200:
+                status = self._find_status(response.json(), body)
+                if status is not None and status not in PENDING_STATUSES:
+                    self._stats.observe_approval(time.perf_counter() - started, status)
+                    return
+
+            await asyncio.sleep(self._config.approval_poll_interval)
+
+        self._stats.observe_approval(time.perf_counter() - started, "timeout")
+
+    async def run(self) -> dict[str, Any]:
+
+        config = self._config
+        if config.duration is None and config.total_requests is None:
+            raise ValueError("Нужно задать длительность или число запросов")
+
+        started = time.perf_counter()
+        if config.duration is not None:
+            self._deadline = started + config.duration
+
+        await asyncio.gather(*(self._worker() for _ in range(config.concurrency)))
+        elapsed = time.perf_counter() - started
+
+        if self._approval_tasks:
+            logger.info(f"Ожидание решения по {len(self._approval_tasks)} заявкам")
+            await asyncio.gather(*self._approval_tasks, return_exceptions=True)
+
+        return self._stats.report(elapsed)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import random
+from dataclasses import asdict, dataclass, field
+from typing import Any, Awaitable, Callable, TypeVar
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RESOURCE_TYPES = ("API", "Database", "Service")
+
+
+@dataclass
+class SeedConfig:
+    resources: int = 200
+    accesses: int = 60
+    groups: int = 20
+    conflicts: int = 10
+    users: int = 500
+    resources_per_access: int = 4
+    accesses_per_group: int = 5
+    concurrency: int = 20
+    random_seed: int = 42
+    # Префикс имен, чтобы повторный запуск не пересекался с уже созданными данными
+    name_prefix: str = "bench"
+
+
+@dataclass
+class Catalog:
+    resource_ids: list[int] = field(default_factory=list)
+    access_ids: list[int] = field(default_factory=list)
+    group_ids: list[int] = field(default_factory=list)
+    conflicts: list[tuple[int, int]] = field(default_factory=list)
+    user_ids: list[int] = field(default_factory=list)
+
+    def save(self, path: str) -> None:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(asdict(self), f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str) -> Catalog:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        data["conflicts"] = [tuple(pair) for pair in data.get("conflicts", [])]
+        return cls(**data)
+
+    def summary(self) -> dict[str, int]:
+        return {
+            "resources": len(self.resource_ids),
+            "accesses": len(self.access_ids),
+            "groups": len(self.group_ids),
+            "conflicts": len(self.conflicts),
+            "users": len(self.user_ids),
+        }
+
+
+async def _gather_limited(concurrency: int, factories: list[Callable[[], Awaitable[T]]]) -> list[T]:
+
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def run(factory: Callable[[], Awaitable[T]]) -> T:
+        async with semaphore:
+            return await factory()
+
+    return await asyncio.gather(*(run(factory) for factory in factories))
+
+
+async def _post(client: httpx.AsyncClient, path: str, payload: dict[str, Any]) -> Any:
+
+    response = await client.post(path, json=payload)
+    if response.status_code >= 400:
+        raise RuntimeError(f"POST {path} вернул {response.status_code}: {response.text}")
+    return response.json()
+
+
+def _conflict_pairs(group_ids: list[int], count: int, rng: random.Random) -> list[tuple[int, int]]:
+
+    candidates = [
+        (a, b) for i, a in enumerate(group_ids) for b in group_ids[i + 1:]
+    ]
+    rng.shuffle(candidates)
+    return candidates[:count]
+
+
+async def seed_catalog(
+    access_control: httpx.AsyncClient,
+    user_service: httpx.AsyncClient,
+    config: SeedConfig,
+) -> Catalog:
+    """Создает ресурсы, доступы, группы, конфликты и пользователей через admin API сервисов."""
+
+    rng = random.Random(config.random_seed)
+    prefix = f"{config.name_prefix}-{rng.randrange(1_000_000):06d}"
+    catalog = Catalog()
+
+    resources = await _gather_limited(config.concurrency, [
+        lambda i=i: _post(access_control, "/admin/resources", {
+            "name": f"{prefix}-resource-{i}",
+            "type": RESOURCE_TYPES[i % len(RESOURCE_TYPES)],
+            "description": "Ресурс нагрузочного стенда",
+        })
+        for i in range(config.resources)
+    ])
+    catalog.resource_ids = [item["id"] for item in resources]
+    logger.info(f"Создано ресурсов: {len(catalog.resource_ids)}")
+
+    resources_per_access = min(config.resources_per_access, len(catalog.resource_ids))
+    accesses = await _gather_limited(config.concurrency, [
+        lambda i=i, ids=rng.sample(catalog.resource_ids, resources_per_access): _post(
+            access_control, "/admin/accesses", {"name": f"{prefix}-access-{i}", "resource_ids": ids}
+        )
+        for i in range(config.accesses)
+    ])
+    catalog.access_ids = [item["id"] for item in accesses]
+    logger.info(f"Создано доступов: {len(catalog.access_ids)}")
+
+    accesses_per_group = min(config.accesses_per_group, len(catalog.access_ids))
+    groups = await _gather_limited(config.concurrency, [
+        lambda i=i, ids=rng.sample(catalog.access_ids, accesses_per_group): _post(
+            access_control, "/admin/groups", {"name": f"{prefix}-group-{i}", "access_ids": ids}
+        )
+        for i in range(config.groups)
+    ])
+    catalog.group_ids = [item["id"] for item in groups]
+    logger.info(f"Создано групп: {len(catalog.group_ids)}")
+
+    for group_id1, group_id2 in _conflict_pairs(catalog.group_ids, config.conflicts, rng):
+        # Конфликты создаем последовательно: каждый меняет матрицу конфликтов целиком
+        await _post(access_control, "/admin/conflicts", {"group_id1": group_id1, "group_id2": group_id2})
+        catalog.conflicts.append((group_id1, group_id2))
+    logger.info(f"Создано конфликтов: {len(catalog.conflicts)}")
+
+    users = await _gather_limited(config.concurrency, [
+        lambda i=i: _post(user_service, "/admin/users", {"username": f"{prefix}-user-{i}"})
+        for i in range(config.users)
+    ])
+    catalog.user_ids = [item["id"] for item in users]
+    logger.info(f"Создано пользователей: {len(catalog.user_ids)}")
+
+    return catalog
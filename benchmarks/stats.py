@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import math
+from collections import Counter
+from typing import Any
+
+REPORT_QUANTILES = (0.5, 0.95, 0.99)
+
+
+def percentile(ordered: list[float], quantile: float) -> float:
+    """Квантиль по методу ближайшего ранга; ordered должен быть отсортирован."""
+
+    if not ordered:
+        return 0.0
+    index = min(len(ordered) - 1, max(0, math.ceil(quantile * len(ordered)) - 1))
+    return ordered[index]
+
+
+class LatencyStats:
+    """Задержки и коды ответов одной операции."""
+
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.status_codes: Counter[str] = Counter()
+        self.errors = 0
+
+    def observe(self, latency: float, status_code: int | None) -> None:
+
+        self.latencies.append(latency)
+        if status_code is None:
+            self.status_codes["transport_error"] += 1
+            self.errors += 1
+            return
+        self.status_codes[str(status_code)] += 1
+        if status_code >= 400:
+            self.errors += 1
+
+    def summary(self, elapsed: float) -> dict[str, Any]:
+
+        ordered = sorted(self.latencies)
+        count = len(ordered)
+        result: dict[str, Any] = {
+            "count": count,
+            "errors": self.errors,
+            "throughput_rps": round(count / elapsed, 2) if elapsed > 0 else 0.0,
+            "mean_ms": round(sum(ordered) / count * 1000, 3) if count else 0.0,
+        }
+        for quantile in REPORT_QUANTILES:
+            result[f"p{int(quantile * 100)}_ms"] = round(percentile(ordered, quantile) * 1000, 3)
+        result["max_ms"] = round(ordered[-1] * 1000, 3) if count else 0.0
+        result["status_codes"] = dict(self.status_codes)
+        return result
+
+
+class BenchmarkStats:
+    """Сводная статистика прогона: по операциям, общая и по времени согласования заявок."""
+
+    def __init__(self) -> None:
+        self.operations: dict[str, LatencyStats] = {}
+        self.total = LatencyStats()
+        self.approval = LatencyStats()
+        self.approval_outcomes: Counter[str] = Counter()
+
+    def observe(self, operation: str, latency: float, status_code: int | None) -> None:
+        self.operations.setdefault(operation, LatencyStats()).observe(latency, status_code)
+        self.total.observe(latency, status_code)
+
+    def observe_approval(self, latency: float, outcome: str) -> None:
+
+        self.approval_outcomes[outcome] += 1
+        if outcome != "timeout":
+            self.approval.latencies.append(latency)
+
+    def report(self, elapsed: float) -> dict[str, Any]:
+
+        approval = self.approval.summary(elapsed)
+        approval.pop("status_codes")
+        approval.pop("errors")
+        approval["outcomes"] = dict(self.approval_outcomes)
+        return {
+            "elapsed_seconds": round(elapsed, 3),
+            "total": self.total.summary(elapsed),
+            "operations": {
+                name: stats.summary(elapsed) for name, stats in sorted(self.operations.items())
+            },
+            "approval": approval,
+        }
+
+
+def format_report(report: dict[str, Any]) -> str:
+    """Текстовая таблица отчета для вывода в консоль."""
+
+    header = f"{'операция':<48} {'count':>8} {'err':>6} {'rps':>9} {'p50':>9} {'p95':>9} {'p99':>9}"
+    lines = [f"Длительность: {report['elapsed_seconds']} с", header, "-" * len(header)]
+
+    def row(name: str, item: dict[str, Any]) -> str:
+        return (
+            f"{name[:48]:<48} {item['count']:>8} {item.get('errors', 0):>6} {item['throughput_rps']:>9} "
+            f"{item['p50_ms']:>9} {item['p95_ms']:>9} {item['p99_ms']:>9}"
+        )
+
+    for name, item in report["operations"].items():
+        lines.append(row(name, item))
+    lines.append("-" * len(header))
+    lines.append(row("ИТОГО", report["total"]))
+
+    approval = report["approval"]
+    if approval["outcomes"]:
+        lines.append("")
+        lines.append(
+            f"Согласование заявок (мс): p50={approval['p50_ms']} p95={approval['p95_ms']} "
+            f"p99={approval['p99_ms']} max={approval['max_ms']} исходы={approval['outcomes']}"
+        )
+    return "\n".join(lines)
@@ -0,0 +1,53 @@
+from __future__ import annotations
+
+import importlib
+import logging
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Цель в виде asgi:<модуль>:<атрибут> — приложение запускается в процессе стенда
+ASGI_PREFIX = "asgi:"
+ASGI_BASE_URL = "http://benchmark.local"
+
+
+def _load_app(target: str):
+
+    spec = target[len(ASGI_PREFIX):]
+    module_name, _, attribute = spec.partition(":")
+    if not module_name:
+        raise ValueError(f"Некорректная цель: {target} (ожидается asgi:<модуль>:<атрибут>)")
+
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute or "app")
+
+
+@asynccontextmanager
+async def open_target(
+    target: str,
+    timeout: float = 30.0,
+    max_connections: int = 100,
+) -> AsyncIterator[httpx.AsyncClient]:
+    """HTTP клиент к цели: URL запущенного сервиса или ASGI приложение в этом же процессе."""
+
+    async with AsyncExitStack() as stack:
+        if target.startswith(ASGI_PREFIX):
+            app = _load_app(target)
+            # ASGITransport не выполняет lifespan, поэтому startup/shutdown запускаем сами
+            await stack.enter_async_context(app.router.lifespan_context(app))
+            transport: httpx.AsyncBaseTransport = httpx.ASGITransport(app=app)
+            base_url = ASGI_BASE_URL
+            logger.debug(f"Цель {target}: приложение запущено в процессе")
+        else:
+            transport = httpx.AsyncHTTPTransport(
+                limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+            )
+            base_url = target
+
+        client = await stack.enter_async_context(
+            httpx.AsyncClient(base_url=base_url, transport=transport, timeout=timeout)
+        )
+        yield client
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import json
+import random
+import re
+from dataclasses import dataclass, field
+from typing import Any
+
+from benchmarks.seed import Catalog
+
+# Плейсхолдеры в пути и теле запроса заменяются случайными ID из каталога
+PLACEHOLDERS = {
+    "user_id": "user_ids",
+    "resource_id": "resource_ids",
+    "access_id": "access_ids",
+    "group_id": "group_ids",
+}
+_PLACEHOLDER_RE = re.compile(r"\{(\w+)\}")
+
+
+@dataclass
+class Operation:
+    """Одна строка файла нагрузки: шаблон запроса и его доля в смеси."""
+
+    name: str
+    method: str
+    path: str
+    weight: float = 1.0
+    body: Any = None
+    # Для заявок на доступ — дожидаться решения и замерять время согласования
+    track_approval: bool = False
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> Operation:
+
+        if "method" not in data or "path" not in data:
+            raise ValueError(f"Операция нагрузки без method/path: {data}")
+
+        weight = float(data.get("weight", 1.0))
+        if weight <= 0:
+            raise ValueError(f"Вес операции должен быть положительным: {data}")
+
+        method = str(data["method"]).upper()
+        return cls(
+            name=data.get("name") or f"{method} {data['path']}",
+            method=method,
+            path=data["path"],
+            weight=weight,
+            body=data.get("body"),
+            track_approval=bool(data.get("track_approval", False)),
+        )
+
+
+@dataclass
+class RenderedRequest:
+    operation: Operation
+    path: str
+    body: Any = None
+    params: dict[str, int] = field(default_factory=dict)
+
+
+def load_workload(path: str) -> list[Operation]:
+    """Читает JSONL файл нагрузки; пустые строки и строки с # пропускаются."""
+
+    operations: list[Operation] = []
+    with open(path, encoding="utf-8") as f:
+        for line_number, line in enumerate(f, start=1):
+            line = line.strip()
+            if not line or line.startswith("#"):
+                continue
+            try:
+                operations.append(Operation.from_dict(json.loads(line)))
+            except (json.JSONDecodeError, ValueError) as e:
+                raise ValueError(f"{path}:{line_number}: {e}") from e
+
+    if not operations:
+        raise ValueError(f"Файл нагрузки {path} не содержит операций")
+    return operations
+
+
+class WorkloadMix:
+    """Взвешенный выбор операций и подстановка ID из каталога."""
+
+    def __init__(self, operations: list[Operation], catalog: Catalog, random_seed: int | None = None):
+        self._operations = operations
+        self._weights = [operation.weight for operation in operations]
+        self._catalog = catalog
+        self._rng = random.Random(random_seed)
+
+    def _pick_id(self, placeholder: str, params: dict[str, int]) -> int:
+
+        if placeholder not in params:
+            attribute = PLACEHOLDERS.get(placeholder)
+            if attribute is None:
+                raise ValueError(f"Неизвестный плейсхолдер {{{placeholder}}}")
+            ids = getattr(self._catalog, attribute)
+            if not ids:
+                raise ValueError(f"В каталоге нет данных для {{{placeholder}}}")
+            params[placeholder] = self._rng.choice(ids)
+        return params[placeholder]
+
+    def _render_value(self, value: Any, params: dict[str, int]) -> Any:
+
+        if isinstance(value, str):
+            # Значение целиком из плейсхолдера подставляется числом, иначе — внутрь строки
+            whole = _PLACEHOLDER_RE.fullmatch(value)
+            if whole is not None:
+                return self._pick_id(whole.group(1), params)
+            return _PLACEHOLDER_RE.sub(lambda m: str(self._pick_id(m.group(1), params)), value)
+        if isinstance(value, dict):
+            return {key: self._render_value(item, params) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._render_value(item, params) for item in value]
+        return value
+
+    def next_request(self) -> RenderedRequest:
+
+        operation = self._rng.choices(self._operations, weights=self._weights)[0]
+        params: dict[str, int] = {}
+        path = self._render_value(operation.path, params)
+        body = self._render_value(operation.body, params) if operation.body is not None else None
+        return RenderedRequest(operation=operation, path=str(path), body=body, params=params)
@@ -20,6 +20,130 @@ class Settings(BaseSettings):
         description="Таймаут для HTTP запросов (секунды)",
     )
 
+    http_pool_timeout: float = Field(
+        default=5.0,
+        description="Максимальное время ожидания свободного соединения в пуле (секунды)",
+    )
+    http_max_connections: int = Field(
+        default=100,
+        description="Максимальное число соединений к одному сервису",
+    )
+    http_max_keepalive_connections: int = Field(
+        default=20,
+        description="Максимальное число простаивающих keep-alive соединений",
+    )
+    http_keepalive_expiry: float = Field(
+        default=30.0,
+        description="Время жизни простаивающего keep-alive соединения (секунды)",
+    )
+    http2_enabled: bool = Field(
+        default=False,
+        description="Использовать HTTP/2 для запросов к сервисам (требует пакет h2)",
+    )
+
+    circuit_breaker_failure_threshold: int = Field(
+        default=5,
+        description="Число ошибок подряд, после которого цепь к сервису размыкается",
+    )
+    circuit_breaker_recovery_timeout: float = Field(
+        default=30.0,
+        description="Время до пробного запроса к сервису после размыкания цепи (секунды)",
+    )
+    retry_budget_ratio: float = Field(
+        default=0.2,
+        description="Доля повторов от числа обычных запросов к сервису",
+    )
+    retry_max_attempts: int = Field(
+        default=3,
+        description="Максимальное число попыток одного запроса (включая первую)",
+    )
+    concurrency_limit_initial: int = Field(
+        default=20,
+        description="Начальный адаптивный лимит одновременных запросов к сервису",
+    )
+    concurrency_limit_max: int = Field(
+        default=200,
+        description="Верхняя граница адаптивного лимита одновременных запросов",
+    )
+    concurrency_latency_threshold: float = Field(
+        default=1.0,
+        description="Задержка ответа (секунды), выше которой лимит одновременных запросов снижается",
+    )
+
+    request_wait_timeout_seconds: float = Field(
+        default=5.0,
+        description="Сколько POST /request?wait=true ждет результата валидации, если клиент не передал timeout",
+    )
+
+    permission_events_buffer_size: int = Field(
+        default=100,
+        description="Буфер событий одного подписчика GET /permissions/events; при переполнении клиент получает resync",
+    )
+    permission_events_max_subscribers: int = Field(
+        default=5000,
+        description="Максимальное число открытых потоков событий заявок на процесс",
+    )
+    permission_events_heartbeat_seconds: float = Field(
+        default=15.0,
+        description="Интервал комментария keepalive в потоке событий без новых событий (секунды)",
+    )
+    permission_events_max_stream_seconds: float = Field(
+        default=300.0,
+        description=(
+            "Время жизни одного потока событий (секунды): затем поток закрывается и клиент "
+            "переподключается, в том числе к другой реплике"
+        ),
+    )
+
+    dashboard_max_concurrency: int = Field(
+        default=10,
+        description="Максимальное число одновременных запросов к Access Control при сборке дашборда",
+    )
+
+    upstream_passthrough: bool = Field(
+        default=True,
+        description=(
+            "Отдавать ответы Access Control Service как есть, без повторной валидации, "
+            "если версия схемы (X-Schema-Version) совпадает с ожидаемой"
+        ),
+    )
+
+    redis_host: str | None = Field(
+        default=None,
+        description=(
+            "Хост Redis для общего кэша ответов, событий инвалидации и событий заявок "
+            "(если не задан, кэш только в памяти, поток событий заявок недоступен)"
+        ),
+    )
+    redis_port: int = Field(
+        default=6379,
+    )
+    redis_db: int = Field(
+        default=0,
+    )
+
+    response_cache_max_entries: int = Field(
+        default=1024,
+        description="Максимальное число ответов в LRU-кэше процесса",
+    )
+    response_cache_ttl_seconds: float = Field(
+        default=60.0,
+        description="Время жизни закэшированного ответа (страховка на случай потерянных событий инвалидации)",
+    )
+    response_cache_local_only_ttl_seconds: float = Field(
+        default=1.0,
+        description="Время жизни ответа в памяти без Redis: события инвалидации тогда не приходят",
+    )
+
+    tracing_exporter: str = Field(
+        default="none",
+        description="Экспорт спанов трассировки: none, memory (в памяти процесса) или jsonl (в файл)",
+    )
+    tracing_jsonl_path: str = Field(
+        default="traces.jsonl",
+        description="Файл для экспортера jsonl",
+    )
+
     log_level: str = Field(
         default="INFO",
         description="Уровень логирования",
@@ -2,12 +2,21 @@ from __future__ import annotations
 
 from functools import lru_cache
 
+import redis.asyncio as redis
+from fastapi import Depends
+
 from bff_service.config.settings import Settings, get_settings
 from bff_service.services.user_service_client import UserServiceClient
 from bff_service.services.access_control_client import AccessControlClient
+from bff_service.services.response_cache import ResponseCache
+from bff_service.services.permission_events import PermissionEventBroker
+from bff_service.services.http_pool import create_http_client
+from bff_service.services.resilience import create_resilience_policy
+from bff_service.services.dashboard_service import UserDashboardService
 from bff_service.services.protocols import (
     UserServiceClientProtocol,
     AccessControlClientProtocol,
+    UserDashboardServiceProtocol,
 )
 
 
@@ -16,19 +25,95 @@ def get_settings_dependency() -> Settings:
     return get_settings()
 
 
+def _create_http_client(name: str, base_url: str):
+    settings = get_settings_dependency()
+    return create_http_client(
+        name=name,
+        base_url=base_url,
+        timeout=settings.http_timeout,
+        pool_timeout=settings.http_pool_timeout,
+        max_connections=settings.http_max_connections,
+        max_keepalive_connections=settings.http_max_keepalive_connections,
+        keepalive_expiry=settings.http_keepalive_expiry,
+        http2=settings.http2_enabled,
+        resilience=create_resilience_policy(
+            name=name,
+            failure_threshold=settings.circuit_breaker_failure_threshold,
+            recovery_timeout=settings.circuit_breaker_recovery_timeout,
+            retry_budget_ratio=settings.retry_budget_ratio,
+            max_attempts=settings.retry_max_attempts,
+            initial_limit=settings.concurrency_limit_initial,
+            max_limit=settings.concurrency_limit_max,
+            latency_threshold=settings.concurrency_latency_threshold,
+            acquire_timeout=settings.http_pool_timeout,
+        ),
+    )
+
+
 @lru_cache(maxsize=1)
 def get_user_service_client() -> UserServiceClientProtocol:
     settings = get_settings_dependency()
+    base_url = str(settings.user_service_url).rstrip("/")
     return UserServiceClient(
-        base_url=str(settings.user_service_url), timeout=settings.http_timeout
+        base_url=base_url,
+        timeout=settings.http_timeout,
+        http_client=_create_http_client("user_service", base_url),
     )
 
 
 @lru_cache(maxsize=1)
 def get_access_control_client() -> AccessControlClientProtocol:
     settings = get_settings_dependency()
+    base_url = str(settings.access_control_service_url).rstrip("/")
     return AccessControlClient(
-        base_url=str(settings.access_control_service_url), timeout=settings.http_timeout
+        base_url=base_url,
+        timeout=settings.http_timeout,
+        passthrough=settings.upstream_passthrough,
+        http_client=_create_http_client("access_control_service", base_url),
+    )
+
+
+def get_dashboard_service(
+    user_service_client: UserServiceClientProtocol = Depends(get_user_service_client),
+    access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
+) -> UserDashboardServiceProtocol:
+    settings = get_settings_dependency()
+    return UserDashboardService(
+        user_service_client=user_service_client,
+        access_control_client=access_control_client,
+        max_concurrency=settings.dashboard_max_concurrency,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_response_cache() -> ResponseCache:
+    settings = get_settings_dependency()
+    redis_conn = None
+    if settings.redis_host:
+        redis_conn = redis.Redis(
+            host=settings.redis_host,
+            port=settings.redis_port,
+            db=settings.redis_db,
+        )
+    return ResponseCache(
+        max_entries=settings.response_cache_max_entries,
+        ttl_seconds=settings.response_cache_ttl_seconds,
+        redis_conn=redis_conn,
+        local_only_ttl_seconds=settings.response_cache_local_only_ttl_seconds,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_permission_event_broker() -> PermissionEventBroker | None:
+    """Раздача событий заявок; None, если Redis не настроен."""
+    settings = get_settings_dependency()
+    redis_conn = get_response_cache().redis_conn
+    if redis_conn is None:
+        return None
+    return PermissionEventBroker(
+        redis_conn=redis_conn,
+        buffer_size=settings.permission_events_buffer_size,
+        max_subscribers=settings.permission_events_max_subscribers,
     )
 
 
@@ -42,3 +127,12 @@ async def close_all_clients():
         access_client = get_access_control_client()
         await access_client.close()
         get_access_control_client.cache_clear()
+
+    # Подписка брокера останавливается в lifespan до закрытия соединения Redis
+    get_permission_event_broker.cache_clear()
+
+    if get_response_cache.cache_info().currsize > 0:
+        response_cache = get_response_cache()
+        if response_cache.redis_conn is not None:
+            await response_cache.redis_conn.close()
+        get_response_cache.cache_clear()
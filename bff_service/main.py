@@ -6,8 +6,18 @@ import httpx
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
 
+from bff_service.services.tracing import configure_tracing, create_exporter, setup_tracing
+from bff_service.services.metrics import REGISTRY, UpstreamStatsCollector, setup_metrics
+from bff_service.services.http_pool import get_all_pool_stats
+from bff_service.services.resilience import get_all_resilience_stats
 from bff_service.routes import permissions, health, resources, accesses, groups, conflicts
-from bff_service.dependencies import close_all_clients, get_settings_dependency
+from bff_service.dependencies import (
+    close_all_clients,
+    get_settings_dependency,
+    get_response_cache,
+    get_permission_event_broker,
+)
+from bff_service.services.response_cache import ResponseCacheInvalidationListener
 
 settings = get_settings_dependency()
 log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
@@ -24,11 +34,35 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+configure_tracing(create_exporter(settings.tracing_exporter, settings.tracing_jsonl_path))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     logger.debug("BFF Service запускается...")
+
+    invalidation_listener = None
+    response_cache = get_response_cache()
+    if response_cache.redis_conn is not None:
+        invalidation_listener = ResponseCacheInvalidationListener(
+            response_cache, response_cache.redis_conn
+        )
+        invalidation_listener.start()
+        logger.debug("Слушатель событий инвалидации кэша ответов запущен")
+
+    permission_event_broker = get_permission_event_broker()
+    if permission_event_broker is not None:
+        permission_event_broker.start()
+        logger.debug("Подписка на события заявок запущена")
+
     yield
+
+    if permission_event_broker is not None:
+        await permission_event_broker.stop()
+
+    if invalidation_listener is not None:
+        await invalidation_listener.stop()
+
     logger.debug("BFF Service завершает работу, закрытие HTTP клиентов...")
     await close_all_clients()
     logger.debug("BFF Service остановлен")
@@ -41,6 +75,10 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+setup_metrics(app)
+setup_tracing(app)
+REGISTRY.register(UpstreamStatsCollector(get_all_pool_stats, get_all_resilience_stats))
+
 
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
@@ -6,6 +6,11 @@ class PermissionType(str, Enum):
     GROUP = "group"
 
 
+class RequestPriority(str, Enum):
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
 class PermissionStatus(str, Enum):
     ACTIVE = "active"
     PENDING = "pending"
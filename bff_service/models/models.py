@@ -1,17 +1,28 @@
 from datetime import datetime
 from pydantic import BaseModel, Field
 
-from bff_service.models.enums import PermissionType, PermissionStatus
+from bff_service.models.enums import PermissionType, PermissionStatus, RequestPriority
+
+# Версия схемы ответов Access Control Service, с которой совпадают модели ниже
+ACCESS_CONTROL_SCHEMA_VERSION = "1"
+SCHEMA_VERSION_HEADER = "X-Schema-Version"
 
 
 class RequestAccessRequest(BaseModel):
     user_id: int = Field(gt=0, description="ID пользователя")
     permission_type: PermissionType = Field(description="Тип права: access или group")
     item_id: int = Field(gt=0, description="ID доступа или группы")
+    priority: RequestPriority = Field(
+        default=RequestPriority.INTERACTIVE,
+        description="Полоса валидации: interactive (одиночные заявки) или bulk (пакетные загрузки)",
+    )
 
 
 class RequestAccessResponse(BaseModel):
-    status: str = Field(default="accepted", description="Статус обработки заявки")
+    status: str = Field(
+        default="accepted",
+        description="accepted — заявка на валидации; при wait=true — итоговый статус (active или rejected)",
+    )
     request_id: str = Field(description="UUID заявки для отслеживания")
 
 
@@ -75,3 +86,51 @@ class Conflict(BaseModel):
 
 class GetConflictsResponse(BaseModel):
     conflicts: list[Conflict] = Field(default_factory=list, description="Список конфликтующих групп")
+
+
+class GetUserResourcesResponse(BaseModel):
+    user_id: int = Field(description="ID пользователя")
+    resources: list[Resource] = Field(default_factory=list, description="Ресурсы, доступные пользователю через активные группы и доступы")
+
+
+class ResourceHolderAccess(BaseModel):
+    access_id: int = Field(description="ID доступа, содержащего ресурс")
+    group_ids: list[int] = Field(default_factory=list, description="ID групп, в которые входит доступ")
+
+
+class ResourceAccessGraph(BaseModel):
+    resource_id: int = Field(description="ID ресурса")
+    accesses: list[ResourceHolderAccess] = Field(default_factory=list, description="Доступы к ресурсу и группы, через которые они выдаются")
+    access_ids: list[int] = Field(default_factory=list, description="ID всех доступов, содержащих ресурс")
+    group_ids: list[int] = Field(default_factory=list, description="ID всех групп, дающих доступ к ресурсу")
+
+
+class PermissionHolders(BaseModel):
+    item_id: int = Field(description="ID группы или доступа")
+    user_ids: list[int] = Field(default_factory=list, description="ID пользователей с активным правом")
+
+
+class GetPermissionHoldersResponse(BaseModel):
+    groups: list[PermissionHolders] = Field(default_factory=list, description="Пользователи по группам")
+    accesses: list[PermissionHolders] = Field(default_factory=list, description="Пользователи по доступам")
+
+
+class ResourceHoldersResponse(ResourceAccessGraph):
+    user_ids: list[int] = Field(default_factory=list, description="ID пользователей, имеющих доступ к ресурсу")
+
+
+class UserDashboardGroup(BaseModel):
+    permission: PermissionResponse = Field(description="Право пользователя на группу")
+    group: Group | None = Field(default=None, description="Группа с доступами и ресурсами (None, если группа не найдена)")
+
+
+class UserDashboardAccess(BaseModel):
+    permission: PermissionResponse = Field(description="Право пользователя на доступ")
+    access: Access | None = Field(default=None, description="Доступ с ресурсами (None, если доступ не найден)")
+
+
+class UserDashboardResponse(BaseModel):
+    user_id: int = Field(description="ID пользователя")
+    groups: list[UserDashboardGroup] = Field(default_factory=list, description="Права на группы с деталями групп")
+    accesses: list[UserDashboardAccess] = Field(default_factory=list, description="Права на доступы с деталями доступов")
+    resources: list[Resource] = Field(default_factory=list, description="Ресурсы, доступные через активные права")
@@ -1,10 +1,11 @@
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from bff_service.models.models import Access
+from bff_service.services.response_cache import ResponseCache, cached_json_response
 from bff_service.services.protocols import AccessControlClientProtocol
-from bff_service.dependencies import get_access_control_client
+from bff_service.dependencies import get_access_control_client, get_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,21 +15,26 @@ router = APIRouter()
 @router.get("", response_model=list[Access])
 async def get_all_accesses(
     access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
-) -> list[Access]:
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     logger.debug("Получен запрос на получение всех доступов")
 
-    response = await access_control_client.get_all_accesses()
-
-    return response
+    return await cached_json_response(
+        response_cache, "accesses", "list", access_control_client.get_all_accesses_raw
+    )
 
 
 @router.get("/{access_id}", response_model=Access)
 async def get_access(
     access_id: int,
     access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
-) -> Access:
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     logger.debug(f"Получен запрос на получение доступа: access_id={access_id}")
 
-    response = await access_control_client.get_access(access_id=access_id)
-
-    return response
+    return await cached_json_response(
+        response_cache,
+        "accesses",
+        f"item:{access_id}",
+        lambda: access_control_client.get_access_raw(access_id=access_id),
+    )
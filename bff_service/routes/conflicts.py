@@ -1,10 +1,11 @@
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from bff_service.models.models import GetConflictsResponse
+from bff_service.services.response_cache import ResponseCache, cached_json_response
 from bff_service.services.protocols import AccessControlClientProtocol
-from bff_service.dependencies import get_access_control_client
+from bff_service.dependencies import get_access_control_client, get_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,9 +15,10 @@ router = APIRouter()
 @router.get("", response_model=GetConflictsResponse)
 async def get_all_conflicts(
     access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
-) -> GetConflictsResponse:
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     logger.debug("Получен запрос на получение всех конфликтов")
 
-    response = await access_control_client.get_conflicts()
-
-    return response
+    return await cached_json_response(
+        response_cache, "conflicts", "list", access_control_client.get_conflicts_raw
+    )
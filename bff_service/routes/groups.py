@@ -1,10 +1,11 @@
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
 from bff_service.models.models import Group
+from bff_service.services.response_cache import ResponseCache, cached_json_response
 from bff_service.services.protocols import AccessControlClientProtocol
-from bff_service.dependencies import get_access_control_client
+from bff_service.dependencies import get_access_control_client, get_response_cache
 
 logger = logging.getLogger(__name__)
 
@@ -14,21 +15,26 @@ router = APIRouter()
 @router.get("", response_model=list[Group])
 async def get_all_groups(
     access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
-) -> list[Group]:
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     logger.debug("Получен запрос на получение всех групп")
 
-    response = await access_control_client.get_all_groups()
-
-    return response
+    return await cached_json_response(
+        response_cache, "groups", "list", access_control_client.get_all_groups_raw
+    )
 
 
 @router.get("/{group_id}", response_model=Group)
 async def get_group(
     group_id: int,
     access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
-) -> Group:
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     logger.debug(f"Получен запрос на получение группы: group_id={group_id}")
 
-    response = await access_control_client.get_group(group_id=group_id)
-
-    return response
+    return await cached_json_response(
+        response_cache,
+        "groups",
+        f"item:{group_id}",
+        lambda: access_control_client.get_group_raw(group_id=group_id),
+    )
@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 from datetime import datetime
 
+from bff_service.services.http_pool import get_all_pool_stats
+from bff_service.services.resilience import get_all_resilience_stats
+
 router = APIRouter()
 
 
@@ -13,6 +16,22 @@ async def health_check():
     }
 
 
+@router.get("/http-pool")
+async def http_pool_stats():
+    return {
+        "service": "bff-service",
+        "pools": get_all_pool_stats()
+    }
+
+
+@router.get("/resilience")
+async def resilience_stats():
+    return {
+        "service": "bff-service",
+        "upstreams": get_all_resilience_stats()
+    }
+
+
 @router.get("/ready")
 async def readiness_check():
 
@@ -1,6 +1,8 @@
 import logging
 
-from fastapi import APIRouter, status, Depends
+from fastapi import APIRouter, HTTPException, Query, Response, status, Depends
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 
 from bff_service.models.models import (
     RequestAccessRequest,
@@ -8,9 +10,28 @@ from bff_service.models.models import (
     RevokePermissionRequest,
     RevokePermissionResponse,
     GetUserPermissionsResponse,
+    GetUserResourcesResponse,
+    UserDashboardResponse,
+)
+from bff_service.config.settings import Settings
+from bff_service.models.enums import PermissionStatus
+from bff_service.services.protocols import (
+    UserServiceClientProtocol,
+    AccessControlClientProtocol,
+    UserDashboardServiceProtocol,
+)
+from bff_service.services.permission_events import (
+    PermissionEventBroker,
+    SubscriberLimitExceeded,
+    stream_frames,
+)
+from bff_service.dependencies import (
+    get_user_service_client,
+    get_access_control_client,
+    get_dashboard_service,
+    get_settings_dependency,
+    get_permission_event_broker,
 )
-from bff_service.services.protocols import UserServiceClientProtocol
-from bff_service.dependencies import get_user_service_client
 
 logger = logging.getLogger(__name__)
 
@@ -20,6 +41,10 @@ router = APIRouter()
 @router.post("/request", response_model=RequestAccessResponse, status_code=status.HTTP_202_ACCEPTED)
 async def request_access(
     request: RequestAccessRequest,
+    http_response: Response,
+    wait: bool = Query(default=False, description="Дождаться результата валидации вместо опроса списка прав"),
+    timeout: float | None = Query(default=None, gt=0, description="Сколько ждать результата, с"),
+    settings: Settings = Depends(get_settings_dependency),
     user_service_client: UserServiceClientProtocol = Depends(get_user_service_client),
 ) -> RequestAccessResponse:
     logger.debug(
@@ -31,11 +56,55 @@ async def request_access(
         user_id=request.user_id,
         permission_type=request.permission_type.value,
         item_id=request.item_id,
+        priority=request.priority.value,
+        wait_timeout=(timeout or settings.request_wait_timeout_seconds) if wait else None,
     )
 
+    # Результат валидации получен — 200 с итоговым статусом; иначе 202, как без wait
+    if response.status != "accepted":
+        http_response.status_code = status.HTTP_200_OK
+
     return response
 
 
+@router.get("/permissions/events", response_class=StreamingResponse)
+async def stream_permission_events(
+    user_id: list[int] = Query(default=[], description="Только события этих пользователей (по умолчанию все)"),
+    settings: Settings = Depends(get_settings_dependency),
+    broker: PermissionEventBroker | None = Depends(get_permission_event_broker),
+) -> StreamingResponse:
+    """Поток смены статусов заявок (text/event-stream) вместо опроса GET /users/{user_id}/permissions.
+
+    События `permission` — pending, active, rejected, revoked; событие `resync` означает, что часть
+    событий пропущена и права нужно перечитать.
+    """
+    logger.debug(f"Подписка на события заявок: users={user_id or 'все'}")
+
+    if broker is None or not broker.running:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Поток событий заявок недоступен: Redis не настроен",
+        )
+
+    try:
+        subscription = broker.subscribe(frozenset(user_id))
+    except SubscriberLimitExceeded as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=str(e))
+
+    return StreamingResponse(
+        stream_frames(
+            subscription,
+            heartbeat=settings.permission_events_heartbeat_seconds,
+            max_duration=settings.permission_events_max_stream_seconds,
+        ),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Выполняется и при отключении клиента
+        background=BackgroundTask(broker.unsubscribe, subscription),
+    )
+
+
 @router.delete("/users/{user_id}/permissions", response_model=RevokePermissionResponse)
 async def revoke_permission(
     user_id: int,
@@ -66,3 +135,45 @@ async def get_user_permissions(
     response = await user_service_client.get_user_permissions(user_id=user_id)
 
     return response
+
+
+@router.get("/users/{user_id}/resources", response_model=GetUserResourcesResponse)
+async def get_user_resources(
+    user_id: int,
+    user_service_client: UserServiceClientProtocol = Depends(get_user_service_client),
+    access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
+) -> GetUserResourcesResponse:
+    logger.debug(f"Получение эффективных ресурсов пользователя: user={user_id}")
+
+    permissions = await user_service_client.get_user_permissions(user_id=user_id)
+
+    group_ids = [
+        permission.item_id
+        for permission in permissions.groups
+        if permission.status == PermissionStatus.ACTIVE.value
+    ]
+    access_ids = [
+        permission.item_id
+        for permission in permissions.accesses
+        if permission.status == PermissionStatus.ACTIVE.value
+    ]
+
+    if not group_ids and not access_ids:
+        return GetUserResourcesResponse(user_id=user_id, resources=[])
+
+    resources = await access_control_client.resolve_effective_resources(
+        group_ids=group_ids, access_ids=access_ids
+    )
+
+    return GetUserResourcesResponse(user_id=user_id, resources=resources)
+
+
+@router.get("/users/{user_id}/dashboard", response_model=UserDashboardResponse)
+async def get_user_dashboard(
+    user_id: int,
+    dashboard_service: UserDashboardServiceProtocol = Depends(get_dashboard_service),
+) -> UserDashboardResponse:
+    """Права пользователя вместе с деталями групп, доступов и доступными ресурсами одним запросом."""
+    logger.debug(f"Получение дашборда пользователя: user={user_id}")
+
+    return await dashboard_service.get_dashboard(user_id)
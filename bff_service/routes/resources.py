@@ -1,10 +1,14 @@
 import logging
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Response
 
-from bff_service.models.models import Resource
-from bff_service.services.protocols import AccessControlClientProtocol
-from bff_service.dependencies import get_access_control_client
+from bff_service.models.models import Resource, ResourceHoldersResponse
+from bff_service.services.response_cache import ResponseCache, cached_json_response
+from bff_service.services.protocols import (
+    AccessControlClientProtocol,
+    UserServiceClientProtocol,
+)
+from bff_service.dependencies import get_access_control_client, get_response_cache, get_user_service_client
 
 logger = logging.getLogger(__name__)
 
@@ -14,21 +18,50 @@ router = APIRouter()
 @router.get("", response_model=list[Resource])
 async def get_all_resources(
     access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
-) -> list[Resource]:
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     logger.debug("Получен запрос на получение всех ресурсов")
 
-    response = await access_control_client.get_all_resources()
-
-    return response
+    return await cached_json_response(
+        response_cache, "resources", "list", access_control_client.get_all_resources_raw
+    )
 
 
 @router.get("/{resource_id}", response_model=Resource)
 async def get_resource(
     resource_id: int,
     access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
-) -> Resource:
+    response_cache: ResponseCache = Depends(get_response_cache),
+) -> Response:
     logger.debug(f"Получен запрос на получение ресурса: resource_id={resource_id}")
 
-    response = await access_control_client.get_resource(resource_id=resource_id)
+    return await cached_json_response(
+        response_cache,
+        "resources",
+        f"item:{resource_id}",
+        lambda: access_control_client.get_resource_raw(resource_id=resource_id),
+    )
+
+
+@router.get("/{resource_id}/holders", response_model=ResourceHoldersResponse)
+async def get_resource_holders(
+    resource_id: int,
+    access_control_client: AccessControlClientProtocol = Depends(get_access_control_client),
+    user_service_client: UserServiceClientProtocol = Depends(get_user_service_client),
+) -> ResourceHoldersResponse:
+    logger.debug(f"Получен запрос на получение держателей ресурса: resource_id={resource_id}")
+
+    graph = await access_control_client.get_resource_access_graph(resource_id)
+    if not graph.access_ids:
+        return ResourceHoldersResponse(**graph.model_dump())
+
+    holders = await user_service_client.get_permission_holders(
+        group_ids=graph.group_ids, access_ids=graph.access_ids
+    )
+    user_ids = {
+        user_id
+        for item in holders.groups + holders.accesses
+        for user_id in item.user_ids
+    }
 
-    return response
+    return ResourceHoldersResponse(**graph.model_dump(), user_ids=sorted(user_ids))
@@ -9,11 +9,18 @@ class AccessClient(BaseHTTPClient[Access]):
         self,
         base_url: str,
         http_client: HTTPClientProtocol,
+        passthrough: bool = True,
     ):
-        super().__init__(base_url, "accesses", http_client)
+        super().__init__(base_url, "accesses", http_client, passthrough=passthrough)
 
     async def get_all(self) -> list[Access]:
         return await self._get_list(Access)
 
     async def get_by_id(self, access_id: int) -> Access:
         return await self._get_one(access_id, Access)
+
+    async def get_all_raw(self) -> bytes:
+        return await self._get_list_raw(Access)
+
+    async def get_by_id_raw(self, access_id: int) -> bytes:
+        return await self._get_one_raw(access_id, Access)
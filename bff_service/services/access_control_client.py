@@ -1,6 +1,13 @@
 import httpx
 
-from bff_service.models.models import Resource, Access, Group, GetConflictsResponse
+from bff_service.models.models import (
+    Resource,
+    Access,
+    Group,
+    GetConflictsResponse,
+    ResourceAccessGraph,
+)
+from bff_service.services.resilience import RETRYABLE_EXTENSION
 from bff_service.services.protocols import (
     HTTPClientProtocol,
     ResourceClientProtocol,
@@ -20,6 +27,7 @@ class AccessControlClient:
         self,
         base_url: str,
         timeout: float = 30.0,
+        passthrough: bool = True,
         http_client: HTTPClientProtocol | None = None,
         resource_client: ResourceClientProtocol | None = None,
         access_client: AccessClientProtocol | None = None,
@@ -37,22 +45,22 @@ class AccessControlClient:
         self._resources: ResourceClientProtocol = (
             resource_client
             if resource_client is not None
-            else ResourceClient(self._base_url, self._client)
+            else ResourceClient(self._base_url, self._client, passthrough=passthrough)
         )
         self._accesses: AccessClientProtocol = (
             access_client
             if access_client is not None
-            else AccessClient(self._base_url, self._client)
+            else AccessClient(self._base_url, self._client, passthrough=passthrough)
         )
         self._groups: GroupClientProtocol = (
             group_client
             if group_client is not None
-            else GroupClient(self._base_url, self._client)
+            else GroupClient(self._base_url, self._client, passthrough=passthrough)
         )
         self._conflicts: ConflictClientProtocol = (
             conflict_client
             if conflict_client is not None
-            else ConflictClient(self._base_url, self._client)
+            else ConflictClient(self._base_url, self._client, passthrough=passthrough)
         )
 
     async def get_all_resources(self) -> list[Resource]:
@@ -76,5 +84,45 @@ class AccessControlClient:
     async def get_conflicts(self) -> GetConflictsResponse:
         return await self._conflicts.get_all()
 
+    async def get_all_resources_raw(self) -> bytes:
+        return await self._resources.get_all_raw()
+
+    async def get_resource_raw(self, resource_id: int) -> bytes:
+        return await self._resources.get_by_id_raw(resource_id)
+
+    async def get_all_accesses_raw(self) -> bytes:
+        return await self._accesses.get_all_raw()
+
+    async def get_access_raw(self, access_id: int) -> bytes:
+        return await self._accesses.get_by_id_raw(access_id)
+
+    async def get_all_groups_raw(self) -> bytes:
+        return await self._groups.get_all_raw()
+
+    async def get_group_raw(self, group_id: int) -> bytes:
+        return await self._groups.get_by_id_raw(group_id)
+
+    async def get_conflicts_raw(self) -> bytes:
+        return await self._conflicts.get_all_raw()
+
+    async def resolve_effective_resources(
+        self, group_ids: list[int], access_ids: list[int]
+    ) -> list[Resource]:
+
+        response = await self._client.post(
+            "/resources/effective",
+            json={"group_ids": group_ids, "access_ids": access_ids},
+            extensions={RETRYABLE_EXTENSION: True},
+        )
+        response.raise_for_status()
+        result = response.json()
+        return [Resource.model_validate(item) for item in result.get("resources", [])]
+
+    async def get_resource_access_graph(self, resource_id: int) -> ResourceAccessGraph:
+
+        response = await self._client.get(f"/resources/{resource_id}/holders")
+        response.raise_for_status()
+        return ResourceAccessGraph.model_validate(response.json())
+
     async def close(self):
         await self._client.aclose()
@@ -1,6 +1,11 @@
+import logging
 from typing import TypeVar, Generic
 
+from bff_service.models.models import ACCESS_CONTROL_SCHEMA_VERSION, SCHEMA_VERSION_HEADER
 from bff_service.services.protocols import HTTPClientProtocol
+from bff_service.services.serialization import serialize_json
+
+logger = logging.getLogger(__name__)
 
 T = TypeVar("T")
 
@@ -12,10 +17,14 @@ class BaseHTTPClient(Generic[T]):
         base_url: str,
         endpoint_prefix: str,
         http_client: HTTPClientProtocol,
+        passthrough: bool = True,
+        schema_version: str = ACCESS_CONTROL_SCHEMA_VERSION,
     ):
         self._base_url = base_url.rstrip("/")
         self._endpoint_prefix = endpoint_prefix
         self._client = http_client
+        self._passthrough = passthrough
+        self._schema_version = schema_version
 
     async def _get_list(self, model_class: type[T]) -> list[T]:
         url = f"/{self._endpoint_prefix}"
@@ -32,3 +41,28 @@ class BaseHTTPClient(Generic[T]):
         response.raise_for_status()
         result = response.json()
         return model_class.model_validate(result)
+
+    async def _get_list_raw(self, model_class: type[T]) -> bytes:
+        return await self._get_raw(f"/{self._endpoint_prefix}", model_class, many=True)
+
+    async def _get_one_raw(self, entity_id: int, model_class: type[T]) -> bytes:
+        return await self._get_raw(f"/{self._endpoint_prefix}/{entity_id}", model_class, many=False)
+
+    async def _get_raw(self, url: str, model_class: type[T], many: bool) -> bytes:
+        """Тело ответа как есть, если версия схемы совпадает; иначе валидация и пересериализация."""
+
+        response = await self._client.get(url)
+        response.raise_for_status()
+
+        if self._passthrough and response.headers.get(SCHEMA_VERSION_HEADER) == self._schema_version:
+            return response.content
+
+        logger.debug(
+            f"Версия схемы ответа {url} не совпадает с ожидаемой "
+            f"({response.headers.get(SCHEMA_VERSION_HEADER)} != {self._schema_version}), "
+            "ответ валидируется"
+        )
+        result = response.json()
+        if many:
+            return serialize_json([model_class.model_validate(item) for item in result])
+        return serialize_json(model_class.model_validate(result))
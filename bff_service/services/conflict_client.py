@@ -9,8 +9,9 @@ class ConflictClient(BaseHTTPClient[GetConflictsResponse]):
         self,
         base_url: str,
         http_client: HTTPClientProtocol,
+        passthrough: bool = True,
     ):
-        super().__init__(base_url, "conflicts", http_client)
+        super().__init__(base_url, "conflicts", http_client, passthrough=passthrough)
 
     async def get_all(self) -> GetConflictsResponse:
         url = f"/{self._endpoint_prefix}"
@@ -19,3 +20,6 @@ class ConflictClient(BaseHTTPClient[GetConflictsResponse]):
         response.raise_for_status()
         result = response.json()
         return GetConflictsResponse.model_validate(result)
+
+    async def get_all_raw(self) -> bytes:
+        return await self._get_raw(f"/{self._endpoint_prefix}", GetConflictsResponse, many=False)
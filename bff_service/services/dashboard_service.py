@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Awaitable, Callable, TypeVar
+
+import httpx
+
+from bff_service.models.enums import PermissionStatus
+from bff_service.models.models import (
+    Access,
+    Group,
+    Resource,
+    UserDashboardAccess,
+    UserDashboardGroup,
+    UserDashboardResponse,
+)
+from bff_service.services.protocols import (
+    AccessControlClientProtocol,
+    UserServiceClientProtocol,
+)
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class UserDashboardService:
+
+    def __init__(
+        self,
+        user_service_client: UserServiceClientProtocol,
+        access_control_client: AccessControlClientProtocol,
+        max_concurrency: int = 10,
+    ):
+        self._user_service_client = user_service_client
+        self._access_control_client = access_control_client
+        self._max_concurrency = max_concurrency
+
+    async def get_dashboard(self, user_id: int) -> UserDashboardResponse:
+
+        permissions = await self._user_service_client.get_user_permissions(user_id=user_id)
+
+        group_ids = list(dict.fromkeys(permission.item_id for permission in permissions.groups))
+        access_ids = list(dict.fromkeys(permission.item_id for permission in permissions.accesses))
+
+        active_group_ids = [
+            permission.item_id
+            for permission in permissions.groups
+            if permission.status == PermissionStatus.ACTIVE.value
+        ]
+        active_access_ids = [
+            permission.item_id
+            for permission in permissions.accesses
+            if permission.status == PermissionStatus.ACTIVE.value
+        ]
+
+        # Один семафор на весь запрос: ограничивает число одновременных обращений к Access Control
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+
+        groups_task = asyncio.gather(
+            *(
+                self._fetch(semaphore, lambda group_id=group_id: self._access_control_client.get_group(group_id))
+                for group_id in group_ids
+            )
+        )
+        accesses_task = asyncio.gather(
+            *(
+                self._fetch(semaphore, lambda access_id=access_id: self._access_control_client.get_access(access_id))
+                for access_id in access_ids
+            )
+        )
+        resources_task = self._resolve_resources(semaphore, active_group_ids, active_access_ids)
+
+        groups, accesses, resources = await asyncio.gather(
+            groups_task, accesses_task, resources_task
+        )
+
+        groups_by_id: dict[int, Group | None] = dict(zip(group_ids, groups))
+        accesses_by_id: dict[int, Access | None] = dict(zip(access_ids, accesses))
+
+        logger.debug(
+            f"Дашборд пользователя {user_id}: {len(group_ids)} групп, "
+            f"{len(access_ids)} доступов, {len(resources)} ресурсов"
+        )
+
+        return UserDashboardResponse(
+            user_id=user_id,
+            groups=[
+                UserDashboardGroup(permission=permission, group=groups_by_id.get(permission.item_id))
+                for permission in permissions.groups
+            ],
+            accesses=[
+                UserDashboardAccess(permission=permission, access=accesses_by_id.get(permission.item_id))
+                for permission in permissions.accesses
+            ],
+            resources=resources,
+        )
+
+    async def _resolve_resources(
+        self,
+        semaphore: asyncio.Semaphore,
+        group_ids: list[int],
+        access_ids: list[int],
+    ) -> list[Resource]:
+
+        if not group_ids and not access_ids:
+            return []
+
+        async with semaphore:
+            return await self._access_control_client.resolve_effective_resources(
+                group_ids=group_ids, access_ids=access_ids
+            )
+
+    async def _fetch(
+        self,
+        semaphore: asyncio.Semaphore,
+        loader: Callable[[], Awaitable[T]],
+    ) -> T | None:
+
+        async with semaphore:
+            try:
+                return await loader()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code in (400, 404):
+                    # Группа/доступ удалены в Access Control, право в User Service осталось
+                    logger.debug(f"Объект для дашборда не найден: {e.request.url}")
+                    return None
+                raise
@@ -9,11 +9,18 @@ class GroupClient(BaseHTTPClient[Group]):
         self,
         base_url: str,
         http_client: HTTPClientProtocol,
+        passthrough: bool = True,
     ):
-        super().__init__(base_url, "groups", http_client)
+        super().__init__(base_url, "groups", http_client, passthrough=passthrough)
 
     async def get_all(self) -> list[Group]:
         return await self._get_list(Group)
 
     async def get_by_id(self, group_id: int) -> Group:
         return await self._get_one(group_id, Group)
+
+    async def get_all_raw(self) -> bytes:
+        return await self._get_list_raw(Group)
+
+    async def get_by_id_raw(self, group_id: int) -> bytes:
+        return await self._get_one_raw(group_id, Group)
@@ -0,0 +1,245 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import defaultdict
+from typing import AsyncIterator
+
+import redis.asyncio as redis
+
+from bff_service.services.metrics import (
+    record_permission_event,
+    record_permission_event_overflow,
+    set_permission_event_subscribers,
+)
+
+logger = logging.getLogger(__name__)
+
+# Канал User Service со сменой статуса заявок (pending -> active/rejected/revoked).
+# Событие: {"request_id", "user_id", "permission_type", "item_id", "status"}.
+PERMISSION_EVENTS_CHANNEL = "permissions:events"
+
+# Клиент пропустил события (переполнен буфер или прервалась подписка на Redis):
+# состояние нужно перечитать через GET /users/{user_id}/permissions
+RESYNC_FRAME = b"event: resync\ndata: {}\n\n"
+HEARTBEAT_FRAME = b": keepalive\n\n"
+# Задержка переподключения EventSource после закрытия потока, мс
+RETRY_FRAME = b"retry: 1000\n\n"
+
+
+def format_event_frame(data: str) -> bytes:
+    return f"event: permission\ndata: {data}\n\n".encode()
+
+
+class SubscriberLimitExceeded(Exception):
+    pass
+
+
+class PermissionEventSubscription:
+    """Ограниченный буфер кадров одного клиента.
+
+    Медленный клиент не задерживает остальных: при переполнении буфер очищается и вместо
+    пропущенных событий клиент получает одно событие resync.
+    """
+
+    def __init__(self, user_ids: frozenset[int], buffer_size: int):
+        self.user_ids = user_ids
+        self._queue: asyncio.Queue[bytes | None] = asyncio.Queue(maxsize=max(buffer_size, 1))
+        self._closed = False
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def offer(self, frame: bytes) -> bool:
+        """Ставит кадр в буфер без ожидания; False — буфер был переполнен и сброшен."""
+
+        if self._closed:
+            return True
+        try:
+            self._queue.put_nowait(frame)
+            return True
+        except asyncio.QueueFull:
+            self._reset(RESYNC_FRAME)
+            return False
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._reset(None)
+
+    async def next_frame(self, timeout: float) -> bytes | None:
+        """Следующий кадр, HEARTBEAT_FRAME по таймауту или None после close()."""
+
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None if self._closed else HEARTBEAT_FRAME
+
+    def _reset(self, frame: bytes | None) -> None:
+
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        self._queue.put_nowait(frame)
+
+
+class PermissionEventBroker:
+    """Одна подписка на Redis-канал на процесс BFF и раздача событий SSE-клиентам.
+
+    Событие кодируется в кадр один раз и попадает только в буферы подписчиков его user_id
+    и подписчиков без фильтра.
+    """
+
+    def __init__(
+        self,
+        redis_conn: redis.Redis,
+        buffer_size: int = 100,
+        max_subscribers: int = 5000,
+        reconnect_delay: float = 1.0,
+    ):
+        self._redis_conn = redis_conn
+        self._buffer_size = buffer_size
+        self._max_subscribers = max_subscribers
+        self._reconnect_delay = reconnect_delay
+        self._by_user: dict[int, set[PermissionEventSubscription]] = defaultdict(set)
+        self._unfiltered: set[PermissionEventSubscription] = set()
+        self._subscriptions: set[PermissionEventSubscription] = set()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None
+
+    @property
+    def subscribers(self) -> int:
+        return len(self._subscriptions)
+
+    def subscribe(self, user_ids: frozenset[int] = frozenset()) -> PermissionEventSubscription:
+        """Подписка на события пользователей user_ids (пустое множество — на все события)."""
+
+        if len(self._subscriptions) >= self._max_subscribers:
+            raise SubscriberLimitExceeded(f"Достигнут лимит подписчиков: {self._max_subscribers}")
+
+        subscription = PermissionEventSubscription(user_ids, self._buffer_size)
+        if user_ids:
+            for user_id in user_ids:
+                self._by_user[user_id].add(subscription)
+        else:
+            self._unfiltered.add(subscription)
+        self._subscriptions.add(subscription)
+        set_permission_event_subscribers(len(self._subscriptions))
+        return subscription
+
+    def unsubscribe(self, subscription: PermissionEventSubscription) -> None:
+
+        subscription.close()
+        if subscription not in self._subscriptions:
+            return
+
+        self._subscriptions.discard(subscription)
+        self._unfiltered.discard(subscription)
+        for user_id in subscription.user_ids:
+            subscribers = self._by_user.get(user_id)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._by_user[user_id]
+        set_permission_event_subscribers(len(self._subscriptions))
+
+    def publish(self, data: str) -> int:
+        """Раздает событие (JSON из канала) подписчикам; возвращает число получателей."""
+
+        try:
+            user_id = int(json.loads(data)["user_id"])
+        except (ValueError, TypeError, KeyError) as e:
+            logger.warning(f"Некорректное событие заявки: {e}")
+            return 0
+
+        receivers = list(self._unfiltered)
+        receivers.extend(self._by_user.get(user_id, ()))
+        if not receivers:
+            return 0
+
+        frame = format_event_frame(data)
+        overflows = sum(1 for subscription in receivers if not subscription.offer(frame))
+        record_permission_event(len(receivers))
+        if overflows:
+            record_permission_event_overflow(overflows)
+            logger.debug(f"Буфер {overflows} подписчиков переполнен, отправлено событие resync")
+        return len(receivers)
+
+    def _broadcast_resync(self) -> None:
+        for subscription in self._subscriptions:
+            subscription.offer(RESYNC_FRAME)
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+
+        # Открытые потоки завершаются, клиенты переподключаются к другой реплике
+        for subscription in list(self._subscriptions):
+            self.unsubscribe(subscription)
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+
+        subscribed_before = False
+        while True:
+            pubsub = self._redis_conn.pubsub()
+            try:
+                await pubsub.subscribe(PERMISSION_EVENTS_CHANNEL)
+                # Пока подписки не было, события могли быть пропущены
+                if subscribed_before:
+                    self._broadcast_resync()
+                subscribed_before = True
+                logger.debug(f"Подписка на канал {PERMISSION_EVENTS_CHANNEL} установлена")
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message" or not self._subscriptions:
+                        continue
+                    data = message["data"]
+                    self.publish(data.decode() if isinstance(data, bytes) else data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Подписка на события заявок прервана: {e}, повтор через {self._reconnect_delay}с"
+                )
+                await asyncio.sleep(self._reconnect_delay)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
+
+
+async def stream_frames(
+    subscription: PermissionEventSubscription,
+    heartbeat: float,
+    max_duration: float,
+) -> AsyncIterator[bytes]:
+    """Кадры text/event-stream до закрытия подписки или истечения max_duration."""
+
+    deadline = time.monotonic() + max_duration
+    yield RETRY_FRAME
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        frame = await subscription.next_frame(min(heartbeat, remaining))
+        if frame is None:
+            return
+        yield frame
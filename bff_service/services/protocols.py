@@ -8,6 +8,9 @@ from bff_service.models.models import (
     RequestAccessResponse,
     RevokePermissionResponse,
     GetUserPermissionsResponse,
+    ResourceAccessGraph,
+    GetPermissionHoldersResponse,
+    UserDashboardResponse,
 )
 
 
@@ -29,7 +32,12 @@ class HTTPClientProtocol(Protocol):
 class UserServiceClientProtocol(Protocol):
 
     async def request_access(
-        self, user_id: int, permission_type: str, item_id: int
+        self,
+        user_id: int,
+        permission_type: str,
+        item_id: int,
+        priority: str = "interactive",
+        wait_timeout: float | None = None,
     ) -> RequestAccessResponse:
         ...
 
@@ -41,6 +49,11 @@ class UserServiceClientProtocol(Protocol):
     async def get_user_permissions(self, user_id: int) -> GetUserPermissionsResponse:
         ...
 
+    async def get_permission_holders(
+        self, group_ids: list[int], access_ids: list[int]
+    ) -> GetPermissionHoldersResponse:
+        ...
+
     async def close(self) -> None:
         ...
 
@@ -53,6 +66,12 @@ class ResourceClientProtocol(Protocol):
     async def get_by_id(self, resource_id: int) -> Resource:
         ...
 
+    async def get_all_raw(self) -> bytes:
+        ...
+
+    async def get_by_id_raw(self, resource_id: int) -> bytes:
+        ...
+
 
 class AccessClientProtocol(Protocol):
 
@@ -62,6 +81,12 @@ class AccessClientProtocol(Protocol):
     async def get_by_id(self, access_id: int) -> Access:
         ...
 
+    async def get_all_raw(self) -> bytes:
+        ...
+
+    async def get_by_id_raw(self, access_id: int) -> bytes:
+        ...
+
 
 class GroupClientProtocol(Protocol):
 
@@ -71,12 +96,21 @@ class GroupClientProtocol(Protocol):
     async def get_by_id(self, group_id: int) -> Group:
         ...
 
+    async def get_all_raw(self) -> bytes:
+        ...
+
+    async def get_by_id_raw(self, group_id: int) -> bytes:
+        ...
+
 
 class ConflictClientProtocol(Protocol):
 
     async def get_all(self) -> GetConflictsResponse:
         ...
 
+    async def get_all_raw(self) -> bytes:
+        ...
+
 
 class AccessControlClientProtocol(Protocol):
 
@@ -101,5 +135,40 @@ class AccessControlClientProtocol(Protocol):
     async def get_conflicts(self) -> GetConflictsResponse:
         ...
 
+    async def get_all_resources_raw(self) -> bytes:
+        ...
+
+    async def get_resource_raw(self, resource_id: int) -> bytes:
+        ...
+
+    async def get_all_accesses_raw(self) -> bytes:
+        ...
+
+    async def get_access_raw(self, access_id: int) -> bytes:
+        ...
+
+    async def get_all_groups_raw(self) -> bytes:
+        ...
+
+    async def get_group_raw(self, group_id: int) -> bytes:
+        ...
+
+    async def get_conflicts_raw(self) -> bytes:
+        ...
+
+    async def resolve_effective_resources(
+        self, group_ids: list[int], access_ids: list[int]
+    ) -> list[Resource]:
+        ...
+
+    async def get_resource_access_graph(self, resource_id: int) -> ResourceAccessGraph:
+        ...
+
     async def close(self) -> None:
         ...
+
+
+class UserDashboardServiceProtocol(Protocol):
+
+    async def get_dashboard(self, user_id: int) -> UserDashboardResponse:
+        ...
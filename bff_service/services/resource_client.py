@@ -9,11 +9,18 @@ class ResourceClient(BaseHTTPClient[Resource]):
         self,
         base_url: str,
         http_client: HTTPClientProtocol,
+        passthrough: bool = True,
     ):
-        super().__init__(base_url, "resources", http_client)
+        super().__init__(base_url, "resources", http_client, passthrough=passthrough)
 
     async def get_all(self) -> list[Resource]:
         return await self._get_list(Resource)
 
     async def get_by_id(self, resource_id: int) -> Resource:
         return await self._get_one(resource_id, Resource)
+
+    async def get_all_raw(self) -> bytes:
+        return await self._get_list_raw(Resource)
+
+    async def get_by_id_raw(self, resource_id: int) -> bytes:
+        return await self._get_one_raw(resource_id, Resource)
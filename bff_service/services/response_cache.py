@@ -0,0 +1,274 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Iterable
+
+import redis.asyncio as redis
+from fastapi import Response
+
+from bff_service.services.metrics import record_cache_lookup
+from bff_service.services.serialization import serialize_json
+
+logger = logging.getLogger(__name__)
+
+# Канал, в который Access Control Service публикует события инвалидации после admin-операций
+CACHE_INVALIDATION_CHANNEL = "access_control:invalidations"
+
+REDIS_KEY_PREFIX = "bff:response"
+# Поколение семейства в Redis: растет при каждой инвалидации (вне шаблона ключей ответов)
+REDIS_GENERATION_PREFIX = "bff:response_generation"
+
+# Поколение семейства, прочитанное до загрузки данных: (в памяти процесса, в Redis)
+CacheGeneration = tuple[int, int | None]
+
+
+class ResponseCache:
+    """Кэш готовых JSON-ответов: LRU в памяти процесса и опционально общий Redis.
+
+    Ответ, загруженный до инвалидации, не должен попасть в кэш после нее: перед загрузкой
+    читается поколение семейства, и set() пропускает запись, если оно успело измениться.
+    Без Redis события инвалидации не приходят, поэтому время жизни в памяти ограничено
+    local_only_ttl_seconds.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 60.0,
+        redis_conn: redis.Redis | None = None,
+        local_only_ttl_seconds: float = 1.0,
+    ):
+        self._max_entries = max_entries
+        self._ttl_seconds = ttl_seconds
+        self._local_ttl_seconds = (
+            ttl_seconds if redis_conn is not None else min(ttl_seconds, local_only_ttl_seconds)
+        )
+        self._redis_conn = redis_conn
+        self._entries: OrderedDict[tuple[str, str], tuple[float, bytes]] = OrderedDict()
+        # Номер последней инвалидации: по семействам и общей очистки (clear_local)
+        self._invalidations = 0
+        self._family_invalidated: dict[str, int] = {}
+        self._cleared = 0
+
+    @property
+    def redis_conn(self) -> redis.Redis | None:
+        return self._redis_conn
+
+    def _redis_key(self, family: str, key: str) -> str:
+        return f"{REDIS_KEY_PREFIX}:{family}:{key}"
+
+    def _generation_key(self, family: str) -> str:
+        return f"{REDIS_GENERATION_PREFIX}:{family}"
+
+    def _local_generation(self, family: str) -> int:
+        return max(self._family_invalidated.get(family, 0), self._cleared)
+
+    async def generation(self, family: str) -> CacheGeneration:
+        """Поколение семейства; читается до загрузки данных и передается в set()."""
+
+        if self._redis_conn is None:
+            return self._local_generation(family), None
+
+        try:
+            remote = await self._redis_conn.get(self._generation_key(family))
+        except redis.RedisError as e:
+            logger.warning(f"Ошибка чтения поколения кэша ответов из Redis: {e}")
+            remote = None
+        else:
+            remote = int(remote or 0)
+        return self._local_generation(family), remote
+
+    async def get(self, family: str, key: str) -> bytes | None:
+
+        entry = self._entries.get((family, key))
+        if entry is not None:
+            expires_at, body = entry
+            if expires_at > time.monotonic():
+                self._entries.move_to_end((family, key))
+                record_cache_lookup(family, hit=True)
+                return body
+            del self._entries[(family, key)]
+
+        if self._redis_conn is None:
+            record_cache_lookup(family, hit=False)
+            return None
+
+        try:
+            body = await self._redis_conn.get(self._redis_key(family, key))
+        except redis.RedisError as e:
+            logger.warning(f"Ошибка чтения кэша ответов из Redis: {e}")
+            record_cache_lookup(family, hit=False)
+            return None
+
+        record_cache_lookup(family, hit=body is not None)
+        if body is not None:
+            self._store_local(family, key, body)
+        return body
+
+    async def set(
+        self,
+        family: str,
+        key: str,
+        body: bytes,
+        generation: CacheGeneration | None = None,
+    ) -> None:
+
+        if generation is not None and generation[0] != self._local_generation(family):
+            logger.debug(f"Ответ {family}:{key} загружен до инвалидации, в кэш не записан")
+            return
+
+        self._store_local(family, key, body)
+
+        if self._redis_conn is None:
+            return
+
+        try:
+            if generation is None:
+                await self._redis_conn.setex(
+                    self._redis_key(family, key), max(int(self._ttl_seconds), 1), body
+                )
+                return
+            if generation[1] is None:
+                return
+
+            # Запись в Redis и проверка поколения атомарны: инвалидация другой реплики
+            # между ними прерывает транзакцию
+            async with self._redis_conn.pipeline(transaction=True) as pipe:
+                await pipe.watch(self._generation_key(family))
+                if int(await pipe.get(self._generation_key(family)) or 0) != generation[1]:
+                    logger.debug(f"Ответ {family}:{key} загружен до инвалидации, в Redis не записан")
+                    return
+                pipe.multi()
+                pipe.setex(self._redis_key(family, key), max(int(self._ttl_seconds), 1), body)
+                await pipe.execute()
+        except redis.WatchError:
+            logger.debug(f"Ответ {family}:{key} загружен до инвалидации, в Redis не записан")
+        except redis.RedisError as e:
+            logger.warning(f"Ошибка записи кэша ответов в Redis: {e}")
+
+    async def invalidate(self, families: Iterable[str]) -> None:
+
+        families = set(families)
+        self._invalidations += 1
+        for family in families:
+            self._family_invalidated[family] = self._invalidations
+        for entry_key in [entry_key for entry_key in self._entries if entry_key[0] in families]:
+            del self._entries[entry_key]
+
+        if self._redis_conn is not None:
+            try:
+                for family in families:
+                    # Поколение растет до удаления ключей: запись, начатая до инвалидации,
+                    # либо будет удалена ниже, либо увидит новое поколение и не выполнится
+                    await self._redis_conn.incr(self._generation_key(family))
+                    keys = [
+                        key
+                        async for key in self._redis_conn.scan_iter(
+                            match=f"{REDIS_KEY_PREFIX}:{family}:*"
+                        )
+                    ]
+                    if keys:
+                        await self._redis_conn.delete(*keys)
+            except redis.RedisError as e:
+                logger.warning(f"Ошибка инвалидации кэша ответов в Redis: {e}")
+
+        logger.debug(f"Кэш ответов инвалидирован для семейств: {sorted(families)}")
+
+    def clear_local(self) -> None:
+        self._invalidations += 1
+        self._cleared = self._invalidations
+        self._entries.clear()
+
+    def _store_local(self, family: str, key: str, body: bytes) -> None:
+
+        self._entries[(family, key)] = (time.monotonic() + self._local_ttl_seconds, body)
+        self._entries.move_to_end((family, key))
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+
+
+async def cached_json_response(
+    cache: ResponseCache,
+    family: str,
+    key: str,
+    loader: Callable[[], Awaitable[Any]],
+) -> Response:
+
+    body = await cache.get(family, key)
+    if body is None:
+        generation = await cache.generation(family)
+        data = await loader()
+        body = data if isinstance(data, bytes) else serialize_json(data)
+        await cache.set(family, key, body, generation)
+    else:
+        logger.debug(f"Кэш hit для ответа {family}:{key}")
+
+    return Response(content=body, media_type="application/json")
+
+
+class ResponseCacheInvalidationListener:
+    """Подписка на события инвалидации Access Control Service через Redis pub/sub."""
+
+    def __init__(
+        self,
+        cache: ResponseCache,
+        redis_conn: redis.Redis,
+        reconnect_delay: float = 1.0,
+    ):
+        self._cache = cache
+        self._redis_conn = redis_conn
+        self._reconnect_delay = reconnect_delay
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+
+        while True:
+            pubsub = self._redis_conn.pubsub()
+            try:
+                await pubsub.subscribe(CACHE_INVALIDATION_CHANNEL)
+                # Пока подписки не было, события могли быть пропущены
+                self._cache.clear_local()
+                logger.debug(f"Подписка на канал {CACHE_INVALIDATION_CHANNEL} установлена")
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message":
+                        continue
+                    try:
+                        families = json.loads(message["data"]).get("families", [])
+                    except (ValueError, AttributeError) as e:
+                        logger.warning(f"Некорректное событие инвалидации: {e}")
+                        continue
+                    await self._cache.invalidate(families)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Подписка на события инвалидации прервана: {e}, "
+                    f"повтор через {self._reconnect_delay}с"
+                )
+                self._cache.clear_local()
+                await asyncio.sleep(self._reconnect_delay)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
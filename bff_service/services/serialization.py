@@ -0,0 +1,15 @@
+import json
+from typing import Any
+
+from fastapi.encoders import jsonable_encoder
+
+
+def serialize_json(data: Any) -> bytes:
+    # Те же параметры сериализации, что и у fastapi.responses.JSONResponse
+    return json.dumps(
+        jsonable_encoder(data),
+        ensure_ascii=False,
+        allow_nan=False,
+        indent=None,
+        separators=(",", ":"),
+    ).encode("utf-8")
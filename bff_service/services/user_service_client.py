@@ -1,8 +1,14 @@
 import logging
 import httpx
 
-from bff_service.models.models import RequestAccessResponse, RevokePermissionResponse, GetUserPermissionsResponse
+from bff_service.models.models import (
+    RequestAccessResponse,
+    RevokePermissionResponse,
+    GetUserPermissionsResponse,
+    GetPermissionHoldersResponse,
+)
 from bff_service.services.protocols import HTTPClientProtocol
+from bff_service.services.resilience import LONG_POLL_EXTENSION, RETRYABLE_EXTENSION
 
 logger = logging.getLogger(__name__)
 
@@ -24,19 +30,35 @@ class UserServiceClient:
         )
 
     async def request_access(
-        self, user_id: int, permission_type: str, item_id: int
+        self,
+        user_id: int,
+        permission_type: str,
+        item_id: int,
+        priority: str = "interactive",
+        wait_timeout: float | None = None,
     ) -> RequestAccessResponse:
+        """wait_timeout — дождаться результата валидации (POST /request?wait=true) не дольше заданного."""
 
         url = "/request"
         payload = {
             "user_id": user_id,
             "permission_type": permission_type,
             "item_id": item_id,
+            "priority": priority,
         }
 
         logger.debug(f"Отправка запроса в User Service: POST {url} с данными {payload}")
 
-        response = await self._client.post(url, json=payload)
+        if wait_timeout is None:
+            response = await self._client.post(url, json=payload)
+        else:
+            response = await self._client.post(
+                url,
+                json=payload,
+                params={"wait": "true", "timeout": wait_timeout},
+                timeout=self._timeout + wait_timeout,
+                extensions={LONG_POLL_EXTENSION: True},
+            )
         response.raise_for_status()
         result = response.json()
         logger.debug(f"Получен ответ от User Service: {result}")
@@ -72,5 +94,20 @@ class UserServiceClient:
         logger.debug(f"Получен ответ от User Service: {result}")
         return GetUserPermissionsResponse.model_validate(result)
 
+    async def get_permission_holders(
+        self, group_ids: list[int], access_ids: list[int]
+    ) -> GetPermissionHoldersResponse:
+
+        url = "/permissions/holders"
+        payload = {"group_ids": group_ids, "access_ids": access_ids}
+
+        logger.debug(f"Отправка запроса в User Service: POST {url} с данными {payload}")
+
+        response = await self._client.post(
+            url, json=payload, extensions={RETRYABLE_EXTENSION: True}
+        )
+        response.raise_for_status()
+        return GetPermissionHoldersResponse.model_validate(response.json())
+
     async def close(self):
         await self._client.aclose()
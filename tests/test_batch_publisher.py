@@ -0,0 +1,70 @@
+import asyncio
+import time
+
+import aio_pika
+import pytest
+
+from user_service.services import batch_publisher as user_batch_publisher
+from validation_service.rabbitmq.in_memory import InMemoryChannel
+from validation_service.rabbitmq.publishers import batch_publisher as validation_batch_publisher
+
+BATCH_PUBLISHER_MODULES = [validation_batch_publisher, user_batch_publisher]
+
+
+class SlowConfirmExchange:
+    """Exchange с задержкой подтверждения брокера."""
+
+    def __init__(self, confirm_delay: float):
+        self.confirm_delay = confirm_delay
+        self.published = 0
+
+    async def publish(self, message: aio_pika.Message, routing_key: str) -> None:
+        self.published += 1
+        await asyncio.sleep(self.confirm_delay)
+
+
+class SlowConfirmChannel:
+
+    def __init__(self, confirm_delay: float):
+        self.default_exchange = SlowConfirmExchange(confirm_delay)
+
+
+@pytest.mark.parametrize("module", BATCH_PUBLISHER_MODULES)
+def test_single_publisher_does_not_wait_for_flush_timer(module):
+
+    async def scenario():
+        channel = InMemoryChannel()
+        publisher = module.BatchPublisher("results", channel, flush_interval=0.5)
+
+        started = time.perf_counter()
+        for i in range(10):
+            await publisher.publish(aio_pika.Message(str(i).encode()), routing_key="result_queue")
+        elapsed = time.perf_counter() - started
+
+        assert elapsed < 0.5
+        assert publisher.batches == 10
+        assert channel.get_queue("result_queue").qsize() == 10
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("module", BATCH_PUBLISHER_MODULES)
+def test_concurrent_publishers_coalesce_while_batch_in_flight(module):
+
+    async def scenario():
+        channel = SlowConfirmChannel(confirm_delay=0.02)
+        publisher = module.BatchPublisher("results", channel, flush_interval=0.5)
+
+        started = time.perf_counter()
+        await asyncio.gather(
+            *(publisher.publish(aio_pika.Message(b"{}"), routing_key="result_queue") for _ in range(50))
+        )
+        elapsed = time.perf_counter() - started
+
+        # Первое сообщение уходит сразу, остальные — одной пачкой по его подтверждению
+        assert publisher.batches == 2
+        assert publisher.confirmed == 50
+        assert channel.default_exchange.published == 50
+        assert elapsed < 0.5
+
+    asyncio.run(scenario())
@@ -0,0 +1,130 @@
+import asyncio
+from pathlib import Path
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from benchmarks.runner import BenchmarkRunner, RunConfig
+from benchmarks.seed import Catalog
+from benchmarks.stats import LatencyStats, percentile
+from benchmarks.workload import Operation, WorkloadMix, load_workload
+
+WORKLOADS_DIR = Path(__file__).resolve().parent.parent / "benchmarks" / "workloads"
+
+
+def test_percentile_uses_nearest_rank():
+
+    ordered = [float(i) for i in range(1, 101)]
+
+    assert percentile(ordered, 0.5) == 50.0
+    assert percentile(ordered, 0.99) == 99.0
+    assert percentile(ordered, 1.0) == 100.0
+    assert percentile([0.3], 0.95) == 0.3
+    assert percentile([], 0.5) == 0.0
+
+
+def test_latency_stats_counts_errors_and_transport_failures():
+
+    stats = LatencyStats()
+    for latency, status_code in [(0.01, 200), (0.02, 201), (0.03, 503), (0.04, None)]:
+        stats.observe(latency, status_code)
+
+    summary = stats.summary(elapsed=2.0)
+    assert summary["count"] == 4
+    assert summary["errors"] == 2
+    assert summary["throughput_rps"] == 2.0
+    assert summary["mean_ms"] == 25.0
+    assert summary["p50_ms"] == 20.0
+    assert summary["max_ms"] == 40.0
+    assert summary["status_codes"] == {"200": 1, "201": 1, "503": 1, "transport_error": 1}
+
+
+@pytest.mark.parametrize("name", ["mixed.jsonl", "requests_only.jsonl"])
+def test_shipped_workloads_parse(name):
+
+    operations = load_workload(str(WORKLOADS_DIR / name))
+
+    assert operations
+    assert all(operation.weight > 0 for operation in operations)
+
+
+def test_load_workload_skips_comments_and_reports_bad_line(tmp_path):
+
+    path = tmp_path / "workload.jsonl"
+    path.write_text(
+        '# комментарий\n\n{"method": "get", "path": "/groups"}\n{"path": "/resources"}\n',
+        encoding="utf-8",
+    )
+
+    with pytest.raises(ValueError, match=r"workload\.jsonl:4"):
+        load_workload(str(path))
+
+    path.write_text('# комментарий\n\n{"method": "get", "path": "/groups"}\n', encoding="utf-8")
+    [operation] = load_workload(str(path))
+    assert (operation.name, operation.method, operation.weight) == ("GET /groups", "GET", 1.0)
+
+
+def test_workload_mix_reuses_placeholder_ids_within_request():
+
+    operation = Operation.from_dict(
+        {
+            "method": "POST",
+            "path": "/users/{user_id}/request",
+            "body": {"user_id": "{user_id}", "item_id": "{group_id}", "note": "группа {group_id}"},
+        }
+    )
+    mix = WorkloadMix([operation], Catalog(user_ids=[7, 8], group_ids=[3]), random_seed=1)
+
+    rendered = mix.next_request()
+    user_id = rendered.params["user_id"]
+    assert rendered.path == f"/users/{user_id}/request"
+    assert rendered.body == {"user_id": user_id, "item_id": 3, "note": "группа 3"}
+
+
+def test_runner_replays_requests_and_tracks_approval():
+
+    app = FastAPI()
+    polls: dict[int, int] = {}
+
+    @app.post("/users/request")
+    async def create_request(body: dict):
+        polls[body["item_id"]] = 0
+        return {"ok": True}
+
+    @app.get("/users/{user_id}/permissions")
+    async def permissions(user_id: int):
+        groups = []
+        for item_id in polls:
+            polls[item_id] += 1
+            # Первый опрос видит заявку на рассмотрении, следующий — решение
+            groups.append({"item_id": item_id, "status": "pending" if polls[item_id] == 1 else "approved"})
+        return {"groups": groups, "accesses": []}
+
+    operation = Operation.from_dict(
+        {
+            "method": "POST",
+            "path": "/users/request",
+            "body": {"user_id": "{user_id}", "permission_type": "group", "item_id": "{group_id}"},
+            "track_approval": True,
+        }
+    )
+    mix = WorkloadMix([operation], Catalog(user_ids=[1], group_ids=[5]), random_seed=1)
+    config = RunConfig(
+        concurrency=2,
+        duration=None,
+        total_requests=6,
+        approval_path="/users/{user_id}/permissions",
+        approval_poll_interval=0.001,
+        approval_timeout=5.0,
+    )
+
+    async def scenario():
+        async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://bff") as client:
+            return await BenchmarkRunner(client, mix, config).run()
+
+    report = asyncio.run(scenario())
+
+    assert report["total"]["count"] == 6
+    assert report["total"]["errors"] == 0
+    assert report["approval"]["outcomes"] == {"approved": 6}
@@ -0,0 +1,91 @@
+import uuid
+
+import pytest
+
+from user_service.models.enums import PermissionType as UserPermissionType
+from user_service.services import codec as user_codec
+from validation_service.models.enums import ReasonCode
+from validation_service.models.validation_models import ValidationResult
+from validation_service.rabbitmq import codec as validation_codec
+
+WIRE_FORMATS = [validation_codec.WIRE_FORMAT_JSON, validation_codec.WIRE_FORMAT_BINARY]
+REQUEST_IDS = [str(uuid.uuid4()), "bench-42"]
+
+
+@pytest.mark.parametrize("wire_format", WIRE_FORMATS)
+@pytest.mark.parametrize("request_id", REQUEST_IDS)
+def test_validation_request_round_trip(wire_format, request_id):
+
+    body, content_type = user_codec.encode_validation_request(
+        user_id=7,
+        permission_type=UserPermissionType.GROUP,
+        item_id=3,
+        request_id=request_id,
+        wire_format=wire_format,
+    )
+    request = validation_codec.decode_validation_request(body, content_type)
+
+    assert (request.user_id, request.permission_type.value, request.item_id, request.request_id) == (
+        7,
+        "group",
+        3,
+        request_id,
+    )
+
+
+@pytest.mark.parametrize("wire_format", WIRE_FORMATS)
+@pytest.mark.parametrize("request_id", REQUEST_IDS)
+def test_conflict_result_round_trip(wire_format, request_id):
+
+    result = ValidationResult(
+        request_id=request_id,
+        approved=False,
+        reason="Конфликт: пользователь имеет группу 2, запрашивается группа 1",
+        user_id=7,
+        permission_type="group",
+        item_id=1,
+        reason_code=ReasonCode.CONFLICT,
+        conflict_user_group_id=2,
+        conflict_requested_group_id=1,
+    )
+    body, content_type = validation_codec.encode_result_message(result, wire_format)
+
+    decoded = validation_codec.decode_validation_result(body, content_type)
+    assert decoded.model_dump(exclude={"reason"}) == result.model_dump(exclude={"reason"})
+    assert decoded.reason
+
+    received = user_codec.decode_validation_result(body, content_type)
+    assert received["request_id"] == request_id
+    assert received["approved"] is False
+    assert (received["user_id"], received["permission_type"], received["item_id"]) == (7, "group", 1)
+
+
+@pytest.mark.parametrize("wire_format", WIRE_FORMATS)
+def test_upstream_error_reason_is_sent_verbatim(wire_format):
+
+    result = ValidationResult(
+        request_id=str(uuid.uuid4()),
+        approved=False,
+        reason="User Service недоступен",
+        user_id=1,
+        permission_type="access",
+        item_id=5,
+        reason_code=ReasonCode.UPSTREAM_ERROR,
+    )
+    body, content_type = validation_codec.encode_result_message(result, wire_format)
+
+    assert validation_codec.decode_validation_result(body, content_type) == result
+    assert user_codec.decode_validation_result(body, content_type)["reason"] == "User Service недоступен"
+
+
+def test_binary_request_with_unknown_version_is_rejected():
+
+    body, content_type = user_codec.encode_validation_request(
+        user_id=1,
+        permission_type=UserPermissionType.ACCESS,
+        item_id=1,
+        request_id=str(uuid.uuid4()),
+        wire_format=user_codec.WIRE_FORMAT_BINARY,
+    )
+    with pytest.raises(ValueError):
+        validation_codec.decode_validation_request(bytes([99]) + body[1:], content_type)
@@ -0,0 +1,21 @@
+import asyncio
+
+from benchmarks.__main__ import main
+from benchmarks.pipeline import PipelineConfig, run_pipeline
+
+
+def test_pipeline_validates_every_message():
+
+    report = asyncio.run(run_pipeline(PipelineConfig(messages=300, bulk_messages=100, consumers=2, shards=2)))
+
+    assert report["results"] == 400
+    assert report["approved"] + report["rejected"] == 400
+    assert report["dead_lettered"] == 0
+    assert report["lanes"]["interactive"]["count"] == 300
+    assert report["lanes"]["bulk"]["count"] == 100
+
+
+def test_pipeline_throughput_gate():
+
+    assert main(["pipeline", "--messages", "500", "--min-throughput", "200"]) == 0
+    assert main(["pipeline", "--messages", "200", "--min-throughput", "1000000000"]) == 1
@@ -0,0 +1,110 @@
+import asyncio
+
+import httpx
+import pytest
+
+from bff_service.services import resilience as bff_resilience
+from validation_service.services import resilience as validation_resilience
+
+RESILIENCE_MODULES = [validation_resilience, bff_resilience]
+
+
+class StubTransport(httpx.AsyncBaseTransport):
+
+    def __init__(self, status_code: int = 200, delay: float = 0.0):
+        self.status_code = status_code
+        self.delay = delay
+        self.calls = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return httpx.Response(self.status_code, request=request)
+
+
+def make_policy(module, recovery_timeout: float = 0.05, initial_limit: int = 1):
+    return module.ResiliencePolicy(
+        name="upstream",
+        circuit_breaker=module.CircuitBreaker(failure_threshold=1, recovery_timeout=recovery_timeout),
+        retry_budget=module.RetryBudget(),
+        limiter=module.AIMDLimiter(initial_limit=initial_limit, max_limit=initial_limit),
+        max_attempts=1,
+        acquire_timeout=0.01,
+    )
+
+
+async def send(transport: httpx.AsyncBaseTransport) -> httpx.Response:
+    return await transport.handle_async_request(httpx.Request("GET", "http://upstream/"))
+
+
+@pytest.mark.parametrize("module", RESILIENCE_MODULES)
+def test_half_open_probe_recovers_after_success(module):
+
+    async def scenario():
+        policy = make_policy(module)
+        stub = StubTransport(status_code=503)
+        transport = module.ResilientTransport(stub, policy)
+
+        assert (await send(transport)).status_code == 503
+        assert policy.circuit_breaker.state == module.CircuitBreaker.OPEN
+        with pytest.raises(module.CircuitOpenError):
+            await send(transport)
+
+        await asyncio.sleep(0.06)
+        assert policy.circuit_breaker.state == module.CircuitBreaker.HALF_OPEN
+        stub.status_code = 200
+        assert (await send(transport)).status_code == 200
+        assert policy.circuit_breaker.state == module.CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("module", RESILIENCE_MODULES)
+def test_half_open_probe_released_when_limiter_rejects(module):
+
+    async def scenario():
+        policy = make_policy(module)
+        stub = StubTransport(status_code=503)
+        transport = module.ResilientTransport(stub, policy)
+        await send(transport)
+        await asyncio.sleep(0.06)
+
+        # Единственный слот лимита занят: пробный запрос получает ConcurrencyLimitError
+        await policy.limiter.acquire()
+        with pytest.raises(module.ConcurrencyLimitError):
+            await send(transport)
+        await policy.limiter.release(0.0, overloaded=False)
+
+        stub.status_code = 200
+        assert (await send(transport)).status_code == 200
+        assert policy.circuit_breaker.state == module.CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
+
+
+@pytest.mark.parametrize("module", RESILIENCE_MODULES)
+def test_half_open_probe_released_when_cancelled_waiting_for_limiter(module):
+
+    async def scenario():
+        policy = make_policy(module)
+        policy.acquire_timeout = None
+        stub = StubTransport(status_code=503)
+        transport = module.ResilientTransport(stub, policy)
+        await send(transport)
+        await asyncio.sleep(0.06)
+
+        # Проигравший дубль отменяется, пока ждет слот лимита
+        await policy.limiter.acquire()
+        probe = asyncio.create_task(send(transport))
+        await asyncio.sleep(0.01)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        await policy.limiter.release(0.0, overloaded=False)
+
+        stub.status_code = 200
+        assert (await send(transport)).status_code == 200
+        assert policy.circuit_breaker.state == module.CircuitBreaker.CLOSED
+
+    asyncio.run(scenario())
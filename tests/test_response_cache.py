@@ -0,0 +1,69 @@
+import asyncio
+
+import fakeredis
+
+from bff_service.services.response_cache import ResponseCache
+
+
+def make_redis(server: fakeredis.FakeServer) -> fakeredis.FakeAsyncRedis:
+    return fakeredis.FakeAsyncRedis(server=server)
+
+
+def test_set_is_skipped_when_invalidated_during_load():
+
+    async def scenario():
+        cache = ResponseCache(redis_conn=make_redis(fakeredis.FakeServer()))
+
+        generation = await cache.generation("groups")
+        await cache.invalidate(["groups"])
+        await cache.set("groups", "list", b"stale", generation)
+        assert await cache.get("groups", "list") is None
+
+        generation = await cache.generation("groups")
+        await cache.set("groups", "list", b"fresh", generation)
+        assert await cache.get("groups", "list") == b"fresh"
+
+    asyncio.run(scenario())
+
+
+def test_set_is_skipped_in_redis_when_other_replica_invalidated():
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        reader = ResponseCache(redis_conn=make_redis(server))
+        other = ResponseCache(redis_conn=make_redis(server))
+
+        generation = await reader.generation("conflicts")
+        # Событие инвалидации дошло до другой реплики раньше, чем до читающей
+        await other.invalidate(["conflicts"])
+        await reader.set("conflicts", "list", b"stale", generation)
+
+        assert await other.get("conflicts", "list") is None
+
+    asyncio.run(scenario())
+
+
+def test_clear_local_discards_loads_started_before_it():
+
+    async def scenario():
+        cache = ResponseCache()
+
+        generation = await cache.generation("resources")
+        cache.clear_local()
+        await cache.set("resources", "list", b"stale", generation)
+        assert await cache.get("resources", "list") is None
+
+    asyncio.run(scenario())
+
+
+def test_local_only_cache_ttl_is_capped():
+
+    async def scenario():
+        cache = ResponseCache(ttl_seconds=60.0, local_only_ttl_seconds=0.05)
+
+        await cache.set("accesses", "list", b"body", await cache.generation("accesses"))
+        assert await cache.get("accesses", "list") == b"body"
+        await asyncio.sleep(0.06)
+        assert await cache.get("accesses", "list") is None
+
+    asyncio.run(scenario())
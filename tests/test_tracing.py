@@ -0,0 +1,119 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from fastapi import FastAPI
+
+from access_control_service.services import tracing as access_control_tracing
+from bff_service.services import tracing as bff_tracing
+from bff_service.services.http_pool import create_http_client
+from user_service.config.settings import get_settings
+from user_service.models.enums import PermissionType
+from user_service.services import tracing as user_tracing
+from user_service.services.in_memory import InMemoryRabbitMQManager
+from validation_service.services import tracing as validation_tracing
+
+TRACING_MODULES = [access_control_tracing, bff_tracing, user_tracing, validation_tracing]
+
+
+@pytest.mark.parametrize("module", TRACING_MODULES)
+def test_jsonl_exporter_writes_in_background_batches(module, tmp_path):
+
+    path = tmp_path / "traces.jsonl"
+    exporter = module.JsonlSpanExporter(str(path), flush_interval=60.0, batch_size=1000)
+    module.configure_tracing(exporter)
+    try:
+        for i in range(10):
+            with module.start_span(f"span-{i}"):
+                pass
+        # export() не пишет файл сам: до сброса буфера на диске ничего нет
+        assert not path.exists()
+    finally:
+        module.configure_tracing(None)
+        exporter.close()
+
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["name"] for line in lines] == [f"span-{i}" for i in range(10)]
+
+
+@pytest.mark.parametrize("module", TRACING_MODULES)
+def test_jsonl_exporter_drops_oldest_when_buffer_is_full(module, tmp_path):
+
+    path = tmp_path / "traces.jsonl"
+    exporter = module.JsonlSpanExporter(str(path), flush_interval=60.0, batch_size=1000, max_buffered=3)
+    module.configure_tracing(exporter)
+    try:
+        for i in range(5):
+            with module.start_span(f"span-{i}"):
+                pass
+    finally:
+        module.configure_tracing(None)
+        exporter.close()
+
+    assert exporter.dropped == 2
+    lines = path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["span-2", "span-3", "span-4"]
+
+
+def test_trace_continues_from_bff_through_http_to_user_service():
+
+    async def scenario():
+        exporter = bff_tracing.InMemorySpanExporter()
+        bff_tracing.configure_tracing(exporter)
+        user_tracing.configure_tracing(exporter)
+
+        user_app = FastAPI()
+        user_tracing.setup_tracing(user_app)
+
+        @user_app.get("/ping")
+        async def ping():
+            return {"ok": True}
+
+        client = create_http_client(
+            "user_service", base_url="http://user-service", transport=httpx.ASGITransport(app=user_app)
+        )
+        try:
+            with bff_tracing.start_span("HTTP GET /bff") as root:
+                response = await client.get("/ping")
+        finally:
+            await client.aclose()
+            bff_tracing.configure_tracing(None)
+            user_tracing.configure_tracing(None)
+
+        spans = exporter.find_trace(root.context.trace_id)
+        server = next(span for span in spans if span.name == "HTTP GET /ping")
+        by_id = {span.context.span_id: span for span in spans}
+        # Серверный спан User Service — потомок клиентского спана BFF внутри того же trace
+        assert server.parent_id in by_id
+        assert by_id[server.parent_id].parent_id == root.context.span_id
+        assert bff_tracing.extract(response.headers).span_id == server.context.span_id
+
+    asyncio.run(scenario())
+
+
+def test_trace_continues_through_validation_queue_with_queue_wait():
+
+    async def scenario():
+        exporter = validation_tracing.InMemorySpanExporter()
+        user_tracing.configure_tracing(exporter)
+        validation_tracing.configure_tracing(exporter)
+        try:
+            manager = InMemoryRabbitMQManager(get_settings())
+            await manager.connect()
+            with user_tracing.start_span("HTTP POST /request") as root:
+                await manager.publish_validation_request(1, PermissionType.GROUP, 2, "request-1")
+
+            message = await manager.validation_queue.get()
+            parent = validation_tracing.extract(message.headers)
+            validation_tracing.record_queue_wait(manager.validation_queue.name, message.headers, parent)
+        finally:
+            user_tracing.configure_tracing(None)
+            validation_tracing.configure_tracing(None)
+
+        spans = {span.name: span for span in exporter.find_trace(root.context.trace_id)}
+        assert spans["amqp.publish"].parent_id == root.context.span_id
+        assert spans["amqp.queue_wait"].parent_id == spans["amqp.publish"].context.span_id
+        assert spans["amqp.queue_wait"].duration_ms >= 0
+
+    asyncio.run(scenario())
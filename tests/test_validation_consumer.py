@@ -0,0 +1,250 @@
+import asyncio
+
+from validation_service.models.enums import ReasonCode
+from validation_service.models.validation_models import ValidationRequest, ValidationResult
+from validation_service.rabbitmq.codec import VALIDATION_REQUEST_CONTENT_TYPE, encode_validation_request
+from validation_service.rabbitmq.consumers.validation_consumer import ValidationConsumer
+from validation_service.rabbitmq.in_memory import InMemoryChannel, InMemoryResultPublisher
+from validation_service.rabbitmq.retry import (
+    ATTEMPT_HEADER,
+    LAST_ERROR_HEADER,
+    dead_letter_queue_name,
+    retry_queue_name,
+)
+from validation_service.rabbitmq.routing import LANE_BULK, LANE_INTERACTIVE, route
+from validation_service.services import tracing
+
+VALIDATION_QUEUE = "validation_queue"
+
+
+class StubValidationService:
+
+    def __init__(
+        self,
+        delay: float = 0.0,
+        reason_code: ReasonCode = ReasonCode.NONE,
+        error: Exception | None = None,
+    ):
+        self.delay = delay
+        self.reason_code = reason_code
+        self.error = error
+        self.validated: list[str] = []
+
+    async def validate(self, request: ValidationRequest) -> ValidationResult:
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.validated.append(request.request_id)
+        if self.error is not None:
+            raise self.error
+        return ValidationResult(
+            request_id=request.request_id,
+            approved=self.reason_code == ReasonCode.NONE,
+            reason=None if self.reason_code == ReasonCode.NONE else "Апстрим недоступен",
+            user_id=request.user_id,
+            permission_type=request.permission_type,
+            item_id=request.item_id,
+            reason_code=self.reason_code,
+        )
+
+
+def enqueue(
+    channel: InMemoryChannel,
+    lane: str,
+    request_id: str,
+    user_id: int = 1,
+    headers: dict | None = None,
+) -> None:
+    request = ValidationRequest(user_id=user_id, permission_type="group", item_id=1, request_id=request_id)
+    channel.get_queue(route(VALIDATION_QUEUE, user_id, lane, 1)).put_nowait(
+        encode_validation_request(request),
+        headers=headers,
+        content_type=VALIDATION_REQUEST_CONTENT_TYPE,
+    )
+
+
+async def run_until(consumer: ValidationConsumer, condition, timeout: float = 5.0) -> None:
+    """Запускает потребление, ждет condition() и останавливает консьюмер."""
+
+    await consumer.connect()
+    task = asyncio.create_task(consumer.start_consuming())
+    try:
+        async with asyncio.timeout(timeout):
+            while not condition():
+                await asyncio.sleep(0.005)
+    finally:
+        await consumer.stop()
+        await task
+
+
+def make_consumer(
+    channel: InMemoryChannel,
+    service: StubValidationService,
+    publisher: InMemoryResultPublisher | None = None,
+    **kwargs,
+) -> ValidationConsumer:
+    return ValidationConsumer(
+        validation_service=service,
+        publisher=publisher or InMemoryResultPublisher(),
+        rabbitmq_url="",
+        validation_queue_name=VALIDATION_QUEUE,
+        channel=channel,
+        **kwargs,
+    )
+
+
+def test_interactive_lane_is_weighted_over_backlogged_bulk_lane():
+
+    async def scenario():
+        channel = InMemoryChannel()
+        for i in range(100):
+            enqueue(channel, LANE_BULK, f"bulk-{i}")
+        for i in range(100):
+            enqueue(channel, LANE_INTERACTIVE, f"interactive-{i}")
+
+        service = StubValidationService(delay=0.001)
+        # prefetch по умолчанию меньше суммы весов — консьюмер поднимает его сам
+        consumer = make_consumer(channel, service, interactive_weight=4, bulk_weight=1, prefetch_count=1)
+        await run_until(consumer, lambda: len(service.validated) >= 50)
+
+        interactive = sum(1 for request_id in service.validated[:50] if request_id.startswith("interactive"))
+        assert interactive >= 35
+
+    asyncio.run(scenario())
+
+
+def test_drain_finishes_delivered_messages_and_leaves_the_rest_queued():
+
+    async def scenario():
+        channel = InMemoryChannel()
+        for i in range(30):
+            enqueue(channel, LANE_INTERACTIVE, f"request-{i}")
+        queue = channel.get_queue(VALIDATION_QUEUE)
+
+        service = StubValidationService(delay=0.005)
+        consumer = make_consumer(channel, service, prefetch_count=5)
+        await consumer.connect()
+        task = asyncio.create_task(consumer.start_consuming())
+        while len(service.validated) < 3:
+            await asyncio.sleep(0.001)
+
+        assert await consumer.drain(timeout=2.0)
+        await task
+
+        assert consumer.in_flight == 0
+        assert len(service.validated) < 30
+        assert len(service.validated) + queue.qsize() == 30
+        assert queue.acked == len(service.validated)
+
+    asyncio.run(scenario())
+
+
+def test_drain_timeout_requeues_unprocessed_messages():
+
+    async def scenario():
+        channel = InMemoryChannel()
+        for i in range(10):
+            enqueue(channel, LANE_INTERACTIVE, f"request-{i}")
+        queue = channel.get_queue(VALIDATION_QUEUE)
+
+        service = StubValidationService(delay=0.05)
+        consumer = make_consumer(channel, service, prefetch_count=5)
+        await consumer.connect()
+        task = asyncio.create_task(consumer.start_consuming())
+        while not service.validated:
+            await asyncio.sleep(0.001)
+
+        assert not await consumer.drain(timeout=0.01)
+        await task
+
+        # Ничего не потеряно: обработанные подтверждены, остальные снова в очереди
+        assert len(service.validated) + queue.qsize() == 10
+        assert not queue.dead_letters
+
+    asyncio.run(scenario())
+
+
+def test_upstream_error_is_retried_with_delay_then_rejected():
+
+    async def scenario():
+        channel = InMemoryChannel()
+        enqueue(channel, LANE_INTERACTIVE, "request-1")
+
+        service = StubValidationService(reason_code=ReasonCode.UPSTREAM_ERROR)
+        consumer = make_consumer(channel, service, retry_delays=[0.01])
+        await run_until(consumer, lambda: consumer._publisher.results)
+
+        assert service.validated == ["request-1", "request-1"]
+        assert channel.get_queue(retry_queue_name(VALIDATION_QUEUE, 0.01)).published == 1
+        [result] = consumer._publisher.results
+        assert not result.approved
+        assert result.reason_code == ReasonCode.UPSTREAM_ERROR
+
+    asyncio.run(scenario())
+
+
+def test_failing_message_goes_to_dlq_after_retries():
+
+    async def scenario():
+        channel = InMemoryChannel()
+        enqueue(channel, LANE_INTERACTIVE, "request-1")
+        dead_letters = channel.get_queue(dead_letter_queue_name(VALIDATION_QUEUE))
+
+        service = StubValidationService(error=RuntimeError("boom"))
+        consumer = make_consumer(channel, service, retry_delays=[0.01])
+        await run_until(consumer, lambda: dead_letters.qsize() == 1)
+
+        assert service.validated == ["request-1", "request-1"]
+        message = await dead_letters.get()
+        assert message.headers[ATTEMPT_HEADER] == 1
+        assert "boom" in message.headers[LAST_ERROR_HEADER]
+        assert not consumer._publisher.results
+
+    asyncio.run(scenario())
+
+
+def test_malformed_message_is_dead_lettered_without_retry():
+
+    async def scenario():
+        channel = InMemoryChannel()
+        channel.get_queue(VALIDATION_QUEUE).put_nowait(b"not json", content_type="application/json")
+        dead_letters = channel.get_queue(dead_letter_queue_name(VALIDATION_QUEUE))
+
+        service = StubValidationService()
+        consumer = make_consumer(channel, service, retry_delays=[0.01])
+        await run_until(consumer, lambda: dead_letters.qsize() == 1)
+
+        assert not service.validated
+        assert channel.get_queue(retry_queue_name(VALIDATION_QUEUE, 0.01)).published == 0
+
+    asyncio.run(scenario())
+
+
+def test_consume_span_continues_the_publisher_trace():
+
+    async def scenario():
+        exporter = tracing.InMemorySpanExporter()
+        tracing.configure_tracing(exporter)
+        try:
+            channel = InMemoryChannel()
+            trace_id = "0af7651916cd43dd8448eb211c80319c"
+            enqueue(
+                channel,
+                LANE_INTERACTIVE,
+                "request-1",
+                headers={tracing.TRACEPARENT_HEADER: f"00-{trace_id}-b7ad6b7169203331-01"},
+            )
+
+            result_queue = channel.get_queue("result_queue")
+            consumer = make_consumer(channel, StubValidationService(), InMemoryResultPublisher(result_queue))
+            await run_until(consumer, lambda: result_queue.qsize() == 1)
+        finally:
+            tracing.configure_tracing(None)
+
+        spans = {span.name: span for span in exporter.find_trace(trace_id)}
+        assert spans["amqp.consume"].parent_id == "b7ad6b7169203331"
+        assert spans["amqp.publish"].parent_id == spans["amqp.consume"].context.span_id
+        # Результат уходит в result_queue с тем же trace_id
+        result_message = await result_queue.get()
+        assert tracing.extract(result_message.headers).trace_id == trace_id
+
+    asyncio.run(scenario())
@@ -0,0 +1,41 @@
+"""pending submitted_at
+
+Revision ID: b7d41e9a0c25
+Revises: 3f9a2c71d4e8
+Create Date: 2026-10-19 16:00:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b7d41e9a0c25'
+down_revision: str | None = '3f9a2c71d4e8'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('user_permissions', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('submitted_at', sa.DateTime(), nullable=True))
+
+    # Уже существующие pending заявки реконсилятор подхватит через порог от момента миграции
+    op.execute(
+        "UPDATE user_permissions SET submitted_at = (now() AT TIME ZONE 'utc') WHERE status = 'pending'"
+    )
+
+    with op.batch_alter_table('user_permissions', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_user_permissions_status_submitted',
+            ['status', 'submitted_at'],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('user_permissions', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_permissions_status_submitted')
+        batch_op.drop_column('submitted_at')
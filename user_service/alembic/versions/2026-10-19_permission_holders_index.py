@@ -0,0 +1,32 @@
+"""permission holders index
+
+Revision ID: 3f9a2c71d4e8
+Revises: 548bb0e590d7
+Create Date: 2026-10-19 10:30:00.000000
+
+"""
+from collections.abc import Sequence
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3f9a2c71d4e8'
+down_revision: str | None = '548bb0e590d7'
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('user_permissions', schema=None) as batch_op:
+        batch_op.create_index(
+            'ix_user_permissions_type_status_item',
+            ['permission_type', 'status', 'item_id'],
+            unique=False,
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('user_permissions', schema=None) as batch_op:
+        batch_op.drop_index('ix_user_permissions_type_status_item')
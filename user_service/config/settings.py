@@ -66,6 +66,46 @@ class Settings(BaseSettings):
     rabbitmq_result_queue: str = Field(
         default="result_queue",
     )
+    # Число шардов очереди заявок (по user_id) в каждой полосе interactive/bulk
+    rabbitmq_validation_queue_shards: int = Field(
+        default=1,
+    )
+    # Формат публикуемых заявок: json или binary (компактный); результаты принимаются в обоих.
+    # binary включается только после обновления всех консьюмеров: прежний консьюмер его отбрасывает
+    rabbitmq_message_format: str = Field(
+        default="json",
+    )
+    # Пакетная публикация заявок с подтверждениями брокера
+    rabbitmq_publish_batch_size: int = Field(
+        default=100,
+    )
+    rabbitmq_publish_flush_interval: float = Field(
+        default=0.005,
+    )
+    rabbitmq_publish_max_outstanding: int = Field(
+        default=1000,
+    )
+    rabbitmq_publish_max_retries: int = Field(
+        default=3,
+    )
+    # Отложенные повторы необработанных результатов: ступени base, base*5, base*25, ... секунд, затем DLQ
+    rabbitmq_retry_base_delay: float = Field(
+        default=1.0,
+    )
+    rabbitmq_retry_tiers: int = Field(
+        default=3,
+    )
+    # Неподтвержденные сообщения result_queue на консьюмер и время на их обработку при остановке, с
+    rabbitmq_consumer_prefetch_count: int = Field(
+        default=100,
+    )
+    rabbitmq_drain_timeout: float = Field(
+        default=8.0,
+    )
+    # Очереди в памяти процесса вместо брокера (бенчмарки и локальные тесты)
+    rabbitmq_in_memory: bool = Field(
+        default=False,
+    )
 
     access_control_service_url: AnyUrl = Field(
         default="http://access-control-service:8000",
@@ -84,6 +124,56 @@ class Settings(BaseSettings):
         ),
     )
 
+    cache_ttl_processed_results_seconds: int = Field(
+        default=86400,
+        description=(
+            "Время хранения отметки об обработанном результате валидации (сутки): "
+            "повторные доставки в этом окне отсекаются без обращения к БД."
+        ),
+    )
+
+    request_wait_timeout_seconds: float = Field(
+        default=5.0,
+        description=(
+            "Сколько POST /request?wait=true ждет результата валидации, прежде чем ответить 202 "
+            "(клиент может передать меньшее значение в параметре timeout)."
+        ),
+    )
+    request_wait_max_timeout_seconds: float = Field(
+        default=30.0,
+        description="Верхняя граница параметра timeout для POST /request?wait=true",
+    )
+
+    pending_reconciler_enabled: bool = Field(
+        default=True,
+        description="Фоновая повторная отправка зависших pending заявок на валидацию",
+    )
+    pending_reconciler_interval_seconds: float = Field(
+        default=30.0,
+        description="Интервал между проходами реконсилятора (секунды)",
+    )
+    pending_reconciler_threshold_seconds: float = Field(
+        default=300.0,
+        description="Заявка pending без результата дольше этого времени после отправки считается зависшей (секунды)",
+    )
+    pending_reconciler_batch_size: int = Field(
+        default=100,
+        description="Число заявок, блокируемых и отправляемых повторно в одной транзакции",
+    )
+    pending_reconciler_max_rate: float = Field(
+        default=200.0,
+        description="Максимальная скорость повторной отправки (заявок в секунду)",
+    )
+
+    tracing_exporter: str = Field(
+        default="none",
+        description="Экспорт спанов трассировки: none, memory (в памяти процесса) или jsonl (в файл)",
+    )
+    tracing_jsonl_path: str = Field(
+        default="traces.jsonl",
+        description="Файл для экспортера jsonl",
+    )
+
     log_level: str = Field(
         default="INFO",
     )
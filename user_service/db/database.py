@@ -8,6 +8,7 @@ from sqlalchemy import text
 from alembic.config import Config
 from alembic import command
 
+from user_service.services.metrics import instrument_engine
 from user_service.db.base import Base  # noqa: F401
 from user_service.db.user import User  # noqa: F401
 from user_service.db.userpermission import UserPermission  # noqa: F401
@@ -24,6 +25,8 @@ class Database:
         self.DB_USER = os.getenv("DB_USER", "postgres")
         self.DB_PASSWORD = os.getenv("DB_PASSWORD", "postgres")
         self.DB_NAME = os.getenv("DB_NAME", "user_service")
+        # Логирование каждого SQL запроса (SQLAlchemy echo), только для отладки
+        self.DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
 
         self.DATABASE_URL = (
             f"postgresql+asyncpg://{self.DB_USER}:{self.DB_PASSWORD}"
@@ -103,9 +106,10 @@ class Database:
 
         self._engine = create_async_engine(
             self.DATABASE_URL,
-            echo=True,
+            echo=self.DB_ECHO,
             future=True,
         )
+        instrument_engine(self._engine)
 
         self._AsyncSessionLocal = async_sessionmaker(
             self._engine,
@@ -10,8 +10,10 @@ from user_service.models.models import (
     RequestAccessResponse,
     GetUserPermissionsResponse,
     GetActiveGroupsResponse,
+    GetPermissionHoldersRequest,
+    GetPermissionHoldersResponse,
 )
-from user_service.models.enums import PermissionType
+from user_service.models.enums import PermissionType, RequestPriority
 from user_service.db.userpermission import UserPermission
 
 
@@ -67,15 +69,23 @@ class RabbitMQManagerProtocol(Protocol):
     async def close(self) -> None:
         ...
 
+    async def flush(self) -> None:
+        ...
+
     async def publish_validation_request(
         self,
         user_id: int,
         permission_type: PermissionType,
         item_id: int,
         request_id: str,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        republish: bool = False,
     ) -> None:
         ...
 
+    async def validation_queue_depth(self) -> int:
+        ...
+
 
 class PermissionServiceProtocol(Protocol):
 
@@ -91,6 +101,12 @@ class PermissionServiceProtocol(Protocol):
     async def get_active_groups(self, user_id: int) -> GetActiveGroupsResponse:
         ...
 
+    async def get_permission_holders(
+        self,
+        holders_request: GetPermissionHoldersRequest,
+    ) -> GetPermissionHoldersResponse:
+        ...
+
     async def apply_validation_result(
         self,
         request_id: str,
@@ -98,7 +114,7 @@ class PermissionServiceProtocol(Protocol):
         user_id: int,
         permission_type: PermissionType,
         item_id: int,
-    ) -> UserPermission | None:
+    ) -> tuple[UserPermission | None, bool]:
         ...
 
     async def revoke_permission(
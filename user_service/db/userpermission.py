@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import String, ForeignKey, DateTime, UniqueConstraint
+from sqlalchemy import String, ForeignKey, DateTime, UniqueConstraint, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from user_service.db.base import Base
@@ -19,9 +19,13 @@ class UserPermission(Base):
     status: Mapped[str] = mapped_column(String(20), nullable=False, default="pending")
     request_id: Mapped[str] = mapped_column(String(36), nullable=False, unique=True, index=True)
     assigned_at: Mapped[datetime | None] = mapped_column(DateTime, default=datetime.utcnow, nullable=True)
+    # Последняя отправка заявки на валидацию: по ней реконсилятор находит зависшие pending заявки
+    submitted_at: Mapped[datetime | None] = mapped_column(DateTime, default=datetime.utcnow, nullable=True)
 
     user: Mapped["User"] = relationship("User", back_populates="permissions")
 
     __table_args__ = (
         UniqueConstraint('user_id', 'permission_type', 'item_id', name='unique_user_permission'),
+        Index('ix_user_permissions_type_status_item', 'permission_type', 'status', 'item_id'),
+        Index('ix_user_permissions_status_submitted', 'status', 'submitted_at'),
     )
@@ -11,6 +11,8 @@ from user_service.config.settings import Settings, get_settings
 from user_service.db.database import Database
 from user_service.services.redis_client import RedisClient
 from user_service.services.rabbitmq_manager import RabbitMQManager
+from user_service.services.in_memory import InMemoryRabbitMQManager
+from user_service.services.permission_events import PermissionResultWaiter
 from user_service.db.protocols import (
     DatabaseProtocol,
     RedisClientProtocol,
@@ -42,6 +44,11 @@ def get_redis_client() -> RedisClientProtocol:
     return RedisClient()
 
 
+@lru_cache(maxsize=1)
+def get_permission_result_waiter() -> PermissionResultWaiter:
+    return PermissionResultWaiter()
+
+
 _rabbitmq_manager: RabbitMQManagerProtocol | None = None
 
 
@@ -52,7 +59,10 @@ def get_rabbitmq_manager(
     if _rabbitmq_manager is None:
         if settings is None:
             settings = get_settings_dependency()
-        _rabbitmq_manager = RabbitMQManager(settings=settings)
+        if settings.rabbitmq_in_memory:
+            _rabbitmq_manager = InMemoryRabbitMQManager(settings=settings)
+        else:
+            _rabbitmq_manager = RabbitMQManager(settings=settings)
     return _rabbitmq_manager
 
 
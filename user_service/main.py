@@ -5,15 +5,20 @@ import asyncio
 import logging
 import sys
 
+from user_service.services.tracing import configure_tracing, create_exporter, setup_tracing
+from user_service.services.metrics import setup_metrics
 from user_service.routes import permissions, health, admin
 from user_service.dependencies import (
     get_database,
     get_redis_client,
     get_rabbitmq_manager,
+    get_permission_result_waiter,
     get_settings_dependency,
 )
 from user_service.services.result_consumer import ResultConsumer
+from user_service.services.pending_reconciler import PendingRequestReconciler
 from user_service.services.permission_service_factory import PermissionServiceFactory
+from user_service.services.retry import retry_delays
 
 settings = get_settings_dependency()
 log_level = getattr(logging, settings.log_level.upper(), logging.INFO)
@@ -31,6 +36,8 @@ logging.getLogger("redis").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+configure_tracing(create_exporter(settings.tracing_exporter, settings.tracing_jsonl_path))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -69,10 +76,17 @@ async def lifespan(app: FastAPI):
         redis_client=redis_client,
     )
 
+    # Результаты для POST /request?wait=true: из ResultConsumer этого процесса и других реплик
+    result_waiter = get_permission_result_waiter()
+    result_waiter.start(redis_client.connection)
+
     result_consumer = ResultConsumer(
         service_factory=service_factory,
         rabbitmq_manager=rabbitmq_manager,
-        db=db
+        db=db,
+        retry_delays=retry_delays(settings.rabbitmq_retry_base_delay, settings.rabbitmq_retry_tiers),
+        redis_conn=redis_client.connection,
+        result_waiter=result_waiter,
     )
 
     consumer_task: asyncio.Task | None = None
@@ -81,28 +95,52 @@ async def lifespan(app: FastAPI):
         logger.debug("Consumer для result_queue запущен как фоновая задача")
     except Exception:
         logger.exception("Не удалось запустить consumer для result_queue")
+        await result_waiter.stop()
         await rabbitmq_manager.close()
         await redis_client.close()
         await db.close()
         raise
 
+    reconciler: PendingRequestReconciler | None = None
+    if settings.pending_reconciler_enabled:
+        reconciler = PendingRequestReconciler(
+            db=db,
+            rabbitmq_manager=rabbitmq_manager,
+            threshold=settings.pending_reconciler_threshold_seconds,
+            interval=settings.pending_reconciler_interval_seconds,
+            batch_size=settings.pending_reconciler_batch_size,
+            max_rate=settings.pending_reconciler_max_rate,
+        )
+        reconciler.start()
+        logger.debug("Реконсилятор зависших заявок запущен")
+
     try:
         yield
     finally:
+        if reconciler is not None:
+            await reconciler.stop()
+
         if consumer_task is not None:
             try:
-                await result_consumer.stop_consuming()
-                await asyncio.sleep(1)
+                # basic.cancel, обработка уже доставленных результатов до rabbitmq_drain_timeout
+                await result_consumer.drain(settings.rabbitmq_drain_timeout)
                 if not consumer_task.done():
                     consumer_task.cancel()
-                    try:
-                        await consumer_task
-                    except asyncio.CancelledError:
-                        pass
+                try:
+                    await consumer_task
+                except asyncio.CancelledError:
+                    pass
                 logger.debug("Consumer для result_queue остановлен")
             except Exception:
                 logger.exception("Ошибка при остановке consumer")
 
+        await result_waiter.stop()
+
+        try:
+            await rabbitmq_manager.flush()
+        except Exception:
+            logger.exception("Ошибка при ожидании подтверждений публикаций RabbitMQ")
+
         try:
             await rabbitmq_manager.close()
             logger.debug("RabbitMQ соединение закрыто")
@@ -129,6 +167,9 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+setup_metrics(app)
+setup_tracing(app)
+
 
 @app.exception_handler(ValueError)
 async def value_error_handler(request: Request, exc: ValueError):
@@ -1,4 +1,4 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class PermissionType(str, Enum):
@@ -13,3 +13,20 @@ class PermissionStatus(str, Enum):
     PENDING = "pending"
     REVOKED = "revoked"
     REJECTED = "rejected"
+
+
+class RequestPriority(str, Enum):
+    """Полоса очереди валидации, выбранная вызывающей стороной."""
+
+    INTERACTIVE = "interactive"
+    BULK = "bulk"
+
+
+class ReasonCode(IntEnum):
+    """Код причины решения Validation Service (в бинарном формате результата)."""
+
+    NONE = 0
+    CONFLICT = 1
+    NO_GROUPS = 2
+    UPSTREAM_ERROR = 3
+    OTHER = 255
@@ -1,7 +1,7 @@
 from datetime import datetime
 from pydantic import BaseModel, ConfigDict, Field
 
-from user_service.models.enums import PermissionType, PermissionStatus
+from user_service.models.enums import PermissionType, PermissionStatus, RequestPriority
 
 
 class User(BaseModel):
@@ -27,11 +27,18 @@ class RequestAccessRequest(BaseModel):
     user_id: int = Field(gt=0, description="ID пользователя")
     permission_type: PermissionType = Field(description="Тип права: access или group")
     item_id: int = Field(gt=0, description="ID доступа или группы")
+    priority: RequestPriority = Field(
+        default=RequestPriority.INTERACTIVE,
+        description="Полоса валидации: interactive (одиночные заявки) или bulk (пакетные загрузки)",
+    )
 
 
 class RequestAccessResponse(BaseModel):
 
-    status: str = Field(default="accepted", description="Статус обработки заявки")
+    status: str = Field(
+        default="accepted",
+        description="accepted — заявка на валидации; при wait=true — итоговый статус (active или rejected)",
+    )
     request_id: str = Field(description="UUID заявки для отслеживания")
 
 
@@ -70,6 +77,21 @@ class GetActiveGroupsResponse(BaseModel):
     groups: list[ActiveGroup] = Field(default_factory=list, description="Список активных групп")
 
 
+class GetPermissionHoldersRequest(BaseModel):
+    group_ids: list[int] = Field(default_factory=list, description="ID групп")
+    access_ids: list[int] = Field(default_factory=list, description="ID доступов")
+
+
+class PermissionHolders(BaseModel):
+    item_id: int = Field(description="ID группы или доступа")
+    user_ids: list[int] = Field(default_factory=list, description="ID пользователей с активным правом")
+
+
+class GetPermissionHoldersResponse(BaseModel):
+    groups: list[PermissionHolders] = Field(default_factory=list, description="Пользователи по группам")
+    accesses: list[PermissionHolders] = Field(default_factory=list, description="Пользователи по доступам")
+
+
 class CreateUserRequest(BaseModel):
     username: str = Field(..., min_length=1, max_length=50, description="Имя пользователя")
 
@@ -107,4 +129,28 @@ class UpdatePermissionStatusRequest(BaseModel):
 class UpdatePermissionStatusResponse(BaseModel):
     request_id: str = Field(description="UUID заявки")
     status: str = Field(description="Итоговый статус заявки")
-    message: str = Field(description="Сообщение о результате операции")
\ No newline at end of file
+    message: str = Field(description="Сообщение о результате операции")
+
+class DeadLetterMessage(BaseModel):
+    message_id: str | None = Field(default=None, description="ID сообщения")
+    original_queue: str | None = Field(default=None, description="Очередь, из которой сообщение попало в DLQ")
+    attempt: int = Field(description="Число выполненных повторов")
+    replayed: int = Field(default=0, description="Сколько раз сообщение уже возвращалось из DLQ")
+    last_error: str | None = Field(default=None, description="Последняя ошибка обработки")
+    content_type: str | None = Field(default=None, description="Формат тела сообщения")
+    body: str = Field(description="Тело: текст для JSON, иначе hex")
+
+
+class GetDeadLettersResponse(BaseModel):
+    queue: str = Field(description="Исходная очередь")
+    messages: list[DeadLetterMessage] = Field(default_factory=list)
+
+
+class ReplayDeadLettersRequest(BaseModel):
+    queue: str = Field(description="Исходная очередь, DLQ которой нужно вернуть в обработку")
+    limit: int = Field(default=100, gt=0, le=10000, description="Максимум сообщений за вызов")
+
+
+class ReplayDeadLettersResponse(BaseModel):
+    queue: str = Field(description="Исходная очередь")
+    replayed: int = Field(description="Число возвращенных в обработку сообщений")
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Protocol
 
 from user_service.db.user import User
@@ -58,17 +59,33 @@ class UserPermissionRepositoryProtocol(Protocol):
     ) -> UserPermission | None:
         ...
 
-    async def find_by_request_id(self, request_id: str) -> UserPermission | None:
+    async def find_by_request_id(self, request_id: str, for_update: bool = False) -> UserPermission | None:
         ...
 
     async def find_active_groups_by_user_id(self, user_id: int) -> list[UserPermission]:
         ...
 
+    async def find_active_holders_by_items(
+        self,
+        group_ids: list[int],
+        access_ids: list[int],
+    ) -> list[tuple[str, int, int]]:
+        ...
+
+    async def find_stale_pending(self, submitted_before: datetime, limit: int) -> list[UserPermission]:
+        ...
+
+    async def count_stale_pending(self, submitted_before: datetime) -> int:
+        ...
+
     async def save(self, permission: UserPermission) -> UserPermission:
         ...
 
     async def flush(self) -> None:
         ...
 
+    async def commit(self) -> None:
+        ...
+
     async def delete(self, permission: UserPermission) -> None:
         ...
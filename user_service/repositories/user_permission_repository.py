@@ -1,5 +1,8 @@
+from datetime import datetime
+
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
+from sqlalchemy import select, func, and_, or_, any_, bindparam, Integer
+from sqlalchemy.dialects.postgresql import ARRAY
 
 from user_service.db.userpermission import UserPermission
 
@@ -63,8 +66,10 @@ class UserPermissionRepository:
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
 
-    async def find_by_request_id(self, request_id: str) -> UserPermission | None:
+    async def find_by_request_id(self, request_id: str, for_update: bool = False) -> UserPermission | None:
         stmt = select(UserPermission).where(UserPermission.request_id == request_id)
+        if for_update:
+            stmt = stmt.with_for_update()
         result = await self._session.execute(stmt)
         return result.scalar_one_or_none()
 
@@ -77,6 +82,60 @@ class UserPermissionRepository:
         result = await self._session.execute(stmt)
         return list(result.scalars().all())
 
+    async def find_active_holders_by_items(
+        self,
+        group_ids: list[int],
+        access_ids: list[int],
+    ) -> list[tuple[str, int, int]]:
+        """Пары (тип права, item_id, user_id) активных прав на переданные группы и доступы."""
+
+        stmt = select(
+            UserPermission.permission_type,
+            UserPermission.item_id,
+            UserPermission.user_id,
+        ).where(
+            UserPermission.status == "active",
+            or_(
+                and_(
+                    UserPermission.permission_type == "group",
+                    UserPermission.item_id == any_(bindparam("group_ids", group_ids, type_=ARRAY(Integer))),
+                ),
+                and_(
+                    UserPermission.permission_type == "access",
+                    UserPermission.item_id == any_(bindparam("access_ids", access_ids, type_=ARRAY(Integer))),
+                ),
+            ),
+        )
+        result = await self._session.execute(stmt)
+        return [tuple(row) for row in result.all()]
+
+    async def find_stale_pending(self, submitted_before: datetime, limit: int) -> list[UserPermission]:
+        """Заявки pending, отправленные на валидацию раньше submitted_before, начиная с самых старых.
+
+        Строки блокируются до конца транзакции; заблокированные другой репликой пропускаются.
+        """
+
+        stmt = (
+            select(UserPermission)
+            .where(
+                UserPermission.status == "pending",
+                UserPermission.submitted_at < submitted_before,
+            )
+            .order_by(UserPermission.submitted_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await self._session.execute(stmt)
+        return list(result.scalars().all())
+
+    async def count_stale_pending(self, submitted_before: datetime) -> int:
+        stmt = select(func.count()).select_from(UserPermission).where(
+            UserPermission.status == "pending",
+            UserPermission.submitted_at < submitted_before,
+        )
+        result = await self._session.execute(stmt)
+        return result.scalar_one()
+
     async def save(self, permission: UserPermission) -> UserPermission:
         self._session.add(permission)
         await self._session.flush()
@@ -86,6 +145,9 @@ class UserPermissionRepository:
     async def flush(self) -> None:
         await self._session.flush()
 
+    async def commit(self) -> None:
+        await self._session.commit()
+
     async def delete(self, permission: UserPermission) -> None:
         await self._session.delete(permission)
         await self._session.flush()
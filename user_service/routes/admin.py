@@ -1,12 +1,24 @@
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query
 
 from user_service.models.models import (
     CreateUserRequest,
-    CreateUserResponse
+    CreateUserResponse,
+    DeadLetterMessage,
+    GetDeadLettersResponse,
+    ReplayDeadLettersRequest,
+    ReplayDeadLettersResponse,
 )
-from user_service.dependencies import get_user_repository
+from user_service.config.settings import Settings
+from user_service.dependencies import (
+    get_user_repository,
+    get_settings_dependency,
+    get_rabbitmq_manager_dependency,
+)
+from user_service.db.protocols import RabbitMQManagerProtocol
 from user_service.repositories.protocols import UserRepositoryProtocol
 from user_service.db.user import User
+from user_service.services.queue_routing import all_queue_names
+from user_service.services.retry import peek_dead_letters, replay_dead_letters
 
 router = APIRouter()
 
@@ -29,3 +41,52 @@ async def create_user(
     new_user = await user_repository.save(new_user)
 
     return CreateUserResponse(id=new_user.id, username=new_user.username)
+
+
+def _require_known_queue(queue: str, settings: Settings, rabbitmq: RabbitMQManagerProtocol) -> None:
+
+    known = {
+        name
+        for _, name in all_queue_names(
+            settings.rabbitmq_validation_queue, settings.rabbitmq_validation_queue_shards
+        )
+    }
+    known.add(settings.rabbitmq_result_queue)
+    if queue not in known:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown queue '{queue}'",
+        )
+    if not rabbitmq.is_connected or rabbitmq.channel is None:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="RabbitMQ is not connected",
+        )
+
+
+@router.get("/dead-letters", response_model=GetDeadLettersResponse)
+async def list_dead_letters(
+    queue: str = Query(description="Исходная очередь (validation_queue..., result_queue)"),
+    limit: int = Query(default=50, gt=0, le=1000),
+    settings: Settings = Depends(get_settings_dependency),
+    rabbitmq: RabbitMQManagerProtocol = Depends(get_rabbitmq_manager_dependency),
+):
+
+    _require_known_queue(queue, settings, rabbitmq)
+    messages = await peek_dead_letters(rabbitmq.channel, queue, limit)
+    return GetDeadLettersResponse(
+        queue=queue,
+        messages=[DeadLetterMessage(**message) for message in messages],
+    )
+
+
+@router.post("/dead-letters/replay", response_model=ReplayDeadLettersResponse)
+async def replay_dead_letter_messages(
+    replay_request: ReplayDeadLettersRequest,
+    settings: Settings = Depends(get_settings_dependency),
+    rabbitmq: RabbitMQManagerProtocol = Depends(get_rabbitmq_manager_dependency),
+):
+
+    _require_known_queue(replay_request.queue, settings, rabbitmq)
+    replayed = await replay_dead_letters(rabbitmq.channel, replay_request.queue, replay_request.limit)
+    return ReplayDeadLettersResponse(queue=replay_request.queue, replayed=replayed)
@@ -3,6 +3,7 @@ from datetime import datetime
 from sqlalchemy import text
 
 from user_service.dependencies import get_database, get_redis_client, get_rabbitmq_manager
+from user_service.services.batch_publisher import get_all_publisher_stats
 
 router = APIRouter()
 
@@ -16,6 +17,14 @@ async def health_check():
     }
 
 
+@router.get("/publisher")
+async def publisher_stats():
+    return {
+        "service": "user-service",
+        "publishers": get_all_publisher_stats()
+    }
+
+
 @router.get("/ready")
 async def readiness_check():
 
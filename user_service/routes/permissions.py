@@ -1,6 +1,7 @@
 import logging
+import time
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, Query, Response, status, Depends
 
 from user_service.models.models import (
     RequestAccessRequest,
@@ -9,14 +10,20 @@ from user_service.models.models import (
     RevokePermissionResponse,
     GetUserPermissionsResponse,
     GetActiveGroupsResponse,
+    GetPermissionHoldersRequest,
+    GetPermissionHoldersResponse,
 )
 from user_service.dependencies import (
     get_settings_dependency,
     get_rabbitmq_manager_dependency,
+    get_permission_result_waiter,
     get_permission_service,
 )
 from user_service.config.settings import Settings
 from user_service.db.protocols import RabbitMQManagerProtocol, PermissionServiceProtocol
+from user_service.services.metrics import record_request_wait
+from user_service.services.permission_events import PermissionResultWaiter
+from user_service.services.tracing import start_span
 
 
 logger = logging.getLogger(__name__)
@@ -27,39 +34,70 @@ router = APIRouter()
 @router.post("/request", response_model=RequestAccessResponse)
 async def request_access(
     request: RequestAccessRequest,
+    response: Response,
+    wait: bool = Query(default=False, description="Дождаться результата валидации"),
+    timeout: float | None = Query(default=None, gt=0, description="Сколько ждать результата, с"),
     service: PermissionServiceProtocol = Depends(get_permission_service),
     settings: Settings = Depends(get_settings_dependency),
     rabbitmq: RabbitMQManagerProtocol = Depends(get_rabbitmq_manager_dependency),
+    result_waiter: PermissionResultWaiter = Depends(get_permission_result_waiter),
 ):
     logger.debug(
         f"Получен запрос на создание заявки: user={request.user_id} permission_type={request.permission_type} item_id={request.item_id}"
     )
 
     try:
-        result = await service.create_request(request)
+        with start_span("db.create_request", attributes={"user.id": request.user_id}):
+            result = await service.create_request(request)
     except ValueError as exc:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail=str(exc),
         ) from exc
 
+    # Регистрация до публикации: результат не может прийти раньше, чем его начнут ждать
+    future = result_waiter.register(result.request_id) if wait else None
+
     try:
         await rabbitmq.publish_validation_request(
             user_id=request.user_id,
             permission_type=request.permission_type,
             item_id=request.item_id,
             request_id=result.request_id,
+            priority=request.priority,
         )
     except Exception:
         # Если публикация не удалась, логируем ошибку, но не прерываем обработку:
-        # заявка уже создана в БД, её можно будет обработать позже (например, через
-        # повторную публикацию или ручной запуск валидации).
+        # заявка уже создана в БД, PendingRequestReconciler отправит её повторно
+        # через pending_reconciler_threshold_seconds.
         logger.exception(
             f"Не удалось опубликовать запрос на валидацию в RabbitMQ: request_id={result.request_id}"
         )
+        if future is not None:
+            result_waiter.discard(result.request_id)
+            future = None
+            response.status_code = status.HTTP_202_ACCEPTED
 
     logger.debug(f"Заявка {result.request_id} успешно принята и отправлена на валидацию")
-    return result
+
+    if future is None:
+        return result
+
+    wait_timeout = min(
+        timeout if timeout is not None else settings.request_wait_timeout_seconds,
+        settings.request_wait_max_timeout_seconds,
+    )
+    started = time.perf_counter()
+    event = await result_waiter.wait(result.request_id, future, wait_timeout)
+    record_request_wait("completed" if event is not None else "timeout", time.perf_counter() - started)
+
+    if event is None:
+        # Результата нет — клиент узнает статус из списка прав, как без wait
+        logger.debug(f"Результат заявки {result.request_id} не получен за {wait_timeout} с")
+        response.status_code = status.HTTP_202_ACCEPTED
+        return result
+
+    return RequestAccessResponse(status=event["status"], request_id=result.request_id)
 
 
 @router.delete("/users/{user_id}/permissions", response_model=RevokePermissionResponse)
@@ -105,3 +143,16 @@ async def get_current_active_groups(
     logger.debug(f"Получение активных групп пользователя user={user_id}")
 
     return await service.get_active_groups(user_id)
+
+
+@router.post("/permissions/holders", response_model=GetPermissionHoldersResponse)
+async def get_permission_holders(
+    holders_request: GetPermissionHoldersRequest,
+    service: PermissionServiceProtocol = Depends(get_permission_service),
+):
+    """Пакетное получение пользователей с активными правами на группы и доступы."""
+    logger.debug(
+        f"Получение владельцев прав: groups={holders_request.group_ids} accesses={holders_request.access_ids}"
+    )
+
+    return await service.get_permission_holders(holders_request)
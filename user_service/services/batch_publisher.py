@@ -0,0 +1,180 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any
+
+import aio_pika
+from aio_pika.abc import AbstractChannel
+from aio_pika.exceptions import DeliveryError
+
+logger = logging.getLogger(__name__)
+
+
+class BatchPublisher:
+    """Конвейерная публикация с подтверждениями брокера (publisher confirms).
+
+    Как в алгоритме Нейгла: если других пачек в полете нет, сообщение уходит сразу; пока
+    брокер подтверждает предыдущую пачку, сообщения копятся в буфере и уходят следующей пачкой
+    по ее подтверждению, по размеру или по таймеру. Подтверждения всей пачки ожидаются одновременно. publish() завершается только
+    после ack брокера — вызывающий может подтверждать входящее сообщение (at-least-once).
+    Число неподтвержденных сообщений ограничено окном, nack повторяется с паузой.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        channel: AbstractChannel,
+        max_batch_size: int = 100,
+        flush_interval: float = 0.005,
+        max_outstanding: int = 1000,
+        max_retries: int = 3,
+        retry_backoff: float = 0.05,
+    ):
+        self.name = name
+        self._channel = channel
+        self._max_batch_size = max_batch_size
+        self._flush_interval = flush_interval
+        self._max_retries = max_retries
+        self._retry_backoff = retry_backoff
+        self._window = asyncio.Semaphore(max_outstanding)
+        self._buffer: list[tuple[aio_pika.Message, str, asyncio.Future]] = []
+        self._flush_handle: asyncio.TimerHandle | None = None
+        self._batch_tasks: set[asyncio.Task] = set()
+        self.published = 0
+        self.confirmed = 0
+        self.nacked = 0
+        self.retried = 0
+        self.failed = 0
+        self.batches = 0
+        self.outstanding = 0
+
+    async def publish(self, message: aio_pika.Message, routing_key: str) -> None:
+
+        await self._window.acquire()
+        self.outstanding += 1
+        try:
+            future = asyncio.get_running_loop().create_future()
+            self._buffer.append((message, routing_key, future))
+            self.published += 1
+
+            # Одиночный публикатор не ждет таймер: копить есть смысл, только пока пачка в полете
+            if len(self._buffer) >= self._max_batch_size or not self._batch_tasks:
+                self._flush_now()
+            elif self._flush_handle is None:
+                self._flush_handle = asyncio.get_running_loop().call_later(
+                    self._flush_interval, self._flush_now
+                )
+
+            # shield: отмена ожидающего не отменяет уже отправленную пачку
+            await asyncio.shield(future)
+        finally:
+            self.outstanding -= 1
+            self._window.release()
+
+    def _flush_now(self) -> None:
+
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._buffer:
+            return
+
+        batch, self._buffer = self._buffer, []
+        self.batches += 1
+        task = asyncio.create_task(self._publish_batch(batch))
+        self._batch_tasks.add(task)
+        task.add_done_callback(self._on_batch_done)
+
+    def _on_batch_done(self, task: asyncio.Task) -> None:
+
+        self._batch_tasks.discard(task)
+        # Накопленное за время подтверждения уходит сразу, не дожидаясь таймера
+        if self._buffer and not self._batch_tasks:
+            self._flush_now()
+
+    async def _publish_batch(self, batch: list[tuple[aio_pika.Message, str, asyncio.Future]]) -> None:
+
+        # Все сообщения пачки уходят в канал сразу, подтверждения ожидаются параллельно
+        results = await asyncio.gather(
+            *(self._publish_one(message, routing_key) for message, routing_key, _ in batch),
+            return_exceptions=True,
+        )
+        for (_, _, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                self.failed += 1
+                future.set_exception(result)
+            else:
+                self.confirmed += 1
+                future.set_result(None)
+
+    async def _publish_one(self, message: aio_pika.Message, routing_key: str) -> None:
+
+        attempt = 1
+        while True:
+            try:
+                await self._channel.default_exchange.publish(message, routing_key=routing_key)
+                return
+            except DeliveryError:
+                self.nacked += 1
+                if attempt >= self._max_retries:
+                    logger.error(f"Брокер отклонил сообщение в {routing_key} после {attempt} попыток")
+                    raise
+                logger.debug(f"Брокер отклонил сообщение в {routing_key}, повтор {attempt}")
+
+            self.retried += 1
+            await asyncio.sleep(self._retry_backoff * 2 ** (attempt - 1))
+            attempt += 1
+
+    async def flush(self) -> None:
+        """Отправляет буфер и ждет подтверждения всех отправленных пачек."""
+
+        self._flush_now()
+        if self._batch_tasks:
+            await asyncio.gather(*self._batch_tasks, return_exceptions=True)
+
+    async def close(self) -> None:
+        await self.flush()
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "published": self.published,
+            "confirmed": self.confirmed,
+            "nacked": self.nacked,
+            "retried": self.retried,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch_size": round(self.published / self.batches, 2) if self.batches else 0.0,
+            "outstanding": self.outstanding,
+            "buffered": len(self._buffer),
+        }
+
+
+_publishers: dict[str, BatchPublisher] = {}
+
+
+def create_batch_publisher(
+    name: str,
+    channel: AbstractChannel,
+    max_batch_size: int = 100,
+    flush_interval: float = 0.005,
+    max_outstanding: int = 1000,
+    max_retries: int = 3,
+) -> BatchPublisher:
+
+    publisher = BatchPublisher(
+        name=name,
+        channel=channel,
+        max_batch_size=max_batch_size,
+        flush_interval=flush_interval,
+        max_outstanding=max_outstanding,
+        max_retries=max_retries,
+    )
+    _publishers[name] = publisher
+    return publisher
+
+
+def get_all_publisher_stats() -> dict[str, dict[str, Any]]:
+    return {name: publisher.snapshot() for name, publisher in _publishers.items()}
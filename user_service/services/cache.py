@@ -6,9 +6,11 @@ import json
 import redis.asyncio as redis
 
 from user_service.config.settings import get_settings
+from user_service.services.metrics import record_cache_lookup
 
 
 USER_GROUPS_KEY_PREFIX = "user:{user_id}:active_groups"
+PROCESSED_RESULT_KEY_PREFIX = "validation_result:{request_id}:processed"
 
 
 def _build_user_groups_key(user_id: int) -> str:
@@ -23,6 +25,7 @@ async def get_user_groups_from_cache(
 
     key = _build_user_groups_key(user_id)
     cached_value = await redis_conn.get(key)
+    record_cache_lookup("user_groups", cached_value is not None)
     if cached_value is None:
         return None
 
@@ -51,3 +54,27 @@ async def invalidate_user_groups_cache(
 
     key = _build_user_groups_key(user_id)
     await redis_conn.delete(key)
+
+
+def _build_processed_result_key(request_id: str) -> str:
+
+    return PROCESSED_RESULT_KEY_PREFIX.format(request_id=request_id)
+
+
+async def is_result_processed(
+    redis_conn: redis.Redis,
+    request_id: str,
+) -> bool:
+
+    processed = bool(await redis_conn.exists(_build_processed_result_key(request_id)))
+    record_cache_lookup("processed_results", processed)
+    return processed
+
+
+async def mark_result_processed(
+    redis_conn: redis.Redis,
+    request_id: str,
+) -> None:
+
+    ttl = get_settings().cache_ttl_processed_results_seconds
+    await redis_conn.set(_build_processed_result_key(request_id), "1", ex=ttl, nx=True)
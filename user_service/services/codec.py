@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import json
+import struct
+import uuid
+from typing import Any
+
+from user_service.models.enums import PermissionType, ReasonCode
+
+# Компактный формат сообщений validation_queue и result_queue
+# (тот же, что в validation_service/rabbitmq/codec.py). Формат выбирается по content_type
+# сообщения; JSON по-прежнему принимается.
+
+JSON_CONTENT_TYPE = "application/json"
+WIRE_FORMAT_VERSION = 1
+VALIDATION_REQUEST_CONTENT_TYPE = f"application/vnd.validation-request.v{WIRE_FORMAT_VERSION}"
+VALIDATION_RESULT_CONTENT_TYPE = f"application/vnd.validation-result.v{WIRE_FORMAT_VERSION}"
+
+WIRE_FORMAT_JSON = "json"
+WIRE_FORMAT_BINARY = "binary"
+
+_REQUEST_HEADER = struct.Struct("<BBBqq")
+_RESULT_HEADER = struct.Struct("<BBBBqq")
+_CONFLICT = struct.Struct("<qq")
+_LENGTH = struct.Struct("<H")
+
+_FLAG_UUID = 0x01
+_FLAG_APPROVED = 0x02
+_FLAG_REASON_TEXT = 0x04
+
+_PERMISSION_CODES = {PermissionType.ACCESS: 0, PermissionType.GROUP: 1}
+_PERMISSION_TYPES = {code: permission_type for permission_type, code in _PERMISSION_CODES.items()}
+
+
+def _encode_request_id(request_id: str) -> tuple[int, bytes]:
+
+    try:
+        parsed = uuid.UUID(request_id)
+    except ValueError:
+        parsed = None
+    if parsed is not None and str(parsed) == request_id:
+        return _FLAG_UUID, parsed.bytes
+
+    encoded = request_id.encode("utf-8")
+    return 0, _LENGTH.pack(len(encoded)) + encoded
+
+
+def _decode_text(data: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    if len(data) < offset + length:
+        raise ValueError("Сообщение обрезано")
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _decode_request_id(data: bytes, offset: int, flags: int) -> tuple[str, int]:
+
+    if flags & _FLAG_UUID:
+        if len(data) < offset + 16:
+            raise ValueError("Сообщение обрезано")
+        return str(uuid.UUID(bytes=data[offset:offset + 16])), offset + 16
+    return _decode_text(data, offset)
+
+
+def _is_binary(content_type: str | None, binary_content_type: str) -> bool:
+    return (content_type or "").split(";", 1)[0].strip().lower() == binary_content_type
+
+
+def encode_validation_request(
+    user_id: int,
+    permission_type: PermissionType,
+    item_id: int,
+    request_id: str,
+    wire_format: str = WIRE_FORMAT_JSON,
+) -> tuple[bytes, str]:
+    """Тело и content_type заявки на валидацию в выбранном формате."""
+
+    if wire_format != WIRE_FORMAT_BINARY:
+        body = json.dumps({
+            "user_id": user_id,
+            "permission_type": permission_type.value,
+            "item_id": item_id,
+            "request_id": request_id,
+        }).encode("utf-8")
+        return body, JSON_CONTENT_TYPE
+
+    flags, encoded_request_id = _encode_request_id(request_id)
+    body = _REQUEST_HEADER.pack(
+        WIRE_FORMAT_VERSION,
+        _PERMISSION_CODES[permission_type],
+        flags,
+        user_id,
+        item_id,
+    ) + encoded_request_id
+    return body, VALIDATION_REQUEST_CONTENT_TYPE
+
+
+def decode_validation_result(body: bytes, content_type: str | None) -> dict[str, Any]:
+    """Результат валидации в виде словаря с теми же ключами, что и JSON-сообщение."""
+
+    if not _is_binary(content_type, VALIDATION_RESULT_CONTENT_TYPE):
+        return json.loads(body.decode("utf-8"))
+
+    try:
+        version, permission_code, flags, reason_code, user_id, item_id = _RESULT_HEADER.unpack_from(body)
+        if version != WIRE_FORMAT_VERSION:
+            raise ValueError(f"Неподдерживаемая версия формата сообщения: {version}")
+
+        offset = _RESULT_HEADER.size
+        result: dict[str, Any] = {}
+        if reason_code == ReasonCode.CONFLICT:
+            result["conflict_user_group_id"], result["conflict_requested_group_id"] = _CONFLICT.unpack_from(
+                body, offset
+            )
+            offset += _CONFLICT.size
+        request_id, offset = _decode_request_id(body, offset, flags)
+        if flags & _FLAG_REASON_TEXT:
+            result["reason"] = _decode_text(body, offset)[0]
+        permission_type = _PERMISSION_TYPES[permission_code]
+    except (struct.error, KeyError, UnicodeDecodeError) as e:
+        raise ValueError(f"Некорректный результат в бинарном формате: {e!r}") from e
+
+    result.update({
+        "request_id": request_id,
+        "approved": bool(flags & _FLAG_APPROVED),
+        "user_id": user_id,
+        "permission_type": permission_type.value,
+        "item_id": item_id,
+        "reason_code": reason_code,
+    })
+    return result
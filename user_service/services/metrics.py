@@ -0,0 +1,208 @@
+from __future__ import annotations
+
+import time
+
+from fastapi import FastAPI, Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    ProcessCollector,
+    generate_latest,
+)
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+# Отдельный реестр сервиса: в /metrics попадают только метрики этого сервиса
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "Количество обработанных HTTP запросов",
+    ["method", "route", "status"],
+    registry=REGISTRY,
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP запроса",
+    ["method", "route"],
+    registry=REGISTRY,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Количество HTTP запросов в обработке",
+    ["method"],
+    registry=REGISTRY,
+)
+
+DB_QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Время выполнения SQL запроса",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+    registry=REGISTRY,
+)
+DB_QUERY_ERRORS_TOTAL = Counter(
+    "db_query_errors_total",
+    "Количество SQL запросов, завершившихся ошибкой",
+    ["operation"],
+    registry=REGISTRY,
+)
+
+CACHE_REQUESTS_TOTAL = Counter(
+    "cache_requests_total",
+    "Обращения к кэшу Redis по семействам ключей",
+    ["family", "result"],
+    registry=REGISTRY,
+)
+
+QUEUE_MESSAGES_PUBLISHED_TOTAL = Counter(
+    "queue_messages_published_total",
+    "Количество опубликованных сообщений",
+    ["queue"],
+    registry=REGISTRY,
+)
+QUEUE_PUBLISH_ERRORS_TOTAL = Counter(
+    "queue_publish_errors_total",
+    "Количество ошибок публикации сообщений",
+    ["queue"],
+    registry=REGISTRY,
+)
+QUEUE_MESSAGES_CONSUMED_TOTAL = Counter(
+    "queue_messages_consumed_total",
+    "Количество полученных сообщений по результату обработки",
+    ["queue", "outcome"],
+    registry=REGISTRY,
+)
+QUEUE_MESSAGE_PROCESSING_DURATION = Histogram(
+    "queue_message_processing_seconds",
+    "Время обработки сообщения из очереди",
+    ["queue"],
+    registry=REGISTRY,
+)
+QUEUE_MESSAGES_IN_PROGRESS = Gauge(
+    "queue_messages_in_progress",
+    "Количество сообщений в обработке",
+    ["queue"],
+    registry=REGISTRY,
+)
+VALIDATION_RESULT_DUPLICATES_TOTAL = Counter(
+    "validation_result_duplicates_total",
+    "Повторно доставленные результаты валидации, пропущенные без изменений",
+    ["layer"],
+    registry=REGISTRY,
+)
+REQUEST_WAIT_TOTAL = Counter(
+    "request_wait_total",
+    "Заявки с ожиданием результата (wait=true) по исходу ожидания",
+    ["outcome"],
+    registry=REGISTRY,
+)
+REQUEST_WAIT_DURATION = Histogram(
+    "request_wait_duration_seconds",
+    "Время ожидания результата валидации в POST /request?wait=true",
+    registry=REGISTRY,
+)
+PENDING_BACKLOG = Gauge(
+    "pending_requests_backlog",
+    "Заявки pending, не получившие результат дольше порога реконсилятора (на момент последнего прохода)",
+    registry=REGISTRY,
+)
+PENDING_REPUBLISHED_TOTAL = Counter(
+    "pending_requests_republished_total",
+    "Повторные отправки зависших заявок на валидацию",
+    ["result"],
+    registry=REGISTRY,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+DB_OPERATIONS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+_QUERY_START_KEY = "metrics_query_start"
+
+
+def record_cache_lookup(family: str, hit: bool) -> None:
+    CACHE_REQUESTS_TOTAL.labels(family=family, result="hit" if hit else "miss").inc()
+
+
+def record_duplicate_result(layer: str) -> None:
+    """layer: redis — отсечен по отметке в Redis, db — заявка уже не в статусе pending."""
+    VALIDATION_RESULT_DUPLICATES_TOTAL.labels(layer=layer).inc()
+
+
+def record_request_wait(outcome: str, duration: float) -> None:
+    """outcome: completed — результат получен, timeout — ответ 202 без результата."""
+    REQUEST_WAIT_TOTAL.labels(outcome=outcome).inc()
+    REQUEST_WAIT_DURATION.observe(duration)
+
+
+def set_pending_backlog(count: int) -> None:
+    PENDING_BACKLOG.set(count)
+
+
+def record_pending_republish(published: int, failed: int) -> None:
+    if published:
+        PENDING_REPUBLISHED_TOTAL.labels(result="published").inc(published)
+    if failed:
+        PENDING_REPUBLISHED_TOTAL.labels(result="failed").inc(failed)
+
+
+def _sql_operation(statement: str) -> str:
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else ""
+    return operation if operation in DB_OPERATIONS else "OTHER"
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Подписка на события SQLAlchemy для замера времени каждого SQL запроса."""
+
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault(_QUERY_START_KEY, []).append(time.perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info[_QUERY_START_KEY].pop()
+        DB_QUERY_DURATION.labels(operation=_sql_operation(statement)).observe(
+            time.perf_counter() - started
+        )
+
+    @event.listens_for(sync_engine, "handle_error")
+    def _handle_error(context):
+        starts = context.connection.info.get(_QUERY_START_KEY) if context.connection else None
+        if starts:
+            starts.pop()
+        DB_QUERY_ERRORS_TOTAL.labels(operation=_sql_operation(context.statement or "")).inc()
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """Middleware с метриками HTTP запросов и endpoint /metrics."""
+
+    @app.middleware("http")
+    async def metrics_middleware(request: Request, call_next):
+
+        method = request.method
+        HTTP_REQUESTS_IN_PROGRESS.labels(method=method).inc()
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            # Шаблон пути (/groups/{group_id}), а не сам путь — иначе метки не ограничены
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            HTTP_REQUEST_DURATION.labels(method=method, route=route_path).observe(
+                time.perf_counter() - started
+            )
+            HTTP_REQUESTS_TOTAL.labels(method=method, route=route_path, status=str(status_code)).inc()
+            HTTP_REQUESTS_IN_PROGRESS.labels(method=method).dec()
+
+    async def metrics_endpoint() -> Response:
+        return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
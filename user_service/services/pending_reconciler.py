@@ -0,0 +1,155 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta
+
+from user_service.db.protocols import DatabaseProtocol, RabbitMQManagerProtocol
+from user_service.models.enums import PermissionType, RequestPriority
+from user_service.repositories.user_permission_repository import UserPermissionRepository
+from user_service.services.metrics import record_pending_republish, set_pending_backlog
+
+logger = logging.getLogger(__name__)
+
+
+class PendingRequestReconciler:
+    """Повторная отправка на валидацию заявок, зависших в статусе pending.
+
+    Заявка зависает, если публикация в validation_queue не удалась после фиксации в БД или
+    сообщение потерялось по дороге. Раз в interval реконсилятор выбирает pending заявки, отправленные
+    раньше порога (индекс по status, submitted_at), пачками по batch_size с блокировкой SKIP LOCKED —
+    реплики не отправляют одну заявку дважды — публикует их в bulk-полосу не быстрее max_rate в
+    секунду и обновляет submitted_at.
+
+    Сообщение помечается заголовком REPUBLISH_HEADER, и Validation Service проверяет заявку заново,
+    даже если уже отметил её как проверенную. Поэтому, пока в очередях валидации есть сообщения,
+    проход пропускается: заявка могла зависнуть в очереди, а не потеряться, и повторная отправка
+    только удвоила бы нагрузку на перегруженную валидацию. Повторный результат для уже
+    обработанной заявки ResultConsumer пропустит.
+    """
+
+    def __init__(
+        self,
+        db: DatabaseProtocol,
+        rabbitmq_manager: RabbitMQManagerProtocol,
+        threshold: float = 300.0,
+        interval: float = 30.0,
+        batch_size: int = 100,
+        max_rate: float = 200.0,
+    ):
+        self._db = db
+        self._rabbitmq_manager = rabbitmq_manager
+        self._threshold = threshold
+        self._interval = interval
+        self._batch_size = max(batch_size, 1)
+        self._max_rate = max_rate
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+
+        while True:
+            try:
+                await self.reconcile()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Проход реконсилятора заявок завершился с ошибкой: {e}")
+            await asyncio.sleep(self._interval)
+
+    async def reconcile(self) -> int:
+        """Один проход; возвращает число повторно отправленных заявок."""
+
+        if self._db.AsyncSessionLocal is None:
+            raise RuntimeError("БД не инициализирована")
+
+        # Порог фиксируется на проход: отправленные в нем заявки получают новый submitted_at
+        # и в следующую пачку не попадают
+        submitted_before = datetime.utcnow() - timedelta(seconds=self._threshold)
+
+        async with self._db.AsyncSessionLocal() as session:
+            backlog = await UserPermissionRepository(session=session).count_stale_pending(submitted_before)
+        # Отправленные заявки из метрики не вычитаются: публикация еще не дает результата,
+        # и без него заявка снова попадет в счет через threshold
+        set_pending_backlog(backlog)
+        if not backlog or not self._rabbitmq_manager.is_connected:
+            return 0
+
+        depth = await self._rabbitmq_manager.validation_queue_depth()
+        if depth:
+            logger.info(
+                f"Зависших pending заявок: {backlog}, но в очередях валидации {depth} сообщений — "
+                f"повторная отправка отложена"
+            )
+            return 0
+
+        logger.info(f"Зависших pending заявок: {backlog}, повторная отправка на валидацию")
+        republished = 0
+        while self._rabbitmq_manager.is_connected:
+            started = time.monotonic()
+            published, selected = await self._republish_batch(submitted_before)
+            republished += published
+            if published < selected or selected < self._batch_size:
+                break
+            # Ограничение скорости: пачка из batch_size заявок не чаще раза в batch_size / max_rate секунд
+            if self._max_rate > 0:
+                await asyncio.sleep(max(selected / self._max_rate - (time.monotonic() - started), 0.0))
+
+        logger.info(f"Повторно отправлено на валидацию заявок: {republished}")
+        return republished
+
+    async def _republish_batch(self, submitted_before: datetime) -> tuple[int, int]:
+        """Публикует одну пачку в транзакции; возвращает (отправлено, выбрано)."""
+
+        async with self._db.AsyncSessionLocal() as session:
+            repository = UserPermissionRepository(session=session)
+            permissions = await repository.find_stale_pending(submitted_before, self._batch_size)
+            if not permissions:
+                return 0, 0
+
+            # Публикации пачки идут параллельно: публикатор RabbitMQManager подтверждает их одной серией
+            results = await asyncio.gather(
+                *(
+                    self._rabbitmq_manager.publish_validation_request(
+                        user_id=permission.user_id,
+                        permission_type=PermissionType(permission.permission_type),
+                        item_id=permission.item_id,
+                        request_id=permission.request_id,
+                        priority=RequestPriority.BULK,
+                        republish=True,
+                    )
+                    for permission in permissions
+                ),
+                return_exceptions=True,
+            )
+
+            now = datetime.utcnow()
+            published = 0
+            for permission, result in zip(permissions, results):
+                if isinstance(result, BaseException):
+                    logger.warning(
+                        f"Не удалось повторно отправить заявку {permission.request_id} на валидацию: {result}"
+                    )
+                    continue
+                permission.submitted_at = now
+                published += 1
+
+            await session.commit()
+
+        record_pending_republish(published, len(permissions) - published)
+        return published, len(permissions)
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+from typing import Any
+
+import redis.asyncio as redis
+
+from user_service.models.enums import PermissionStatus
+
+logger = logging.getLogger(__name__)
+
+# Канал смены статуса заявки после фиксации в БД: pending и revoked публикует PermissionService,
+# active и rejected — ResultConsumer. Событие: {"request_id", "user_id", "permission_type", "item_id", "status"}.
+# Канал читают ожидающие POST /request?wait=true и поток событий BFF (GET /permissions/events).
+PERMISSION_EVENTS_CHANNEL = "permissions:events"
+
+
+def build_permission_event(
+    request_id: str,
+    user_id: int,
+    permission_type: str,
+    item_id: int,
+    status: str,
+) -> dict[str, Any]:
+    return {
+        "request_id": request_id,
+        "user_id": user_id,
+        "permission_type": permission_type,
+        "item_id": item_id,
+        "status": status,
+    }
+
+
+async def publish_permission_event(redis_conn: redis.Redis, event: dict[str, Any]) -> None:
+
+    receivers = await redis_conn.publish(PERMISSION_EVENTS_CHANNEL, json.dumps(event))
+    logger.debug(f"Событие заявки {event['request_id']} ({event['status']}) отправлено {receivers} подписчикам")
+
+
+class PermissionResultWaiter:
+    """Ожидание результата валидации заявки для POST /request?wait=true.
+
+    Обработчик регистрирует request_id до публикации заявки и ждет future. Future
+    завершается либо напрямую ResultConsumer этого процесса, либо событием из Redis
+    pub/sub, если результат применила другая реплика.
+    """
+
+    def __init__(self, reconnect_delay: float = 1.0):
+        self._reconnect_delay = reconnect_delay
+        self._waiters: dict[str, asyncio.Future] = {}
+        self._redis_conn: redis.Redis | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def pending(self) -> int:
+        return len(self._waiters)
+
+    def register(self, request_id: str) -> asyncio.Future:
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters[request_id] = future
+        return future
+
+    def discard(self, request_id: str) -> None:
+
+        future = self._waiters.pop(request_id, None)
+        if future is not None and not future.done():
+            future.cancel()
+
+    def resolve(self, event: dict[str, Any]) -> bool:
+        """Передает событие ожидающему обработчику; False, если заявку в этом процессе не ждут."""
+
+        # pending — создание заявки, а не результат валидации
+        if event.get("status") == PermissionStatus.PENDING.value:
+            return False
+        future = self._waiters.pop(str(event.get("request_id")), None)
+        if future is None or future.done():
+            return False
+        future.set_result(event)
+        return True
+
+    async def wait(self, request_id: str, future: asyncio.Future, timeout: float) -> dict[str, Any] | None:
+
+        try:
+            return await asyncio.wait_for(future, timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._waiters.pop(request_id, None)
+
+    def start(self, redis_conn: redis.Redis) -> None:
+
+        self._redis_conn = redis_conn
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+
+        for request_id in list(self._waiters):
+            self.discard(request_id)
+
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+
+        while True:
+            pubsub = self._redis_conn.pubsub()
+            try:
+                await pubsub.subscribe(PERMISSION_EVENTS_CHANNEL)
+                logger.debug(f"Подписка на канал {PERMISSION_EVENTS_CHANNEL} установлена")
+
+                async for message in pubsub.listen():
+                    if message.get("type") != "message" or not self._waiters:
+                        continue
+                    try:
+                        event = json.loads(message["data"])
+                    except (ValueError, TypeError) as e:
+                        logger.warning(f"Некорректное событие заявки: {e}")
+                        continue
+                    if isinstance(event, dict):
+                        self.resolve(event)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    f"Подписка на события заявок прервана: {e}, повтор через {self._reconnect_delay}с"
+                )
+                await asyncio.sleep(self._reconnect_delay)
+            finally:
+                try:
+                    await pubsub.reset()
+                except Exception:
+                    pass
@@ -15,6 +15,8 @@ from user_service.services.cache import (
     get_user_groups_from_cache,
     set_user_groups_cache,
 )
+from user_service.services.metrics import record_duplicate_result
+from user_service.services.permission_events import build_permission_event, publish_permission_event
 from user_service.services.mapping import (
     permission_model_to_schema,
     permissions_to_active_groups_schema,
@@ -25,6 +27,9 @@ from user_service.models.models import (
     GetUserPermissionsResponse,
     GetActiveGroupsResponse,
     ActiveGroup,
+    GetPermissionHoldersRequest,
+    GetPermissionHoldersResponse,
+    PermissionHolders,
 )
 logger = logging.getLogger(__name__)
 
@@ -67,6 +72,7 @@ class PermissionService:
             existing_permission.status = PermissionStatus.PENDING.value
             existing_permission.request_id = new_request_id
             existing_permission.assigned_at = None
+            existing_permission.submitted_at = datetime.utcnow()
             await self._permission_repository.save(existing_permission)
             logger.debug(
                 f"Повторное использование заявки {new_request_id}: статус переведён в pending"
@@ -80,10 +86,22 @@ class PermissionService:
                 status=PermissionStatus.PENDING.value,
                 request_id=new_request_id,
                 assigned_at=None,
+                submitted_at=datetime.utcnow(),
             )
             await self._permission_repository.save(permission_record)
             logger.debug(f"Создана новая заявка {new_request_id}")
 
+        # Фиксация до публикации в validation_queue: иначе ResultConsumer может не найти заявку
+        # (или ждать блокировки строки, пока POST /request?wait=true ждет результата)
+        await self._permission_repository.commit()
+        await self._publish_event(
+            new_request_id,
+            request_data.user_id,
+            request_data.permission_type.value,
+            request_data.item_id,
+            PermissionStatus.PENDING.value,
+        )
+
         logger.debug(f"Заявка {new_request_id} успешно создана")
         return RequestAccessResponse(status="accepted", request_id=new_request_id)
 
@@ -127,6 +145,40 @@ class PermissionService:
 
         return response
 
+    async def get_permission_holders(
+        self,
+        holders_request: GetPermissionHoldersRequest,
+    ) -> GetPermissionHoldersResponse:
+
+        group_ids = sorted(set(holders_request.group_ids))
+        access_ids = sorted(set(holders_request.access_ids))
+
+        if not group_ids and not access_ids:
+            return GetPermissionHoldersResponse()
+
+        rows = await self._permission_repository.find_active_holders_by_items(group_ids, access_ids)
+
+        holders: dict[str, dict[int, list[int]]] = {
+            PermissionType.GROUP.value: {group_id: [] for group_id in group_ids},
+            PermissionType.ACCESS.value: {access_id: [] for access_id in access_ids},
+        }
+        for permission_type, item_id, user_id in rows:
+            holders[permission_type][item_id].append(user_id)
+
+        logger.debug(
+            f"Найдено {len(rows)} активных прав для групп {group_ids} и доступов {access_ids}"
+        )
+        return GetPermissionHoldersResponse(
+            groups=[
+                PermissionHolders(item_id=item_id, user_ids=sorted(user_ids))
+                for item_id, user_ids in holders[PermissionType.GROUP.value].items()
+            ],
+            accesses=[
+                PermissionHolders(item_id=item_id, user_ids=sorted(user_ids))
+                for item_id, user_ids in holders[PermissionType.ACCESS.value].items()
+            ],
+        )
+
     async def apply_validation_result(
         self,
         request_id: str,
@@ -134,12 +186,14 @@ class PermissionService:
         user_id: int,
         permission_type: PermissionType,
         item_id: int,
-    ) -> UserPermission | None:
+    ) -> tuple[UserPermission | None, bool]:
+        """Применяет результат к pending заявке; возвращает (заявка, был ли переход статуса)."""
 
-        permission = await self._permission_repository.find_by_request_id(request_id)
+        # Блокировка строки: параллельные доставки одного результата применяются по очереди
+        permission = await self._permission_repository.find_by_request_id(request_id, for_update=True)
 
         if permission is None:
-            return None
+            return None, False
 
         if (
             permission.user_id != user_id
@@ -151,7 +205,16 @@ class PermissionService:
                 f"ожидалось user_id={user_id}, permission_type={permission_type}, item_id={item_id}, "
                 f"найдено user_id={permission.user_id}, permission_type={permission.permission_type}, item_id={permission.item_id}"
             )
-            return None
+            return None, False
+
+        # Результат применяется только к заявке в статусе pending: повторная доставка
+        # (или результат для уже отозванной заявки) не меняет статус и не сбрасывает кэш
+        if permission.status != PermissionStatus.PENDING.value:
+            record_duplicate_result("db")
+            logger.debug(
+                f"Заявка {request_id} уже в статусе {permission.status}, результат валидации пропущен"
+            )
+            return permission, False
 
         if approved:
             permission.status = PermissionStatus.ACTIVE.value
@@ -167,7 +230,7 @@ class PermissionService:
                 f"Кэш активных групп инвалидирован: user_id={user_id} (из-за изменения статуса заявки {request_id})"
             )
 
-        return permission
+        return permission, True
 
     async def revoke_permission(
         self,
@@ -189,11 +252,42 @@ class PermissionService:
         permission.status = PermissionStatus.REVOKED.value
         permission.assigned_at = datetime.utcnow()
         await self._permission_repository.save(permission)
+        # Событие отзыва уходит подписчикам только после фиксации
+        await self._permission_repository.commit()
 
         if self._redis_conn is not None and permission.permission_type == PermissionType.GROUP.value:
-            await invalidate_user_groups_cache(self.redis_conn, user_id)
+            await invalidate_user_groups_cache(self._redis_conn, user_id)
             logger.debug(
                 f"Кэш активных групп инвалидирован: user_id={user_id} (из-за отзыва группы permission_type={permission.permission_type}, item_id={permission.item_id})"
             )
 
+        await self._publish_event(
+            permission.request_id,
+            user_id,
+            permission.permission_type,
+            permission.item_id,
+            PermissionStatus.REVOKED.value,
+        )
+
         return permission
+
+    async def _publish_event(
+        self,
+        request_id: str,
+        user_id: int,
+        permission_type: str,
+        item_id: int,
+        status: str,
+    ) -> None:
+        """Смена статуса для потока событий BFF; ошибка Redis не отменяет уже зафиксированную операцию."""
+
+        if self._redis_conn is None:
+            return
+
+        try:
+            await publish_permission_event(
+                self._redis_conn,
+                build_permission_event(request_id, user_id, permission_type, item_id, status),
+            )
+        except Exception as exc:
+            logger.warning(f"Не удалось опубликовать событие заявки: request_id={request_id}, {exc}")
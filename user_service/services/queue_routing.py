@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import zlib
+
+# Маршрутизация заявок на валидацию: полоса (interactive/bulk) выбирается вызывающей стороной,
+# шард — по user_id, так что заявки одного пользователя всегда попадают в одну очередь.
+# Имена очередей: validation_queue[.bulk][.<шард>]; при одном шарде interactive-очередь
+# совпадает с прежней validation_queue.
+# Копия validation_service/rabbitmq/routing.py — схемы должны совпадать.
+
+LANE_INTERACTIVE = "interactive"
+LANE_BULK = "bulk"
+LANES = (LANE_INTERACTIVE, LANE_BULK)
+
+# Заголовок повторной отправки зависшей заявки: консьюмер валидации обрабатывает такое сообщение,
+# даже если заявка уже отмечена как проверенная, — прежний результат до User Service не дошел
+REPUBLISH_HEADER = "x-republish"
+
+
+def shard_for(user_id: int, shards: int) -> int:
+    """Номер шарда пользователя; crc32, в отличие от hash(), одинаков во всех процессах."""
+
+    if shards <= 1:
+        return 0
+    return zlib.crc32(str(user_id).encode("ascii")) % shards
+
+
+def queue_name(base: str, lane: str, shard: int, shards: int) -> str:
+
+    if lane not in LANES:
+        raise ValueError(f"Неизвестная полоса очереди: {lane}")
+    name = base if lane == LANE_INTERACTIVE else f"{base}.{lane}"
+    return name if shards <= 1 else f"{name}.{shard}"
+
+
+def route(base: str, user_id: int, lane: str, shards: int) -> str:
+    return queue_name(base, lane, shard_for(user_id, shards), shards)
+
+
+def all_queue_names(base: str, shards: int) -> list[tuple[str, str]]:
+    """Пары (полоса, имя очереди) для всех шардов обеих полос."""
+
+    return [
+        (lane, queue_name(base, lane, shard, shards))
+        for lane in LANES
+        for shard in range(max(shards, 1))
+    ]
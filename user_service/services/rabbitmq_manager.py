@@ -1,13 +1,27 @@
 from __future__ import annotations
 
-import json
 import logging
+import time
 
 import aio_pika
 from aio_pika.abc import AbstractConnection, AbstractChannel, AbstractQueue
 
 from user_service.config.settings import Settings
-from user_service.models.enums import PermissionType
+from user_service.models.enums import PermissionType, RequestPriority
+from user_service.services.codec import encode_validation_request
+from user_service.services.batch_publisher import BatchPublisher, create_batch_publisher
+from user_service.services.queue_routing import (
+    LANE_INTERACTIVE,
+    REPUBLISH_HEADER,
+    all_queue_names,
+    queue_name,
+    route,
+)
+from user_service.services.tracing import PUBLISHED_AT_HEADER, inject, start_span
+from user_service.services.metrics import (
+    QUEUE_MESSAGES_PUBLISHED_TOTAL,
+    QUEUE_PUBLISH_ERRORS_TOTAL,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -19,8 +33,9 @@ class RabbitMQManager:
         self._settings = settings
         self._connection: AbstractConnection | None = None
         self._channel: AbstractChannel | None = None
-        self._validation_queue: AbstractQueue | None = None
+        self._validation_queues: dict[str, AbstractQueue] = {}
         self._result_queue: AbstractQueue | None = None
+        self._batch_publisher: BatchPublisher | None = None
 
     @property
     def is_connected(self) -> bool:
@@ -38,7 +53,20 @@ class RabbitMQManager:
     @property
     def validation_queue(self) -> AbstractQueue | None:
 
-        return self._validation_queue
+        # Interactive-очередь первого шарда (при одном шарде — прежняя validation_queue)
+        return self._validation_queues.get(
+            queue_name(
+                self._settings.rabbitmq_validation_queue,
+                LANE_INTERACTIVE,
+                0,
+                self._settings.rabbitmq_validation_queue_shards,
+            )
+        )
+
+    @property
+    def validation_queues(self) -> dict[str, AbstractQueue]:
+
+        return self._validation_queues
 
     @property
     def result_queue(self) -> AbstractQueue | None:
@@ -56,14 +84,18 @@ class RabbitMQManager:
             logger.debug(f"Подключение к RabbitMQ: {self._settings.rabbitmq_host}:{self._settings.rabbitmq_port}")
 
             self._connection = await aio_pika.connect_robust(rabbitmq_url)
-            self._channel = await self._connection.channel()
+            self._channel = await self._connection.channel(publisher_confirms=True)
+            await self._channel.set_qos(prefetch_count=self._settings.rabbitmq_consumer_prefetch_count)
 
             validation_queue_name = self._settings.rabbitmq_validation_queue
-            self._validation_queue = await self._channel.declare_queue(
-                validation_queue_name,
-                durable=True,
-            )
-            logger.debug(f"Очередь объявлена: {validation_queue_name}")
+            for _, shard_queue_name in all_queue_names(
+                validation_queue_name, self._settings.rabbitmq_validation_queue_shards
+            ):
+                self._validation_queues[shard_queue_name] = await self._channel.declare_queue(
+                    shard_queue_name,
+                    durable=True,
+                )
+                logger.debug(f"Очередь объявлена: {shard_queue_name}")
 
             result_queue_name = self._settings.rabbitmq_result_queue
             self._result_queue = await self._channel.declare_queue(
@@ -72,6 +104,15 @@ class RabbitMQManager:
             )
             logger.debug(f"Очередь объявлена: {result_queue_name}")
 
+            self._batch_publisher = create_batch_publisher(
+                name=validation_queue_name,
+                channel=self._channel,
+                max_batch_size=self._settings.rabbitmq_publish_batch_size,
+                flush_interval=self._settings.rabbitmq_publish_flush_interval,
+                max_outstanding=self._settings.rabbitmq_publish_max_outstanding,
+                max_retries=self._settings.rabbitmq_publish_max_retries,
+            )
+
             logger.debug("RabbitMQ менеджер успешно подключён, все очереди объявлены")
 
         except Exception:
@@ -79,6 +120,24 @@ class RabbitMQManager:
             await self._cleanup()
             raise
 
+    async def flush(self) -> None:
+        """Ждет подтверждения брокером всех отправленных заявок."""
+
+        if self._batch_publisher:
+            await self._batch_publisher.flush()
+
+    async def validation_queue_depth(self) -> int:
+        """Число готовых к выдаче сообщений во всех очередях validation_queue (пассивное объявление)."""
+
+        if not self.is_connected or not self._channel:
+            raise RuntimeError("RabbitMQ не подключён. Вызовите connect() сначала.")
+
+        depth = 0
+        for shard_queue_name in self._validation_queues:
+            queue = await self._channel.declare_queue(shard_queue_name, passive=True)
+            depth += queue.declaration_result.message_count or 0
+        return depth
+
     async def close(self) -> None:
 
         await self._cleanup()
@@ -86,6 +145,12 @@ class RabbitMQManager:
 
     async def _cleanup(self) -> None:
 
+        try:
+            if self._batch_publisher:
+                await self._batch_publisher.close()
+        except Exception:
+            logger.exception("Ошибка при отправке буфера публикаций RabbitMQ")
+
         try:
             if self._channel and not self._channel.is_closed:
                 await self._channel.close()
@@ -100,8 +165,9 @@ class RabbitMQManager:
 
         self._channel = None
         self._connection = None
-        self._validation_queue = None
+        self._validation_queues = {}
         self._result_queue = None
+        self._batch_publisher = None
 
     async def publish_validation_request(
         self,
@@ -109,37 +175,62 @@ class RabbitMQManager:
         permission_type: PermissionType,
         item_id: int,
         request_id: str,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        republish: bool = False,
     ) -> None:
 
         if not self.is_connected or not self._channel:
             raise RuntimeError("RabbitMQ не подключён. Вызовите connect() сначала.")
 
-        if not self._validation_queue:
+        if not self._validation_queues or not self._batch_publisher:
             raise RuntimeError("Очередь validation_queue не объявлена")
 
+        routing_key = route(
+            self._settings.rabbitmq_validation_queue,
+            user_id,
+            priority.value,
+            self._settings.rabbitmq_validation_queue_shards,
+        )
+
+        headers = {PUBLISHED_AT_HEADER: time.time_ns()}
+        if republish:
+            headers[REPUBLISH_HEADER] = 1
+
         try:
-            message_data = {
-                "user_id": user_id,
-                "permission_type": permission_type.value,
-                "item_id": item_id,
-                "request_id": request_id,
-            }
-            message_body = json.dumps(message_data).encode("utf-8")
-
-            await self._channel.default_exchange.publish(
-                aio_pika.Message(
-                    message_body,
-                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
-                ),
-                routing_key=self._settings.rabbitmq_validation_queue,
+            message_body, content_type = encode_validation_request(
+                user_id=user_id,
+                permission_type=permission_type,
+                item_id=item_id,
+                request_id=request_id,
+                wire_format=self._settings.rabbitmq_message_format,
             )
 
+            with start_span(
+                "amqp.publish",
+                attributes={
+                    "messaging.queue": routing_key,
+                    "request.id": request_id,
+                },
+            ):
+                # Заявки от параллельных HTTP запросов уходят пачками с подтверждением брокера
+                await self._batch_publisher.publish(
+                    aio_pika.Message(
+                        message_body,
+                        content_type=content_type,
+                        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                        headers=inject(headers),
+                    ),
+                    routing_key=routing_key,
+                )
+            QUEUE_MESSAGES_PUBLISHED_TOTAL.labels(queue=routing_key).inc()
+
             logger.debug(
-                f"Запрос на валидацию опубликован в очередь: request_id={request_id}, user_id={user_id}, "
+                f"Запрос на валидацию опубликован в очередь {routing_key}: request_id={request_id}, user_id={user_id}, "
                 f"permission_type={permission_type}, item_id={item_id}"
             )
 
         except Exception:
+            QUEUE_PUBLISH_ERRORS_TOTAL.labels(queue=routing_key).inc()
             logger.exception(
                 f"Ошибка при публикации запроса на валидацию: request_id={request_id}"
             )
@@ -1,9 +1,12 @@
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
+import time
 
 import aio_pika
+import redis.asyncio as redis
 
 from user_service.db.protocols import (
     RabbitMQManagerProtocol,
@@ -11,6 +14,21 @@ from user_service.db.protocols import (
     DatabaseProtocol,
 )
 from user_service.models.enums import PermissionType
+from user_service.services.cache import is_result_processed, mark_result_processed
+from user_service.services.codec import decode_validation_result
+from user_service.services.permission_events import (
+    PermissionResultWaiter,
+    build_permission_event,
+    publish_permission_event,
+)
+from user_service.services.retry import RetryRouter
+from user_service.services.tracing import extract, record_queue_wait, start_span
+from user_service.services.metrics import (
+    QUEUE_MESSAGES_CONSUMED_TOTAL,
+    QUEUE_MESSAGE_PROCESSING_DURATION,
+    QUEUE_MESSAGES_IN_PROGRESS,
+    record_duplicate_result,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -22,11 +40,31 @@ class ResultConsumer:
         service_factory: PermissionServiceFactoryProtocol,
         rabbitmq_manager: RabbitMQManagerProtocol,
         db: DatabaseProtocol,
+        retry_delays: list[float] | None = None,
+        redis_conn: redis.Redis | None = None,
+        result_waiter: PermissionResultWaiter | None = None,
     ) -> None:
         self._service_factory = service_factory
         self._rabbitmq_manager = rabbitmq_manager
         self._db = db
+        self._retry_delays = retry_delays if retry_delays is not None else []
+        self._retry: RetryRouter | None = None
+        self._redis_conn = redis_conn
+        # Ожидающие результата POST /request?wait=true в этом процессе
+        self._result_waiter = result_waiter
         self._consuming = False
+        self._draining = False
+        self._handling = 0
+        # Доставленные брокером сообщения; None — сигнал проверить флаги остановки
+        self._buffer: asyncio.Queue[aio_pika.IncomingMessage | None] = asyncio.Queue()
+        self._consumer_tag: str | None = None
+        self._stopped = asyncio.Event()
+        self._stopped.set()
+
+    @property
+    def in_flight(self) -> int:
+        """Доставленные, но еще не подтвержденные сообщения: буфер и текущее."""
+        return self._buffer.qsize() + self._handling
 
     async def start_consuming(self) -> None:
 
@@ -37,85 +75,197 @@ class ResultConsumer:
         if not result_queue:
             raise RuntimeError("Очередь result_queue не объявлена")
 
+        self._retry = RetryRouter(result_queue.name, self._retry_delays)
+        await self._retry.declare(self._rabbitmq_manager.channel)
+
         self._consuming = True
-        logger.debug("Начато потребление сообщений из очереди result_queue")
+        self._draining = False
+        self._stopped.clear()
 
         try:
-            async with result_queue.iterator() as queue_iter:
-                async for message in queue_iter:
-                    if not self._consuming:
-                        logger.debug("Получен сигнал остановки потребления")
-                        break
-
-                    try:
-                        await self._handle_message(message)
-                    except Exception:
-                        logger.exception("Ошибка при обработке сообщения, продолжаем обработку следующих сообщений")
+            self._consumer_tag = await result_queue.consume(self._on_message)
+            logger.debug("Начато потребление сообщений из очереди result_queue")
+
+            while self._consuming:
+                if self._draining and self._buffer.empty():
+                    break
+
+                message = await self._buffer.get()
+                if message is None:
+                    continue
+
+                self._handling = 1
+                try:
+                    await self._handle_message(message)
+                except Exception:
+                    logger.exception("Ошибка при обработке сообщения, продолжаем обработку следующих сообщений")
+                finally:
+                    self._handling = 0
         except Exception:
             logger.exception("Критическая ошибка в цикле потребления сообщений")
             raise
         finally:
+            await self._cancel_consumer()
+            await self._requeue_buffered()
+            self._stopped.set()
             logger.debug("Потребление сообщений из result_queue остановлено")
 
+    async def _on_message(self, message: aio_pika.IncomingMessage) -> None:
+        self._buffer.put_nowait(message)
+
     async def stop_consuming(self) -> None:
+        """Завершает цикл потребления после обработки текущего сообщения."""
 
         self._consuming = False
+        self._buffer.put_nowait(None)
         logger.debug("Запрошена остановка потребления сообщений")
 
-    async def _handle_message(self, message: aio_pika.IncomingMessage) -> None:
+    async def drain(self, timeout: float) -> bool:
+        """Останавливает получение сообщений и дожидается обработки уже доставленных.
 
-        async with message.process(ignore_processed=True):
-            result_data: dict | None = None
-            try:
-                result_data = await self._parse_message_or_nack(message)
-                if result_data is None:
-                    return
+        basic.cancel прекращает выдачу новых сообщений, доставленные обрабатываются до timeout;
+        после него цикл завершается на текущем сообщении, остальные возвращаются в очередь.
+        Возвращает True, если все доставленные сообщения обработаны.
+        """
 
-                payload = await self._extract_payload_or_nack(message, result_data)
-                if payload is None:
-                    return
+        if self._stopped.is_set():
+            return True
 
-                request_id, approved, user_id, permission_type_str, item_id = payload
+        started = time.perf_counter()
+        logger.info(f"Остановка потребления result_queue, сообщений в обработке: {self.in_flight}")
+        self._draining = True
+        await self._cancel_consumer()
+        self._buffer.put_nowait(None)
 
-                permission_type = await self._parse_permission_type_or_nack(
-                    message, permission_type_str
-                )
-                if permission_type is None:
-                    return
-
-                await self._apply_result(
-                    message,
-                    request_id,
-                    approved,
-                    user_id,
-                    permission_type,
-                    item_id,
-                )
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Обработка result_queue не завершилась за {timeout} с, в обработке: {self.in_flight}; "
+                f"необработанные сообщения будут возвращены в очередь"
+            )
+            await self.stop_consuming()
+            return False
 
-                await message.ack()
+        logger.info(
+            f"Потребление result_queue остановлено, обработка завершена за {time.perf_counter() - started:.2f} с"
+        )
+        return True
 
+    async def _cancel_consumer(self) -> None:
+
+        consumer_tag, self._consumer_tag = self._consumer_tag, None
+        result_queue = self._rabbitmq_manager.result_queue
+        if consumer_tag is None or result_queue is None:
+            return
+        try:
+            await result_queue.cancel(consumer_tag)
+        except Exception:
+            logger.warning("Не удалось отменить потребление из result_queue", exc_info=True)
+
+    async def _requeue_buffered(self) -> None:
+        """Возвращает в очередь доставленные, но не обработанные сообщения (по одному, без multiple)."""
+
+        while not self._buffer.empty():
+            message = self._buffer.get_nowait()
+            if message is None:
+                continue
+            try:
+                await message.nack(requeue=True)
+                QUEUE_MESSAGES_CONSUMED_TOTAL.labels(
+                    queue=message.routing_key or "result_queue", outcome="requeued"
+                ).inc()
             except Exception:
-                request_id_value = (
-                    result_data.get("request_id") if result_data is not None else "unknown"
-                )
-                logger.exception(
-                    f"Ошибка обработки сообщения из result_queue: request_id={request_id_value}"
-                )
-                await message.nack(requeue=False)
-                raise
+                logger.warning(f"Не удалось вернуть сообщение {message.message_id} в result_queue", exc_info=True)
+
+    async def _handle_message(self, message: aio_pika.IncomingMessage) -> None:
+
+        queue_name = message.routing_key or "result_queue"
+        QUEUE_MESSAGES_IN_PROGRESS.labels(queue=queue_name).inc()
+        started = time.perf_counter()
+        # rejected — сообщение отклонено на этапе разбора (nack без повторной доставки)
+        outcome = "rejected"
+
+        trace_parent = extract(message.headers)
+        record_queue_wait(queue_name, message.headers, trace_parent)
+
+        with start_span(
+            "amqp.consume", parent=trace_parent, attributes={"messaging.queue": queue_name}
+        ):
+            async with message.process(ignore_processed=True):
+                result_data: dict | None = None
+                try:
+                    result_data = await self._parse_message_or_nack(message)
+                    if result_data is None:
+                        return
+
+                    payload = await self._extract_payload_or_nack(message, result_data)
+                    if payload is None:
+                        return
+
+                    request_id, approved, user_id, permission_type_str, item_id = payload
+
+                    permission_type = await self._parse_permission_type_or_nack(
+                        message, permission_type_str
+                    )
+                    if permission_type is None:
+                        return
+
+                    if await self._is_duplicate(request_id):
+                        outcome = "duplicate"
+                        await message.ack()
+                        return
+
+                    status = await self._apply_result(
+                        request_id,
+                        approved,
+                        user_id,
+                        permission_type,
+                        item_id,
+                    )
+                    await self._mark_processed(request_id)
+                    if status is not None:
+                        await self._notify(
+                            build_permission_event(request_id, user_id, permission_type.value, item_id, status)
+                        )
+
+                    await message.ack()
+                    outcome = "processed"
+
+                except asyncio.CancelledError:
+                    # Задачу отменили после rabbitmq_drain_timeout: без явного nack process()
+                    # выполнит reject(requeue=False) и результат будет потерян
+                    outcome = "requeued"
+                    await message.nack(requeue=True)
+                    raise
+                except Exception as exc:
+                    outcome = "failed"
+                    request_id_value = (
+                        result_data.get("request_id") if result_data is not None else "unknown"
+                    )
+                    logger.exception(
+                        f"Ошибка обработки сообщения из result_queue: request_id={request_id_value}"
+                    )
+                    # Временные сбои (БД, сеть) — повтор с задержкой вместо немедленного возврата в очередь
+                    await self._retry.retry(message, repr(exc))
+                finally:
+                    QUEUE_MESSAGE_PROCESSING_DURATION.labels(queue=queue_name).observe(
+                        time.perf_counter() - started
+                    )
+                    QUEUE_MESSAGES_CONSUMED_TOTAL.labels(queue=queue_name, outcome=outcome).inc()
+                    QUEUE_MESSAGES_IN_PROGRESS.labels(queue=queue_name).dec()
 
     async def _parse_message_or_nack(
         self, message: aio_pika.IncomingMessage
     ) -> dict | None:
         try:
-            body = message.body.decode("utf-8")
-            return json.loads(body)
-        except (json.JSONDecodeError, UnicodeDecodeError) as exc:
+            return decode_validation_result(message.body, message.content_type)
+        except (json.JSONDecodeError, UnicodeDecodeError, ValueError) as exc:
             logger.error(
                 f"Ошибка парсинга сообщения из result_queue: {exc}, "
                 f"body: {message.body.decode('utf-8', errors='ignore')}"
             )
-            await message.nack(requeue=False)
+            await self._retry.dead_letter(message, f"Ошибка парсинга: {exc}")
             return None
 
     async def _extract_payload_or_nack(
@@ -132,7 +282,7 @@ class ResultConsumer:
                 f"Неполные данные в сообщении result_queue: request_id={request_id}, "
                 f"approved={approved}, user_id={user_id}, permission_type={permission_type_str}, item_id={item_id}"
             )
-            await message.nack(requeue=False)
+            await self._retry.dead_letter(message, "Неполные данные в сообщении")
             return None
 
         return (
@@ -150,47 +300,96 @@ class ResultConsumer:
             return PermissionType(permission_type_str)
         except ValueError:
             logger.error(f"Некорректный permission_type в сообщении: {permission_type_str}")
-            await message.nack(requeue=False)
+            await self._retry.dead_letter(message, f"Некорректный permission_type: {permission_type_str}")
             return None
 
+    async def _is_duplicate(self, request_id: str) -> bool:
+        """Быстрая проверка по Redis; при его недоступности дубликаты отсекает статус заявки в БД."""
+
+        if self._redis_conn is None:
+            return False
+
+        try:
+            processed = await is_result_processed(self._redis_conn, request_id)
+        except Exception as exc:
+            logger.warning(f"Не удалось проверить отметку обработки в Redis: request_id={request_id}, {exc}")
+            return False
+
+        if processed:
+            record_duplicate_result("redis")
+            logger.debug(f"Повторная доставка результата пропущена: request_id={request_id}")
+        return processed
+
+    async def _mark_processed(self, request_id: str) -> None:
+
+        if self._redis_conn is None:
+            return
+
+        try:
+            await mark_result_processed(self._redis_conn, request_id)
+        except Exception as exc:
+            logger.warning(f"Не удалось сохранить отметку обработки в Redis: request_id={request_id}, {exc}")
+
+    async def _notify(self, event: dict) -> None:
+        """Событие о смене статуса: ожидающим в этом процессе — напрямую, другим репликам — через Redis."""
+
+        if self._result_waiter is not None:
+            self._result_waiter.resolve(event)
+
+        if self._redis_conn is None:
+            return
+
+        try:
+            await publish_permission_event(self._redis_conn, event)
+        except Exception as exc:
+            logger.warning(f"Не удалось опубликовать событие заявки: request_id={event['request_id']}, {exc}")
+
     async def _apply_result(
         self,
-        message: aio_pika.IncomingMessage,
         request_id: str,
         approved: bool,
         user_id: int,
         permission_type: PermissionType,
         item_id: int,
-    ) -> None:
-        if self._db.AsyncSessionLocal is None:
-            logger.error("БД не инициализирована, невозможно обработать сообщение")
-            await message.nack(requeue=True)
-            return
+    ) -> str | None:
+        """Применяет результат к заявке; возвращает новый статус или None, если статус не изменился.
 
-        async with self._service_factory.create_with_session() as service:
-            permission = await service.apply_validation_result(
-                request_id=request_id,
-                approved=approved,
-                user_id=user_id,
-                permission_type=permission_type,
-                item_id=item_id,
-            )
-
-            if permission is None:
-                logger.warning(
-                    f"Заявка не найдена в БД: request_id={request_id}, user_id={user_id}, "
-                    f"permission_type={permission_type}, item_id={item_id}. Возможно, заявка была удалена "
-                    f"или request_id некорректен."
+        None — заявка не найдена или уже вышла из pending (повторный или запоздавший результат):
+        подписчики о таком результате не уведомляются.
+        """
+        if self._db.AsyncSessionLocal is None:
+            raise RuntimeError("БД не инициализирована, невозможно обработать сообщение")
+
+        # Спан охватывает и фиксацию транзакции при выходе из create_with_session
+        with start_span(
+            "db.apply_validation_result",
+            attributes={"request.id": request_id, "approved": approved},
+        ):
+            async with self._service_factory.create_with_session() as service:
+                permission, transitioned = await service.apply_validation_result(
+                    request_id=request_id,
+                    approved=approved,
+                    user_id=user_id,
+                    permission_type=permission_type,
+                    item_id=item_id,
                 )
-            else:
-                if approved:
-                    logger.debug(
-                        f"Заявка одобрена и активирована: request_id={request_id}, user_id={user_id}, "
-                        f"permission_type={permission_type}, item_id={item_id}, новый статус={permission.status}"
-                    )
-                else:
-                    logger.debug(
-                        f"Заявка отклонена: request_id={request_id}, user_id={user_id}, "
-                        f"permission_type={permission_type}, item_id={item_id}, новый статус={permission.status}"
-                    )
 
+                if permission is None:
+                    logger.warning(
+                        f"Заявка не найдена в БД: request_id={request_id}, user_id={user_id}, "
+                        f"permission_type={permission_type}, item_id={item_id}. Возможно, заявка была удалена "
+                        f"или request_id некорректен."
+                    )
+                elif transitioned:
+                    if approved:
+                        logger.debug(
+                            f"Заявка одобрена и активирована: request_id={request_id}, user_id={user_id}, "
+                            f"permission_type={permission_type}, item_id={item_id}, новый статус={permission.status}"
+                        )
+                    else:
+                        logger.debug(
+                            f"Заявка отклонена: request_id={request_id}, user_id={user_id}, "
+                            f"permission_type={permission_type}, item_id={item_id}, новый статус={permission.status}"
+                        )
+
+        return permission.status if transitioned else None
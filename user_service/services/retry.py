@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+import aio_pika
+
+logger = logging.getLogger(__name__)
+
+# Отложенные повторы и dead-letter очереди.
+# Для очереди q объявляются q.retry.<мс> (по одной на ступень задержки) с x-message-ttl и
+# x-dead-letter-routing-key=q — по истечении TTL брокер возвращает сообщение в q — и q.dlq
+# для сообщений, которые не удалось обработать. Исходные очереди не переобъявляются с
+# x-dead-letter-exchange: изменение аргументов существующей durable очереди брокер отклоняет
+# (PRECONDITION_FAILED), поэтому консьюмер сам перекладывает сообщение и подтверждает исходное.
+# Копия validation_service/rabbitmq/retry.py с просмотром и повтором DLQ — схемы должны совпадать.
+
+ATTEMPT_HEADER = "x-attempt"
+ORIGINAL_QUEUE_HEADER = "x-original-queue"
+LAST_ERROR_HEADER = "x-last-error"
+REPLAYED_HEADER = "x-replayed"
+
+_TIER_FACTOR = 5
+_MAX_ERROR_LENGTH = 512
+
+
+def retry_delays(base_delay: float, tiers: int) -> list[float]:
+    """Экспоненциальные ступени задержки: base, base*5, base*25, ..."""
+    return [base_delay * _TIER_FACTOR ** tier for tier in range(max(tiers, 0))]
+
+
+def dead_letter_queue_name(queue_name: str) -> str:
+    return f"{queue_name}.dlq"
+
+
+def retry_queue_name(queue_name: str, delay: float) -> str:
+    # Задержка в имени: при смене настроек объявляется новая очередь, а не меняется старая
+    return f"{queue_name}.retry.{int(delay * 1000)}"
+
+
+def get_attempt(headers: dict[str, Any] | None) -> int:
+
+    try:
+        return int((headers or {}).get(ATTEMPT_HEADER, 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+def _copy_message(message: Any, headers: dict[str, Any]) -> aio_pika.Message:
+    return aio_pika.Message(
+        message.body,
+        headers=headers,
+        content_type=message.content_type,
+        message_id=message.message_id,
+        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+    )
+
+
+class RetryRouter:
+    """Перекладывает необработанное сообщение в очередь отложенного повтора или в DLQ."""
+
+    def __init__(self, queue_name: str, delays: list[float]):
+        self._queue_name = queue_name
+        self._delays = delays
+        self._exchange: Any | None = None
+
+    @property
+    def queue_name(self) -> str:
+        return self._queue_name
+
+    @property
+    def dead_letter_queue(self) -> str:
+        return dead_letter_queue_name(self._queue_name)
+
+    async def declare(self, channel: Any) -> None:
+
+        for delay in self._delays:
+            await channel.declare_queue(
+                retry_queue_name(self._queue_name, delay),
+                durable=True,
+                arguments={
+                    "x-message-ttl": int(delay * 1000),
+                    "x-dead-letter-exchange": "",
+                    "x-dead-letter-routing-key": self._queue_name,
+                },
+            )
+        await channel.declare_queue(self.dead_letter_queue, durable=True)
+        self._exchange = channel.default_exchange
+
+    def can_retry(self, message: Any) -> bool:
+        return get_attempt(message.headers) < len(self._delays)
+
+    async def retry(self, message: Any, error: str) -> str:
+        """Повтор с задержкой текущей ступени; после последней ступени — DLQ. Возвращает очередь."""
+
+        attempt = get_attempt(message.headers)
+        if attempt >= len(self._delays):
+            return await self.dead_letter(message, error)
+
+        target = retry_queue_name(self._queue_name, self._delays[attempt])
+        await self._reroute(message, target, attempt + 1, error)
+        logger.warning(
+            f"Сообщение {message.message_id} из {self._queue_name} будет повторено через "
+            f"{self._delays[attempt]} с (попытка {attempt + 1}): {error}"
+        )
+        return target
+
+    async def dead_letter(self, message: Any, error: str) -> str:
+
+        await self._reroute(message, self.dead_letter_queue, get_attempt(message.headers), error)
+        logger.error(f"Сообщение {message.message_id} из {self._queue_name} перемещено в DLQ: {error}")
+        return self.dead_letter_queue
+
+    async def _reroute(self, message: Any, target: str, attempt: int, error: str) -> None:
+
+        if self._exchange is None:
+            raise RuntimeError("Очереди повторов не объявлены. Вызовите declare() сначала.")
+
+        headers = dict(message.headers or {})
+        headers[ATTEMPT_HEADER] = attempt
+        headers[ORIGINAL_QUEUE_HEADER] = self._queue_name
+        headers[LAST_ERROR_HEADER] = error[:_MAX_ERROR_LENGTH]
+
+        try:
+            await self._exchange.publish(_copy_message(message, headers), routing_key=target)
+        except Exception:
+            # Без подтверждения копии исходное сообщение возвращается в очередь
+            logger.exception(f"Не удалось переложить сообщение {message.message_id} в {target}")
+            await message.nack(requeue=True)
+            return
+
+        await message.ack()
+
+
+def _describe(message: Any) -> dict[str, Any]:
+
+    headers = dict(message.headers or {})
+    content_type = message.content_type or ""
+    if content_type.startswith("application/json"):
+        body = message.body.decode("utf-8", errors="replace")
+    else:
+        body = message.body.hex()
+    return {
+        "message_id": message.message_id,
+        "original_queue": headers.get(ORIGINAL_QUEUE_HEADER),
+        "attempt": get_attempt(headers),
+        "replayed": int(headers.get(REPLAYED_HEADER, 0) or 0),
+        "last_error": headers.get(LAST_ERROR_HEADER),
+        "content_type": message.content_type,
+        "body": body,
+    }
+
+
+async def peek_dead_letters(channel: Any, queue_name: str, limit: int) -> list[dict[str, Any]]:
+    """Первые limit сообщений DLQ очереди queue_name; сообщения возвращаются в DLQ."""
+
+    dead_letter_queue = await channel.declare_queue(dead_letter_queue_name(queue_name), durable=True)
+    messages = []
+    try:
+        while len(messages) < limit:
+            message = await dead_letter_queue.get(no_ack=False, fail=False)
+            if message is None:
+                break
+            messages.append(message)
+        return [_describe(message) for message in messages]
+    finally:
+        for message in messages:
+            await message.nack(requeue=True)
+
+
+async def replay_dead_letters(channel: Any, queue_name: str, limit: int) -> int:
+    """Возвращает до limit сообщений из DLQ в исходную очередь со сброшенным счетчиком попыток."""
+
+    dead_letter_queue = await channel.declare_queue(dead_letter_queue_name(queue_name), durable=True)
+    replayed = 0
+    while replayed < limit:
+        message = await dead_letter_queue.get(no_ack=False, fail=False)
+        if message is None:
+            break
+
+        headers = dict(message.headers or {})
+        target = headers.pop(ORIGINAL_QUEUE_HEADER, None) or queue_name
+        headers.pop(ATTEMPT_HEADER, None)
+        headers.pop(LAST_ERROR_HEADER, None)
+        headers[REPLAYED_HEADER] = int(headers.get(REPLAYED_HEADER, 0) or 0) + 1
+
+        try:
+            await channel.default_exchange.publish(_copy_message(message, headers), routing_key=target)
+        except Exception:
+            await message.nack(requeue=True)
+            raise
+
+        await message.ack()
+        replayed += 1
+
+    logger.info(f"Из {dead_letter_queue_name(queue_name)} повторно опубликовано сообщений: {replayed}")
+    return replayed
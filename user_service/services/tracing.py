@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import re
+import secrets
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Iterator, Mapping
+
+from fastapi import FastAPI, Request
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "user-service"
+
+# W3C Trace Context: 00-<trace_id 32 hex>-<span_id 16 hex>-<flags>
+TRACEPARENT_HEADER = "traceparent"
+# Время публикации сообщения (unix ns) — для расчета ожидания в очереди
+PUBLISHED_AT_HEADER = "x-published-at"
+
+_TRACEPARENT_RE = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-[0-9a-f]{2}$")
+
+
+class SpanContext:
+
+    def __init__(self, trace_id: str, span_id: str):
+        self.trace_id = trace_id
+        self.span_id = span_id
+
+    def to_traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    @classmethod
+    def from_traceparent(cls, value: str | bytes | None) -> SpanContext | None:
+
+        if isinstance(value, bytes):
+            value = value.decode("ascii", errors="ignore")
+        if not value:
+            return None
+
+        match = _TRACEPARENT_RE.match(value.strip().lower())
+        if match is None or set(match.group(1)) == {"0"} or set(match.group(2)) == {"0"}:
+            return None
+        return cls(match.group(1), match.group(2))
+
+
+class Span:
+
+    def __init__(
+        self,
+        name: str,
+        context: SpanContext,
+        parent_id: str | None,
+        start_ns: int,
+        attributes: dict[str, Any] | None = None,
+    ):
+        self.name = name
+        self.context = context
+        self.parent_id = parent_id
+        self.start_ns = start_ns
+        self.end_ns: int | None = None
+        self.status = "ok"
+        self.attributes: dict[str, Any] = dict(attributes or {})
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1_000_000
+
+    def to_dict(self) -> dict[str, Any]:
+        """Поля в духе OTLP JSON, чтобы файл можно было загрузить во внешний коллектор."""
+        return {
+            "traceId": self.context.trace_id,
+            "spanId": self.context.span_id,
+            "parentSpanId": self.parent_id,
+            "name": self.name,
+            "service": SERVICE_NAME,
+            "startTimeUnixNano": self.start_ns,
+            "endTimeUnixNano": self.end_ns,
+            "durationMs": self.duration_ms,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class InMemorySpanExporter:
+    """Хранит завершенные спаны в памяти процесса (для тестов и локальной отладки)."""
+
+    def __init__(self, max_spans: int = 10000):
+        self._max_spans = max_spans
+        self._spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self._spans.append(span)
+        if len(self._spans) > self._max_spans:
+            del self._spans[: len(self._spans) - self._max_spans]
+
+    @property
+    def spans(self) -> list[Span]:
+        return list(self._spans)
+
+    def find_trace(self, trace_id: str) -> list[Span]:
+        return [span for span in self._spans if span.context.trace_id == trace_id]
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class JsonlSpanExporter:
+    """Дописывает завершенные спаны в файл, по одному JSON объекту на строку.
+
+    export() только ставит строку в буфер: файл дописывается пачками в фоновом потоке раз в
+    flush_interval или по накоплении batch_size строк, поэтому цикл событий не ждет диск.
+    Если диск не успевает, сверх max_buffered строк старые спаны отбрасываются.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        flush_interval: float = 1.0,
+        batch_size: int = 512,
+        max_buffered: int = 10000,
+    ):
+        self._path = path
+        self._flush_interval = flush_interval
+        self._batch_size = batch_size
+        self._buffer: deque[str] = deque(maxlen=max_buffered)
+        self._condition = threading.Condition()
+        # Порядок строк в файле: пачку забирает и пишет один поток за раз
+        self._write_lock = threading.Lock()
+        self._writer: threading.Thread | None = None
+        self._closed = False
+        self.dropped = 0
+
+    def export(self, span: Span) -> None:
+
+        line = json.dumps(span.to_dict(), ensure_ascii=False, default=str)
+        with self._condition:
+            if self._writer is None:
+                self._start_writer()
+            if len(self._buffer) == self._buffer.maxlen:
+                self.dropped += 1
+            self._buffer.append(line)
+            if len(self._buffer) >= self._batch_size:
+                self._condition.notify()
+
+    def flush(self) -> None:
+        """Синхронно дописывает буфер в файл (вне цикла событий или при остановке)."""
+
+        with self._write_lock:
+            with self._condition:
+                lines = list(self._buffer)
+                self._buffer.clear()
+            if lines:
+                with open(self._path, "a", encoding="utf-8") as f:
+                    f.write("\n".join(lines) + "\n")
+
+    def close(self) -> None:
+
+        with self._condition:
+            self._closed = True
+            self._condition.notify()
+        if self._writer is not None:
+            self._writer.join(timeout=5.0)
+        self.flush()
+
+    def _start_writer(self) -> None:
+
+        self._writer = threading.Thread(target=self._run, name="jsonl-span-exporter", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+
+        while True:
+            with self._condition:
+                if not self._closed and len(self._buffer) < self._batch_size:
+                    self._condition.wait(self._flush_interval)
+                closed = self._closed
+            try:
+                self.flush()
+            except Exception as e:
+                logger.warning(f"Ошибка записи спанов в {self._path}: {e}")
+            if closed:
+                return
+
+
+_current_span: ContextVar[Span | None] = ContextVar("current_span", default=None)
+_exporter: InMemorySpanExporter | JsonlSpanExporter | None = None
+
+
+def create_exporter(
+    kind: str,
+    jsonl_path: str = "traces.jsonl",
+) -> InMemorySpanExporter | JsonlSpanExporter | None:
+
+    kind = kind.lower()
+    if kind in ("", "none"):
+        return None
+    if kind == "memory":
+        return InMemorySpanExporter()
+    if kind == "jsonl":
+        return JsonlSpanExporter(jsonl_path)
+    raise ValueError(f"Неизвестный экспортер трассировки: {kind}")
+
+
+def configure_tracing(exporter: InMemorySpanExporter | JsonlSpanExporter | None) -> None:
+    global _exporter
+    _exporter = exporter
+
+
+def get_exporter() -> InMemorySpanExporter | JsonlSpanExporter | None:
+    return _exporter
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+def _new_context(parent: SpanContext | None) -> SpanContext:
+    trace_id = parent.trace_id if parent is not None else secrets.token_hex(16)
+    return SpanContext(trace_id, secrets.token_hex(8))
+
+
+def _export(span: Span) -> None:
+
+    if _exporter is None:
+        return
+    try:
+        _exporter.export(span)
+    except Exception as e:
+        logger.warning(f"Ошибка экспорта спана {span.name}: {e}")
+
+
+@contextmanager
+def start_span(
+    name: str,
+    parent: SpanContext | None = None,
+    attributes: dict[str, Any] | None = None,
+) -> Iterator[Span]:
+    """Спан становится текущим внутри блока; родитель — явный контекст или текущий спан."""
+
+    if parent is None:
+        current = _current_span.get()
+        parent = current.context if current is not None else None
+
+    span = Span(
+        name=name,
+        context=_new_context(parent),
+        parent_id=parent.span_id if parent is not None else None,
+        start_ns=time.time_ns(),
+        attributes=attributes,
+    )
+    token = _current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.status = "error"
+        span.set_attribute("error", repr(e))
+        raise
+    finally:
+        _current_span.reset(token)
+        span.end_ns = time.time_ns()
+        _export(span)
+
+
+def record_span(
+    name: str,
+    start_ns: int,
+    end_ns: int,
+    parent: SpanContext | None = None,
+    attributes: dict[str, Any] | None = None,
+) -> Span:
+    """Завершенный спан с известными границами (например, ожидание в очереди)."""
+
+    span = Span(
+        name=name,
+        context=_new_context(parent),
+        parent_id=parent.span_id if parent is not None else None,
+        start_ns=start_ns,
+        attributes=attributes,
+    )
+    span.end_ns = max(start_ns, end_ns)
+    _export(span)
+    return span
+
+
+def inject(headers: dict[str, Any]) -> dict[str, Any]:
+    span = _current_span.get()
+    if span is not None:
+        headers[TRACEPARENT_HEADER] = span.context.to_traceparent()
+    return headers
+
+
+def extract(headers: Mapping[str, Any] | None) -> SpanContext | None:
+    if not headers:
+        return None
+    return SpanContext.from_traceparent(headers.get(TRACEPARENT_HEADER))
+
+
+def record_queue_wait(queue: str, headers: Mapping[str, Any] | None, parent: SpanContext | None) -> None:
+
+    published_at = (headers or {}).get(PUBLISHED_AT_HEADER)
+    if published_at is None:
+        return
+    try:
+        start_ns = int(published_at)
+    except (TypeError, ValueError):
+        return
+    record_span("amqp.queue_wait", start_ns, time.time_ns(), parent, {"messaging.queue": queue})
+
+
+def setup_tracing(app: FastAPI) -> None:
+    """Middleware: серверный спан на каждый HTTP запрос с продолжением входящего traceparent."""
+
+    @app.middleware("http")
+    async def tracing_middleware(request: Request, call_next):
+
+        with start_span(
+            f"HTTP {request.method}",
+            parent=extract(request.headers),
+            attributes={"http.method": request.method, "http.target": request.url.path},
+        ) as span:
+            response = await call_next(request)
+            route = request.scope.get("route")
+            if route is not None:
+                span.name = f"HTTP {request.method} {route.path}"
+            span.set_attribute("http.status_code", response.status_code)
+            response.headers[TRACEPARENT_HEADER] = span.context.to_traceparent()
+            return response
@@ -13,11 +13,70 @@ class Settings(BaseSettings):
     RABBITMQ_VHOST: str = "/"
     VALIDATION_QUEUE: str = "validation_queue"
     RESULT_QUEUE: str = "result_queue"
+    # Шардирование очереди заявок по user_id и веса полос interactive/bulk при потреблении
+    VALIDATION_QUEUE_SHARDS: int = 1
+    INTERACTIVE_QUEUE_WEIGHT: int = 4
+    BULK_QUEUE_WEIGHT: int = 1
+    # Не меньше суммы весов: иначе буфер очереди не успевает заполниться и веса не работают
+    CONSUMER_PREFETCH_COUNT: int = 5
+    # Сколько при остановке ждать обработки уже доставленных сообщений (после basic.cancel), с
+    CONSUMER_DRAIN_TIMEOUT: float = 8.0
+    # Отложенные повторы необработанных заявок: ступени base, base*5, base*25, ... секунд, затем DLQ
+    MESSAGE_RETRY_BASE_DELAY: float = 1.0
+    MESSAGE_RETRY_TIERS: int = 3
+    # Сколько хранится отметка о провалидированной заявке (отсечение повторных доставок), с
+    VALIDATION_DEDUP_TTL: int = 86400
+    # Формат публикуемых результатов: json или binary (компактный); входящие заявки принимаются в обоих.
+    # binary включается только после обновления всех консьюмеров: прежний консьюмер его отбрасывает
+    MESSAGE_FORMAT: str = "json"
+    # Пакетная публикация результатов с подтверждениями брокера
+    PUBLISH_BATCH_SIZE: int = 100
+    PUBLISH_FLUSH_INTERVAL: float = 0.005
+    PUBLISH_MAX_OUTSTANDING: int = 1000
+    PUBLISH_MAX_RETRIES: int = 3
+    # Консьюмер в процессе HTTP приложения; false — очередь обрабатывают воркеры
+    # (python -m validation_service.worker), приложение отвечает только на health-запросы
+    RUN_CONSUMER_IN_APP: bool = True
+    # Число процессов-воркеров (0 — по числу CPU), время на их остановку и базовый порт метрик
+    # (воркер i отдаёт метрики на порту WORKER_METRICS_PORT + i; 0 — не отдавать)
+    WORKER_PROCESSES: int = 0
+    WORKER_SHUTDOWN_TIMEOUT: float = 30.0
+    WORKER_METRICS_PORT: int = 0
 
     REDIS_HOST: str = "redis"
     REDIS_PORT: int = 6379
 
     HTTP_TIMEOUT: float = 30.0
+    HTTP_POOL_TIMEOUT: float = 5.0
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    # Мультиплексирование запросов в одном соединении (требует пакет h2)
+    HTTP2_ENABLED: bool = False
+
+    # Защита от каскадных отказов при обращениях к сервисам
+    CIRCUIT_BREAKER_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_BREAKER_RECOVERY_TIMEOUT: float = 30.0
+    RETRY_BUDGET_RATIO: float = 0.2
+    RETRY_MAX_ATTEMPTS: int = 3
+    CONCURRENCY_LIMIT_INITIAL: int = 20
+    CONCURRENCY_LIMIT_MAX: int = 200
+    CONCURRENCY_LATENCY_THRESHOLD: float = 1.0
+
+    # Дублирующие GET-запросы, если ответа нет дольше квантиля задержки апстрима
+    HEDGING_ENABLED: bool = False
+    HEDGING_QUANTILE: float = 0.95
+    HEDGING_BUDGET_RATIO: float = 0.05
+    HEDGING_MIN_DELAY: float = 0.005
+    HEDGING_MIN_SAMPLES: int = 20
+
+    # matrix - проверка по упакованной матрице конфликтов на стороне сервиса,
+    # remote - проверка на стороне Access Control Service (POST /conflicts/check)
+    CONFLICT_CHECK_MODE: str = "matrix"
+
+    # Экспорт спанов трассировки: none, memory (в памяти процесса) или jsonl (в файл)
+    TRACING_EXPORTER: str = "none"
+    TRACING_JSONL_PATH: str = "traces.jsonl"
 
     LOG_LEVEL: str = "INFO"
 
@@ -0,0 +1,202 @@
+from __future__ import annotations
+
+import logging
+from dataclasses import dataclass
+
+from validation_service.config.settings import Settings
+from validation_service.services.redis_cache import RedisCache
+from validation_service.services.http_pool import create_http_client
+from validation_service.services.resilience import create_resilience_policy
+from validation_service.services.hedging import HedgingPolicy, create_hedging_policy
+from validation_service.services.user_service_client import UserServiceClient
+from validation_service.services.access_control_client import AccessControlClient
+from validation_service.services.validation_service import ValidationService
+from validation_service.services.protocols import (
+    UserServiceClientProtocol,
+    AccessControlClientProtocol,
+    ValidationServiceProtocol,
+)
+from validation_service.rabbitmq.publishers.result_publisher import ResultPublisher
+from validation_service.rabbitmq.consumers.validation_consumer import ValidationConsumer
+from validation_service.rabbitmq.retry import retry_delays
+
+logger = logging.getLogger(__name__)
+
+# Сборка компонентов конвейера валидации по настройкам: общая для HTTP приложения (main.py)
+# и отдельных процессов-воркеров (worker.py).
+
+
+def create_upstream_http_client(settings: Settings, name: str):
+    return create_http_client(
+        name=name,
+        timeout=settings.HTTP_TIMEOUT,
+        pool_timeout=settings.HTTP_POOL_TIMEOUT,
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+        http2=settings.HTTP2_ENABLED,
+        resilience=create_resilience_policy(
+            name=name,
+            failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+            recovery_timeout=settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+            retry_budget_ratio=settings.RETRY_BUDGET_RATIO,
+            max_attempts=settings.RETRY_MAX_ATTEMPTS,
+            initial_limit=settings.CONCURRENCY_LIMIT_INITIAL,
+            max_limit=settings.CONCURRENCY_LIMIT_MAX,
+            latency_threshold=settings.CONCURRENCY_LATENCY_THRESHOLD,
+            acquire_timeout=settings.HTTP_POOL_TIMEOUT,
+        ),
+    )
+
+
+def create_upstream_hedging_policy(settings: Settings, name: str) -> HedgingPolicy | None:
+    if not settings.HEDGING_ENABLED:
+        return None
+    return create_hedging_policy(
+        name=name,
+        quantile=settings.HEDGING_QUANTILE,
+        budget_ratio=settings.HEDGING_BUDGET_RATIO,
+        min_delay=settings.HEDGING_MIN_DELAY,
+        min_samples=settings.HEDGING_MIN_SAMPLES,
+    )
+
+
+async def create_cache(settings: Settings) -> RedisCache:
+
+    cache = RedisCache(
+        redis_host=settings.REDIS_HOST,
+        redis_port=settings.REDIS_PORT
+    )
+    await cache.connect()
+    return cache
+
+
+def create_upstream_clients(
+    settings: Settings,
+    cache: RedisCache,
+) -> tuple[UserServiceClientProtocol, AccessControlClientProtocol]:
+
+    user_client = UserServiceClient(
+        base_url=settings.USER_SERVICE_URL,
+        cache=cache,
+        timeout=settings.HTTP_TIMEOUT,
+        http_client=create_upstream_http_client(settings, "user_service"),
+        hedging=create_upstream_hedging_policy(settings, "user_service")
+    )
+    access_control_client = AccessControlClient(
+        base_url=settings.ACCESS_CONTROL_SERVICE_URL,
+        cache=cache,
+        timeout=settings.HTTP_TIMEOUT,
+        http_client=create_upstream_http_client(settings, "access_control_service"),
+        hedging=create_upstream_hedging_policy(settings, "access_control_service")
+    )
+    return user_client, access_control_client
+
+
+def create_validation_service(
+    settings: Settings,
+    user_client: UserServiceClientProtocol,
+    access_control_client: AccessControlClientProtocol,
+) -> ValidationServiceProtocol:
+    return ValidationService(
+        user_client=user_client,
+        access_control_client=access_control_client,
+        conflict_check_mode=settings.CONFLICT_CHECK_MODE
+    )
+
+
+async def create_publisher(settings: Settings) -> ResultPublisher:
+
+    publisher = ResultPublisher(
+        rabbitmq_url=settings.rabbitmq_url,
+        result_queue_name=settings.RESULT_QUEUE,
+        batch_size=settings.PUBLISH_BATCH_SIZE,
+        flush_interval=settings.PUBLISH_FLUSH_INTERVAL,
+        max_outstanding=settings.PUBLISH_MAX_OUTSTANDING,
+        max_retries=settings.PUBLISH_MAX_RETRIES,
+        wire_format=settings.MESSAGE_FORMAT
+    )
+    await publisher.connect()
+    return publisher
+
+
+async def create_consumer(
+    settings: Settings,
+    validation_service: ValidationServiceProtocol,
+    publisher: ResultPublisher,
+    cache: RedisCache,
+) -> ValidationConsumer:
+
+    consumer = ValidationConsumer(
+        validation_service=validation_service,
+        publisher=publisher,
+        rabbitmq_url=settings.rabbitmq_url,
+        validation_queue_name=settings.VALIDATION_QUEUE,
+        shards=settings.VALIDATION_QUEUE_SHARDS,
+        interactive_weight=settings.INTERACTIVE_QUEUE_WEIGHT,
+        bulk_weight=settings.BULK_QUEUE_WEIGHT,
+        prefetch_count=settings.CONSUMER_PREFETCH_COUNT,
+        retry_delays=retry_delays(settings.MESSAGE_RETRY_BASE_DELAY, settings.MESSAGE_RETRY_TIERS),
+        cache=cache,
+        dedup_ttl=settings.VALIDATION_DEDUP_TTL
+    )
+    await consumer.connect()
+    return consumer
+
+
+@dataclass
+class ConsumerStack:
+    """Полный набор компонентов одного консьюмера; закрывается в порядке, обратном созданию."""
+
+    cache: RedisCache
+    user_client: UserServiceClientProtocol
+    access_control_client: AccessControlClientProtocol
+    validation_service: ValidationServiceProtocol
+    publisher: ResultPublisher
+    consumer: ValidationConsumer
+
+    async def close(self) -> None:
+
+        for name, resource in (
+            ("ValidationConsumer", self.consumer),
+            ("ResultPublisher", self.publisher),
+            ("UserServiceClient", self.user_client),
+            ("AccessControlClient", self.access_control_client),
+            ("Redis кэш", self.cache),
+        ):
+            try:
+                await resource.close()
+            except Exception as e:
+                logger.exception(f"Ошибка при закрытии {name}: {e}")
+
+
+async def create_consumer_stack(settings: Settings) -> ConsumerStack:
+
+    cache = await create_cache(settings)
+    user_client, access_control_client = create_upstream_clients(settings, cache)
+    validation_service = create_validation_service(settings, user_client, access_control_client)
+    try:
+        publisher = await create_publisher(settings)
+    except Exception:
+        await user_client.close()
+        await access_control_client.close()
+        await cache.close()
+        raise
+
+    try:
+        consumer = await create_consumer(settings, validation_service, publisher, cache)
+    except Exception:
+        await publisher.close()
+        await user_client.close()
+        await access_control_client.close()
+        await cache.close()
+        raise
+
+    return ConsumerStack(
+        cache=cache,
+        user_client=user_client,
+        access_control_client=access_control_client,
+        validation_service=validation_service,
+        publisher=publisher,
+        consumer=consumer,
+    )
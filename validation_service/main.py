@@ -4,21 +4,23 @@ import sys
 from contextlib import asynccontextmanager
 from fastapi import FastAPI, Request, status
 from fastapi.responses import JSONResponse
-import httpx
 
 from validation_service.config.settings import Settings
-from validation_service.services.redis_cache import RedisCache
-from validation_service.services.user_service_client import UserServiceClient
-from validation_service.services.access_control_client import AccessControlClient
-from validation_service.services.validation_service import ValidationService
-from validation_service.services.protocols import (
-    UserServiceClientProtocol,
-    AccessControlClientProtocol,
-    ValidationServiceProtocol,
+from validation_service.factory import (
+    create_cache,
+    create_consumer,
+    create_publisher,
+    create_upstream_clients,
+    create_validation_service,
 )
-from validation_service.rabbitmq.publishers.result_publisher import ResultPublisher
+from validation_service.services.http_pool import get_all_pool_stats
+from validation_service.services.resilience import get_all_resilience_stats
+from validation_service.services.hedging import get_all_hedging_stats
+from validation_service.services.tracing import configure_tracing, create_exporter, setup_tracing
+from validation_service.services.metrics import REGISTRY, UpstreamStatsCollector, setup_metrics
+from validation_service.services.protocols import ValidationServiceProtocol
+from validation_service.rabbitmq.publishers.batch_publisher import get_all_publisher_stats
 from validation_service.rabbitmq.protocols import ResultPublisherProtocol
-from validation_service.rabbitmq.consumers.validation_consumer import ValidationConsumer
 
 settings = Settings()
 log_level = getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO)
@@ -37,6 +39,8 @@ logging.getLogger("redis").setLevel(logging.WARNING)
 
 logger = logging.getLogger(__name__)
 
+configure_tracing(create_exporter(settings.TRACING_EXPORTER, settings.TRACING_JSONL_PATH))
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -48,11 +52,7 @@ async def lifespan(app: FastAPI):
 
         try:
             logger.debug("Инициализация Redis кэша...")
-            cache = RedisCache(
-                redis_host=settings.REDIS_HOST,
-                redis_port=settings.REDIS_PORT
-            )
-            await cache.connect()
+            cache = await create_cache(settings)
             app.state.cache = cache
             logger.debug("Redis кэш подключен")
         except Exception as e:
@@ -61,16 +61,7 @@ async def lifespan(app: FastAPI):
 
         try:
             logger.debug("Инициализация HTTP клиентов...")
-            user_client: UserServiceClientProtocol = UserServiceClient(
-                base_url=settings.USER_SERVICE_URL,
-                cache=cache,
-                timeout=settings.HTTP_TIMEOUT
-            )
-            access_control_client: AccessControlClientProtocol = AccessControlClient(
-                base_url=settings.ACCESS_CONTROL_SERVICE_URL,
-                cache=cache,
-                timeout=settings.HTTP_TIMEOUT
-            )
+            user_client, access_control_client = create_upstream_clients(settings, cache)
             app.state.user_client = user_client
             app.state.access_control_client = access_control_client
             logger.debug("HTTP клиенты инициализированы")
@@ -80,9 +71,8 @@ async def lifespan(app: FastAPI):
 
         try:
             logger.debug("Инициализация ValidationService...")
-            validation_service: ValidationServiceProtocol = ValidationService(
-                user_client=user_client,
-                access_control_client=access_control_client
+            validation_service: ValidationServiceProtocol = create_validation_service(
+                settings, user_client, access_control_client
             )
             app.state.validation_service = validation_service
             logger.debug("ValidationService инициализирован")
@@ -90,42 +80,36 @@ async def lifespan(app: FastAPI):
             logger.exception(f"Ошибка инициализации ValidationService: {e}")
             raise
 
-        try:
-            logger.debug("Инициализация ResultPublisher...")
-            publisher: ResultPublisherProtocol = ResultPublisher(
-                rabbitmq_url=settings.rabbitmq_url,
-                result_queue_name=settings.RESULT_QUEUE
-            )
-            await publisher.connect()
-            app.state.publisher = publisher
-            logger.debug("ResultPublisher подключен")
-        except Exception as e:
-            logger.exception(f"Ошибка инициализации ResultPublisher: {e}")
-            raise
+        if settings.RUN_CONSUMER_IN_APP:
+            try:
+                logger.debug("Инициализация ResultPublisher...")
+                publisher: ResultPublisherProtocol = await create_publisher(settings)
+                app.state.publisher = publisher
+                logger.debug("ResultPublisher подключен")
+            except Exception as e:
+                logger.exception(f"Ошибка инициализации ResultPublisher: {e}")
+                raise
 
-        try:
-            logger.debug("Инициализация ValidationConsumer...")
-            consumer = ValidationConsumer(
-                validation_service=validation_service,
-                publisher=publisher,
-                rabbitmq_url=settings.rabbitmq_url,
-                validation_queue_name=settings.VALIDATION_QUEUE
-            )
-            await consumer.connect()
-            app.state.consumer = consumer
-            logger.debug("ValidationConsumer подключен")
-        except Exception as e:
-            logger.exception(f"Ошибка инициализации ValidationConsumer: {e}")
-            raise
+            try:
+                logger.debug("Инициализация ValidationConsumer...")
+                consumer = await create_consumer(settings, validation_service, publisher, cache)
+                app.state.consumer = consumer
+                logger.debug("ValidationConsumer подключен")
+            except Exception as e:
+                logger.exception(f"Ошибка инициализации ValidationConsumer: {e}")
+                raise
 
-        try:
-            logger.debug("Запуск ValidationConsumer в фоновом режиме...")
-            consumer_task = asyncio.create_task(consumer.start_consuming())
-            app.state.consumer_task = consumer_task
-            logger.debug("Validation Service запущен и готов к работе")
-        except Exception as e:
-            logger.exception(f"Ошибка запуска ValidationConsumer: {e}")
-            raise
+            try:
+                logger.debug("Запуск ValidationConsumer в фоновом режиме...")
+                consumer_task = asyncio.create_task(consumer.start_consuming())
+                app.state.consumer_task = consumer_task
+                logger.debug("Validation Service запущен и готов к работе")
+            except Exception as e:
+                logger.exception(f"Ошибка запуска ValidationConsumer: {e}")
+                raise
+        else:
+            # Очередь обрабатывают отдельные процессы: python -m validation_service.worker
+            logger.info("Консьюмер в приложении отключен (RUN_CONSUMER_IN_APP=false)")
 
     except Exception as e:
         logger.exception(f"Критическая ошибка при запуске Validation Service: {e}")
@@ -145,19 +129,32 @@ async def lifespan(app: FastAPI):
     if consumer_task and not consumer_task.done():
         try:
             logger.debug("Остановка ValidationConsumer...")
+            # basic.cancel, обработка уже доставленных сообщений до CONSUMER_DRAIN_TIMEOUT
             if consumer:
-                consumer._consuming = False
-            consumer_task.cancel()
+                await consumer.drain(settings.CONSUMER_DRAIN_TIMEOUT)
+            if not consumer_task.done():
+                consumer_task.cancel()
             try:
                 await consumer_task
             except asyncio.CancelledError:
                 pass
-            if consumer:
-                await consumer.close()
             logger.debug("ValidationConsumer остановлен")
         except Exception as e:
             logger.exception(f"Ошибка при остановке ValidationConsumer: {e}")
 
+    if publisher:
+        try:
+            logger.debug("Ожидание подтверждений ResultPublisher...")
+            await publisher.flush()
+        except Exception as e:
+            logger.exception(f"Ошибка при ожидании подтверждений ResultPublisher: {e}")
+
+    if consumer:
+        try:
+            await consumer.close()
+        except Exception as e:
+            logger.exception(f"Ошибка при закрытии ValidationConsumer: {e}")
+
     if publisher:
         try:
             logger.debug("Закрытие ResultPublisher...")
@@ -200,6 +197,12 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+setup_metrics(app)
+setup_tracing(app)
+REGISTRY.register(
+    UpstreamStatsCollector(get_all_pool_stats, get_all_resilience_stats, get_all_hedging_stats)
+)
+
 
 @app.get("/health")
 async def health_check():
@@ -209,15 +212,49 @@ async def health_check():
     }
 
 
+@app.get("/health/http-pool")
+async def http_pool_stats():
+    return {
+        "service": "validation-service",
+        "pools": get_all_pool_stats()
+    }
+
+
+@app.get("/health/resilience")
+async def resilience_stats():
+    return {
+        "service": "validation-service",
+        "upstreams": get_all_resilience_stats()
+    }
+
+
+@app.get("/health/hedging")
+async def hedging_stats():
+    return {
+        "service": "validation-service",
+        "enabled": settings.HEDGING_ENABLED,
+        "upstreams": get_all_hedging_stats()
+    }
+
+
+@app.get("/health/publisher")
+async def publisher_stats():
+    return {
+        "service": "validation-service",
+        "publishers": get_all_publisher_stats()
+    }
+
+
 @app.get("/ready")
 async def readiness_check(request: Request):
 
     checks = {
         "redis": False,
-        "rabbitmq": False,
         "user_service": False,
         "access_control_service": False
     }
+    if settings.RUN_CONSUMER_IN_APP:
+        checks["rabbitmq"] = False
 
     app = request.app
     cache = getattr(app.state, "cache", None)
@@ -233,29 +270,24 @@ async def readiness_check(request: Request):
     except Exception as e:
         logger.warning(f"Redis недоступен: {e}")
 
-    try:
-        if consumer and consumer.connection and not consumer.connection.is_closed:
-            checks["rabbitmq"] = True
-        elif publisher and publisher.connection and not publisher.connection.is_closed:
-            checks["rabbitmq"] = True
-    except Exception as e:
-        logger.warning(f"RabbitMQ недоступен: {e}")
+    if settings.RUN_CONSUMER_IN_APP:
+        try:
+            if consumer and consumer.connection and not consumer.connection.is_closed:
+                checks["rabbitmq"] = True
+            elif publisher and publisher.connection and not publisher.connection.is_closed:
+                checks["rabbitmq"] = True
+        except Exception as e:
+            logger.warning(f"RabbitMQ недоступен: {e}")
 
     try:
         if user_client:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{user_client.base_url}/health")
-                if response.status_code == 200:
-                    checks["user_service"] = True
+            checks["user_service"] = await user_client.check_health(timeout=5.0)
     except Exception as e:
         logger.warning(f"User Service недоступен: {e}")
 
     try:
         if access_control_client:
-            async with httpx.AsyncClient(timeout=5.0) as client:
-                response = await client.get(f"{access_control_client.base_url}/health")
-                if response.status_code == 200:
-                    checks["access_control_service"] = True
+            checks["access_control_service"] = await access_control_client.check_health(timeout=5.0)
     except Exception as e:
         logger.warning(f"Access Control Service недоступен: {e}")
 
@@ -1,7 +1,17 @@
-from enum import Enum
+from enum import Enum, IntEnum
 
 
 class PermissionType(str, Enum):
 
     ACCESS = "access"
     GROUP = "group"
+
+
+class ReasonCode(IntEnum):
+    """Код причины решения; в бинарном формате передается вместо текста."""
+
+    NONE = 0
+    CONFLICT = 1
+    NO_GROUPS = 2
+    UPSTREAM_ERROR = 3
+    OTHER = 255
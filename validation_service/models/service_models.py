@@ -33,6 +33,12 @@ class GetConflictsResponse(BaseModel):
     conflicts: list[Conflict] = Field(default_factory=list, description="Список конфликтов групп")
 
 
+class CheckConflictsResponse(BaseModel):
+    has_conflict: bool = Field(description="Найден ли конфликт")
+    user_group_id: int | None = Field(default=None, description="ID группы пользователя, участвующей в конфликте")
+    requested_group_id: int | None = Field(default=None, description="ID запрашиваемой группы, участвующей в конфликте")
+
+
 class GetGroupAccessesResponse(BaseModel):
     group_id: int = Field(description="ID группы")
     accesses: list[Access] = Field(default_factory=list, description="Доступы, связанные с группой")
@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field, ConfigDict
 
-from validation_service.models.enums import PermissionType
+from validation_service.models.enums import PermissionType, ReasonCode
 
 
 class ValidationRequest(BaseModel):
@@ -38,6 +38,18 @@ class ValidationResult(BaseModel):
         description="Тип права: 'access' - доступ, 'group' - группа"
     )
     item_id: int = Field(description="ID доступа или группы")
+    reason_code: ReasonCode = Field(
+        default=ReasonCode.NONE,
+        description="Код причины решения"
+    )
+    conflict_user_group_id: int | None = Field(
+        default=None,
+        description="Группа пользователя, участвующая в конфликте"
+    )
+    conflict_requested_group_id: int | None = Field(
+        default=None,
+        description="Запрашиваемая группа, участвующая в конфликте"
+    )
 
     model_config = ConfigDict(
         extra="forbid",
@@ -45,10 +57,38 @@ class ValidationResult(BaseModel):
             "example": {
                 "request_id": "550e8400-e29b-41d4-a716-446655440000",
                 "approved": False,
-                "reason": "Conflict: User has group 2 (Developer), requesting group 1 (Owner)",
+                "reason": "Конфликт: пользователь имеет группу 2, запрашивается группа 1",
                 "user_id": 123,
                 "permission_type": "group",
-                "item_id": 2
+                "item_id": 2,
+                "reason_code": 1,
+                "conflict_user_group_id": 2,
+                "conflict_requested_group_id": 1
             }
         }
     )
+
+
+def format_reason(
+    reason_code: ReasonCode,
+    permission_type: PermissionType | str,
+    item_id: int,
+    conflict_user_group_id: int | None = None,
+    conflict_requested_group_id: int | None = None,
+    detail: str | None = None,
+) -> str | None:
+    """Текст причины по коду: в бинарном формате текст не передается и восстанавливается здесь."""
+
+    if reason_code == ReasonCode.NONE:
+        return None
+    if reason_code == ReasonCode.CONFLICT:
+        return (
+            f"Конфликт: пользователь имеет группу {conflict_user_group_id}, "
+            f"запрашивается группа {conflict_requested_group_id}"
+        )
+    if reason_code == ReasonCode.NO_GROUPS:
+        permission_type = getattr(permission_type, "value", permission_type)
+        return f"Не найдено групп для {permission_type} с ID {item_id}"
+    if reason_code == ReasonCode.UPSTREAM_ERROR:
+        return f"Ошибка при получении данных: {detail}" if detail else "Ошибка при получении данных"
+    return detail
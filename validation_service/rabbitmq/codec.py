@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import json
+import struct
+import uuid
+
+from validation_service.models.enums import PermissionType, ReasonCode
+from validation_service.models.validation_models import (
+    ValidationRequest,
+    ValidationResult,
+    format_reason,
+)
+
+# Компактный формат сообщений очередей validation_queue и result_queue.
+# Формат выбирается по content_type сообщения; JSON по-прежнему принимается.
+#
+# Заявка (little-endian):
+#   версия (uint8), тип права (uint8), флаги (uint8), user_id (int64), item_id (int64), request_id
+# Результат:
+#   версия (uint8), тип права (uint8), флаги (uint8), код причины (uint8), user_id (int64), item_id (int64),
+#   [группа пользователя (int64), запрашиваемая группа (int64) — только для CONFLICT], request_id,
+#   [текст причины — при флаге REASON_TEXT]
+# request_id: 16 байт UUID при флаге UUID, иначе длина (uint16) и UTF-8.
+
+JSON_CONTENT_TYPE = "application/json"
+WIRE_FORMAT_VERSION = 1
+VALIDATION_REQUEST_CONTENT_TYPE = f"application/vnd.validation-request.v{WIRE_FORMAT_VERSION}"
+VALIDATION_RESULT_CONTENT_TYPE = f"application/vnd.validation-result.v{WIRE_FORMAT_VERSION}"
+
+WIRE_FORMAT_JSON = "json"
+WIRE_FORMAT_BINARY = "binary"
+
+_REQUEST_HEADER = struct.Struct("<BBBqq")
+_RESULT_HEADER = struct.Struct("<BBBBqq")
+_CONFLICT = struct.Struct("<qq")
+_LENGTH = struct.Struct("<H")
+
+_FLAG_UUID = 0x01
+_FLAG_APPROVED = 0x02
+_FLAG_REASON_TEXT = 0x04
+
+_PERMISSION_CODES = {PermissionType.ACCESS: 0, PermissionType.GROUP: 1}
+_PERMISSION_TYPES = {code: permission_type for permission_type, code in _PERMISSION_CODES.items()}
+
+
+def _encode_request_id(request_id: str) -> tuple[int, bytes]:
+
+    try:
+        parsed = uuid.UUID(request_id)
+    except ValueError:
+        parsed = None
+    if parsed is not None and str(parsed) == request_id:
+        return _FLAG_UUID, parsed.bytes
+
+    encoded = request_id.encode("utf-8")
+    return 0, _LENGTH.pack(len(encoded)) + encoded
+
+
+def _decode_text(data: bytes, offset: int) -> tuple[str, int]:
+    (length,) = _LENGTH.unpack_from(data, offset)
+    offset += _LENGTH.size
+    if len(data) < offset + length:
+        raise ValueError("Сообщение обрезано")
+    return data[offset:offset + length].decode("utf-8"), offset + length
+
+
+def _decode_request_id(data: bytes, offset: int, flags: int) -> tuple[str, int]:
+
+    if flags & _FLAG_UUID:
+        if len(data) < offset + 16:
+            raise ValueError("Сообщение обрезано")
+        return str(uuid.UUID(bytes=data[offset:offset + 16])), offset + 16
+    return _decode_text(data, offset)
+
+
+def _check_version(version: int) -> None:
+    if version != WIRE_FORMAT_VERSION:
+        raise ValueError(f"Неподдерживаемая версия формата сообщения: {version}")
+
+
+def _is_binary(content_type: str | None, binary_content_type: str) -> bool:
+    return (content_type or "").split(";", 1)[0].strip().lower() == binary_content_type
+
+
+def encode_validation_request(request: ValidationRequest) -> bytes:
+
+    flags, request_id = _encode_request_id(request.request_id)
+    return _REQUEST_HEADER.pack(
+        WIRE_FORMAT_VERSION,
+        _PERMISSION_CODES[request.permission_type],
+        flags,
+        request.user_id,
+        request.item_id,
+    ) + request_id
+
+
+def decode_validation_request(body: bytes, content_type: str | None) -> ValidationRequest:
+    """Декодирует заявку; ошибки формата — ValueError (сообщение отбрасывается)."""
+
+    if not _is_binary(content_type, VALIDATION_REQUEST_CONTENT_TYPE):
+        return ValidationRequest(**json.loads(body.decode("utf-8")))
+
+    try:
+        version, permission_code, flags, user_id, item_id = _REQUEST_HEADER.unpack_from(body)
+        _check_version(version)
+        request_id, _ = _decode_request_id(body, _REQUEST_HEADER.size, flags)
+        permission_type = _PERMISSION_TYPES[permission_code]
+    except (struct.error, KeyError, UnicodeDecodeError) as e:
+        raise ValueError(f"Некорректная заявка в бинарном формате: {e!r}") from e
+
+    return ValidationRequest(
+        user_id=user_id,
+        permission_type=permission_type,
+        item_id=item_id,
+        request_id=request_id,
+    )
+
+
+def encode_validation_result(result: ValidationResult) -> bytes:
+
+    flags, request_id = _encode_request_id(result.request_id)
+    if result.approved:
+        flags |= _FLAG_APPROVED
+
+    # Текст передается только для причин, которые нельзя восстановить по коду
+    reason_text = b""
+    if result.reason and result.reason_code in (ReasonCode.UPSTREAM_ERROR, ReasonCode.OTHER):
+        flags |= _FLAG_REASON_TEXT
+        encoded = result.reason.encode("utf-8")[:0xFFFF]
+        reason_text = _LENGTH.pack(len(encoded)) + encoded
+
+    parts = [
+        _RESULT_HEADER.pack(
+            WIRE_FORMAT_VERSION,
+            _PERMISSION_CODES[result.permission_type],
+            flags,
+            result.reason_code,
+            result.user_id,
+            result.item_id,
+        )
+    ]
+    if result.reason_code == ReasonCode.CONFLICT:
+        parts.append(_CONFLICT.pack(result.conflict_user_group_id or 0, result.conflict_requested_group_id or 0))
+    parts.append(request_id)
+    parts.append(reason_text)
+    return b"".join(parts)
+
+
+def decode_validation_result(body: bytes, content_type: str | None) -> ValidationResult:
+
+    if not _is_binary(content_type, VALIDATION_RESULT_CONTENT_TYPE):
+        return ValidationResult(**json.loads(body.decode("utf-8")))
+
+    try:
+        version, permission_code, flags, reason_code, user_id, item_id = _RESULT_HEADER.unpack_from(body)
+        _check_version(version)
+        offset = _RESULT_HEADER.size
+        conflict_user_group_id = conflict_requested_group_id = None
+        if reason_code == ReasonCode.CONFLICT:
+            conflict_user_group_id, conflict_requested_group_id = _CONFLICT.unpack_from(body, offset)
+            offset += _CONFLICT.size
+        request_id, offset = _decode_request_id(body, offset, flags)
+        detail = _decode_text(body, offset)[0] if flags & _FLAG_REASON_TEXT else None
+        permission_type = _PERMISSION_TYPES[permission_code]
+        reason_code = ReasonCode(reason_code)
+    except (struct.error, KeyError, UnicodeDecodeError) as e:
+        raise ValueError(f"Некорректный результат в бинарном формате: {e!r}") from e
+
+    if reason_code == ReasonCode.UPSTREAM_ERROR and detail is not None:
+        reason = detail
+    else:
+        reason = format_reason(
+            reason_code, permission_type, item_id, conflict_user_group_id, conflict_requested_group_id, detail
+        )
+
+    return ValidationResult(
+        request_id=request_id,
+        approved=bool(flags & _FLAG_APPROVED),
+        reason=reason,
+        user_id=user_id,
+        permission_type=permission_type,
+        item_id=item_id,
+        reason_code=reason_code,
+        conflict_user_group_id=conflict_user_group_id,
+        conflict_requested_group_id=conflict_requested_group_id,
+    )
+
+
+def encode_result_message(result: ValidationResult, wire_format: str) -> tuple[bytes, str]:
+    """Тело и content_type результата в выбранном формате."""
+
+    if wire_format == WIRE_FORMAT_BINARY:
+        return encode_validation_result(result), VALIDATION_RESULT_CONTENT_TYPE
+    return result.model_dump_json().encode("utf-8"), JSON_CONTENT_TYPE
@@ -1,14 +1,47 @@
+import asyncio
 import json
 import logging
+import time
+from functools import partial
+from typing import Any
+
 import aio_pika
 from aio_pika.abc import AbstractConnection, AbstractChannel
 
-from validation_service.models.validation_models import ValidationRequest
-from validation_service.services.protocols import ValidationServiceProtocol
+from validation_service.rabbitmq.codec import decode_validation_request
+from validation_service.models.enums import ReasonCode
+from validation_service.rabbitmq.retry import RetryRouter
+from validation_service.rabbitmq.routing import LANE_BULK, LANE_INTERACTIVE, REPUBLISH_HEADER, all_queue_names
+from validation_service.services.protocols import CacheProtocol, ValidationServiceProtocol
 from validation_service.rabbitmq.protocols import ResultPublisherProtocol
+from validation_service.services.tracing import extract, record_queue_wait, start_span
+from validation_service.services.metrics import (
+    QUEUE_MESSAGES_CONSUMED_TOTAL,
+    QUEUE_MESSAGE_PROCESSING_DURATION,
+    QUEUE_MESSAGES_IN_PROGRESS,
+    VALIDATION_REQUEST_DUPLICATES_TOTAL,
+    record_cache_lookup,
+)
 
 logger = logging.getLogger(__name__)
 
+VALIDATED_REQUEST_KEY = "validation_request:{request_id}:validated"
+
+
+class _Lane:
+    """Очередь-шард с буфером доставленных сообщений и весом для планировщика."""
+
+    def __init__(self, name: str, lane: str, weight: int):
+        self.name = name
+        self.lane = lane
+        self.weight = weight
+        self.queue: aio_pika.abc.AbstractQueue | Any | None = None
+        self.retry: RetryRouter | None = None
+        # Размер буфера ограничен prefetch: брокер не выдает консьюмеру больше неподтвержденных
+        self.buffer: asyncio.Queue = asyncio.Queue()
+        self.consumer_tag: str | None = None
+        self.current = 0
+
 
 class ValidationConsumer:
     
@@ -17,17 +50,51 @@ class ValidationConsumer:
         validation_service: ValidationServiceProtocol,
         publisher: ResultPublisherProtocol,
         rabbitmq_url: str,
-        validation_queue_name: str
+        validation_queue_name: str,
+        shards: int = 1,
+        interactive_weight: int = 4,
+        bulk_weight: int = 1,
+        prefetch_count: int = 1,
+        retry_delays: list[float] | None = None,
+        cache: CacheProtocol | None = None,
+        dedup_ttl: int = 86400,
+        channel: Any | None = None
     ):
 
         self._validation_service = validation_service
         self._publisher = publisher
         self._rabbitmq_url = rabbitmq_url
         self._validation_queue_name = validation_queue_name
+        # Очередь должна держать в буфере сообщения на весь цикл весов: при prefetch=1 только что
+        # подтвержденная очередь еще пуста при выборе следующей, и веса вырождаются в чередование 1:1
+        self._prefetch_count = max(prefetch_count, interactive_weight + bulk_weight)
+        self._retry_delays = retry_delays if retry_delays is not None else []
+        # Отметки провалидированных request_id: повторная доставка не вызывает повторную валидацию
+        self._cache = cache
+        self._dedup_ttl = dedup_ttl
         self._connection: AbstractConnection | None = None
         self._channel: AbstractChannel | None = None
-        self._queue: aio_pika.abc.AbstractQueue | None = None
+        weights = {LANE_INTERACTIVE: interactive_weight, LANE_BULK: bulk_weight}
+        self._lanes = [
+            _Lane(name, lane, weights[lane])
+            for lane, name in all_queue_names(validation_queue_name, shards)
+        ]
+        # Готовый канал (например, InMemoryChannel в бенчмарках) — без подключения к брокеру
+        self._external_channel = channel
+        self._ready = asyncio.Event()
+        self._stopped = asyncio.Event()
+        self._stopped.set()
         self._consuming = False
+        self._draining = False
+        self._handling = 0
+
+    @property
+    def connection(self) -> AbstractConnection | None:
+        return self._connection
+
+    @property
+    def queue_names(self) -> list[str]:
+        return [lane.name for lane in self._lanes]
 
     async def connect(self):
 
@@ -36,18 +103,24 @@ class ValidationConsumer:
             return
 
         try:
-            self._connection = await aio_pika.connect_robust(self._rabbitmq_url)
-            self._channel = await self._connection.channel()
+            if self._external_channel is not None:
+                self._channel = self._external_channel
+            else:
+                self._connection = await aio_pika.connect_robust(self._rabbitmq_url)
+                # Канал с подтверждениями: сообщение подтверждается только после того, как брокер
+                # принял его копию в очереди повтора или DLQ
+                self._channel = await self._connection.channel(publisher_confirms=True)
 
-            await self._channel.set_qos(prefetch_count=1)
+            # prefetch ограничивает число неподтвержденных сообщений на каждую очередь-шард
+            await self._channel.set_qos(prefetch_count=self._prefetch_count)
 
-            self._queue = await self._channel.declare_queue(
-                self._validation_queue_name,
-                durable=True
-            )
+            for lane in self._lanes:
+                lane.queue = await self._channel.declare_queue(lane.name, durable=True)
+                lane.retry = RetryRouter(lane.name, self._retry_delays)
+                await lane.retry.declare(self._channel)
 
             logger.info(
-                f"ValidationConsumer подключен к RabbitMQ, очередь: {self._validation_queue_name}"
+                f"ValidationConsumer подключен к RabbitMQ, очереди: {self.queue_names}"
             )
         except Exception as e:
             logger.error(f"Ошибка подключения ValidationConsumer к RabbitMQ: {e}")
@@ -64,52 +137,215 @@ class ValidationConsumer:
         except Exception as e:
             logger.error(f"Ошибка при закрытии ValidationConsumer: {e}")
 
+    @property
+    def in_flight(self) -> int:
+        """Доставленные, но еще не подтвержденные сообщения: буферы очередей и текущее."""
+        return sum(lane.buffer.qsize() for lane in self._lanes) + self._handling
+
     async def start_consuming(self):
-        if not self._queue:
+        if not self._lanes or any(lane.queue is None for lane in self._lanes):
             raise RuntimeError("Consumer не подключен к RabbitMQ. Вызовите connect() сначала.")
 
         self._consuming = True
-        logger.info(f"Начато потребление сообщений из очереди {self._validation_queue_name}")
+        self._draining = False
+        self._stopped.clear()
+        try:
+            for lane in self._lanes:
+                lane.consumer_tag = await lane.queue.consume(partial(self._on_message, lane))
+            logger.info(f"Начато потребление сообщений из очередей {self.queue_names}")
+
+            while self._consuming:
+                lane = self._next_lane()
+                if lane is None:
+                    if self._draining:
+                        break
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+
+                self._handling = 1
+                try:
+                    await self._handle_message(lane.buffer.get_nowait(), lane)
+                finally:
+                    self._handling = 0
+        finally:
+            await self._cancel_consumers()
+            await self._requeue_buffered()
+            self._stopped.set()
+
+    async def _on_message(self, lane: _Lane, message: aio_pika.IncomingMessage) -> None:
+        lane.buffer.put_nowait(message)
+        self._ready.set()
+
+    async def stop(self) -> None:
+        """Завершает цикл потребления после обработки текущего сообщения."""
+
+        self._consuming = False
+        self._ready.set()
+
+    async def drain(self, timeout: float) -> bool:
+        """Останавливает получение сообщений и дожидается обработки уже доставленных.
+
+        Сначала basic.cancel по всем очередям — брокер перестает выдавать новые сообщения;
+        затем обрабатываются сообщения из буферов. Если за timeout это не удалось, цикл
+        завершается после текущего сообщения, а необработанные возвращаются в очередь.
+        Возвращает True, если все доставленные сообщения обработаны.
+        """
+
+        if self._stopped.is_set():
+            return True
+
+        started = time.perf_counter()
+        logger.info(f"Остановка потребления, сообщений в обработке: {self.in_flight}")
+        self._draining = True
+        await self._cancel_consumers()
+        self._ready.set()
+
+        try:
+            await asyncio.wait_for(self._stopped.wait(), timeout=timeout)
+        except asyncio.TimeoutError:
+            logger.warning(
+                f"Обработка не завершилась за {timeout} с, в обработке: {self.in_flight}; "
+                f"необработанные сообщения будут возвращены в очередь"
+            )
+            await self.stop()
+            return False
 
-        async with self._queue.iterator() as queue_iter:
-            async for message in queue_iter:
-                if not self._consuming:
-                    break
-                await self._handle_message(message)
+        logger.info(f"Потребление остановлено, обработка завершена за {time.perf_counter() - started:.2f} с")
+        return True
 
-    async def _handle_message(self, message: aio_pika.IncomingMessage):
+    async def _cancel_consumers(self) -> None:
 
-        async with message.process():
+        for lane in self._lanes:
+            consumer_tag, lane.consumer_tag = lane.consumer_tag, None
+            if consumer_tag is None:
+                continue
             try:
+                await lane.queue.cancel(consumer_tag)
+            except Exception as e:
+                logger.warning(f"Не удалось отменить потребление из {lane.name}: {e}")
+
+    async def _requeue_buffered(self) -> None:
+        """Возвращает в очередь доставленные, но не обработанные сообщения (по одному, без multiple)."""
+
+        for lane in self._lanes:
+            while not lane.buffer.empty():
+                message = lane.buffer.get_nowait()
                 try:
-                    body = message.body.decode('utf-8')
-                    request_data = json.loads(body)
-                    request = ValidationRequest(**request_data)
-                except (json.JSONDecodeError, ValueError, TypeError) as e:
-                    logger.error(
-                        f"Ошибка парсинга сообщения: {e}, "
-                        f"body: {message.body.decode('utf-8', errors='ignore')}"
+                    await message.nack(requeue=True)
+                    QUEUE_MESSAGES_CONSUMED_TOTAL.labels(queue=lane.name, outcome="requeued").inc()
+                except Exception as e:
+                    logger.warning(f"Не удалось вернуть сообщение {message.message_id} в {lane.name}: {e}")
+
+    def _next_lane(self) -> _Lane | None:
+        """Плавный взвешенный round-robin по очередям, в буфере которых есть сообщения.
+
+        Interactive-очереди получают interactive_weight обработок на каждые bulk_weight
+        обработок bulk-очередей, поэтому пакетная загрузка не блокирует одиночные заявки.
+        """
+
+        selected: _Lane | None = None
+        total = 0
+        for lane in self._lanes:
+            if lane.buffer.empty():
+                continue
+            lane.current += lane.weight
+            total += lane.weight
+            if selected is None or lane.current > selected.current:
+                selected = lane
+
+        if selected is not None:
+            selected.current -= total
+        return selected
+
+    async def _is_validated(self, request_id: str) -> bool:
+
+        if self._cache is None:
+            return False
+        validated = await self._cache.get(VALIDATED_REQUEST_KEY.format(request_id=request_id)) is not None
+        record_cache_lookup("validated_requests", validated)
+        return validated
+
+    async def _mark_validated(self, request_id: str) -> None:
+
+        if self._cache is not None:
+            await self._cache.setex(VALIDATED_REQUEST_KEY.format(request_id=request_id), self._dedup_ttl, "1")
+
+    async def _handle_message(self, message: aio_pika.IncomingMessage, lane: _Lane):
+
+        queue_name = lane.name
+        QUEUE_MESSAGES_IN_PROGRESS.labels(queue=queue_name).inc()
+        started = time.perf_counter()
+        outcome = "processed"
+
+        trace_parent = extract(message.headers)
+        record_queue_wait(queue_name, message.headers, trace_parent)
+
+        with start_span(
+            "amqp.consume", parent=trace_parent, attributes={"messaging.queue": queue_name}
+        ):
+            async with message.process(ignore_processed=True):
+                try:
+                    try:
+                        request = decode_validation_request(message.body, message.content_type)
+                    except (json.JSONDecodeError, ValueError, TypeError) as e:
+                        # Некорректное сообщение не исправится при повторе — сразу в DLQ
+                        outcome = "dead_lettered"
+                        logger.error(
+                            f"Ошибка парсинга сообщения: {e}, "
+                            f"body: {message.body.decode('utf-8', errors='ignore')}"
+                        )
+                        await lane.retry.dead_letter(message, f"Ошибка парсинга: {e}")
+                        return
+
+                    logger.debug(
+                        f"Получен запрос на валидацию: request_id={request.request_id}, "
+                        f"user_id={request.user_id}, {request.permission_type}={request.item_id}"
                     )
-                    await message.nack(requeue=False)
-                    return
 
-                logger.info(
-                    f"Получен запрос на валидацию: request_id={request.request_id}, "
-                    f"user_id={request.user_id}, {request.permission_type}={request.item_id}"
-                )
+                    # Повторную отправку реконсилятора User Service не пропускаем: заявка там
+                    # все еще pending, значит прежний результат потерян
+                    republished = bool((message.headers or {}).get(REPUBLISH_HEADER))
+                    if not republished and await self._is_validated(request.request_id):
+                        outcome = "duplicate"
+                        VALIDATION_REQUEST_DUPLICATES_TOTAL.labels(queue=queue_name).inc()
+                        logger.debug(f"Повторная доставка заявки {request.request_id} пропущена")
+                        await message.ack()
+                        return
 
-                result = await self._validation_service.validate(request)
+                    result = await self._validation_service.validate(request)
 
-                await self._publisher.publish_result(result)
+                    # Недоступность соседнего сервиса — повтор с задержкой; после последней
+                    # ступени публикуется отклонение, как и раньше
+                    if result.reason_code == ReasonCode.UPSTREAM_ERROR and lane.retry.can_retry(message):
+                        outcome = "retried"
+                        await lane.retry.retry(message, result.reason)
+                        return
 
-                logger.debug(
-                    f"Запрос {request.request_id} обработан успешно, "
-                    f"результат: approved={result.approved}"
-                )
+                    await self._publisher.publish_result(result)
+                    await self._mark_validated(request.request_id)
 
-            except Exception as e:
-                logger.exception(
-                    f"Ошибка обработки сообщения: {e}, "
-                    f"message_id={message.message_id if hasattr(message, 'message_id') else 'unknown'}"
-                )
-                await message.nack(requeue=False)
+                    logger.debug(
+                        f"Запрос {request.request_id} обработан успешно, "
+                        f"результат: approved={result.approved}"
+                    )
+
+                except asyncio.CancelledError:
+                    # Остановка по истечении срока drain: process() отклонил бы сообщение без
+                    # возврата в очередь, поэтому оно возвращается явно
+                    outcome = "requeued"
+                    await message.nack(requeue=True)
+                    raise
+                except Exception as e:
+                    outcome = "failed"
+                    logger.exception(
+                        f"Ошибка обработки сообщения: {e}, "
+                        f"message_id={message.message_id if hasattr(message, 'message_id') else 'unknown'}"
+                    )
+                    await lane.retry.retry(message, repr(e))
+                finally:
+                    QUEUE_MESSAGE_PROCESSING_DURATION.labels(queue=queue_name).observe(
+                        time.perf_counter() - started
+                    )
+                    QUEUE_MESSAGES_CONSUMED_TOTAL.labels(queue=queue_name, outcome=outcome).inc()
+                    QUEUE_MESSAGES_IN_PROGRESS.labels(queue=queue_name).dec()
@@ -0,0 +1,339 @@
+from __future__ import annotations
+
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+from typing import Any, Awaitable, Callable
+
+from validation_service.models.validation_models import ValidationResult
+from validation_service.rabbitmq.codec import WIRE_FORMAT_BINARY, encode_result_message
+from validation_service.services.tracing import PUBLISHED_AT_HEADER, inject, start_span
+
+logger = logging.getLogger(__name__)
+
+# In-memory замена RabbitMQ для бенчмарков и тестов: повторяет ту часть API aio_pika,
+# которой пользуются ValidationConsumer и ResultPublisher (consume/cancel, iterator, process, ack/nack),
+# включая очереди с x-message-ttl и x-dead-letter-routing-key для отложенных повторов.
+
+
+class InMemoryMessageProcessError(RuntimeError):
+    """Повторное подтверждение уже обработанного сообщения (как MessageProcessError в aio_pika)."""
+
+
+class InMemoryMessage:
+
+    _delivery_tags = itertools.count(1)
+
+    def __init__(
+        self,
+        queue: InMemoryQueue,
+        body: bytes,
+        headers: dict[str, Any] | None = None,
+        message_id: str | None = None,
+        content_type: str | None = None,
+    ):
+        self._queue = queue
+        self.body = body
+        self.content_type = content_type
+        self.headers: dict[str, Any] = dict(headers or {})
+        self.message_id = message_id or uuid.uuid4().hex
+        self.routing_key = queue.name
+        self.delivery_tag = next(self._delivery_tags)
+        self.redelivered = False
+        self.channel = queue.channel
+        self._processed = False
+        # Освобождает место в окне prefetch консьюмера, получившего сообщение
+        self._on_settle: Callable[[], None] | None = None
+
+    @property
+    def processed(self) -> bool:
+        return self._processed
+
+    def _settle(self) -> None:
+        if self._processed:
+            raise InMemoryMessageProcessError(f"Сообщение {self.message_id} уже обработано")
+        self._processed = True
+        self._queue._task_done()
+        if self._on_settle is not None:
+            self._on_settle()
+
+    async def ack(self, multiple: bool = False) -> None:
+        self._settle()
+        self._queue.acked += 1
+
+    async def reject(self, requeue: bool = False) -> None:
+        await self.nack(requeue=requeue)
+
+    async def nack(self, multiple: bool = False, requeue: bool = True) -> None:
+
+        self._settle()
+        if requeue:
+            self._queue._redeliver(self)
+        else:
+            self._queue.dead_letters.append(self)
+
+    def process(
+        self,
+        requeue: bool = False,
+        reject_on_redelivered: bool = False,
+        ignore_processed: bool = False,
+    ) -> _ProcessContext:
+        return _ProcessContext(self, requeue, reject_on_redelivered, ignore_processed)
+
+
+class _ProcessContext:
+
+    def __init__(
+        self,
+        message: InMemoryMessage,
+        requeue: bool,
+        reject_on_redelivered: bool,
+        ignore_processed: bool,
+    ):
+        self._message = message
+        self._requeue = requeue
+        self._reject_on_redelivered = reject_on_redelivered
+        self._ignore_processed = ignore_processed
+
+    async def __aenter__(self) -> InMemoryMessage:
+        return self._message
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+
+        message = self._message
+        if self._ignore_processed and message.processed:
+            return
+
+        if exc_type is None:
+            await message.ack()
+        elif self._reject_on_redelivered and message.redelivered:
+            await message.reject(requeue=False)
+        else:
+            await message.reject(requeue=self._requeue)
+
+
+class InMemoryQueue:
+    """Очередь сообщений в памяти процесса с подтверждениями и списком отброшенных сообщений.
+
+    Очередь с x-message-ttl и x-dead-letter-routing-key не выдает сообщения консьюмерам,
+    а по истечении TTL перекладывает их в очередь назначения того же канала.
+    """
+
+    _consumer_tags = itertools.count(1)
+
+    def __init__(
+        self,
+        name: str,
+        channel: InMemoryChannel | None = None,
+        arguments: dict[str, Any] | None = None,
+    ):
+        self.name = name
+        self.channel = channel
+        self.arguments = dict(arguments or {})
+        self._messages: asyncio.Queue[InMemoryMessage] = asyncio.Queue()
+        self._unsettled = 0
+        self._settled = asyncio.Event()
+        self._settled.set()
+        self.published = 0
+        self.acked = 0
+        self.dead_letters: list[InMemoryMessage] = []
+        self._consumers: dict[str, asyncio.Task] = {}
+
+    def qsize(self) -> int:
+        return self._messages.qsize()
+
+    def put_nowait(
+        self,
+        body: bytes,
+        headers: dict[str, Any] | None = None,
+        message_id: str | None = None,
+        content_type: str | None = None,
+    ) -> InMemoryMessage:
+
+        message = InMemoryMessage(self, body, headers, message_id, content_type)
+        self._unsettled += 1
+        self._settled.clear()
+        self.published += 1
+
+        ttl = self.arguments.get("x-message-ttl")
+        target = self.arguments.get("x-dead-letter-routing-key")
+        if ttl is not None and target is not None and self.channel is not None:
+            asyncio.get_running_loop().call_later(ttl / 1000, self._expire, message, target)
+        else:
+            self._messages.put_nowait(message)
+        return message
+
+    def _expire(self, message: InMemoryMessage, target: str) -> None:
+
+        self.channel.get_queue(target).put_nowait(
+            message.body, message.headers, message.message_id, message.content_type
+        )
+        message._settle()
+
+    async def put(
+        self,
+        body: bytes,
+        headers: dict[str, Any] | None = None,
+        message_id: str | None = None,
+        content_type: str | None = None,
+    ) -> InMemoryMessage:
+        return self.put_nowait(body, headers, message_id, content_type)
+
+    def _redeliver(self, message: InMemoryMessage) -> None:
+
+        redelivered = InMemoryMessage(
+            self, message.body, message.headers, message.message_id, message.content_type
+        )
+        redelivered.redelivered = True
+        self._unsettled += 1
+        self._settled.clear()
+        self._messages.put_nowait(redelivered)
+
+    def _task_done(self) -> None:
+        self._unsettled -= 1
+        if self._unsettled == 0:
+            self._settled.set()
+
+    async def join(self) -> None:
+        """Ожидает, пока все опубликованные сообщения будут подтверждены или отброшены."""
+        await self._settled.wait()
+
+    async def get(self, no_ack: bool = False, fail: bool = True) -> InMemoryMessage | None:
+
+        try:
+            return self._messages.get_nowait()
+        except asyncio.QueueEmpty:
+            if fail:
+                raise
+            return None
+
+    def iterator(self) -> _QueueIterator:
+        return _QueueIterator(self._messages)
+
+    async def consume(self, callback: Callable[[InMemoryMessage], Awaitable[Any]], no_ack: bool = False) -> str:
+        """basic.consume: сообщения передаются в callback с учетом prefetch канала."""
+
+        consumer_tag = f"ctag.{next(self._consumer_tags)}"
+        prefetch_count = self.channel.prefetch_count if self.channel is not None else 0
+        self._consumers[consumer_tag] = asyncio.create_task(self._deliver(callback, prefetch_count))
+        return consumer_tag
+
+    async def _deliver(self, callback: Callable[[InMemoryMessage], Awaitable[Any]], prefetch_count: int) -> None:
+
+        window = asyncio.Semaphore(prefetch_count) if prefetch_count else None
+        while True:
+            if window is not None:
+                await window.acquire()
+            message = await self._messages.get()
+            if window is not None:
+                message._on_settle = window.release
+            await callback(message)
+
+    async def cancel(self, consumer_tag: str) -> None:
+        """basic.cancel: новые сообщения не доставляются, выданные остаются неподтвержденными."""
+
+        task = self._consumers.pop(consumer_tag, None)
+        if task is not None:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+
+
+class _QueueIterator:
+
+    def __init__(self, messages: asyncio.Queue[InMemoryMessage]):
+        self._messages = messages
+
+    async def __aenter__(self) -> _QueueIterator:
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb) -> None:
+        return None
+
+    def __aiter__(self) -> _QueueIterator:
+        return self
+
+    async def __anext__(self) -> InMemoryMessage:
+        return await self._messages.get()
+
+
+class InMemoryExchange:
+    """Exchange по умолчанию: сообщение попадает в очередь с именем routing_key."""
+
+    def __init__(self, channel: InMemoryChannel):
+        self._channel = channel
+
+    async def publish(self, message: Any, routing_key: str) -> None:
+        await self._channel.get_queue(routing_key).put(
+            message.body,
+            headers=message.headers,
+            message_id=message.message_id,
+            content_type=message.content_type,
+        )
+
+
+class InMemoryChannel:
+    """Канал с реестром очередей по имени; повторное объявление возвращает ту же очередь."""
+
+    is_closed = False
+
+    def __init__(self) -> None:
+        self.queues: dict[str, InMemoryQueue] = {}
+        self.prefetch_count = 0
+        self.default_exchange = InMemoryExchange(self)
+
+    def get_queue(self, name: str, arguments: dict[str, Any] | None = None) -> InMemoryQueue:
+
+        if name not in self.queues:
+            self.queues[name] = InMemoryQueue(name, self, arguments)
+        return self.queues[name]
+
+    async def declare_queue(
+        self,
+        name: str,
+        durable: bool = False,
+        arguments: dict[str, Any] | None = None,
+    ) -> InMemoryQueue:
+        return self.get_queue(name, arguments)
+
+    async def set_qos(self, prefetch_count: int = 0) -> None:
+        self.prefetch_count = prefetch_count
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemoryResultPublisher:
+    """ResultPublisherProtocol без брокера: результаты сохраняются в списке и, при наличии, в очереди."""
+
+    def __init__(self, result_queue: InMemoryQueue | None = None, wire_format: str = WIRE_FORMAT_BINARY):
+        self._result_queue = result_queue
+        self._wire_format = wire_format
+        self.results: list[ValidationResult] = []
+
+    async def connect(self) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+    async def flush(self) -> None:
+        return None
+
+    async def publish_result(self, result: ValidationResult) -> None:
+
+        self.results.append(result)
+        if self._result_queue is None:
+            return
+
+        with start_span(
+            "amqp.publish",
+            attributes={"messaging.queue": self._result_queue.name, "request.id": result.request_id},
+        ):
+            body, content_type = encode_result_message(result, self._wire_format)
+            await self._result_queue.put(
+                body,
+                headers=inject({PUBLISHED_AT_HEADER: time.time_ns()}),
+                content_type=content_type,
+            )
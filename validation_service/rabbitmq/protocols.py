@@ -11,5 +11,8 @@ class ResultPublisherProtocol(Protocol):
     async def close(self) -> None:
         ...
 
+    async def flush(self) -> None:
+        ...
+
     async def publish_result(self, result: ValidationResult) -> None:
         ...
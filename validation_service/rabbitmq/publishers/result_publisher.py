@@ -1,8 +1,16 @@
 import logging
+import time
 import aio_pika
 from aio_pika.abc import AbstractConnection, AbstractChannel
 
 from validation_service.models.validation_models import ValidationResult
+from validation_service.rabbitmq.codec import WIRE_FORMAT_JSON, encode_result_message
+from validation_service.rabbitmq.publishers.batch_publisher import BatchPublisher, create_batch_publisher
+from validation_service.services.tracing import PUBLISHED_AT_HEADER, inject, start_span
+from validation_service.services.metrics import (
+    QUEUE_MESSAGES_PUBLISHED_TOTAL,
+    QUEUE_PUBLISH_ERRORS_TOTAL,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -12,24 +20,43 @@ class ResultPublisher:
     def __init__(
         self,
         rabbitmq_url: str,
-        result_queue_name: str
+        result_queue_name: str,
+        batch_size: int = 100,
+        flush_interval: float = 0.005,
+        max_outstanding: int = 1000,
+        max_retries: int = 3,
+        wire_format: str = WIRE_FORMAT_JSON
     ):
 
         self._rabbitmq_url = rabbitmq_url
         self._result_queue_name = result_queue_name
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_outstanding = max_outstanding
+        self._max_retries = max_retries
+        self._wire_format = wire_format
         self._connection: AbstractConnection | None = None
         self._channel: AbstractChannel | None = None
         self._queue: aio_pika.abc.AbstractQueue | None = None
+        self._batch_publisher: BatchPublisher | None = None
 
     async def connect(self):
         try:
             self._connection = await aio_pika.connect_robust(self._rabbitmq_url)
-            self._channel = await self._connection.channel()
+            self._channel = await self._connection.channel(publisher_confirms=True)
 
             self._queue = await self._channel.declare_queue(
                 self._result_queue_name,
                 durable=True
             )
+            self._batch_publisher = create_batch_publisher(
+                name=self._result_queue_name,
+                channel=self._channel,
+                max_batch_size=self._batch_size,
+                flush_interval=self._flush_interval,
+                max_outstanding=self._max_outstanding,
+                max_retries=self._max_retries,
+            )
 
             logger.info(
                 f"Publisher подключен к RabbitMQ, очередь: {self._result_queue_name}"
@@ -38,8 +65,15 @@ class ResultPublisher:
             logger.error(f"Ошибка подключения Publisher к RabbitMQ: {e}")
             raise
 
+    async def flush(self):
+        """Ждет подтверждения брокером всех отправленных результатов."""
+        if self._batch_publisher:
+            await self._batch_publisher.flush()
+
     async def close(self):
         try:
+            if self._batch_publisher:
+                await self._batch_publisher.close()
             if self._channel and not self._channel.is_closed:
                 await self._channel.close()
             if self._connection and not self._connection.is_closed:
@@ -49,26 +83,35 @@ class ResultPublisher:
             logger.error(f"Ошибка при закрытии Publisher: {e}")
 
     async def publish_result(self, result: ValidationResult):
-        if not self._channel or self._channel.is_closed:
+        if not self._channel or self._channel.is_closed or not self._batch_publisher:
             logger.error("Канал RabbitMQ не открыт, невозможно отправить результат")
             raise RuntimeError("Publisher не подключен к RabbitMQ")
 
         try:
-            message_body = result.model_dump_json().encode('utf-8')
+            message_body, content_type = encode_result_message(result, self._wire_format)
 
-            await self._channel.default_exchange.publish(
-                aio_pika.Message(
-                    message_body,
-                    delivery_mode=aio_pika.DeliveryMode.PERSISTENT
-                ),
-                routing_key=self._result_queue_name
-            )
+            with start_span(
+                "amqp.publish",
+                attributes={"messaging.queue": self._result_queue_name, "request.id": result.request_id},
+            ):
+                # Возврат только после подтверждения брокера: входящее сообщение можно ack-нуть
+                await self._batch_publisher.publish(
+                    aio_pika.Message(
+                        message_body,
+                        content_type=content_type,
+                        delivery_mode=aio_pika.DeliveryMode.PERSISTENT,
+                        headers=inject({PUBLISHED_AT_HEADER: time.time_ns()})
+                    ),
+                    routing_key=self._result_queue_name
+                )
+            QUEUE_MESSAGES_PUBLISHED_TOTAL.labels(queue=self._result_queue_name).inc()
 
-            logger.info(
+            logger.debug(
                 f"Результат валидации отправлен в очередь {self._result_queue_name}: "
                 f"request_id={result.request_id}, approved={result.approved}"
             )
         except Exception as msg:
+            QUEUE_PUBLISH_ERRORS_TOTAL.labels(queue=self._result_queue_name).inc()
             logger.error(
                 f"Ошибка при отправке результата валидации в очередь: {msg}, "
                 f"request_id={result.request_id}"
@@ -1,9 +1,11 @@
 import logging
-from typing import Any
 import httpx
-from tenacity import retry, stop_after_attempt, wait_exponential
 
 from validation_service.services.base_client import BaseServiceClient
+from validation_service.services.hedging import HedgingPolicy
+from validation_service.services.protocols import CacheProtocol
+from validation_service.services.metrics import cache_family, record_cache_lookup
+from validation_service.services.conflict_matrix import ConflictMatrix, CONFLICTS_CSR_MEDIA_TYPE
 from validation_service.services.cache_constants import (
     CONFLICTS_MATRIX_TTL,
     GROUP_ACCESSES_TTL,
@@ -11,6 +13,7 @@ from validation_service.services.cache_constants import (
 )
 from validation_service.models.service_models import (
     GetConflictsResponse,
+    CheckConflictsResponse,
     GetGroupAccessesResponse,
     GetAccessGroupsResponse,
     Conflict,
@@ -26,15 +29,13 @@ class AccessControlClient(BaseServiceClient):
     def __init__(
         self,
         base_url: str,
-        cache: Any | None = None,
-        timeout: float = 30.0
+        cache: CacheProtocol | None = None,
+        timeout: float = 30.0,
+        http_client: httpx.AsyncClient | None = None,
+        hedging: HedgingPolicy | None = None
     ):
-        super().__init__(base_url, cache, timeout)
+        super().__init__(base_url, cache, timeout, http_client, hedging)
 
-    @retry(
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=2, max=10)
-    )
     async def get_conflicts_matrix(
         self,
         use_cache: bool = True
@@ -69,10 +70,57 @@ class AccessControlClient(BaseServiceClient):
 
         return response
 
-    @retry(
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=2, max=10)
-    )
+    async def get_conflict_matrix_packed(
+        self,
+        use_cache: bool = True
+    ) -> ConflictMatrix:
+
+        cache_key = "conflicts_matrix:csr"
+
+        if use_cache and self._cache:
+            cached = await self._cache.get_bytes(cache_key)
+            record_cache_lookup(cache_family(cache_key), cached is not None)
+            if cached is not None:
+                try:
+                    matrix = ConflictMatrix(cached)
+                    logger.debug("Кэш для упакованной матрицы конфликтов")
+                    return matrix
+                except ValueError as e:
+                    logger.warning(f"Повреждённая упакованная матрица конфликтов в кэше: {e}")
+                    await self._cache.delete(cache_key)
+
+        data, content_type = await self._get_bytes("conflicts", accept=CONFLICTS_CSR_MEDIA_TYPE)
+        if content_type != CONFLICTS_CSR_MEDIA_TYPE:
+            raise ValueError(
+                f"Access Control Service вернул неожиданный тип содержимого: {content_type}"
+            )
+
+        matrix = ConflictMatrix(data)
+
+        if use_cache and self._cache:
+            await self._cache.setex_bytes(cache_key, ttl=CONFLICTS_MATRIX_TTL, value=data)
+            logger.debug(
+                f"Кэш сохранен для упакованной матрицы конфликтов: {len(data)} байт"
+            )
+
+        return matrix
+
+    async def check_conflicts(
+        self,
+        user_group_ids: list[int],
+        requested_group_ids: list[int]
+    ) -> CheckConflictsResponse:
+
+        data = await self._post_json_data(
+            "conflicts/check",
+            {
+                "user_group_ids": user_group_ids,
+                "requested_group_ids": requested_group_ids,
+            },
+            retryable=True,
+        )
+        return CheckConflictsResponse.model_validate(data)
+
     async def get_group_accesses(
         self,
         group_id: int,
@@ -108,10 +156,6 @@ class AccessControlClient(BaseServiceClient):
 
         return response
 
-    @retry(
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=2, max=10)
-    )
     async def get_groups_by_access(
         self,
         access_id: int,
@@ -158,6 +202,10 @@ class AccessControlClient(BaseServiceClient):
             "conflicts_matrix",
             "Кэш инвалидирован для матрицы конфликтов"
         )
+        await self._invalidate_cache(
+            "conflicts_matrix:csr",
+            "Кэш инвалидирован для упакованной матрицы конфликтов"
+        )
 
     async def invalidate_group_cache(self, group_id: int):
         await self._invalidate_cache(
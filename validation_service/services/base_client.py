@@ -2,7 +2,10 @@ import logging
 from typing import Any, Callable, Awaitable
 import httpx
 
-from validation_service.services.redis_cache import RedisCache
+from validation_service.services.protocols import CacheProtocol
+from validation_service.services.resilience import RETRYABLE_EXTENSION
+from validation_service.services.hedging import HedgingPolicy
+from validation_service.services.metrics import cache_family, record_cache_lookup
 
 logger = logging.getLogger(__name__)
 
@@ -12,14 +15,17 @@ class BaseServiceClient:
     def __init__(
         self,
         base_url: str,
-        cache: RedisCache | None = None,
-        timeout: float = 30.0
+        cache: CacheProtocol | None = None,
+        timeout: float = 30.0,
+        http_client: httpx.AsyncClient | None = None,
+        hedging: HedgingPolicy | None = None
     ):
 
         self._base_url = base_url.rstrip('/')
         self._cache = cache
         self._timeout = timeout
-        self._client = httpx.AsyncClient(timeout=timeout)
+        self._client = http_client or httpx.AsyncClient(timeout=timeout)
+        self._hedging = hedging
 
     @property
     def base_url(self) -> str:
@@ -29,6 +35,12 @@ class BaseServiceClient:
 
         await self._client.aclose()
 
+    async def check_health(self, timeout: float = 5.0) -> bool:
+
+        # Проверка идет через общий пул клиента: readiness-probe не открывает новых соединений
+        response = await self._client.get(f"{self._base_url}/health", timeout=timeout)
+        return response.status_code == 200
+
     async def _get_from_cache(
         self,
         cache_key: str,
@@ -39,6 +51,7 @@ class BaseServiceClient:
 
         if use_cache and self._cache:
             cached = await self._cache.get_json(cache_key)
+            record_cache_lookup(cache_family(cache_key), cached is not None)
             if cached is not None:
                 log_msg = cache_log_message or f"Кэш hit для {cache_key}"
                 logger.debug(log_msg)
@@ -93,7 +106,10 @@ class BaseServiceClient:
     ) -> Any:
 
         url = f"{self._base_url}/{path.lstrip('/')}"
-        response = await self._client.get(url)
+        if self._hedging is not None:
+            response = await self._hedging.run(lambda: self._client.get(url))
+        else:
+            response = await self._client.get(url)
         response.raise_for_status()
 
         data = response.json()
@@ -101,6 +117,33 @@ class BaseServiceClient:
             return data.get(response_key, default)
         return data
 
+    async def _post_json_data(
+        self,
+        path: str,
+        payload: Any,
+        retryable: bool = False,
+    ) -> Any:
+
+        url = f"{self._base_url}/{path.lstrip('/')}"
+        response = await self._client.post(
+            url, json=payload, extensions={RETRYABLE_EXTENSION: retryable}
+        )
+        response.raise_for_status()
+        return response.json()
+
+    async def _get_bytes(
+        self,
+        path: str,
+        accept: str,
+    ) -> tuple[bytes, str]:
+
+        url = f"{self._base_url}/{path.lstrip('/')}"
+        response = await self._client.get(url, headers={"Accept": accept})
+        response.raise_for_status()
+
+        content_type = response.headers.get("content-type", "").split(";", 1)[0].strip()
+        return response.content, content_type
+
     async def _cached_request(
         self,
         cache_key: str,
@@ -113,6 +156,7 @@ class BaseServiceClient:
 
         if use_cache and self._cache:
             cached = await self._cache.get_json(cache_key)
+            record_cache_lookup(cache_family(cache_key), cached is not None)
             if cached is not None:
                 log_msg = cache_log_message or f"Кэш hit для {cache_key}"
                 logger.debug(log_msg)
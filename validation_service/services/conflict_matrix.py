@@ -0,0 +1,110 @@
+from __future__ import annotations
+
+import struct
+import sys
+from array import array
+from bisect import bisect_left
+from typing import Iterable, Sequence
+
+# Декодер компактной матрицы конфликтов Access Control Service
+# (media type application/vnd.conflicts.csr, см. access_control_service/services/conflict_packing.py).
+
+CONFLICTS_CSR_MEDIA_TYPE = "application/vnd.conflicts.csr"
+CONFLICTS_CSR_MAGIC = b"CCSR"
+CONFLICTS_CSR_VERSION = 1
+
+_HEADER = struct.Struct("<4sHHI")
+_INT32_SIZE = 4
+
+
+def _int32_view(data: memoryview) -> Sequence[int]:
+    if sys.byteorder == "little":
+        return data.cast("i")
+
+    values = array("i", data.tobytes())
+    values.byteswap()
+    return values
+
+
+def pack_conflict_matrix(pairs: Iterable[tuple[int, int]]) -> bytes:
+    """Упаковка пар конфликтов в тот же формат (для in-memory подмен Access Control Service)."""
+
+    adjacency: dict[int, set[int]] = {}
+    for group_id1, group_id2 in pairs:
+        adjacency.setdefault(group_id1, set()).add(group_id2)
+        adjacency.setdefault(group_id2, set()).add(group_id1)
+
+    group_ids = array("i", sorted(adjacency))
+    offsets = array("i", [0])
+    neighbors = array("i")
+    for group_id in group_ids:
+        neighbors.extend(sorted(adjacency[group_id]))
+        offsets.append(len(neighbors))
+
+    parts = [_HEADER.pack(CONFLICTS_CSR_MAGIC, CONFLICTS_CSR_VERSION, 0, len(group_ids))]
+    for values in (group_ids, offsets, neighbors):
+        if sys.byteorder != "little":
+            values.byteswap()
+        parts.append(values.tobytes())
+    return b"".join(parts)
+
+
+class ConflictMatrix:
+
+    def __init__(self, data: bytes):
+
+        if len(data) < _HEADER.size:
+            raise ValueError("Упакованная матрица конфликтов слишком короткая")
+
+        magic, version, _, groups_count = _HEADER.unpack_from(data)
+        if magic != CONFLICTS_CSR_MAGIC or version != CONFLICTS_CSR_VERSION:
+            raise ValueError(
+                f"Неподдерживаемый формат матрицы конфликтов: magic={magic!r}, version={version}"
+            )
+
+        view = memoryview(data)
+        offsets_start = _HEADER.size + groups_count * _INT32_SIZE
+        neighbors_start = offsets_start + (groups_count + 1) * _INT32_SIZE
+        if len(data) < neighbors_start:
+            raise ValueError("Упакованная матрица конфликтов повреждена")
+
+        self._data = data
+        self._group_ids = _int32_view(view[_HEADER.size:offsets_start])
+        self._offsets = _int32_view(view[offsets_start:neighbors_start])
+        self._neighbors = _int32_view(view[neighbors_start:])
+
+        if self._offsets[groups_count] != len(self._neighbors):
+            raise ValueError("Упакованная матрица конфликтов повреждена")
+
+    @property
+    def raw(self) -> bytes:
+        return self._data
+
+    @property
+    def pairs_count(self) -> int:
+        return len(self._neighbors)
+
+    def neighbors(self, group_id: int) -> Sequence[int]:
+
+        index = bisect_left(self._group_ids, group_id)
+        if index == len(self._group_ids) or self._group_ids[index] != group_id:
+            return ()
+        return self._neighbors[self._offsets[index]:self._offsets[index + 1]]
+
+    def find_conflict(
+        self,
+        user_group_ids: Iterable[int],
+        new_group_ids: Iterable[int],
+    ) -> tuple[int, int] | None:
+        """Возвращает пару (группа пользователя, запрашиваемая группа) первого найденного конфликта."""
+
+        user_groups_set = set(user_group_ids)
+        if not user_groups_set:
+            return None
+
+        for new_group_id in new_group_ids:
+            for neighbor_id in self.neighbors(new_group_id):
+                if neighbor_id in user_groups_set:
+                    return neighbor_id, new_group_id
+
+        return None
@@ -0,0 +1,175 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+from validation_service.services.resilience import RetryBudget
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Скользящее окно задержек успешных ответов апстрима.
+
+    Квантиль пересчитывается сортировкой окна не чаще раза в refresh_every новых замеров,
+    а не на каждый запрос; между пересчетами отдается закэшированное значение.
+    """
+
+    def __init__(self, window_size: int = 1000, refresh_every: int = 50):
+        self._samples: deque[float] = deque(maxlen=window_size)
+        self._refresh_every = max(refresh_every, 1)
+        self._observed_since_refresh = 0
+        self._cached: dict[float, float] = {}
+
+    def observe(self, latency: float) -> None:
+        self._samples.append(latency)
+        self._observed_since_refresh += 1
+        if self._observed_since_refresh >= self._refresh_every:
+            self._cached.clear()
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, quantile: float) -> float | None:
+
+        if not self._samples:
+            return None
+
+        cached = self._cached.get(quantile)
+        if cached is not None:
+            return cached
+
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, int(quantile * len(ordered)))
+        self._cached[quantile] = ordered[index]
+        self._observed_since_refresh = 0
+        return ordered[index]
+
+
+class HedgingPolicy:
+    """Политика дублирующих запросов: порог по квантилю задержки и бюджет на дубли."""
+
+    def __init__(
+        self,
+        name: str,
+        quantile: float = 0.95,
+        budget_ratio: float = 0.05,
+        min_delay: float = 0.005,
+        min_samples: int = 20,
+        window_size: int = 1000,
+    ):
+        self.name = name
+        self._quantile = quantile
+        self._min_delay = min_delay
+        self._min_samples = min_samples
+        self._latencies = LatencyTracker(window_size)
+        # Без резерва в секунду: дубли возможны только пропорционально обычному трафику
+        self._budget = RetryBudget(ratio=budget_ratio, min_retries_per_second=0.0)
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.budget_exhausted = 0
+
+    def hedge_delay(self) -> float | None:
+        """Через сколько секунд отправлять дубль; None — данных для оценки квантиля пока мало."""
+
+        if len(self._latencies) < self._min_samples:
+            return None
+        return max(self._min_delay, self._latencies.percentile(self._quantile))
+
+    def observe(self, latency: float) -> None:
+        self._latencies.observe(latency)
+
+    def try_acquire_hedge(self) -> bool:
+
+        if self._budget.try_acquire_retry():
+            self.hedges += 1
+            return True
+
+        self.budget_exhausted += 1
+        return False
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "hedge_rate": round(self.hedges / self.requests, 4) if self.requests else 0.0,
+            "win_rate": round(self.hedge_wins / self.hedges, 4) if self.hedges else 0.0,
+            "budget_exhausted": self.budget_exhausted,
+            "hedge_delay_seconds": self.hedge_delay(),
+        }
+
+    async def run(self, send: Callable[[], Awaitable[T]]) -> T:
+        """Выполняет запрос; если ответа нет дольше порога — дублирует его и берет первый успешный."""
+
+        self.requests += 1
+        self._budget.record_request()
+
+        started: dict[asyncio.Task, float] = {}
+
+        def launch() -> asyncio.Task:
+            task = asyncio.ensure_future(send())
+            started[task] = time.perf_counter()
+            return task
+
+        primary = launch()
+        pending: set[asyncio.Task] = {primary}
+        error: BaseException | None = None
+
+        try:
+            delay = self.hedge_delay()
+            if delay is not None:
+                done, _ = await asyncio.wait(pending, timeout=delay)
+                if not done and self.try_acquire_hedge():
+                    logger.debug(f"Дублирующий запрос к {self.name} после {delay:.3f}с ожидания")
+                    pending.add(launch())
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    self.observe(time.perf_counter() - started[task])
+                    if task is not primary:
+                        self.hedge_wins += 1
+                    return task.result()
+
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+            if pending:
+                await asyncio.gather(*pending, return_exceptions=True)
+
+
+_policies: dict[str, HedgingPolicy] = {}
+
+
+def create_hedging_policy(
+    name: str,
+    quantile: float = 0.95,
+    budget_ratio: float = 0.05,
+    min_delay: float = 0.005,
+    min_samples: int = 20,
+) -> HedgingPolicy:
+
+    policy = HedgingPolicy(
+        name=name,
+        quantile=quantile,
+        budget_ratio=budget_ratio,
+        min_delay=min_delay,
+        min_samples=min_samples,
+    )
+    _policies[name] = policy
+    return policy
+
+
+def get_all_hedging_stats() -> dict[str, dict[str, Any]]:
+    return {name: policy.snapshot() for name, policy in _policies.items()}
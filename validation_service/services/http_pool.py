@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import logging
+import time
+from bisect import bisect_left
+from typing import Any
+
+import httpx
+
+from validation_service.services.metrics import record_upstream_request
+from validation_service.services.resilience import ResiliencePolicy, ResilientTransport
+from validation_service.services.tracing import TracingTransport
+
+logger = logging.getLogger(__name__)
+
+# Границы гистограммы времени ожидания соединения из пула (секунды)
+POOL_WAIT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+class HTTPPoolStats:
+    """Статистика ожидания соединения из пула httpx для одного апстрима."""
+
+    def __init__(self, name: str):
+        self.name = name
+        self.requests = 0
+        self.pool_timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self.bucket_counts = [0] * (len(POOL_WAIT_BUCKETS) + 1)
+
+    def observe(self, wait_seconds: float) -> None:
+        self.requests += 1
+        self.wait_seconds_total += wait_seconds
+        self.wait_seconds_max = max(self.wait_seconds_max, wait_seconds)
+        self.bucket_counts[bisect_left(POOL_WAIT_BUCKETS, wait_seconds)] += 1
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "requests": self.requests,
+            "pool_timeouts": self.pool_timeouts,
+            "wait_seconds_total": round(self.wait_seconds_total, 6),
+            "wait_seconds_avg": round(self.wait_seconds_total / self.requests, 6) if self.requests else 0.0,
+            "wait_seconds_max": round(self.wait_seconds_max, 6),
+            "buckets": {
+                **{str(bound): count for bound, count in zip(POOL_WAIT_BUCKETS, self.bucket_counts)},
+                "+Inf": self.bucket_counts[-1],
+            },
+        }
+
+
+_pool_stats: dict[str, HTTPPoolStats] = {}
+
+
+def get_pool_stats(name: str) -> HTTPPoolStats:
+    if name not in _pool_stats:
+        _pool_stats[name] = HTTPPoolStats(name)
+    return _pool_stats[name]
+
+
+def get_all_pool_stats() -> dict[str, dict[str, Any]]:
+    return {name: stats.snapshot() for name, stats in _pool_stats.items()}
+
+
+class PoolInstrumentedTransport(httpx.AsyncBaseTransport):
+    """Транспорт, измеряющий время ожидания свободного соединения в пуле.
+
+    Первое trace-событие httpcore (connect_tcp или send_request_headers) возникает
+    сразу после того, как запросу выделено соединение из пула.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, stats: HTTPPoolStats):
+        self._transport = transport
+        self._stats = stats
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+
+        started = time.perf_counter()
+        acquired: float | None = None
+        parent_trace = request.extensions.get("trace")
+
+        async def trace(event_name: str, info: dict[str, Any]) -> None:
+            nonlocal acquired
+            if acquired is None:
+                acquired = time.perf_counter()
+            if parent_trace is not None:
+                await parent_trace(event_name, info)
+
+        request.extensions["trace"] = trace
+        status_code: int | None = None
+        try:
+            response = await self._transport.handle_async_request(request)
+            status_code = response.status_code
+            return response
+        except httpx.PoolTimeout:
+            self._stats.pool_timeouts += 1
+            raise
+        finally:
+            finished = time.perf_counter()
+            self._stats.observe((acquired or finished) - started)
+            record_upstream_request(self._stats.name, request.method, status_code, finished - started)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def create_http_client(
+    name: str,
+    base_url: str = "",
+    timeout: float = 30.0,
+    pool_timeout: float | None = None,
+    max_connections: int | None = 100,
+    max_keepalive_connections: int | None = 20,
+    keepalive_expiry: float | None = 30.0,
+    http2: bool = False,
+    resilience: ResiliencePolicy | None = None,
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> httpx.AsyncClient:
+    """transport подменяет сетевой транспорт, например httpx.ASGITransport для сервиса в том же процессе."""
+
+    if http2 and not _http2_available():
+        logger.warning(f"HTTP/2 для {name} недоступен (не установлен пакет h2), используется HTTP/1.1")
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=max_keepalive_connections,
+        keepalive_expiry=keepalive_expiry,
+    )
+    if transport is None:
+        transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+    transport = PoolInstrumentedTransport(transport, get_pool_stats(name))
+    if resilience is not None:
+        # Лимит конкурентности стоит перед пулом: лишние запросы не занимают соединения
+        transport = ResilientTransport(transport, resilience)
+    # Один клиентский спан на логический запрос, включая повторы внутри ResilientTransport
+    transport = TracingTransport(transport, name)
+
+    logger.debug(
+        f"HTTP клиент {name}: max_connections={max_connections}, "
+        f"max_keepalive={max_keepalive_connections}, keepalive_expiry={keepalive_expiry}, http2={http2}"
+    )
+    return httpx.AsyncClient(
+        base_url=base_url,
+        timeout=httpx.Timeout(timeout, pool=pool_timeout if pool_timeout is not None else timeout),
+        transport=transport,
+    )
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Iterable
+
+from validation_service.models.service_models import (
+    Access,
+    CheckConflictsResponse,
+    Conflict,
+    GetAccessGroupsResponse,
+    GetConflictsResponse,
+    GetGroupAccessesResponse,
+    GetUserGroupsResponse,
+    Group,
+)
+from validation_service.services.conflict_matrix import ConflictMatrix, pack_conflict_matrix
+
+logger = logging.getLogger(__name__)
+
+# In-memory реализации CacheProtocol и клиентских протоколов: конвейер валидации
+# можно запустить в одном процессе без Redis и соседних сервисов.
+
+
+class InMemoryCache:
+    """CacheProtocol поверх словаря с TTL; строки и байты хранятся в одном пространстве ключей, как в Redis."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, tuple[str | bytes, float]] = {}
+
+    def _get_raw(self, key: str) -> str | bytes | None:
+
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    async def get(self, key: str) -> str | None:
+        value = self._get_raw(key)
+        return value.decode("utf-8") if isinstance(value, bytes) else value
+
+    async def setex(self, key: str, ttl: int, value: str) -> None:
+        self._data[key] = (value, time.monotonic() + ttl)
+
+    async def get_bytes(self, key: str) -> bytes | None:
+        value = self._get_raw(key)
+        return value.encode("utf-8") if isinstance(value, str) else value
+
+    async def setex_bytes(self, key: str, ttl: int, value: bytes) -> None:
+        self._data[key] = (value, time.monotonic() + ttl)
+
+    async def delete(self, key: str) -> None:
+        self._data.pop(key, None)
+
+    async def get_json(self, key: str) -> Any | None:
+
+        value = await self.get(key)
+        if value is None:
+            return None
+        return json.loads(value)
+
+    async def setex_json(self, key: str, ttl: int, value: Any) -> None:
+        await self.setex(key, ttl, json.dumps(value))
+
+    async def close(self) -> None:
+        self._data.clear()
+
+
+async def _simulate_latency(latency: float) -> None:
+    if latency > 0:
+        await asyncio.sleep(latency)
+
+
+class InMemoryUserServiceClient:
+    """UserServiceClientProtocol с активными группами пользователей в памяти."""
+
+    def __init__(self, user_groups: dict[int, list[int]] | None = None, latency: float = 0.0):
+        self._user_groups: dict[int, list[int]] = {
+            user_id: list(group_ids) for user_id, group_ids in (user_groups or {}).items()
+        }
+        self._latency = latency
+        self.calls = 0
+
+    def set_user_groups(self, user_id: int, group_ids: Iterable[int]) -> None:
+        self._user_groups[user_id] = list(group_ids)
+
+    async def get_user_active_groups(self, user_id: int, use_cache: bool = True) -> GetUserGroupsResponse:
+
+        self.calls += 1
+        await _simulate_latency(self._latency)
+        return GetUserGroupsResponse(
+            groups=[Group(id=group_id) for group_id in self._user_groups.get(user_id, [])]
+        )
+
+    async def invalidate_user_cache(self, user_id: int) -> None:
+        return None
+
+    async def check_health(self, timeout: float = 5.0) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
+
+
+class InMemoryAccessControlClient:
+    """AccessControlClientProtocol с каталогом групп, доступов и конфликтов в памяти."""
+
+    def __init__(
+        self,
+        group_accesses: dict[int, list[int]] | None = None,
+        conflicts: Iterable[tuple[int, int]] = (),
+        latency: float = 0.0,
+    ):
+        self._group_accesses: dict[int, list[int]] = {}
+        self._access_groups: dict[int, list[int]] = {}
+        for group_id, access_ids in (group_accesses or {}).items():
+            self.set_group_accesses(group_id, access_ids)
+        self._latency = latency
+        self._matrix: ConflictMatrix | None = None
+        self._conflicts: list[tuple[int, int]] = []
+        self.set_conflicts(conflicts)
+        self.calls = 0
+
+    def set_group_accesses(self, group_id: int, access_ids: Iterable[int]) -> None:
+
+        for access_id in self._group_accesses.get(group_id, []):
+            self._access_groups[access_id].remove(group_id)
+        self._group_accesses[group_id] = list(access_ids)
+        for access_id in self._group_accesses[group_id]:
+            self._access_groups.setdefault(access_id, []).append(group_id)
+
+    def set_conflicts(self, conflicts: Iterable[tuple[int, int]]) -> None:
+        self._conflicts = [(group_id1, group_id2) for group_id1, group_id2 in conflicts]
+        self._matrix = ConflictMatrix(pack_conflict_matrix(self._conflicts))
+
+    async def _call(self) -> None:
+        self.calls += 1
+        await _simulate_latency(self._latency)
+
+    async def get_conflicts_matrix(self, use_cache: bool = True) -> GetConflictsResponse:
+
+        await self._call()
+        return GetConflictsResponse(
+            conflicts=[
+                Conflict(group_id1=group_id1, group_id2=group_id2)
+                for group_id1, group_id2 in self._conflicts
+            ]
+        )
+
+    async def get_conflict_matrix_packed(self, use_cache: bool = True) -> ConflictMatrix:
+        await self._call()
+        return self._matrix
+
+    async def check_conflicts(
+        self,
+        user_group_ids: list[int],
+        requested_group_ids: list[int],
+    ) -> CheckConflictsResponse:
+
+        await self._call()
+        conflict = self._matrix.find_conflict(user_group_ids, requested_group_ids)
+        if conflict is None:
+            return CheckConflictsResponse(has_conflict=False)
+        return CheckConflictsResponse(
+            has_conflict=True,
+            user_group_id=conflict[0],
+            requested_group_id=conflict[1],
+        )
+
+    async def get_group_accesses(self, group_id: int, use_cache: bool = True) -> GetGroupAccessesResponse:
+
+        await self._call()
+        return GetGroupAccessesResponse(
+            group_id=group_id,
+            accesses=[
+                Access(id=access_id, name=f"access-{access_id}")
+                for access_id in self._group_accesses.get(group_id, [])
+            ],
+        )
+
+    async def get_groups_by_access(self, access_id: int, use_cache: bool = True) -> GetAccessGroupsResponse:
+
+        await self._call()
+        return GetAccessGroupsResponse(
+            access_id=access_id,
+            groups=[Group(id=group_id) for group_id in self._access_groups.get(access_id, [])],
+        )
+
+    async def invalidate_conflicts_cache(self) -> None:
+        return None
+
+    async def invalidate_group_cache(self, group_id: int) -> None:
+        return None
+
+    async def invalidate_access_cache(self, access_id: int) -> None:
+        return None
+
+    async def check_health(self, timeout: float = 5.0) -> bool:
+        return True
+
+    async def close(self) -> None:
+        return None
@@ -0,0 +1,253 @@
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Iterable
+
+from fastapi import FastAPI, Request, Response
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    ProcessCollector,
+    generate_latest,
+)
+from prometheus_client.core import CounterMetricFamily, GaugeMetricFamily, HistogramMetricFamily
+from prometheus_client.registry import Collector
+
+# Отдельный реестр сервиса: в /metrics попадают только метрики этого сервиса
+REGISTRY = CollectorRegistry()
+ProcessCollector(registry=REGISTRY)
+
+HTTP_REQUESTS_TOTAL = Counter(
+    "http_requests_total",
+    "Количество обработанных HTTP запросов",
+    ["method", "route", "status"],
+    registry=REGISTRY,
+)
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Время обработки HTTP запроса",
+    ["method", "route"],
+    registry=REGISTRY,
+)
+HTTP_REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Количество HTTP запросов в обработке",
+    ["method"],
+    registry=REGISTRY,
+)
+
+CACHE_REQUESTS_TOTAL = Counter(
+    "cache_requests_total",
+    "Обращения к кэшу по семействам ключей",
+    ["family", "result"],
+    registry=REGISTRY,
+)
+
+QUEUE_MESSAGES_PUBLISHED_TOTAL = Counter(
+    "queue_messages_published_total",
+    "Количество опубликованных сообщений",
+    ["queue"],
+    registry=REGISTRY,
+)
+QUEUE_PUBLISH_ERRORS_TOTAL = Counter(
+    "queue_publish_errors_total",
+    "Количество ошибок публикации сообщений",
+    ["queue"],
+    registry=REGISTRY,
+)
+QUEUE_MESSAGES_CONSUMED_TOTAL = Counter(
+    "queue_messages_consumed_total",
+    "Количество полученных сообщений по результату обработки",
+    ["queue", "outcome"],
+    registry=REGISTRY,
+)
+QUEUE_MESSAGE_PROCESSING_DURATION = Histogram(
+    "queue_message_processing_seconds",
+    "Время обработки сообщения из очереди",
+    ["queue"],
+    registry=REGISTRY,
+)
+QUEUE_MESSAGES_IN_PROGRESS = Gauge(
+    "queue_messages_in_progress",
+    "Количество сообщений в обработке",
+    ["queue"],
+    registry=REGISTRY,
+)
+VALIDATION_REQUEST_DUPLICATES_TOTAL = Counter(
+    "validation_request_duplicates_total",
+    "Повторно доставленные заявки, уже провалидированные ранее",
+    ["queue"],
+    registry=REGISTRY,
+)
+
+UPSTREAM_REQUEST_DURATION = Histogram(
+    "upstream_request_duration_seconds",
+    "Время запроса к другому сервису (одна попытка, до получения заголовков ответа)",
+    ["upstream", "method", "status"],
+    registry=REGISTRY,
+)
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def cache_family(cache_key: str) -> str:
+    """Семейство ключа кэша без идентификаторов: user:42:groups -> user_groups."""
+    return "_".join(part for part in cache_key.split(":") if not part.isdigit())
+
+
+def record_cache_lookup(family: str, hit: bool) -> None:
+    CACHE_REQUESTS_TOTAL.labels(family=family, result="hit" if hit else "miss").inc()
+
+
+def setup_metrics(app: FastAPI) -> None:
+    """Middleware с метриками HTTP запросов и endpoint /metrics."""
+
+    @app.middleware("http")
+    async def metrics_middleware(request: Request, call_next):
+
+        method = request.method
+        HTTP_REQUESTS_IN_PROGRESS.labels(method=method).inc()
+        started = time.perf_counter()
+        status_code = 500
+        try:
+            response = await call_next(request)
+            status_code = response.status_code
+            return response
+        finally:
+            # Шаблон пути (/groups/{group_id}), а не сам путь — иначе метки не ограничены
+            route = request.scope.get("route")
+            route_path = getattr(route, "path", UNMATCHED_ROUTE)
+            HTTP_REQUEST_DURATION.labels(method=method, route=route_path).observe(
+                time.perf_counter() - started
+            )
+            HTTP_REQUESTS_TOTAL.labels(method=method, route=route_path, status=str(status_code)).inc()
+            HTTP_REQUESTS_IN_PROGRESS.labels(method=method).dec()
+
+    async def metrics_endpoint() -> Response:
+        return Response(content=generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
+
+    app.add_api_route("/metrics", metrics_endpoint, methods=["GET"], include_in_schema=False)
+
+
+def record_upstream_request(upstream: str, method: str, status_code: int | None, duration: float) -> None:
+    status = f"{status_code // 100}xx" if status_code is not None else "error"
+    UPSTREAM_REQUEST_DURATION.labels(upstream=upstream, method=method, status=status).observe(duration)
+
+
+StatsSource = Callable[[], dict[str, dict[str, Any]]]
+
+
+class UpstreamStatsCollector(Collector):
+    """Экспорт статистики, которую пулы соединений и политики устойчивости ведут сами."""
+
+    def __init__(
+        self,
+        pool_stats: StatsSource,
+        resilience_stats: StatsSource,
+        hedging_stats: StatsSource | None = None,
+    ):
+        self._pool_stats = pool_stats
+        self._resilience_stats = resilience_stats
+        self._hedging_stats = hedging_stats
+
+    def collect(self) -> Iterable[Any]:
+        yield from self._collect_pools()
+        yield from self._collect_resilience()
+        if self._hedging_stats is not None:
+            yield from self._collect_hedging()
+
+    def _collect_pools(self) -> Iterable[Any]:
+
+        wait = HistogramMetricFamily(
+            "http_pool_wait_seconds",
+            "Время ожидания свободного соединения в пуле",
+            labels=["upstream"],
+        )
+        timeouts = CounterMetricFamily(
+            "http_pool_timeouts",
+            "Количество запросов, не дождавшихся соединения из пула",
+            labels=["upstream"],
+        )
+
+        for upstream, stats in self._pool_stats().items():
+            cumulative = 0
+            buckets = []
+            for bound, count in stats["buckets"].items():
+                cumulative += count
+                buckets.append((bound, cumulative))
+            wait.add_metric([upstream], buckets=buckets, sum_value=stats["wait_seconds_total"])
+            timeouts.add_metric([upstream], stats["pool_timeouts"])
+
+        yield wait
+        yield timeouts
+
+    def _collect_resilience(self) -> Iterable[Any]:
+
+        circuit_state = GaugeMetricFamily(
+            "upstream_circuit_state",
+            "Текущее состояние размыкателя цепи (1 — активное состояние)",
+            labels=["upstream", "state"],
+        )
+        counters = {
+            "circuit_opened": CounterMetricFamily(
+                "upstream_circuit_opened", "Количество размыканий цепи", labels=["upstream"]
+            ),
+            "circuit_rejected": CounterMetricFamily(
+                "upstream_circuit_rejected", "Запросы, отклоненные разомкнутой цепью", labels=["upstream"]
+            ),
+            "retries": CounterMetricFamily(
+                "upstream_retries", "Количество повторных попыток запросов", labels=["upstream"]
+            ),
+            "retry_budget_exhausted": CounterMetricFamily(
+                "upstream_retry_budget_exhausted", "Повторы, не выполненные из-за исчерпания бюджета", labels=["upstream"]
+            ),
+            "limit_rejected": CounterMetricFamily(
+                "upstream_limit_rejected", "Запросы, отклоненные адаптивным лимитом конкурентности", labels=["upstream"]
+            ),
+        }
+        gauges = {
+            "concurrency_limit": GaugeMetricFamily(
+                "upstream_concurrency_limit", "Текущий адаптивный лимит одновременных запросов", labels=["upstream"]
+            ),
+            "in_flight": GaugeMetricFamily(
+                "upstream_requests_in_flight", "Количество выполняющихся запросов к сервису", labels=["upstream"]
+            ),
+        }
+
+        for upstream, stats in self._resilience_stats().items():
+            for state in ("closed", "open", "half_open"):
+                circuit_state.add_metric([upstream, state], 1.0 if stats["circuit_state"] == state else 0.0)
+            for key, family in counters.items():
+                family.add_metric([upstream], stats[key])
+            for key, family in gauges.items():
+                family.add_metric([upstream], stats[key])
+
+        yield circuit_state
+        yield from counters.values()
+        yield from gauges.values()
+
+    def _collect_hedging(self) -> Iterable[Any]:
+
+        families = {
+            "requests": CounterMetricFamily(
+                "upstream_hedging_requests", "Запросы, выполненные через hedging-политику", labels=["upstream"]
+            ),
+            "hedges": CounterMetricFamily(
+                "upstream_hedges", "Количество отправленных дублирующих запросов", labels=["upstream"]
+            ),
+            "hedge_wins": CounterMetricFamily(
+                "upstream_hedge_wins", "Дублирующие запросы, ответившие раньше основного", labels=["upstream"]
+            ),
+            "budget_exhausted": CounterMetricFamily(
+                "upstream_hedge_budget_exhausted", "Дубли, не отправленные из-за исчерпания бюджета", labels=["upstream"]
+            ),
+        }
+
+        for upstream, stats in self._hedging_stats().items():
+            for key, family in families.items():
+                family.add_metric([upstream], stats[key])
+
+        yield from families.values()
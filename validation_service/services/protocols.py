@@ -1,4 +1,4 @@
-from typing import Protocol
+from typing import Any, Protocol
 
 from validation_service.models.validation_models import (
     ValidationRequest,
@@ -6,10 +6,39 @@ from validation_service.models.validation_models import (
 )
 from validation_service.models.service_models import (
     GetConflictsResponse,
+    CheckConflictsResponse,
     GetGroupAccessesResponse,
     GetAccessGroupsResponse,
     GetUserGroupsResponse,
 )
+from validation_service.services.conflict_matrix import ConflictMatrix
+
+
+class CacheProtocol(Protocol):
+
+    async def get(self, key: str) -> str | None:
+        ...
+
+    async def setex(self, key: str, ttl: int, value: str) -> None:
+        ...
+
+    async def get_bytes(self, key: str) -> bytes | None:
+        ...
+
+    async def setex_bytes(self, key: str, ttl: int, value: bytes) -> None:
+        ...
+
+    async def delete(self, key: str) -> None:
+        ...
+
+    async def get_json(self, key: str) -> Any | None:
+        ...
+
+    async def setex_json(self, key: str, ttl: int, value: Any) -> None:
+        ...
+
+    async def close(self) -> None:
+        ...
 
 
 class UserServiceClientProtocol(Protocol):
@@ -24,6 +53,9 @@ class UserServiceClientProtocol(Protocol):
     async def invalidate_user_cache(self, user_id: int) -> None:
         ...
 
+    async def check_health(self, timeout: float = 5.0) -> bool:
+        ...
+
     async def close(self) -> None:
         ...
 
@@ -36,6 +68,19 @@ class AccessControlClientProtocol(Protocol):
     ) -> GetConflictsResponse:
         ...
 
+    async def get_conflict_matrix_packed(
+        self,
+        use_cache: bool = True
+    ) -> ConflictMatrix:
+        ...
+
+    async def check_conflicts(
+        self,
+        user_group_ids: list[int],
+        requested_group_ids: list[int]
+    ) -> CheckConflictsResponse:
+        ...
+
     async def get_group_accesses(
         self,
         group_id: int,
@@ -59,6 +104,9 @@ class AccessControlClientProtocol(Protocol):
     async def invalidate_access_cache(self, access_id: int) -> None:
         ...
 
+    async def check_health(self, timeout: float = 5.0) -> bool:
+        ...
+
     async def close(self) -> None:
         ...
 
@@ -13,6 +13,11 @@ class RedisCache:
         self._redis_host = redis_host
         self._redis_port = redis_port
         self._client: redis.Redis | None = None
+        self._binary_client: redis.Redis | None = None
+
+    @property
+    def client(self) -> redis.Redis | None:
+        return self._client
 
     async def connect(self):
         try:
@@ -21,6 +26,11 @@ class RedisCache:
                 port=self._redis_port,
                 decode_responses=True
             )
+            self._binary_client = redis.Redis(
+                host=self._redis_host,
+                port=self._redis_port,
+                decode_responses=False
+            )
             await self._client.ping()
             logger.info(f"Подключение к Redis успешно: {self._redis_host}:{self._redis_port}")
         except Exception as e:
@@ -31,6 +41,8 @@ class RedisCache:
         if self._client:
             await self._client.close()
             logger.info("Подключение к Redis закрыто")
+        if self._binary_client:
+            await self._binary_client.close()
 
     async def get(self, key: str) -> str | None:
 
@@ -54,6 +66,27 @@ class RedisCache:
         except Exception as e:
             logger.error(f"Ошибка при установке значения в кэш {key}: {e}")
 
+    async def get_bytes(self, key: str) -> bytes | None:
+
+        if not self._binary_client:
+            return None
+
+        try:
+            return await self._binary_client.get(key)
+        except Exception as e:
+            logger.error(f"Ошибка при получении значения из кэша {key}: {e}")
+            return None
+
+    async def setex_bytes(self, key: str, ttl: int, value: bytes) -> None:
+
+        if not self._binary_client:
+            return
+
+        try:
+            await self._binary_client.setex(key, ttl, value)
+        except Exception as e:
+            logger.error(f"Ошибка при установке значения в кэш {key}: {e}")
+
     async def delete(self, key: str) -> None:
 
         if not self._client:
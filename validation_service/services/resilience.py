@@ -0,0 +1,353 @@
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from typing import Any
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+# Ключ extensions запроса, разрешающий повтор POST-запроса только на чтение
+RETRYABLE_EXTENSION = "retryable"
+
+# Повторяются только безопасные методы: DELETE/PUT в этих сервисах меняют состояние прав
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+RETRYABLE_STATUS_CODES = frozenset({502, 503, 504})
+OVERLOAD_STATUS_CODES = frozenset({429, 502, 503, 504})
+
+RETRY_BACKOFF_BASE = 0.05
+RETRY_BACKOFF_MAX = 1.0
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Запрос отклонен без обращения к сервису: цепь разомкнута."""
+
+
+class ConcurrencyLimitError(httpx.TransportError):
+    """Запрос отклонен: превышен адаптивный лимит одновременных запросов."""
+
+
+class CircuitBreaker:
+    """Размыкатель цепи по числу последовательных ошибок с пробным запросом в half-open."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self.opened_count = 0
+        self.rejected_count = 0
+
+    @property
+    def state(self) -> str:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self._recovery_timeout:
+            return self.HALF_OPEN
+        return self._state
+
+    def allow_request(self) -> bool:
+
+        state = self.state
+        if state == self.CLOSED:
+            return True
+
+        if state == self.HALF_OPEN and not self._probe_in_flight:
+            self._state = self.HALF_OPEN
+            self._probe_in_flight = True
+            return True
+
+        self.rejected_count += 1
+        return False
+
+    def record_success(self) -> None:
+        if self._state != self.CLOSED:
+            logger.info("Цепь замкнута: сервис снова отвечает")
+        self._state = self.CLOSED
+        self._failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self) -> None:
+
+        self._failures += 1
+        if self._state == self.HALF_OPEN or self._failures >= self._failure_threshold:
+            if self._state != self.OPEN:
+                self.opened_count += 1
+                logger.warning(f"Цепь разомкнута после {self._failures} ошибок подряд")
+            self._state = self.OPEN
+            self._opened_at = time.monotonic()
+        self._probe_in_flight = False
+
+    def release_probe(self) -> None:
+        """Пробный запрос завершился без вердикта (отмена, нет свободного соединения)."""
+        self._probe_in_flight = False
+
+
+class RetryBudget:
+    """Бюджет повторов: доля от числа обычных запросов плюс небольшой резерв в секунду."""
+
+    def __init__(
+        self,
+        ratio: float = 0.2,
+        min_retries_per_second: float = 1.0,
+        max_tokens: float = 100.0,
+    ):
+        self._ratio = ratio
+        self._min_retries_per_second = min_retries_per_second
+        self._max_tokens = max_tokens
+        self._tokens = min_retries_per_second
+        self._updated_at = time.monotonic()
+        self.exhausted_count = 0
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._max_tokens,
+            self._tokens + (now - self._updated_at) * self._min_retries_per_second,
+        )
+        self._updated_at = now
+
+    def record_request(self) -> None:
+        self._refill()
+        self._tokens = min(self._max_tokens, self._tokens + self._ratio)
+
+    def try_acquire_retry(self) -> bool:
+
+        self._refill()
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+
+        self.exhausted_count += 1
+        return False
+
+    @property
+    def tokens(self) -> float:
+        self._refill()
+        return self._tokens
+
+
+class AIMDLimiter:
+    """Адаптивный лимит одновременных запросов: аддитивный рост, мультипликативное снижение."""
+
+    def __init__(
+        self,
+        initial_limit: int = 20,
+        min_limit: int = 1,
+        max_limit: int = 200,
+        backoff_ratio: float = 0.9,
+        latency_threshold: float = 1.0,
+    ):
+        self._limit = float(initial_limit)
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._backoff_ratio = backoff_ratio
+        self._latency_threshold = latency_threshold
+        self._in_flight = 0
+        self._condition = asyncio.Condition()
+        self.rejected_count = 0
+
+    @property
+    def limit(self) -> int:
+        return max(self._min_limit, int(self._limit))
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    async def acquire(self, timeout: float | None = None) -> None:
+
+        async with self._condition:
+            try:
+                await asyncio.wait_for(
+                    self._condition.wait_for(lambda: self._in_flight < self.limit),
+                    timeout=timeout,
+                )
+            except asyncio.TimeoutError:
+                self.rejected_count += 1
+                raise ConcurrencyLimitError(
+                    f"Превышен лимит одновременных запросов ({self.limit})"
+                ) from None
+            self._in_flight += 1
+
+    async def release(self, latency: float, overloaded: bool) -> None:
+
+        async with self._condition:
+            in_flight = self._in_flight
+            self._in_flight -= 1
+
+            if overloaded or latency > self._latency_threshold:
+                self._limit = max(float(self._min_limit), self._limit * self._backoff_ratio)
+            elif in_flight * 2 >= self.limit:
+                # Лимит растет только когда он действительно используется
+                self._limit = min(float(self._max_limit), self._limit + 1.0 / self._limit)
+
+            self._condition.notify_all()
+
+
+class ResiliencePolicy:
+    """Набор защит для одного апстрима: размыкатель, бюджет повторов и лимит конкурентности."""
+
+    def __init__(
+        self,
+        name: str,
+        circuit_breaker: CircuitBreaker,
+        retry_budget: RetryBudget,
+        limiter: AIMDLimiter,
+        max_attempts: int = 3,
+        acquire_timeout: float | None = None,
+    ):
+        self.name = name
+        self.circuit_breaker = circuit_breaker
+        self.retry_budget = retry_budget
+        self.limiter = limiter
+        self.max_attempts = max_attempts
+        self.acquire_timeout = acquire_timeout
+        self.retries = 0
+
+    def snapshot(self) -> dict[str, Any]:
+        return {
+            "circuit_state": self.circuit_breaker.state,
+            "circuit_opened": self.circuit_breaker.opened_count,
+            "circuit_rejected": self.circuit_breaker.rejected_count,
+            "retries": self.retries,
+            "retry_budget_tokens": round(self.retry_budget.tokens, 2),
+            "retry_budget_exhausted": self.retry_budget.exhausted_count,
+            "concurrency_limit": self.limiter.limit,
+            "in_flight": self.limiter.in_flight,
+            "limit_rejected": self.limiter.rejected_count,
+        }
+
+
+_policies: dict[str, ResiliencePolicy] = {}
+
+
+def create_resilience_policy(
+    name: str,
+    failure_threshold: int = 5,
+    recovery_timeout: float = 30.0,
+    retry_budget_ratio: float = 0.2,
+    max_attempts: int = 3,
+    initial_limit: int = 20,
+    max_limit: int = 200,
+    latency_threshold: float = 1.0,
+    acquire_timeout: float | None = None,
+) -> ResiliencePolicy:
+
+    policy = ResiliencePolicy(
+        name=name,
+        circuit_breaker=CircuitBreaker(failure_threshold, recovery_timeout),
+        retry_budget=RetryBudget(ratio=retry_budget_ratio),
+        limiter=AIMDLimiter(
+            initial_limit=initial_limit,
+            max_limit=max_limit,
+            latency_threshold=latency_threshold,
+        ),
+        max_attempts=max_attempts,
+        acquire_timeout=acquire_timeout,
+    )
+    _policies[name] = policy
+    return policy
+
+
+def get_all_resilience_stats() -> dict[str, dict[str, Any]]:
+    return {name: policy.snapshot() for name, policy in _policies.items()}
+
+
+def _is_retryable_request(request: httpx.Request) -> bool:
+    return request.method in SAFE_METHODS or bool(request.extensions.get(RETRYABLE_EXTENSION))
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """Транспорт с размыкателем цепи, адаптивным лимитом и повторами в пределах бюджета."""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, policy: ResiliencePolicy):
+        self._transport = transport
+        self._policy = policy
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+
+        policy = self._policy
+        policy.retry_budget.record_request()
+        attempt = 1
+
+        while True:
+            try:
+                response = await self._send_once(request)
+            except httpx.TransportError as e:
+                if isinstance(e, (CircuitOpenError, ConcurrencyLimitError, httpx.PoolTimeout)):
+                    raise
+                if not self._can_retry(request, attempt):
+                    raise
+                logger.debug(f"Повтор запроса {request.method} {request.url} после ошибки: {e}")
+            else:
+                if response.status_code not in RETRYABLE_STATUS_CODES or not self._can_retry(request, attempt):
+                    return response
+                await response.aclose()
+                logger.debug(
+                    f"Повтор запроса {request.method} {request.url} после ответа {response.status_code}"
+                )
+
+            policy.retries += 1
+            await asyncio.sleep(
+                min(RETRY_BACKOFF_MAX, RETRY_BACKOFF_BASE * 2 ** (attempt - 1)) * random.uniform(0.5, 1.0)
+            )
+            attempt += 1
+
+    def _can_retry(self, request: httpx.Request, attempt: int) -> bool:
+        return (
+            attempt < self._policy.max_attempts
+            and _is_retryable_request(request)
+            and self._policy.retry_budget.try_acquire_retry()
+        )
+
+    async def _send_once(self, request: httpx.Request) -> httpx.Response:
+
+        policy = self._policy
+        if not policy.circuit_breaker.allow_request():
+            raise CircuitOpenError(f"Цепь к {policy.name} разомкнута", request=request)
+
+        try:
+            await policy.limiter.acquire(policy.acquire_timeout)
+        except BaseException:
+            # Слот лимита не получен (таймаут или отмена дубля/клиентом): без release_probe
+            # пробный запрос навсегда оставил бы цепь в half_open
+            policy.circuit_breaker.release_probe()
+            raise
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except httpx.PoolTimeout:
+            policy.circuit_breaker.release_probe()
+            await policy.limiter.release(time.perf_counter() - started, overloaded=True)
+            raise
+        except httpx.TransportError:
+            policy.circuit_breaker.record_failure()
+            await policy.limiter.release(time.perf_counter() - started, overloaded=True)
+            raise
+        except BaseException:
+            policy.circuit_breaker.release_probe()
+            await policy.limiter.release(time.perf_counter() - started, overloaded=False)
+            raise
+
+        # 4xx — сервис отвечает, это ошибка запроса, а не сбой апстрима
+        if response.status_code >= 500:
+            policy.circuit_breaker.record_failure()
+        else:
+            policy.circuit_breaker.record_success()
+
+        await policy.limiter.release(
+            time.perf_counter() - started,
+            overloaded=response.status_code in OVERLOAD_STATUS_CODES,
+        )
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
@@ -1,8 +1,9 @@
 import logging
-from typing import Any
-from tenacity import retry, stop_after_attempt, wait_exponential
+import httpx
 
 from validation_service.services.base_client import BaseServiceClient
+from validation_service.services.hedging import HedgingPolicy
+from validation_service.services.protocols import CacheProtocol
 from validation_service.services.cache_constants import USER_GROUPS_TTL
 from validation_service.models.service_models import GetUserGroupsResponse, Group
 
@@ -14,15 +15,13 @@ class UserServiceClient(BaseServiceClient):
     def __init__(
         self,
         base_url: str,
-        cache: Any | None = None,
-        timeout: float = 30.0
+        cache: CacheProtocol | None = None,
+        timeout: float = 30.0,
+        http_client: httpx.AsyncClient | None = None,
+        hedging: HedgingPolicy | None = None
     ):
-        super().__init__(base_url, cache, timeout)
+        super().__init__(base_url, cache, timeout, http_client, hedging)
 
-    @retry(
-        stop=stop_after_attempt(5),
-        wait=wait_exponential(multiplier=2, min=2, max=10)
-    )
     async def get_user_active_groups(
         self,
         user_id: int,
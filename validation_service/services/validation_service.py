@@ -1,9 +1,11 @@
 import logging
 import httpx
 
+from validation_service.models.enums import ReasonCode
 from validation_service.models.validation_models import (
     ValidationRequest,
-    ValidationResult
+    ValidationResult,
+    format_reason
 )
 from validation_service.models.service_models import (
     Group,
@@ -13,6 +15,7 @@ from validation_service.services.protocols import (
     UserServiceClientProtocol,
     AccessControlClientProtocol,
 )
+from validation_service.services.tracing import start_span
 
 logger = logging.getLogger(__name__)
 
@@ -22,84 +25,98 @@ class ValidationService:
     def __init__(
         self,
         user_client: UserServiceClientProtocol,
-        access_control_client: AccessControlClientProtocol
+        access_control_client: AccessControlClientProtocol,
+        conflict_check_mode: str = "matrix"
     ):
 
         self._user_client = user_client
         self._access_control_client = access_control_client
+        self._conflict_check_mode = conflict_check_mode
 
     async def validate(self, request: ValidationRequest) -> ValidationResult:
 
         try:
-            user_groups = await self._get_user_active_groups(request.user_id)
+            with start_span("validation.fetch_user_groups", attributes={"user.id": request.user_id}):
+                user_groups = await self._get_user_active_groups(request.user_id)
             logger.debug(
                 f"Пользователь {request.user_id} имеет активные группы: {user_groups}"
             )
 
-            new_groups = await self._get_new_groups_for_validation(
-                request.permission_type,
-                request.item_id
-            )
+            with start_span(
+                "validation.fetch_item_groups",
+                attributes={"permission.type": str(request.permission_type), "item.id": request.item_id},
+            ):
+                new_groups = await self._get_new_groups_for_validation(
+                    request.permission_type,
+                    request.item_id
+                )
             logger.debug(
                 f"Запрос {request.request_id}: новые группы для проверки: {new_groups}"
             )
 
             if not new_groups:
-                return ValidationResult(
-                    request_id=request.request_id,
-                    approved=False,
-                    reason=f"Не найдено групп для {request.permission_type} с ID {request.item_id}",
-                    user_id=request.user_id,
-                    permission_type=request.permission_type,
-                    item_id=request.item_id
-                )
-
-            conflicts_response = await self._access_control_client.get_conflicts_matrix()
-            logger.debug(f"Загружено {len(conflicts_response.conflicts)} пар конфликтов")
-
-            is_valid, reason = await self._check_conflicts(
-                user_groups,
-                new_groups,
-                conflicts_response.conflicts
-            )
-
-            if is_valid:
+                return self._build_result(request, ReasonCode.NO_GROUPS)
+
+            with start_span(
+                "validation.conflict_check", attributes={"mode": self._conflict_check_mode}
+            ) as span:
+                if self._conflict_check_mode == "remote":
+                    conflict = await self._check_conflicts_remote(
+                        user_groups,
+                        new_groups
+                    )
+                else:
+                    conflict = await self._check_conflicts_with_matrix(
+                        user_groups,
+                        new_groups
+                    )
+                span.set_attribute("approved", conflict is None)
+
+            if conflict is None:
                 logger.debug(
                     f"Запрос {request.request_id} одобрен: "
                     f"пользователь {request.user_id}, {request.permission_type} {request.item_id}"
                 )
-                return ValidationResult(
-                    request_id=request.request_id,
-                    approved=True,
-                    reason=None,
-                    user_id=request.user_id,
-                    permission_type=request.permission_type,
-                    item_id=request.item_id
-                )
-            else:
-                logger.warning(
-                    f"Запрос {request.request_id} отклонен: {reason}"
-                )
-                return ValidationResult(
-                    request_id=request.request_id,
-                    approved=False,
-                    reason=reason,
-                    user_id=request.user_id,
-                    permission_type=request.permission_type,
-                    item_id=request.item_id
-                )
+                return self._build_result(request, ReasonCode.NONE)
 
-        except httpx.HTTPError as e:
-            error_msg = f"Ошибка при получении данных: {str(e)}"
-            logger.error(f"Запрос {request.request_id}: {error_msg}")
-            return ValidationResult(
-                request_id=request.request_id,
-                approved=False,
-                reason=error_msg,
-                user_id=request.user_id,
-                permission_type=request.permission_type,
-                item_id=request.item_id
+            result = self._build_result(request, ReasonCode.CONFLICT, conflict=conflict)
+            logger.warning(
+                f"Запрос {request.request_id} отклонен: {result.reason}"
             )
+            return result
+
+        except httpx.HTTPError as e:
+            result = self._build_result(request, ReasonCode.UPSTREAM_ERROR, detail=str(e))
+            logger.error(f"Запрос {request.request_id}: {result.reason}")
+            return result
+
+    def _build_result(
+        self,
+        request: ValidationRequest,
+        reason_code: ReasonCode,
+        conflict: tuple[int, int] | None = None,
+        detail: str | None = None
+    ) -> ValidationResult:
+
+        conflict_user_group_id, conflict_requested_group_id = conflict or (None, None)
+        return ValidationResult(
+            request_id=request.request_id,
+            approved=reason_code == ReasonCode.NONE,
+            reason=format_reason(
+                reason_code,
+                request.permission_type,
+                request.item_id,
+                conflict_user_group_id,
+                conflict_requested_group_id,
+                detail
+            ),
+            user_id=request.user_id,
+            permission_type=request.permission_type,
+            item_id=request.item_id,
+            reason_code=reason_code,
+            conflict_user_group_id=conflict_user_group_id,
+            conflict_requested_group_id=conflict_requested_group_id
+        )
 
     def _extract_group_ids(self, groups: list[Group]) -> list[int]:
         return [group.id for group in groups]
@@ -127,15 +144,58 @@ class ValidationService:
             )
             return []
 
+    async def _check_conflicts_remote(
+        self,
+        user_group_ids: list[int],
+        new_group_ids: list[int]
+    ) -> tuple[int, int] | None:
+
+        if not user_group_ids:
+            return None
+
+        response = await self._access_control_client.check_conflicts(
+            user_group_ids,
+            new_group_ids
+        )
+        if not response.has_conflict:
+            return None
+
+        return response.user_group_id, response.requested_group_id
+
+    async def _check_conflicts_with_matrix(
+        self,
+        user_group_ids: list[int],
+        new_group_ids: list[int]
+    ) -> tuple[int, int] | None:
+        """Возвращает пару (группа пользователя, запрашиваемая группа) первого конфликта."""
+
+        try:
+            matrix = await self._access_control_client.get_conflict_matrix_packed()
+        except ValueError as e:
+            logger.warning(
+                f"Упакованная матрица конфликтов недоступна, используется JSON: {e}"
+            )
+            conflicts_response = await self._access_control_client.get_conflicts_matrix()
+            logger.debug(f"Загружено {len(conflicts_response.conflicts)} пар конфликтов")
+            return await self._check_conflicts(
+                user_group_ids,
+                new_group_ids,
+                conflicts_response.conflicts
+            )
+
+        logger.debug(f"Загружено {matrix.pairs_count} пар конфликтов")
+
+        return matrix.find_conflict(user_group_ids, new_group_ids)
+
     async def _check_conflicts(
         self,
         user_group_ids: list[int],
         new_group_ids: list[int],
         conflicts: list[Conflict]
-    ) -> tuple[bool, str | None]:
+    ) -> tuple[int, int] | None:
 
         if not user_group_ids or not new_group_ids:
-            return True, None
+            return None
 
         user_groups_set = set(user_group_ids)
         new_groups_set = set(new_group_ids)
@@ -145,15 +205,9 @@ class ValidationService:
             group2_id = conflict.group_id2
 
             if group1_id in user_groups_set and group2_id in new_groups_set:
-                return False, (
-                    f"Конфликт: пользователь имеет группу {group1_id}, "
-                    f"запрашивается группа {group2_id}"
-                )
+                return group1_id, group2_id
 
             if group2_id in user_groups_set and group1_id in new_groups_set:
-                return False, (
-                    f"Конфликт: пользователь имеет группу {group2_id}, "
-                    f"запрашивается группа {group1_id}"
-                )
+                return group2_id, group1_id
 
-        return True, None
+        return None
@@ -0,0 +1,228 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from multiprocessing.connection import wait
+
+from validation_service.config.settings import Settings
+from validation_service.factory import create_consumer_stack
+
+logger = logging.getLogger(__name__)
+
+# Отдельные процессы-воркеры валидации: каждый со своим event loop, соединениями с RabbitMQ и
+# Redis и HTTP пулами, поэтому CPU-часть валидации масштабируется по ядрам, а не упирается в GIL
+# одного процесса. Брокер распределяет сообщения между консьюмерами всех процессов.
+# Запуск: python -m validation_service.worker --processes 4
+
+_RESTART_BACKOFF_INITIAL = 1.0
+_RESTART_BACKOFF_MAX = 30.0
+# Процесс, проработавший дольше этого времени, считается стабильным: задержка рестарта сбрасывается
+_STABLE_UPTIME = 60.0
+# Запас сверх WORKER_SHUTDOWN_TIMEOUT на закрытие соединений воркера
+_SHUTDOWN_GRACE = 5.0
+
+
+async def run_worker(settings: Settings, worker_id: int = 0) -> None:
+    """Консьюмер валидации в текущем процессе до SIGTERM/SIGINT."""
+
+    loop = asyncio.get_running_loop()
+    stop_requested = asyncio.Event()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        loop.add_signal_handler(sig, stop_requested.set)
+
+    stack = await create_consumer_stack(settings)
+    consumer_task = asyncio.create_task(stack.consumer.start_consuming())
+    stop_task = asyncio.create_task(stop_requested.wait())
+    logger.info(f"Воркер {worker_id} (pid={os.getpid()}) запущен")
+
+    try:
+        await asyncio.wait({consumer_task, stop_task}, return_when=asyncio.FIRST_COMPLETED)
+        if consumer_task.done():
+            # Консьюмер завершился сам — ошибка соединения; процесс перезапустит супервизор
+            consumer_task.result()
+            return
+
+        logger.info(f"Воркер {worker_id}: остановка...")
+        if not await stack.consumer.drain(settings.WORKER_SHUTDOWN_TIMEOUT):
+            consumer_task.cancel()
+        await asyncio.gather(consumer_task, return_exceptions=True)
+        await stack.publisher.flush()
+    finally:
+        stop_task.cancel()
+        await stack.close()
+        logger.info(f"Воркер {worker_id} остановлен")
+
+
+def _configure_process(settings: Settings, worker_id: int) -> None:
+
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
+        format=f"%(asctime)s - worker-{worker_id} - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+        force=True
+    )
+    logging.getLogger("aio_pika").setLevel(logging.WARNING)
+    logging.getLogger("httpx").setLevel(logging.WARNING)
+    logging.getLogger("redis").setLevel(logging.WARNING)
+
+    from validation_service.services.tracing import configure_tracing, create_exporter
+
+    # У каждого процесса свой файл трасс, чтобы записи не перемешивались
+    configure_tracing(create_exporter(settings.TRACING_EXPORTER, f"{settings.TRACING_JSONL_PATH}.{worker_id}"))
+
+    if settings.WORKER_METRICS_PORT:
+        from prometheus_client import start_http_server
+
+        from validation_service.services.http_pool import get_all_pool_stats
+        from validation_service.services.hedging import get_all_hedging_stats
+        from validation_service.services.metrics import REGISTRY, UpstreamStatsCollector
+        from validation_service.services.resilience import get_all_resilience_stats
+
+        REGISTRY.register(
+            UpstreamStatsCollector(get_all_pool_stats, get_all_resilience_stats, get_all_hedging_stats)
+        )
+        start_http_server(settings.WORKER_METRICS_PORT + worker_id, registry=REGISTRY)
+
+
+def _worker_main(worker_id: int, settings_overrides: dict) -> None:
+    """Точка входа дочернего процесса."""
+
+    settings = Settings(**settings_overrides)
+    _configure_process(settings, worker_id)
+    try:
+        asyncio.run(run_worker(settings, worker_id))
+    except Exception as e:
+        logging.getLogger(__name__).exception(f"Воркер {worker_id} завершился с ошибкой: {e}")
+        sys.exit(1)
+
+
+class WorkerSupervisor:
+    """Запускает N процессов-воркеров, перезапускает упавшие и останавливает все по сигналу."""
+
+    def __init__(self, processes: int, shutdown_timeout: float, settings_overrides: dict | None = None):
+        self._processes = processes
+        self._shutdown_timeout = shutdown_timeout
+        self._settings_overrides = settings_overrides or {}
+        # spawn: дочерний процесс не наследует event loop и соединения родителя
+        self._context = multiprocessing.get_context("spawn")
+        self._workers: dict[int, multiprocessing.process.BaseProcess] = {}
+        self._started_at: dict[int, float] = {}
+        self._backoff: dict[int, float] = {}
+        self._restart_at: dict[int, float] = {}
+        self._stopping = False
+
+    def _start(self, worker_id: int) -> None:
+
+        process = self._context.Process(
+            target=_worker_main,
+            args=(worker_id, self._settings_overrides),
+            name=f"validation-worker-{worker_id}",
+        )
+        process.start()
+        self._workers[worker_id] = process
+        self._started_at[worker_id] = time.monotonic()
+        logger.info(f"Запущен воркер {worker_id} (pid={process.pid})")
+
+    def _on_exit(self, worker_id: int) -> None:
+
+        process = self._workers.pop(worker_id)
+        process.join()
+        uptime = time.monotonic() - self._started_at.pop(worker_id)
+        if uptime >= _STABLE_UPTIME:
+            self._backoff[worker_id] = _RESTART_BACKOFF_INITIAL
+        delay = self._backoff.get(worker_id, _RESTART_BACKOFF_INITIAL)
+        self._backoff[worker_id] = min(delay * 2, _RESTART_BACKOFF_MAX)
+        self._restart_at[worker_id] = time.monotonic() + delay
+        logger.warning(
+            f"Воркер {worker_id} (pid={process.pid}) завершился с кодом {process.exitcode} "
+            f"после {uptime:.1f} с, перезапуск через {delay} с"
+        )
+
+    def _request_stop(self, signum, frame) -> None:
+        logger.info(f"Получен сигнал {signal.Signals(signum).name}, остановка воркеров...")
+        self._stopping = True
+
+    def run(self) -> None:
+
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGINT, self._request_stop)
+
+        for worker_id in range(self._processes):
+            self._start(worker_id)
+
+        while not self._stopping:
+            now = time.monotonic()
+            for worker_id, restart_at in list(self._restart_at.items()):
+                if restart_at <= now:
+                    del self._restart_at[worker_id]
+                    self._start(worker_id)
+
+            timeout = min((at - now for at in self._restart_at.values()), default=1.0)
+            sentinels = {process.sentinel: worker_id for worker_id, process in self._workers.items()}
+            for sentinel in wait(list(sentinels), timeout=max(min(timeout, 1.0), 0.0)):
+                self._on_exit(sentinels[sentinel])
+
+        self._shutdown()
+
+    def _shutdown(self) -> None:
+
+        # Воркеры получают SIGTERM и дорабатывают текущие сообщения; по истечении срока — SIGKILL
+        for process in self._workers.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self._shutdown_timeout + _SHUTDOWN_GRACE
+        for process in self._workers.values():
+            process.join(max(deadline - time.monotonic(), 0.0))
+
+        for worker_id, process in self._workers.items():
+            if process.is_alive():
+                logger.warning(f"Воркер {worker_id} (pid={process.pid}) не остановился, принудительное завершение")
+                process.kill()
+                process.join()
+
+        logger.info("Все воркеры остановлены")
+
+
+def main(argv: list[str] | None = None) -> None:
+
+    settings = Settings()
+    parser = argparse.ArgumentParser(description="Процессы-воркеры Validation Service")
+    parser.add_argument(
+        "--processes", type=int, default=settings.WORKER_PROCESSES,
+        help="число процессов (0 — по числу CPU)",
+    )
+    parser.add_argument("--shutdown-timeout", type=float, default=settings.WORKER_SHUTDOWN_TIMEOUT)
+    parser.add_argument(
+        "--metrics-port", type=int, default=settings.WORKER_METRICS_PORT,
+        help="базовый порт /metrics: воркер i слушает порт + i (0 — не отдавать)",
+    )
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(
+        level=getattr(logging, settings.LOG_LEVEL.upper(), logging.INFO),
+        format="%(asctime)s - supervisor - %(name)s - %(levelname)s - %(message)s",
+        handlers=[logging.StreamHandler(sys.stdout)],
+    )
+
+    processes = args.processes or os.cpu_count() or 1
+    supervisor = WorkerSupervisor(
+        processes=processes,
+        shutdown_timeout=args.shutdown_timeout,
+        settings_overrides={
+            "WORKER_SHUTDOWN_TIMEOUT": args.shutdown_timeout,
+            "WORKER_METRICS_PORT": args.metrics_port,
+        },
+    )
+    logger.info(f"Запуск {processes} воркеров валидации")
+    supervisor.run()
+
+
+if __name__ == "__main__":
+    main()